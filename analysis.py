@@ -0,0 +1,143 @@
+"""
+Análisis sin estado de una función.
+``analyze`` recibe la función y las opciones y devuelve un resultado
+inmutable; no usa MathHelper ni ningún almacén compartido, de modo que puede
+llamarse desde varios hilos a la vez y su resultado (una dataclass congelada
+con __slots__) se envía entre procesos sin arrastrar estado. La interfaz
+gráfica sigue usando los métodos de MathHelper, que comparten los mismos
+pasos de cálculo; el servicio HTTP (server.py) usa ``analyze``.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import sympy as sp
+
+from logic import (parse_expression, free_parameters, differentiate, integrate,
+                   critical_points_of)
+
+
+@dataclass(frozen=True, slots=True)
+class AnalysisOptions:
+    """Opciones de ``analyze``."""
+
+    # Nombre de la variable independiente
+    variable: str = 'x'
+    # Simplificar la derivada (se omite siempre en expresiones grandes)
+    simplify: bool = True
+    # Buscar y clasificar los puntos críticos
+    critical_points: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class CriticalPoint:
+    """Punto crítico de una función."""
+
+    x: float
+    y: Optional[float] = None
+    type: str = "Indeterminado"
+
+    def as_dict(self):
+        """dict: Formato {'x', 'y', 'type'} que usa la interfaz gráfica."""
+        return {'x': self.x, 'y': self.y, 'type': self.type}
+
+
+@dataclass(frozen=True, slots=True)
+class AnalysisResult:
+    """Resultado inmutable de ``analyze``."""
+
+    function: sp.Expr
+    derivative: sp.Expr
+    order: int
+    integral: Optional[sp.Expr] = None
+    integral_spec: object = None
+    critical_points: tuple = ()
+    parameters: tuple = ()
+    errors: tuple = ()
+
+    def as_dict(self):
+        """
+        Convierte el resultado al formato de ``MathHelper.run_analysis``.
+
+        Returns:
+            dict: Función, derivada, integral y puntos críticos (diccionarios).
+        """
+        return {
+            'function': self.function,
+            'derivative': self.derivative,
+            'integral': self.integral,
+            'critical_points': [point.as_dict() for point in self.critical_points],
+        }
+
+
+DEFAULT_OPTIONS = AnalysisOptions()
+
+
+def analyze(expr, order=1, integral_spec=None, options=None):
+    """
+    Analiza una función: derivada, integral y puntos críticos.
+
+    Args:
+        expr (str | sympy.Expr): Función, como texto (misma sintaxis que la
+            interfaz) o como expresión de SymPy.
+        order (int): Orden de la derivada.
+        integral_spec: None para omitir la integral, 'indefinida' o una
+            tupla (inferior, superior) para la integral definida.
+        options (AnalysisOptions, optional): Opciones del análisis.
+
+    Returns:
+        AnalysisResult: Resultado. Los fallos de la integral o de los puntos
+            críticos no interrumpen el análisis: se describen en ``errors``.
+
+    Raises:
+        ValueError: Si la función no se puede interpretar o el orden no es válido.
+    """
+    if options is None:
+        options = DEFAULT_OPTIONS
+    if order < 1:
+        raise ValueError("el orden de la derivada debe ser al menos 1")
+
+    if isinstance(expr, str):
+        try:
+            function = parse_expression(expr)
+        except Exception as e:
+            raise ValueError(f"No se pudo analizar la función: {expr} ({str(e)})")
+    else:
+        function = sp.sympify(expr)
+    x_symbol = sp.Symbol(options.variable)
+    errors = []
+
+    derivative = differentiate(function, x_symbol, order, options.simplify)
+
+    critical_points = ()
+    if options.critical_points:
+        try:
+            first_derivative = derivative if order == 1 else None
+            critical_points = tuple(
+                CriticalPoint(point['x'], point['y'], point['type'])
+                for point in critical_points_of(function, x_symbol, first_derivative)
+            )
+        except Exception as e:
+            errors.append(f"Error al encontrar puntos críticos: {str(e)}")
+
+    integral = None
+    if integral_spec is not None:
+        try:
+            if integral_spec == 'indefinida':
+                integral = integrate(function, x_symbol)
+            else:
+                lower, upper = integral_spec
+                integral = integrate(function, x_symbol, lower, upper)
+                integral_spec = (lower, upper)
+        except Exception as e:
+            errors.append(f"Error al calcular integral: {str(e)}")
+
+    return AnalysisResult(
+        function=function,
+        derivative=derivative,
+        order=order,
+        integral=integral,
+        integral_spec=integral_spec,
+        critical_points=critical_points,
+        parameters=tuple(s.name for s in free_parameters(function, x_symbol)),
+        errors=tuple(errors),
+    )
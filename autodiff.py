@@ -0,0 +1,367 @@
+"""
+Diferenciación automática en modo directo (modo Taylor) vectorizada.
+A partir del árbol de la expresión se compila un programa que propaga
+coeficientes de Taylor truncados ("jets") sobre toda la malla de x, de modo
+que f, f', ..., f^(n) se obtienen en una sola pasada sin construir la
+expresión simbólica de la derivada.
+
+Cada jet es un arreglo de forma (n + 1, m) con los coeficientes
+c_k = f^(k)(x) / k! en cada uno de los m puntos.
+"""
+import math
+
+import numpy as np
+import sympy as sp
+
+
+def _constant(value, order, shape):
+    """Jet de una constante."""
+    jet = np.zeros((order + 1,) + shape)
+    jet[0] = value
+    return jet
+
+
+def _mul(a, b):
+    """Producto de Cauchy de dos jets."""
+    n = a.shape[0]
+    out = np.empty_like(a)
+    for k in range(n):
+        out[k] = np.einsum('i...,i...->...', a[:k + 1], b[k::-1])
+    return out
+
+
+def _div(a, b):
+    """Cociente de dos jets."""
+    n = a.shape[0]
+    out = np.empty_like(a)
+    for k in range(n):
+        acc = a[k].copy()
+        for j in range(1, k + 1):
+            acc -= b[j] * out[k - j]
+        out[k] = acc / b[0]
+    return out
+
+
+def _integrate(a, h, g0):
+    """
+    Jet de g tal que g' = a' * h, con g(x0) = g0.
+
+    Es la recurrencia común a exp, log, funciones trigonométricas inversas y
+    potencias: g_k = (1/k) * sum_{j=1..k} j * a_j * h_{k-j}.
+    """
+    n = a.shape[0]
+    out = np.empty_like(a)
+    out[0] = g0
+    for k in range(1, n):
+        acc = np.zeros_like(a[0])
+        for j in range(1, k + 1):
+            acc += j * a[j] * h[k - j]
+        out[k] = acc / k
+    return out
+
+
+def _exp(a):
+    """Exponencial de un jet."""
+    n = a.shape[0]
+    out = np.empty_like(a)
+    out[0] = np.exp(a[0])
+    for k in range(1, n):
+        acc = np.zeros_like(a[0])
+        for j in range(1, k + 1):
+            acc += j * a[j] * out[k - j]
+        out[k] = acc / k
+    return out
+
+
+def _log(a):
+    """Logaritmo natural de un jet."""
+    n = a.shape[0]
+    out = np.empty_like(a)
+    out[0] = np.log(a[0])
+    for k in range(1, n):
+        acc = k * a[k]
+        for j in range(1, k):
+            acc -= j * out[j] * a[k - j]
+        out[k] = acc / (k * a[0])
+    return out
+
+
+def _sin_cos(a, hyperbolic=False):
+    """Seno y coseno (o sus versiones hiperbólicas) de un jet a la vez."""
+    n = a.shape[0]
+    s = np.empty_like(a)
+    c = np.empty_like(a)
+    if hyperbolic:
+        s[0], c[0], sign = np.sinh(a[0]), np.cosh(a[0]), 1.0
+    else:
+        s[0], c[0], sign = np.sin(a[0]), np.cos(a[0]), -1.0
+    for k in range(1, n):
+        acc_s = np.zeros_like(a[0])
+        acc_c = np.zeros_like(a[0])
+        for j in range(1, k + 1):
+            acc_s += j * a[j] * c[k - j]
+            acc_c += j * a[j] * s[k - j]
+        s[k] = acc_s / k
+        c[k] = sign * acc_c / k
+    return s, c
+
+
+def _pow_const(a, r):
+    """Potencia de un jet con exponente constante."""
+    if float(r).is_integer():
+        r = int(r)
+        if r == 0:
+            return _constant(1.0, a.shape[0] - 1, a.shape[1:])
+        # Exponentes enteros por multiplicación binaria (válido también en a = 0)
+        base = a if r > 0 else _div(_constant(1.0, a.shape[0] - 1, a.shape[1:]), a)
+        result = None
+        power = base
+        e = abs(r)
+        while e:
+            if e & 1:
+                result = power if result is None else _mul(result, power)
+            e >>= 1
+            if e:
+                power = _mul(power, power)
+        return result
+
+    n = a.shape[0]
+    out = np.empty_like(a)
+    out[0] = np.power(a[0], r)
+    for k in range(1, n):
+        acc = np.zeros_like(a[0])
+        for j in range(1, k + 1):
+            acc += ((r + 1) * j - k) * a[j] * out[k - j]
+        out[k] = acc / (k * a[0])
+    return out
+
+
+# Funciones de un argumento que ``_unary`` sabe propagar
+SUPPORTED_FUNCTIONS = frozenset({
+    'exp', 'log', 'sin', 'cos', 'sinh', 'cosh', 'tan', 'cot', 'sec', 'csc', 'tanh',
+    'asin', 'acos', 'atan', 'asinh', 'acosh', 'atanh', 'Abs', 'sign',
+    'Heaviside', 'DiracDelta',
+})
+
+
+def _unary(name, a):
+    """Aplica una función elemental de un argumento a un jet."""
+    order = a.shape[0] - 1
+    one = _constant(1.0, order, a.shape[1:])
+
+    if name == 'exp':
+        return _exp(a)
+    if name == 'log':
+        return _log(a)
+    if name in ('sin', 'cos'):
+        s, c = _sin_cos(a)
+        return s if name == 'sin' else c
+    if name in ('sinh', 'cosh'):
+        s, c = _sin_cos(a, hyperbolic=True)
+        return s if name == 'sinh' else c
+    if name == 'tan':
+        s, c = _sin_cos(a)
+        return _div(s, c)
+    if name == 'cot':
+        s, c = _sin_cos(a)
+        return _div(c, s)
+    if name == 'sec':
+        return _div(one, _sin_cos(a)[1])
+    if name == 'csc':
+        return _div(one, _sin_cos(a)[0])
+    if name == 'tanh':
+        s, c = _sin_cos(a, hyperbolic=True)
+        return _div(s, c)
+    if name == 'asin':
+        return _integrate(a, _pow_const(one - _mul(a, a), -0.5), np.arcsin(a[0]))
+    if name == 'acos':
+        return _integrate(a, -_pow_const(one - _mul(a, a), -0.5), np.arccos(a[0]))
+    if name == 'atan':
+        return _integrate(a, _div(one, one + _mul(a, a)), np.arctan(a[0]))
+    if name == 'asinh':
+        return _integrate(a, _pow_const(_mul(a, a) + one, -0.5), np.arcsinh(a[0]))
+    if name == 'acosh':
+        return _integrate(a, _pow_const(_mul(a, a) - one, -0.5), np.arccosh(a[0]))
+    if name == 'atanh':
+        return _integrate(a, _div(one, one - _mul(a, a)), np.arctanh(a[0]))
+    if name == 'Abs':
+        # |a| = sign(a0) * a, válido fuera de los ceros de a
+        return np.sign(a[0]) * a
+    if name == 'sign':
+        jet = _constant(0.0, order, a.shape[1:])
+        jet[0] = np.sign(a[0])
+        return jet
+    if name == 'Heaviside':
+        jet = _constant(0.0, order, a.shape[1:])
+        jet[0] = np.heaviside(a[0], 0.5)
+        return jet
+    if name == 'DiracDelta':
+        # Nula fuera de los ceros de a
+        return _constant(0.0, order, a.shape[1:])
+
+    raise NotImplementedError(f"Función no soportada por la diferenciación automática: {name}")
+
+
+class TaylorEvaluator:
+    """
+    Programa compilado que evalúa f y sus derivadas hasta un orden dado.
+    """
+
+    def __init__(self, expr, x_symbol, order, values=None):
+        """
+        Compila la expresión en una secuencia de operaciones sobre jets.
+
+        Args:
+            expr (sympy.Expr): Función f(x).
+            x_symbol (sympy.Symbol): Variable independiente.
+            order (int): Orden máximo de derivación.
+            values (dict, optional): Valores numéricos de los parámetros libres.
+
+        Raises:
+            NotImplementedError: Si la expresión contiene operaciones no soportadas.
+        """
+        self.order = order
+        self.x_symbol = x_symbol
+        values = {sp.Symbol(k) if isinstance(k, str) else k: float(v) for k, v in (values or {}).items()}
+
+        # Programa en orden topológico: (operación, argumentos); cada nodo se
+        # compila una sola vez aunque aparezca varias veces en el árbol
+        self.program = []
+        index = {}
+
+        def compile_node(node):
+            if node in index:
+                return index[node]
+
+            if node == x_symbol:
+                instruction = ('x', ())
+            elif node.is_Number or isinstance(node, sp.NumberSymbol):
+                instruction = ('const', float(node))
+            elif node.is_Symbol:
+                if node not in values:
+                    raise NotImplementedError(f"Parámetro sin valor: {node}")
+                instruction = ('const', values[node])
+            elif node.is_Add:
+                instruction = ('add', tuple(compile_node(arg) for arg in node.args))
+            elif node.is_Mul:
+                instruction = ('mul', tuple(compile_node(arg) for arg in node.args))
+            elif node.is_Pow:
+                base, exponent = node.args
+                if exponent.is_Number:
+                    instruction = ('pow', (compile_node(base),), float(exponent))
+                else:
+                    # a^b = exp(b * log(a))
+                    instruction = ('powgen', (compile_node(base), compile_node(exponent)))
+            elif isinstance(node, sp.Piecewise):
+                # Cada rama es un jet; las condiciones se evalúan sobre x
+                conditions = [condition.subs(values) for _, condition in node.args]
+                if any(condition.free_symbols - {x_symbol} for condition in conditions):
+                    raise NotImplementedError(f"Condición con parámetros sin valor: {node}")
+                instruction = ('piecewise',
+                               tuple(compile_node(branch) for branch, _ in node.args),
+                               tuple(sp.lambdify(x_symbol, c, modules='numpy') for c in conditions))
+            elif isinstance(node, (sp.Heaviside, sp.DiracDelta)):
+                instruction = ('func', (compile_node(node.args[0]),), node.func.__name__)
+            elif isinstance(node, sp.Function) and len(node.args) == 1:
+                # Se rechaza al compilar (no al evaluar), para que quien llama
+                # pueda recurrir a la derivada simbólica
+                name = node.func.__name__
+                if name not in SUPPORTED_FUNCTIONS:
+                    raise NotImplementedError(f"Función no soportada por la diferenciación automática: {name}")
+                instruction = ('func', (compile_node(node.args[0]),), name)
+            else:
+                raise NotImplementedError(f"Operación no soportada: {node.func}")
+
+            self.program.append(instruction)
+            index[node] = len(self.program) - 1
+            return index[node]
+
+        self.output = compile_node(expr)
+
+    def jets(self, x_vals):
+        """
+        Evalúa los coeficientes de Taylor sobre la malla.
+
+        Args:
+            x_vals (numpy.ndarray): Valores de x (1D).
+
+        Returns:
+            numpy.ndarray: Arreglo (order + 1, len(x)) con f^(k)(x) / k!.
+        """
+        x_vals = np.asarray(x_vals, dtype=float)
+        shape = x_vals.shape
+        order = self.order
+        results = []
+
+        with np.errstate(all='ignore'):
+            for instruction in self.program:
+                op = instruction[0]
+                if op == 'x':
+                    jet = _constant(0.0, order, shape)
+                    jet[0] = x_vals
+                    if order >= 1:
+                        jet[1] = 1.0
+                elif op == 'const':
+                    jet = _constant(instruction[1], order, shape)
+                elif op == 'add':
+                    jet = results[instruction[1][0]].copy()
+                    for i in instruction[1][1:]:
+                        jet += results[i]
+                elif op == 'mul':
+                    jet = results[instruction[1][0]]
+                    for i in instruction[1][1:]:
+                        jet = _mul(jet, results[i])
+                elif op == 'pow':
+                    jet = _pow_const(results[instruction[1][0]], instruction[2])
+                elif op == 'powgen':
+                    base, exponent = (results[i] for i in instruction[1])
+                    jet = _exp(_mul(exponent, _log(base)))
+                elif op == 'piecewise':
+                    # Gana la primera condición que se cumple (como numpy.select)
+                    jet = np.full((order + 1,) + shape, np.nan)
+                    for i, condition in reversed(list(zip(instruction[1], instruction[2]))):
+                        mask = np.broadcast_to(condition(x_vals), shape)
+                        jet[:, mask] = results[i][:, mask]
+                else:
+                    jet = _unary(instruction[2], results[instruction[1][0]])
+                results.append(jet)
+
+        return results[self.output]
+
+    def derivatives(self, x_vals):
+        """
+        Evalúa f, f', ..., f^(order) sobre la malla.
+
+        Args:
+            x_vals (numpy.ndarray): Valores de x (1D).
+
+        Returns:
+            numpy.ndarray: Arreglo (order + 1, len(x)); la fila k es f^(k)(x).
+        """
+        jets = self.jets(x_vals)
+        factorials = np.array([math.factorial(k) for k in range(self.order + 1)], dtype=float)
+        return jets * factorials.reshape((-1,) + (1,) * (jets.ndim - 1))
+
+
+class DerivativeFunction:
+    """Función numérica de x que devuelve la derivada k-ésima mediante AD."""
+
+    __slots__ = ('evaluator', 'k', 'key')
+
+    def __init__(self, evaluator, k, key=None):
+        """
+        Inicializa la función.
+
+        Args:
+            evaluator (TaylorEvaluator): Programa compilado.
+            k (int): Orden de la derivada a devolver.
+            key (hashable, optional): Clave para la caché de curvas.
+        """
+        self.evaluator = evaluator
+        self.k = k
+        self.key = key
+
+    def __call__(self, x):
+        scalar = np.ndim(x) == 0
+        values = self.evaluator.derivatives(np.atleast_1d(x))[self.k]
+        return values[0] if scalar else values
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Banco de pruebas de rendimiento para el renderizado de gráficas.
+
+Ejecuta ``plot_functions`` de ``gui.canvas.MathPlotCanvas`` y de
+``plotter.MathCanvas`` sin ventana visible, con un conjunto fijo de
+funciones, rangos y cantidades de puntos críticos. Mide por separado el
+muestreo, la creación de artistas, ``tight_layout`` y el dibujado, y
+genera un informe JSON junto con perfiles de cProfile (``.prof``) y pilas
+plegadas (``.folded``) aptas para flamegraph. ``MathPlotCanvas`` se configura
+como en la aplicación (muestreador en varios procesos, dominios y caché de
+curvas, que se vacía antes de cada medición).
+
+Uso:
+    python benchmark.py --repeat 5 --output bench_results
+    python benchmark.py --baseline bench_results/report.json --output bench_new --tolerance 0.25
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import cProfile
+from collections import defaultdict
+
+# Renderizado fuera de pantalla: el canvas de Qt dibuja con Agg sin ventana
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import sympy as sp
+import matplotlib
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QT_VERSION_STR
+
+from domain import DomainAnalyzer
+from logic import MathHelper
+from parallel_sampling import ParallelSampler
+
+# Casos fijos: (nombre, función, rango, número de puntos críticos sintéticos)
+CASES = [
+    ("polinomio", "x^3 - 3x", (-3, 3), 2),
+    ("trigonometrica", "sin(x)*x^2", (-10, 10), 20),
+    ("exponencial", "exp(x)*cos(x)", (-5, 5), 0),
+    ("racional", "1/(x^2 + 1)", (-20, 20), 1),
+    ("periodica_densa", "sin(5x)", (-50, 50), 300),
+]
+
+STAGES = ('sampling', 'artists', 'tight_layout', 'draw', 'total')
+
+REPORT_FILENAME = 'report.json'
+
+
+class _StageClock:
+    """Acumula el tiempo de pared de una etapa a través de varias llamadas."""
+
+    def __init__(self):
+        """Inicializa el acumulador."""
+        self.elapsed = 0.0
+
+    def wrap(self, func):
+        """
+        Envuelve una función para acumular su tiempo de ejecución.
+
+        Args:
+            func (callable): Función a medir.
+
+        Returns:
+            callable: Función envuelta (conserva la clave de las funciones
+                del almacén, de la que dependen la caché y los dominios).
+        """
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.elapsed += time.perf_counter() - start
+        timed.key = getattr(func, 'key', None)
+        return timed
+
+
+class _FoldedStackProfiler:
+    """
+    Perfilador determinista que acumula el tiempo propio por pila de llamadas.
+
+    El resultado usa el formato de pilas plegadas (``a;b;c microsegundos``)
+    que aceptan flamegraph.pl, speedscope o inferno.
+    """
+
+    def __init__(self):
+        """Inicializa la pila y los contadores."""
+        self.stack = []
+        self.totals = defaultdict(float)
+
+    def _profile(self, frame, event, arg):
+        """Callback de ``sys.setprofile``."""
+        now = time.perf_counter()
+        if event == 'call':
+            code = frame.f_code
+            label = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+            self.stack.append([label, now, 0.0])
+        elif event == 'c_call':
+            label = f"<c>:{getattr(arg, '__qualname__', getattr(arg, '__name__', '?'))}"
+            self.stack.append([label, now, 0.0])
+        elif event in ('return', 'c_return', 'c_exception'):
+            if not self.stack:
+                return
+            label, start, child = self.stack.pop()
+            elapsed = now - start
+            key = ';'.join([entry[0] for entry in self.stack] + [label])
+            self.totals[key] += elapsed - child
+            if self.stack:
+                self.stack[-1][2] += elapsed
+
+    def run(self, func):
+        """
+        Ejecuta una función bajo el perfilador.
+
+        Args:
+            func (callable): Función sin argumentos a perfilar.
+        """
+        sys.setprofile(self._profile)
+        try:
+            func()
+        finally:
+            sys.setprofile(None)
+
+    def dump(self, filename):
+        """
+        Escribe las pilas plegadas en un archivo.
+
+        Args:
+            filename (str): Ruta del archivo de salida.
+        """
+        with open(filename, 'w', encoding='utf-8') as fh:
+            for key, seconds in sorted(self.totals.items()):
+                micros = int(seconds * 1e6)
+                if micros > 0:
+                    fh.write(f"{key} {micros}\n")
+
+
+def build_lambda_functions(func_str, helper=None):
+    """
+    Construye las funciones lambda de un caso usando la lógica real.
+
+    Args:
+        func_str (str): Función en la notación de la calculadora.
+        helper (MathHelper, optional): Lógica cuyo almacén comparten los
+            canvas (uno nuevo por defecto).
+
+    Returns:
+        dict: Funciones lambda para f(x), f'(x) e integral.
+    """
+    helper = helper or MathHelper()
+    if not helper.set_function(func_str):
+        raise ValueError(f"No se pudo analizar la función: {func_str}")
+    helper.calculate_derivative(1)
+    try:
+        helper.calculate_integral(False)
+    except Exception:
+        pass
+    return helper.create_lambda_functions()
+
+
+def synthetic_critical_points(x_range, count):
+    """
+    Genera puntos críticos sintéticos repartidos en el rango.
+
+    Args:
+        x_range (tuple): Rango (x_min, x_max).
+        count (int): Número de puntos a generar.
+
+    Returns:
+        list: Lista de puntos críticos en el formato de ``find_critical_points``.
+    """
+    types = ["Máximo", "Mínimo", "Punto de inflexión", "Indeterminado"]
+    x_min, x_max = x_range
+    return [
+        {'x': float(x), 'y': float(np.sin(x)), 'type': types[i % len(types)]}
+        for i, x in enumerate(np.linspace(x_min, x_max, count + 2)[1:-1])
+    ]
+
+
+def make_targets(helper):
+    """
+    Crea los canvas a medir.
+
+    Args:
+        helper (MathHelper): Lógica de la que proceden las funciones.
+
+    Returns:
+        dict: Nombre del objetivo -> (canvas Qt, figura, función de graficado,
+            objeto cuyo método ``sample`` se mide o None para medir las funciones).
+    """
+    from gui.canvas import MathPlotCanvas
+    from plotter import MathCanvas
+
+    # Misma configuración que la aplicación (ver main.py)
+    plot_canvas = MathPlotCanvas()
+    plot_canvas.resize(1000, 700)
+    plot_canvas.sampler = ParallelSampler(helper.store)
+    plot_canvas.domains = DomainAnalyzer(helper.store)
+    math_canvas = MathCanvas(width=10, height=7)
+
+    def plot_gui(lambda_funcs, x_range, critical_points):
+        plot_canvas.plot_functions(lambda_funcs, x_range, critical_points=critical_points)
+
+    def plot_legacy(lambda_funcs, x_range, critical_points):
+        eval_point = critical_points[0]['x'] if critical_points else None
+        math_canvas.plot_functions(lambda_funcs, x_range, eval_point=eval_point)
+
+    return {
+        'MathPlotCanvas': (plot_canvas.canvas, plot_canvas.fig, plot_gui, plot_canvas),
+        'plotter.MathCanvas': (math_canvas, math_canvas.fig, plot_legacy, None),
+    }
+
+
+def _clear_curves(sampled):
+    """Vacía la caché de curvas para medir el muestreo completo."""
+    if sampled is not None:
+        sampled.curve_cache.clear()
+
+
+def measure_once(canvas, fig, plot, lambda_funcs, x_range, critical_points, sampled=None):
+    """
+    Mide una ejecución de graficado separando sus etapas.
+
+    Args:
+        canvas (FigureCanvasQTAgg): Canvas sobre el que se dibuja.
+        fig (Figure): Figura asociada al canvas.
+        plot (callable): Función de graficado del objetivo.
+        lambda_funcs (dict): Funciones lambda del caso.
+        x_range (tuple): Rango del eje x.
+        critical_points (list): Puntos críticos sintéticos.
+        sampled (MathPlotCanvas, optional): Canvas cuyo método ``sample``
+            (caché, dominios y procesos de trabajo) se mide como muestreo; sin
+            él, se mide el tiempo dentro de las funciones.
+
+    Returns:
+        dict: Segundos por etapa.
+    """
+    sampling = _StageClock()
+    layout = _StageClock()
+    _clear_curves(sampled)
+    if sampled is None:
+        timed_funcs = {k: sampling.wrap(v) for k, v in lambda_funcs.items()}
+    else:
+        timed_funcs = lambda_funcs
+        sampled.sample = sampling.wrap(sampled.sample)
+
+    original_tight_layout = fig.tight_layout
+    fig.tight_layout = layout.wrap(original_tight_layout)
+    try:
+        start = time.perf_counter()
+        plot(timed_funcs, x_range, critical_points)
+        plot_time = time.perf_counter() - start
+    finally:
+        del fig.tight_layout
+        if sampled is not None:
+            del sampled.sample
+
+    start = time.perf_counter()
+    canvas.draw()
+    draw_time = time.perf_counter() - start
+
+    return {
+        'sampling': sampling.elapsed,
+        'artists': max(plot_time - sampling.elapsed - layout.elapsed, 0.0),
+        'tight_layout': layout.elapsed,
+        'draw': draw_time,
+        'total': plot_time + draw_time,
+    }
+
+
+def summarize(samples):
+    """
+    Resume las muestras de cada etapa.
+
+    Args:
+        samples (list): Lista de diccionarios devueltos por ``measure_once``.
+
+    Returns:
+        dict: Estadísticas (ms) por etapa.
+    """
+    summary = {}
+    for stage in STAGES:
+        values = np.array([s[stage] for s in samples]) * 1000.0
+        summary[stage] = {
+            'median_ms': float(np.median(values)),
+            'min_ms': float(values.min()),
+            'mean_ms': float(values.mean()),
+            'max_ms': float(values.max()),
+        }
+    return summary
+
+
+def environment_info():
+    """
+    Recoge las versiones relevantes para comparar informes.
+
+    Returns:
+        dict: Versiones de Python y bibliotecas.
+    """
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'sympy': sp.__version__,
+        'matplotlib': matplotlib.__version__,
+        'matplotlib_backend': matplotlib.get_backend(),
+        'qt': QT_VERSION_STR,
+    }
+
+
+def run_benchmark(repeat, output_dir, profile=True):
+    """
+    Ejecuta todos los casos sobre todos los objetivos.
+
+    Args:
+        repeat (int): Repeticiones medidas por caso.
+        output_dir (str): Directorio donde guardar informe y perfiles.
+        profile (bool): Si es True, genera perfiles por caso.
+
+    Returns:
+        dict: Informe completo.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    helper = MathHelper()
+    targets = make_targets(helper)
+    report = {'environment': environment_info(), 'repeat': repeat, 'results': {}}
+
+    for name, func_str, x_range, n_points in CASES:
+        lambda_funcs = build_lambda_functions(func_str, helper)
+        critical_points = synthetic_critical_points(x_range, n_points)
+
+        for target_name, (canvas, fig, plot, sampled) in targets.items():
+            # Calentamiento para excluir cachés de fuentes y primeras asignaciones
+            measure_once(canvas, fig, plot, lambda_funcs, x_range, critical_points, sampled)
+            samples = [
+                measure_once(canvas, fig, plot, lambda_funcs, x_range, critical_points, sampled)
+                for _ in range(repeat)
+            ]
+
+            case_key = f"{target_name}/{name}"
+            report['results'][case_key] = {
+                'function': func_str,
+                'x_range': list(x_range),
+                'critical_points': n_points,
+                'stages': summarize(samples),
+            }
+
+            if profile:
+                def run_case():
+                    _clear_curves(sampled)
+                    plot(lambda_funcs, x_range, critical_points)
+                    canvas.draw()
+
+                base = os.path.join(output_dir, case_key.replace('/', '__'))
+                profiler = cProfile.Profile()
+                profiler.runcall(run_case)
+                profiler.dump_stats(base + '.prof')
+
+                folded = _FoldedStackProfiler()
+                folded.run(run_case)
+                folded.dump(base + '.folded')
+
+            total = report['results'][case_key]['stages']['total']['median_ms']
+            print(f"{case_key:45s} {total:9.2f} ms")
+
+    for _, _, _, sampled in targets.values():
+        if sampled is not None:
+            sampled.sampler.shutdown()
+
+    report_path = os.path.join(output_dir, REPORT_FILENAME)
+    with open(report_path, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+    print(f"Informe guardado en {report_path}")
+
+    return report
+
+
+def compare_reports(report, baseline, tolerance):
+    """
+    Compara un informe con una línea base y detecta regresiones.
+
+    Args:
+        report (dict): Informe actual.
+        baseline (dict): Informe de referencia.
+        tolerance (float): Aumento relativo permitido (0.25 = 25 %).
+
+    Returns:
+        list: Descripciones de las regresiones encontradas.
+    """
+    regressions = []
+    for case_key, current in report['results'].items():
+        reference = baseline.get('results', {}).get(case_key)
+        if reference is None:
+            continue
+        for stage in STAGES:
+            new = current['stages'][stage]['median_ms']
+            old = reference['stages'][stage]['median_ms']
+            # Ignorar etapas demasiado pequeñas para medirse con fiabilidad
+            if old < 0.5:
+                continue
+            if new > old * (1.0 + tolerance):
+                regressions.append(
+                    f"{case_key} [{stage}]: {old:.2f} ms -> {new:.2f} ms (+{(new / old - 1) * 100:.0f} %)"
+                )
+    return regressions
+
+
+def main(argv=None):
+    """
+    Función principal del banco de pruebas.
+
+    Args:
+        argv (list, optional): Argumentos (sin el nombre del programa).
+
+    Returns:
+        int: 0 sin regresiones; 1 si se detectan.
+    """
+    parser = argparse.ArgumentParser(description="Banco de pruebas de renderizado de gráficas")
+    parser.add_argument('--repeat', type=int, default=5, help="repeticiones medidas por caso")
+    parser.add_argument('--output', default='bench_results', help="directorio de salida")
+    parser.add_argument('--no-profile', action='store_true', help="no generar perfiles")
+    parser.add_argument('--baseline', help="informe JSON de referencia para detectar regresiones")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="aumento relativo permitido frente a la referencia")
+    args = parser.parse_args(argv)
+
+    # La referencia se lee antes de medir, y no puede ser el informe que se va
+    # a escribir: se compararía la ejecución consigo misma
+    baseline = None
+    if args.baseline:
+        report_path = os.path.join(args.output, REPORT_FILENAME)
+        if os.path.abspath(args.baseline) == os.path.abspath(report_path):
+            parser.error(f"--baseline coincide con el informe de salida ({report_path}); "
+                         "use otro --output")
+        with open(args.baseline, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    report = run_benchmark(args.repeat, args.output, profile=not args.no_profile)
+
+    if baseline is not None:
+        if baseline.get('environment', {}).get('matplotlib') != matplotlib.__version__:
+            print(f"Matplotlib {baseline['environment'].get('matplotlib')} -> {matplotlib.__version__}")
+        regressions = compare_reports(report, baseline, args.tolerance)
+        if regressions:
+            print("Regresiones detectadas:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("Sin regresiones respecto a la referencia.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
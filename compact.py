@@ -0,0 +1,123 @@
+"""
+Representación compacta de expresiones grandes.
+Las derivadas de orden alto repiten los mismos subárboles muchas veces; con
+eliminación de subexpresiones comunes (sp.cse) se guardan como una lista de
+definiciones u1 = ..., u2 = ... y una expresión reducida, de modo que el
+texto, la compilación y la memoria crecen con el tamaño del DAG y no con el
+del árbol completo.
+"""
+import sympy as sp
+
+from piecewise import numeric_modules
+
+# A partir de este número de nodos (árbol) una expresión se considera grande
+COMPACT_NODE_THRESHOLD = 300
+
+
+def expression_size(expr):
+    """
+    Calcula el tamaño de una expresión como árbol y como DAG.
+
+    El recorrido es iterativo y visita cada nodo distinto una sola vez, por
+    lo que su coste es lineal en el tamaño del DAG.
+
+    Args:
+        expr (sympy.Basic): Expresión a medir.
+
+    Returns:
+        tuple: (nodos del árbol, nodos distintos del DAG).
+    """
+    sizes = {}
+    stack = [(expr, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node in sizes:
+            continue
+        if expanded or not node.args:
+            sizes[node] = 1 + sum(sizes[arg] for arg in node.args)
+        else:
+            stack.append((node, True))
+            stack.extend((arg, False) for arg in node.args if arg not in sizes)
+    return sizes[expr], len(sizes)
+
+
+def is_large(expr, threshold=COMPACT_NODE_THRESHOLD):
+    """
+    Indica si una expresión es lo bastante grande para guardarla compacta.
+
+    Args:
+        expr (sympy.Basic): Expresión a medir.
+        threshold (int): Número de nodos del árbol a partir del cual es grande.
+
+    Returns:
+        bool: True si el árbol supera el umbral.
+    """
+    return expression_size(expr)[0] > threshold
+
+
+class CompactExpression:
+    """
+    Expresión guardada como subexpresiones con nombre y una expresión reducida.
+    """
+
+    # No se guarda la expresión completa: ``expand`` la reconstruye cuando se pide
+    __slots__ = ('replacements', 'reduced', 'tree_nodes', 'dag_nodes')
+
+    def __init__(self, expr, prefix='u'):
+        """
+        Aplica la eliminación de subexpresiones comunes.
+
+        Args:
+            expr (sympy.Expr): Expresión completa.
+            prefix (str): Prefijo de los nombres de las subexpresiones.
+        """
+        # Evitar nombres que coincidan con símbolos de la propia expresión
+        names = sp.numbered_symbols(prefix, start=1, exclude=expr.free_symbols)
+        replacements, reduced = sp.cse(expr, symbols=names)
+        self.replacements = replacements
+        self.reduced = reduced[0]
+        self.tree_nodes, self.dag_nodes = expression_size(expr)
+
+    def expand(self):
+        """
+        Reconstruye la expresión completa sustituyendo las subexpresiones.
+
+        Returns:
+            sympy.Expr: Expresión equivalente sin nombres intermedios.
+        """
+        definitions = {}
+        for symbol, value in self.replacements:
+            definitions[symbol] = value.xreplace(definitions)
+        return self.reduced.xreplace(definitions)
+
+    def stats(self):
+        """
+        Obtiene estadísticas de tamaño.
+
+        Returns:
+            dict: Nodos del árbol, nodos del DAG, número de subexpresiones y
+                nodos de la forma compacta.
+        """
+        compact_nodes = expression_size(self.reduced)[0] + sum(
+            expression_size(value)[0] for _, value in self.replacements
+        )
+        return {
+            'tree_nodes': self.tree_nodes,
+            'dag_nodes': self.dag_nodes,
+            'subexpressions': len(self.replacements),
+            'compact_nodes': compact_nodes,
+        }
+
+    def lambdify(self, x_symbol, modules=('numpy', 'sympy')):
+        """
+        Compila la forma compacta; cada subexpresión se evalúa una sola vez.
+
+        Args:
+            x_symbol (sympy.Symbol): Variable independiente.
+            modules (tuple): Módulos para lambdify.
+
+        Returns:
+            callable: Función numérica de x.
+        """
+        return sp.lambdify(x_symbol, self.reduced, modules=numeric_modules(modules),
+                           cse=lambda _: (self.replacements, self.reduced))
@@ -0,0 +1,347 @@
+"""
+Comparación de varias funciones separadas por ';' (por ejemplo, "sen(x); x^2; e^x").
+Los resultados simbólicos se guardan en el almacén de expresiones compartido,
+así que añadir una función a un conjunto ya analizado solo calcula la nueva;
+las que faltan se reparten entre procesos de trabajo. Las curvas de todas las
+funciones se evalúan sobre una única malla con una sola llamada vectorizada.
+"""
+import os
+import time
+import atexit
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+import numpy as np
+import sympy as sp
+
+from sandbox import _get_context, _limit_resources, DEFAULT_MEMORY_LIMIT_MB, DEFAULT_TIMEOUT_S
+from piecewise import numeric_modules
+
+SEPARATOR = ';'
+
+# Procesos de trabajo para las funciones que no están en el almacén
+MAX_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# Funciones apiladas compiladas que se conservan
+STACKED_CACHE_CAPACITY = 32
+
+# Curvas que se comparan, en el orden en que se apilan
+CURVE_KEYS = ('function', 'derivative', 'integral')
+
+# Espera máxima (s) a que termine cada proceso de trabajo interrumpido
+TERMINATE_JOIN_S = 1.0
+
+
+def split_functions(text):
+    """
+    Separa una entrada con varias funciones.
+
+    Args:
+        text (str): Funciones separadas por ';'.
+
+    Returns:
+        list: Funciones no vacías, sin espacios sobrantes.
+    """
+    return [part.strip() for part in text.split(SEPARATOR) if part.strip()]
+
+
+def integral_key(integral_spec):
+    """
+    Obtiene el nombre con el que se guarda la integral en el almacén.
+
+    Args:
+        integral_spec: None, 'indefinida' o una tupla (inferior, superior).
+
+    Returns:
+        tuple: Nombre del resultado (igual que en ``MathHelper.calculate_integral``) o None.
+    """
+    if integral_spec is None:
+        return None
+    if integral_spec == 'indefinida':
+        return ('integral',)
+    return ('integral',) + tuple(integral_spec)
+
+
+def _analyze_remote(func_str, order, integral_spec):
+    """
+    Analiza una función en un proceso de trabajo.
+
+    Args:
+        func_str (str): Función a analizar.
+        order (int): Orden de la derivada.
+        integral_spec: Especificación de la integral.
+
+    Returns:
+        dict: Expresiones en formato srepr (la integral es None si no se pidió
+            y False si no se pudo calcular) y puntos críticos.
+    """
+    # Importar aquí: el proceso de trabajo no necesita la interfaz
+    from logic import MathHelper
+
+    helper = MathHelper()
+    if not helper.set_function(func_str):
+        raise ValueError(f"No se pudo analizar la función: {func_str}")
+
+    derivative = helper.calculate_derivative(order)
+    integral = None
+    if integral_spec is not None:
+        try:
+            if integral_spec == 'indefinida':
+                integral = sp.srepr(helper.calculate_integral(False))
+            else:
+                integral = sp.srepr(helper.calculate_integral(True, *integral_spec))
+        except Exception:
+            integral = False
+
+    return {
+        'function': sp.srepr(helper.current['function']),
+        'derivative': sp.srepr(derivative),
+        'integral': integral,
+        'critical_points': helper.find_critical_points(),
+    }
+
+
+class StackedFunctions:
+    """
+    Varias expresiones compiladas en una única función que devuelve todas las curvas.
+    """
+
+    def __init__(self, x_symbol, expressions):
+        """
+        Compila las expresiones; las subexpresiones comunes se evalúan una vez.
+
+        Args:
+            x_symbol (sympy.Symbol): Variable independiente.
+            expressions (list): Expresiones a apilar.
+        """
+        self.size = len(expressions)
+        self.func = sp.lambdify(x_symbol, list(expressions), modules=numeric_modules(('numpy', 'sympy')), cse=True)
+
+    def evaluate(self, x_vals):
+        """
+        Evalúa todas las expresiones sobre la malla en una sola llamada.
+
+        Args:
+            x_vals (numpy.ndarray): Malla de x (1D).
+
+        Returns:
+            numpy.ndarray: Matriz (número de expresiones, len(x)); NaN donde
+                una expresión no es un real finito.
+        """
+        x_vals = np.asarray(x_vals, dtype=float)
+        values = np.empty((self.size, x_vals.size))
+        with np.errstate(all='ignore'):
+            for row, result in zip(values, self.func(x_vals)):
+                result = np.asarray(result)
+                if np.iscomplexobj(result):
+                    result = np.where(result.imag == 0, result.real, np.nan)
+                # Las expresiones constantes devuelven un escalar
+                row[:] = np.broadcast_to(result.astype(float), x_vals.shape)
+        values[~np.isfinite(values)] = np.nan
+        return values
+
+
+class ComparisonCurves:
+    """
+    Curvas de varias funciones listas para graficar juntas.
+    """
+
+    def __init__(self, stacked, layout, labels):
+        """
+        Inicializa las curvas.
+
+        Args:
+            stacked (StackedFunctions): Todas las expresiones apiladas.
+            layout (dict): Curva ('function', ...) -> (filas de la matriz, índices de función).
+            labels (list): Etiqueta de cada función.
+        """
+        self.stacked = stacked
+        self.layout = layout
+        self.labels = labels
+
+    def evaluate(self, x_vals):
+        """
+        Evalúa todas las curvas sobre una malla compartida.
+
+        Args:
+            x_vals (numpy.ndarray): Malla de x (1D).
+
+        Returns:
+            dict: Curva -> (matriz de valores con una fila por función,
+                etiquetas de esas funciones).
+        """
+        values = self.stacked.evaluate(x_vals)
+        return {
+            key: (values[rows], [self.labels[i] for i in functions])
+            for key, (rows, functions) in self.layout.items()
+        }
+
+
+class FunctionComparison:
+    """
+    Análisis concurrente de varias funciones con caché compartida.
+    """
+
+    def __init__(self, helper, max_workers=MAX_WORKERS):
+        """
+        Inicializa la comparación.
+
+        Args:
+            helper (MathHelper): Ayudante cuyo almacén de expresiones se comparte.
+            max_workers (int): Número máximo de procesos de trabajo.
+        """
+        self.helper = helper
+        self.max_workers = max_workers
+        self._executor = None
+        self._stacked = OrderedDict()
+        atexit.register(self.shutdown)
+
+    def _get_executor(self):
+        """Crea el grupo de procesos al primer uso y lo reutiliza después."""
+        if self._executor is None:
+            # Solo se limita la memoria: el tiempo de CPU se acumularía entre
+            # tareas; las que superan el tiempo máximo se interrumpen (ver shutdown)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=_get_context(),
+                initializer=_limit_resources,
+                initargs=(DEFAULT_MEMORY_LIMIT_MB, None),
+            )
+        return self._executor
+
+    def shutdown(self, terminate=False):
+        """
+        Termina los procesos de trabajo.
+
+        Args:
+            terminate (bool): Si es True, interrumpe también las tareas en
+                curso; ``shutdown`` del grupo solo cancela las pendientes y
+                deja terminar a los procesos ocupados.
+        """
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        processes = list((executor._processes or {}).values()) if terminate else []
+        for process in processes:
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.join(TERMINATE_JOIN_S)
+
+    def analyze(self, func_strs, order=1, integral_spec=None, timeout=DEFAULT_TIMEOUT_S):
+        """
+        Analiza varias funciones, calculando solo las que no están en el almacén.
+
+        Args:
+            func_strs (list): Funciones a comparar.
+            order (int): Orden de la derivada.
+            integral_spec: None, 'indefinida' o una tupla (inferior, superior).
+            timeout (float): Tiempo máximo de espera por todos los procesos de
+                trabajo juntos; al superarlo se interrumpen.
+
+        Returns:
+            list: Un diccionario por función con 'text', 'handle', 'function',
+                'derivative', 'integral' (None si no se pidió o no se pudo
+                calcular) y 'definite' (True si la integral es un número).
+
+        Raises:
+            ValueError: Si alguna función no se puede analizar.
+        """
+        helper = self.helper
+        store = helper.store
+        key = integral_key(integral_spec)
+
+        # Analizar sintácticamente en este proceso y buscar en el almacén
+        entries = []
+        pending = OrderedDict()
+        for text in func_strs:
+            if not helper.set_function(text):
+                raise ValueError(f"No se pudo analizar la función: {text}")
+            if helper.current['parameters']:
+                raise ValueError(f"{text}: la comparación no admite parámetros libres")
+            handle = helper.current['handle']
+            entries.append({'text': text, 'handle': handle, 'function': handle.expr})
+
+            missing = store.recall(handle, ('derivative', order)) is None \
+                or store.recall(handle, ('critical_points',)) is None \
+                or (key is not None and store.recall(handle, key) is None)
+            if missing:
+                pending.setdefault(handle, text)
+
+        if len(pending) == 1 or (pending and self.max_workers <= 1):
+            # Una sola función nueva: no compensa repartirla
+            for handle, text in pending.items():
+                self._store_result(handle, order, key, _analyze_remote(text, order, integral_spec))
+        elif pending:
+            executor = self._get_executor()
+            futures = {
+                handle: executor.submit(_analyze_remote, text, order, integral_spec)
+                for handle, text in pending.items()
+            }
+            # Un único plazo para todas las funciones, no uno por cada una
+            deadline = time.monotonic() + timeout
+            try:
+                for handle, future in futures.items():
+                    remaining = max(0.0, deadline - time.monotonic())
+                    self._store_result(handle, order, key, future.result(timeout=remaining))
+            except FutureTimeoutError:
+                # Procesos bloqueados: interrumpirlos y descartar el grupo
+                self.shutdown(terminate=True)
+                raise ValueError(f"se superó el tiempo máximo ({timeout} s)")
+            except Exception as e:
+                raise ValueError(f"{pending[handle]}: {str(e)}")
+
+        for entry in entries:
+            handle = entry['handle']
+            entry['derivative'] = store.recall(handle, ('derivative', order))
+            entry['integral'] = (store.recall(handle, key) or None) if key is not None else None
+            entry['definite'] = key is not None and len(key) > 1
+        return entries
+
+    def _store_result(self, handle, order, key, result):
+        """Guarda en el almacén compartido el resultado de un proceso de trabajo."""
+        store = self.helper.store
+        store.remember(handle, ('derivative', order), sp.sympify(result['derivative']))
+        store.remember(handle, ('critical_points',), result['critical_points'])
+        if key is not None:
+            # False indica que ya se intentó y no se pudo calcular
+            integral = result['integral']
+            store.remember(handle, key, sp.sympify(integral) if integral else False)
+
+    def curves(self, entries, labels):
+        """
+        Obtiene las curvas de todas las funciones compiladas en una sola función.
+
+        Args:
+            entries (list): Resultado de ``analyze``.
+            labels (list): Etiqueta de cada función.
+
+        Returns:
+            ComparisonCurves: Curvas evaluables sobre una malla compartida.
+        """
+        expressions = []
+        layout = {}
+        for curve in CURVE_KEYS:
+            # Las integrales definidas son números, no curvas; las demás
+            # expresiones constantes se dibujan como rectas horizontales
+            functions = [i for i, entry in enumerate(entries)
+                         if entry.get(curve) is not None
+                         and not (curve == 'integral' and entry.get('definite'))]
+            if not functions:
+                continue
+            start = len(expressions)
+            expressions.extend(entries[i][curve] for i in functions)
+            layout[curve] = (slice(start, len(expressions)), functions)
+
+        # Reutilizar la compilación si el conjunto de expresiones no cambió
+        cache_key = tuple(self.helper.store.handle(expr).key for expr in expressions)
+        stacked = self._stacked.get(cache_key)
+        if stacked is None:
+            stacked = StackedFunctions(self.helper.x_symbol, expressions)
+            self._stacked[cache_key] = stacked
+            while len(self._stacked) > STACKED_CACHE_CAPACITY:
+                self._stacked.popitem(last=False)
+        else:
+            self._stacked.move_to_end(cache_key)
+
+        return ComparisonCurves(stacked, layout, labels)
@@ -0,0 +1,302 @@
+"""
+Caché compacta de curvas muestreadas.
+Guarda las series (x, y) ya filtradas por valores finitos, con clave
+(expresión, rango, resolución) y precisión configurable (float32 para
+visualización). Cuando se supera el presupuesto de memoria, las entradas
+menos usadas se vuelcan a archivos np.memmap en disco; cuando se supera el
+de disco, las volcadas menos usadas se descartan y se borran sus archivos.
+"""
+import os
+import shutil
+import tempfile
+import itertools
+from collections import OrderedDict
+
+import numpy as np
+
+# Presupuesto de memoria predeterminado (bytes)
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Presupuesto predeterminado de los archivos volcados a disco (bytes)
+DEFAULT_DISK_BUDGET = 512 * 1024 * 1024
+
+# Ubicación de las muestras de una entrada
+IN_MEMORY = 'memory'
+SPILLED = 'disk'        # archivos memmap propios de la caché
+SESSION = 'session'     # proyectadas desde la instantánea de sesión (no se borran)
+
+
+class CurveCache:
+    """
+    Caché LRU de curvas muestreadas con volcado a disco.
+    """
+
+    def __init__(self, dtype=np.float32, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 spill_dir=None, disk_budget=DEFAULT_DISK_BUDGET):
+        """
+        Inicializa la caché.
+
+        Args:
+            dtype (numpy.dtype): Precisión de almacenamiento de las muestras.
+            memory_budget (int): Bytes máximos en memoria antes de volcar a disco.
+            spill_dir (str, optional): Directorio para los archivos memmap.
+            disk_budget (int): Bytes máximos volcados a disco antes de descartar.
+        """
+        self.dtype = np.dtype(dtype)
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self._spill_dir = spill_dir
+        self._owns_spill_dir = spill_dir is None
+        self._entries = OrderedDict()   # clave -> (x, y, ubicación)
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._file_ids = itertools.count()
+        # Curvas de una sesión anterior, por identificador de expresión en la sesión
+        self._preloaded = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(expr_key, x_range, resolution):
+        """
+        Construye la clave de una curva.
+
+        Args:
+            expr_key (hashable): Identificador estructural de la expresión.
+            x_range (tuple): Rango (x_min, x_max).
+            resolution (int): Número de puntos de muestreo.
+
+        Returns:
+            tuple: Clave de la caché.
+        """
+        return (expr_key, float(x_range[0]), float(x_range[1]), int(resolution))
+
+    def get(self, key):
+        """
+        Obtiene una curva guardada.
+
+        Args:
+            key (tuple): Clave devuelta por ``make_key``.
+
+        Returns:
+            tuple: (x, y) con solo valores finitos, o None si no existe.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def put(self, key, x, y):
+        """
+        Guarda una curva filtrando los valores no finitos una única vez.
+
+        Args:
+            key (tuple): Clave devuelta por ``make_key``.
+            x (numpy.ndarray): Valores de x.
+            y (numpy.ndarray): Valores de la función.
+
+        Returns:
+            tuple: (x, y) guardados con la precisión de la caché.
+        """
+        y = np.asarray(y, dtype=float)
+        if y.shape != np.shape(x):
+            y = np.broadcast_to(y, np.shape(x))
+        # Convertir antes de filtrar: los valores que no caben en la precisión
+        # de la caché (más de ~3.4e38 en float32) pasan a inf y se descartan
+        with np.errstate(over='ignore'):
+            x_stored = np.asarray(x, dtype=self.dtype)
+            y_stored = np.asarray(y, dtype=self.dtype)
+        valid = np.isfinite(x_stored) & np.isfinite(y_stored)
+        x_stored = np.ascontiguousarray(x_stored[valid])
+        y_stored = np.ascontiguousarray(y_stored[valid])
+
+        self.discard(key)
+        self._entries[key] = (x_stored, y_stored, IN_MEMORY)
+        self._memory_bytes += x_stored.nbytes + y_stored.nbytes
+        self._enforce_budget()
+
+        # Con un presupuesto de disco mínimo la propia curva puede descartarse
+        entry = self._entries.get(key, (x_stored, y_stored))
+        return entry[0], entry[1]
+
+    def get_or_compute(self, key, func, x_vals):
+        """
+        Obtiene una curva de la caché o la calcula y la guarda.
+
+        Args:
+            key (tuple): Clave devuelta por ``make_key``.
+            func (callable): Función numérica de x.
+            x_vals (numpy.ndarray): Malla de evaluación.
+
+        Returns:
+            tuple: (x, y) con solo valores finitos.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return self.put(key, x_vals, func(x_vals))
+
+    def discard(self, key):
+        """
+        Elimina una curva de la caché.
+
+        Args:
+            key (tuple): Clave de la curva.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        x, y, location = entry
+        if location == IN_MEMORY:
+            self._memory_bytes -= x.nbytes + y.nbytes
+        elif location == SPILLED:
+            self._disk_bytes -= x.nbytes + y.nbytes
+            self._remove_files(x, y)
+
+    def _spill_directory(self):
+        """Obtiene (y crea si hace falta) el directorio de volcado."""
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='calcderivadas-curvas-')
+        os.makedirs(self._spill_dir, exist_ok=True)
+        return self._spill_dir
+
+    def _to_memmap(self, array):
+        """Copia un arreglo a un archivo memmap y devuelve la vista de solo lectura."""
+        path = os.path.join(self._spill_directory(), f"curva-{next(self._file_ids)}.dat")
+        if array.size == 0:
+            return np.empty(0, dtype=self.dtype)
+        mapped = np.memmap(path, dtype=self.dtype, mode='w+', shape=array.shape)
+        mapped[:] = array
+        mapped.flush()
+        del mapped
+        return np.memmap(path, dtype=self.dtype, mode='r', shape=array.shape)
+
+    @staticmethod
+    def _remove_files(*arrays):
+        """Elimina los archivos asociados a arreglos memmap."""
+        for array in arrays:
+            filename = getattr(array, 'filename', None)
+            if filename:
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+
+    def _enforce_budget(self):
+        """
+        Vuelca a disco las curvas menos usadas hasta cumplir el presupuesto
+        de memoria, y descarta las volcadas menos usadas hasta cumplir el de disco.
+        """
+        if self._memory_bytes > self.memory_budget:
+            for key in list(self._entries):
+                if self._memory_bytes <= self.memory_budget:
+                    break
+                x, y, location = self._entries[key]
+                if location != IN_MEMORY:
+                    continue
+                try:
+                    self._entries[key] = (self._to_memmap(x), self._to_memmap(y), SPILLED)
+                    self._memory_bytes -= x.nbytes + y.nbytes
+                    self._disk_bytes += x.nbytes + y.nbytes
+                except OSError as e:
+                    print(f"Error al volcar curva a disco: {str(e)}")
+                    # Sin disco disponible, descartar la curva
+                    self.discard(key)
+
+        if self._disk_bytes > self.disk_budget:
+            for key in [k for k, entry in self._entries.items() if entry[2] == SPILLED]:
+                if self._disk_bytes <= self.disk_budget:
+                    break
+                self.discard(key)
+
+    def preload(self, curves):
+        """
+        Registra curvas de una sesión anterior proyectadas desde disco.
+
+        Las curvas no ocupan el presupuesto de memoria: se tratan como volcadas.
+
+        Args:
+            curves (dict): Identificador de la expresión en la sesión -> lista
+                de (x_min, x_max, resolución, x, y, sufijo). El sufijo (tupla,
+                vacía para la propia expresión) completa la clave de las
+                curvas derivadas, como (clave, 'ad', orden).
+        """
+        for session_id, items in curves.items():
+            self._preloaded.setdefault(session_id, []).extend(items)
+
+    def adopt(self, session_id, expr_key):
+        """
+        Asocia las curvas de una sesión anterior a la clave actual de su expresión.
+
+        Args:
+            session_id (int): Identificador de la expresión en la sesión.
+            expr_key (hashable): Clave actual de la expresión.
+        """
+        for x_min, x_max, resolution, x, y, suffix in self._preloaded.pop(session_id, ()):
+            curve_key = (expr_key,) + suffix if suffix else expr_key
+            key = self.make_key(curve_key, (x_min, x_max), resolution)
+            if key not in self._entries:
+                self._entries[key] = (x, y, SESSION)
+                self._entries.move_to_end(key, last=False)
+
+    def snapshot(self):
+        """
+        Recorre todas las curvas guardadas, incluidas las aún no asociadas.
+
+        Returns:
+            list: Tuplas (clave de expresión, x_min, x_max, resolución, x, y);
+                las curvas de la sesión anterior sin asociar usan la clave
+                ('session', identificador), seguida de su sufijo si lo tienen.
+        """
+        entries = [key + (x, y) for key, (x, y, _) in self._entries.items()]
+        for session_id, items in self._preloaded.items():
+            for x_min, x_max, resolution, x, y, suffix in items:
+                curve_key = (('session', session_id),) + suffix if suffix else ('session', session_id)
+                entries.append((curve_key, x_min, x_max, resolution, x, y))
+        return entries
+
+    def detach_session(self):
+        """
+        Copia a memoria las curvas proyectadas desde la instantánea de sesión.
+
+        Después no queda ninguna vista sobre el archivo, que así puede
+        cerrarse y sustituirse (en Windows no se puede mientras está proyectado).
+        """
+        for key, (x, y, location) in list(self._entries.items()):
+            if location == SESSION:
+                x, y = np.array(x), np.array(y)
+                self._entries[key] = (x, y, IN_MEMORY)
+                self._memory_bytes += x.nbytes + y.nbytes
+        for items in self._preloaded.values():
+            items[:] = [(x_min, x_max, resolution, np.array(x), np.array(y), suffix)
+                        for x_min, x_max, resolution, x, y, suffix in items]
+        self._enforce_budget()
+
+    def stats(self):
+        """
+        Obtiene estadísticas de uso de la caché.
+
+        Returns:
+            dict: Entradas, bytes en memoria y en disco, entradas en disco,
+                aciertos y fallos.
+        """
+        return {
+            'entries': len(self._entries),
+            'memory_bytes': self._memory_bytes,
+            'disk_bytes': self._disk_bytes,
+            'spilled': sum(1 for entry in self._entries.values() if entry[2] != IN_MEMORY),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def clear(self):
+        """Vacía la caché y elimina los archivos volcados."""
+        for key in list(self._entries):
+            self.discard(key)
+        self._preloaded.clear()
+        if self._owns_spill_dir and self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
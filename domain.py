@@ -0,0 +1,303 @@
+"""
+Dominio real de las funciones graficadas.
+El dominio de cada expresión se calcula una vez con ``continuous_domain`` de
+SymPy y se guarda por expresión. Al graficar se convierte en una máscara
+booleana sobre la malla, de modo que solo se evalúan los puntos válidos (sin
+avisos de NumPy ni excepciones por puntos fuera del dominio), y sus bordes
+(polos, extremos de intervalos) se usan para cortar las curvas, igual que los
+saltos de las funciones a trozos. Si el dominio simbólico no se puede
+calcular, no se puede convertir en máscara o resulta más estrecho que el
+numérico, se usa la evaluación sobre toda la malla.
+"""
+import numpy as np
+import sympy as sp
+from sympy.calculus.util import continuous_domain
+
+from intervals import evaluate
+from piecewise import discontinuities
+
+# Expresiones con más operaciones no se analizan simbólicamente (coste)
+MAX_DOMAIN_OPS = 60
+
+# Puntos fuera del dominio simbólico que se evalúan para validarlo
+PROBE_POINTS = 64
+
+# Separación (en pasos de la malla) a partir de la cual dos muestras no se unen
+GAP_STEPS = 1.5
+
+
+def real_domain(expr, x_symbol=None):
+    """
+    Calcula el dominio real en el que una expresión es continua.
+
+    Args:
+        expr (sympy.Expr): Expresión de una variable.
+        x_symbol (sympy.Symbol, optional): Variable; por defecto, el único
+            símbolo libre de la expresión.
+
+    Returns:
+        sympy.Set: Dominio, o None si no se puede calcular.
+    """
+    symbols = expr.free_symbols
+    if x_symbol is None:
+        if len(symbols) > 1:
+            return None
+        x_symbol = next(iter(symbols), sp.Symbol('x'))
+    if symbols - {x_symbol}:
+        return None
+    if not symbols:
+        return sp.S.Reals
+
+    try:
+        if sp.count_ops(expr) > MAX_DOMAIN_OPS:
+            return None
+        return continuous_domain(expr, x_symbol, sp.S.Reals)
+    except Exception:
+        return None
+
+
+def _image_points(image, x_min, x_max):
+    """Puntos de un ImageSet lineal a*n + b (n entero) dentro de [x_min, x_max]."""
+    if image.base_sets != (sp.S.Integers,):
+        raise NotImplementedError(str(image))
+    (n,), body = image.lamda.signature, image.lamda.expr
+    a = sp.diff(body, n)
+    if not (a.is_number and a != 0):
+        raise NotImplementedError(str(image))
+    a, b = float(a), float(body.subs(n, 0))
+    first, last = sorted(((x_min - b) / a, (x_max - b) / a))
+    return a * np.arange(np.ceil(first), np.floor(last) + 1) + b
+
+
+def domain_mask(domain, x_vals):
+    """
+    Convierte un dominio en una máscara sobre la malla.
+
+    Args:
+        domain (sympy.Set): Dominio (intervalos, uniones, intersecciones,
+            complementos, conjuntos finitos y ImageSet lineales).
+        x_vals (numpy.ndarray): Malla ordenada.
+
+    Returns:
+        numpy.ndarray: True en los puntos del dominio.
+
+    Raises:
+        NotImplementedError: Si el conjunto no se puede convertir.
+    """
+    if domain is sp.S.Reals:
+        return np.ones(len(x_vals), dtype=bool)
+    if domain is sp.S.EmptySet:
+        return np.zeros(len(x_vals), dtype=bool)
+    if isinstance(domain, sp.Interval):
+        lower, upper = float(domain.start), float(domain.end)
+        mask = (x_vals > lower) if domain.left_open else (x_vals >= lower)
+        mask &= (x_vals < upper) if domain.right_open else (x_vals <= upper)
+        return mask
+    if isinstance(domain, sp.Union):
+        return np.logical_or.reduce([domain_mask(arg, x_vals) for arg in domain.args])
+    if isinstance(domain, sp.Intersection):
+        return np.logical_and.reduce([domain_mask(arg, x_vals) for arg in domain.args])
+    if isinstance(domain, sp.Complement):
+        included, excluded = domain.args
+        return domain_mask(included, x_vals) & ~domain_mask(excluded, x_vals)
+    if isinstance(domain, (sp.FiniteSet, sp.ImageSet)):
+        points = domain_breaks(domain, x_vals[0], x_vals[-1])
+        return np.isin(x_vals, points)
+    raise NotImplementedError(str(domain))
+
+
+def domain_breaks(domain, x_min, x_max):
+    """
+    Obtiene los bordes de un dominio dentro de un rango.
+
+    Args:
+        domain (sympy.Set): Dominio (mismos tipos que ``domain_mask``).
+        x_min (float): Inicio del rango.
+        x_max (float): Final del rango.
+
+    Returns:
+        numpy.ndarray: Bordes ordenados y sin repetir (extremos de
+            intervalos, puntos excluidos y puntos aislados).
+
+    Raises:
+        NotImplementedError: Si el conjunto no se puede analizar.
+    """
+    if domain is sp.S.Reals or domain is sp.S.EmptySet:
+        points = []
+    elif isinstance(domain, sp.Interval):
+        points = [float(end) for end in (domain.start, domain.end) if end.is_finite]
+    elif isinstance(domain, (sp.Union, sp.Intersection, sp.Complement)):
+        points = np.concatenate([domain_breaks(arg, x_min, x_max) for arg in domain.args])
+    elif isinstance(domain, sp.FiniteSet):
+        points = [float(p) for p in domain.args if p.is_real]
+    elif isinstance(domain, sp.ImageSet):
+        points = _image_points(domain, x_min, x_max)
+    else:
+        raise NotImplementedError(str(domain))
+    points = np.asarray(points, dtype=float)
+    return np.unique(points[(points >= x_min) & (points <= x_max)])
+
+
+def insert_breaks(x, y, breaks=(), step=None):
+    """
+    Inserta NaN en una curva para que matplotlib no una sus tramos.
+
+    Args:
+        x (numpy.ndarray): Valores de x ordenados (solo muestras válidas).
+        y (numpy.ndarray): Valores de la función.
+        breaks (array_like): Bordes del dominio que separan tramos.
+        step (float, optional): Paso de la malla; también se corta donde
+            faltan muestras (puntos fuera del dominio numérico).
+
+    Returns:
+        tuple: (x, y) con NaN en cada corte.
+    """
+    positions = np.searchsorted(x, np.asarray(breaks, dtype=float))
+    if step is not None and len(x) > 1:
+        positions = np.concatenate([positions, np.nonzero(np.diff(x) > GAP_STEPS * step)[0] + 1])
+    positions = np.unique(positions[(positions > 0) & (positions < len(x))])
+    if not len(positions):
+        return x, y
+    return (np.insert(np.asarray(x, dtype=float), positions, np.nan),
+            np.insert(np.asarray(y, dtype=float), positions, np.nan))
+
+
+class DomainAnalyzer:
+    """
+    Dominios de las funciones compiladas del almacén, calculados una vez por expresión.
+    """
+
+    def __init__(self, store):
+        """
+        Inicializa el analizador.
+
+        Args:
+            store (ExpressionStore): Almacén del que proceden las funciones.
+        """
+        self.store = store
+        # Clave de la expresión -> dominio (None si solo se usa el numérico)
+        self._domains = {}
+        # Clave de la expresión -> saltos de las funciones a trozos
+        self._jumps = {}
+
+    def domain(self, func):
+        """
+        Obtiene el dominio simbólico de una función compilada.
+
+        Args:
+            func (callable): Función numérica (CompiledFunction del almacén).
+
+        Returns:
+            sympy.Set: Dominio, o None si no se conoce.
+        """
+        key = getattr(func, 'key', None)
+        if not isinstance(key, int):
+            return None
+        if key not in self._domains:
+            try:
+                self._domains[key] = real_domain(self.store.expression(key))
+            except KeyError:
+                return None
+        return self._domains[key]
+
+    def mask(self, func, x_vals):
+        """
+        Calcula la máscara del dominio de una función sobre la malla.
+
+        Args:
+            func (callable): Función numérica.
+            x_vals (numpy.ndarray): Malla ordenada.
+
+        Returns:
+            numpy.ndarray: True en los puntos del dominio, o None si hay que
+                evaluar toda la malla.
+        """
+        domain = self.domain(func)
+        if domain is None:
+            return None
+        try:
+            mask = domain_mask(domain, x_vals)
+        except (NotImplementedError, TypeError, ValueError):
+            self._domains[func.key] = None
+            return None
+
+        # Un dominio simbólico incompleto ocultaría tramos válidos: se
+        # comprueba con unos pocos puntos de fuera
+        outside = np.flatnonzero(~mask)
+        if len(outside):
+            probe = outside[np.linspace(0, len(outside) - 1, min(PROBE_POINTS, len(outside))).astype(int)]
+            try:
+                values = evaluate(func, x_vals[probe], fallback=True)
+            except Exception:
+                values = np.array([])
+            if np.isfinite(values).any():
+                self._domains[func.key] = None
+                return None
+        return mask
+
+    def evaluate(self, func, x_vals):
+        """
+        Evalúa una función solo en los puntos de su dominio.
+
+        Args:
+            func (callable): Función numérica.
+            x_vals (numpy.ndarray): Malla ordenada.
+
+        Returns:
+            numpy.ndarray: Valores (NaN fuera del dominio o donde no son reales finitos).
+        """
+        mask = self.mask(func, x_vals)
+        if mask is None:
+            return evaluate(func, x_vals, fallback=True)
+        y = np.full(len(x_vals), np.nan)
+        if mask.any():
+            y[mask] = evaluate(func, x_vals[mask], fallback=True)
+        return y
+
+    def jumps(self, func):
+        """
+        Obtiene los saltos de una función a trozos.
+
+        Args:
+            func (callable): Función numérica (CompiledFunction del almacén).
+
+        Returns:
+            list: Valores de x de los saltos (vacía si no es a trozos).
+        """
+        key = getattr(func, 'key', None)
+        if not isinstance(key, int):
+            return []
+        if key not in self._jumps:
+            try:
+                expr = self.store.expression(key)
+                symbols = expr.free_symbols
+                self._jumps[key] = discontinuities(expr, *symbols) if len(symbols) == 1 else []
+            except Exception:
+                self._jumps[key] = []
+        return self._jumps[key]
+
+    def breaks(self, func, x_range):
+        """
+        Obtiene los bordes del dominio y los saltos de una función dentro del rango.
+
+        Args:
+            func (callable): Función numérica.
+            x_range (tuple): Rango (x_min, x_max).
+
+        Returns:
+            numpy.ndarray: Puntos de corte (vacío si no se conocen).
+        """
+        x_min, x_max = x_range
+        points = [x for x in self.jumps(func) if x_min <= x <= x_max]
+        domain = self.domain(func)
+        if domain is not None:
+            try:
+                points.extend(domain_breaks(domain, x_min, x_max))
+            except (NotImplementedError, TypeError, ValueError):
+                pass
+        return np.unique(np.asarray(points, dtype=float))
+
+    def clear(self):
+        """Olvida los dominios y saltos calculados."""
+        self._domains.clear()
+        self._jumps.clear()
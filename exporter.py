@@ -0,0 +1,209 @@
+"""
+Exportación de tablas numéricas de f, f' e ∫f.
+Las funciones compiladas se evalúan sobre el rango pedido en bloques de
+tamaño fijo y cada bloque se escribe en cuanto se calcula (CSV, .npy
+proyectado en memoria o Parquet), de modo que la memoria usada no depende
+del número de filas.
+"""
+import os
+import time
+
+import numpy as np
+
+from intervals import evaluate
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet es opcional
+    pyarrow = None
+
+# Filas evaluadas y escritas por bloque
+CHUNK_ROWS = 1 << 18
+
+# Cabeceras de las columnas, en el orden de exportación
+COLUMN_NAMES = {
+    'function': "f(x)",
+    'derivative': "f'(x)",
+    'integral': "∫f(x)dx",
+}
+
+EXPORT_FORMATS = ('.csv', '.npy', '.parquet')
+
+
+class ExportCancelled(Exception):
+    """La exportación se canceló antes de terminar."""
+
+
+def row_count(x_start, x_stop, step):
+    """
+    Calcula el número de filas de una tabla.
+
+    Args:
+        x_start (float): Primer valor de x.
+        x_stop (float): Último valor de x (incluido si cae en la malla).
+        step (float): Paso entre filas.
+
+    Returns:
+        int: Número de filas.
+
+    Raises:
+        ValueError: Si el paso no es positivo o el rango está invertido.
+    """
+    if not step > 0:
+        raise ValueError("el paso debe ser positivo")
+    if x_stop < x_start:
+        raise ValueError("el final del rango es menor que el inicio")
+    # Tolerancia para que x_stop se incluya pese al redondeo de la división
+    return int(np.floor((x_stop - x_start) / step * (1 + 1e-12))) + 1
+
+
+def available_formats():
+    """
+    Obtiene los formatos de exportación disponibles.
+
+    Returns:
+        tuple: Extensiones admitidas (Parquet solo si pyarrow está instalado).
+    """
+    return tuple(ext for ext in EXPORT_FORMATS if ext != '.parquet' or pyarrow is not None)
+
+
+class _CsvWriter:
+    """Escritura de bloques en texto CSV."""
+
+    def __init__(self, path, columns, rows):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.file.write(",".join(columns) + "\n")
+
+    def write(self, start, block):
+        np.savetxt(self.file, block, fmt='%.17g', delimiter=',')
+
+    def close(self):
+        self.file.close()
+
+
+class _NpyWriter:
+    """Escritura de bloques en un archivo .npy proyectado en memoria."""
+
+    def __init__(self, path, columns, rows):
+        # Crear el archivo completo con su cabecera y cerrar la proyección
+        array = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64,
+                                          shape=(rows, len(columns)))
+        self.path = path
+        self.offset = array.offset
+        self.row_bytes = array.itemsize * len(columns)
+        del array
+
+    def write(self, start, block):
+        # Proyectar solo la ventana del bloque: la memoria residente no crece con el archivo
+        window = np.memmap(self.path, dtype=np.float64, mode='r+', shape=block.shape,
+                           offset=self.offset + start * self.row_bytes)
+        window[:] = block
+        window.flush()
+        del window
+
+    def close(self):
+        pass
+
+
+class _ParquetWriter:
+    """Escritura de bloques como grupos de filas de Parquet."""
+
+    def __init__(self, path, columns, rows):
+        if pyarrow is None:
+            raise ValueError("la exportación a Parquet necesita el paquete pyarrow")
+        self.columns = columns
+        schema = pyarrow.schema([(name, pyarrow.float64()) for name in columns])
+        self.writer = pyarrow.parquet.ParquetWriter(path, schema)
+
+    def write(self, start, block):
+        table = pyarrow.Table.from_arrays(
+            [pyarrow.array(block[:, i]) for i in range(block.shape[1])], names=self.columns
+        )
+        self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+
+
+_WRITERS = {
+    '.csv': _CsvWriter,
+    '.npy': _NpyWriter,
+    '.parquet': _ParquetWriter,
+}
+
+
+def export_table(funcs, x_start, x_stop, step, path, chunk_rows=CHUNK_ROWS,
+                 progress=None, cancelled=None, sampler=None):
+    """
+    Exporta una tabla de x y de los valores de las funciones.
+
+    Las columnas son x seguida de las funciones en el orden de COLUMN_NAMES;
+    los puntos donde una función no es un real finito quedan como NaN. El
+    formato se elige por la extensión de path.
+
+    Args:
+        funcs (dict): 'function', 'derivative' y/o 'integral' -> función numérica.
+        x_start (float): Primer valor de x.
+        x_stop (float): Último valor de x.
+        step (float): Paso entre filas.
+        path (str): Archivo de destino (.csv, .npy o .parquet).
+        chunk_rows (int): Filas por bloque.
+        progress (callable, optional): Recibe (filas escritas, filas totales,
+            segundos restantes estimados) tras cada bloque.
+        cancelled (callable, optional): Devuelve True para detener la exportación.
+        sampler (ParallelSampler, optional): Reparte la evaluación de cada
+            bloque entre procesos; el bloque se escribe directamente desde
+            su búfer compartido.
+
+    Returns:
+        int: Filas escritas.
+
+    Raises:
+        ValueError: Si el formato o el rango no son válidos.
+        ExportCancelled: Si se canceló; el archivo parcial se elimina.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    writer_class = _WRITERS.get(extension)
+    if writer_class is None:
+        raise ValueError(f"formato no admitido: {extension or 'sin extensión'}")
+
+    rows = row_count(x_start, x_stop, step)
+    names = [name for name in COLUMN_NAMES if name in funcs]
+    columns = ["x"] + [COLUMN_NAMES[name] for name in names]
+
+    writer = writer_class(path, columns, rows)
+    completed = False
+    try:
+        block = np.empty((min(chunk_rows, rows), len(columns)))
+        began = time.perf_counter()
+        for start in range(0, rows, chunk_rows):
+            if cancelled is not None and cancelled():
+                raise ExportCancelled()
+
+            count = min(chunk_rows, rows - start)
+            chunk = block[:count]
+            # x a partir del índice: el error no se acumula entre bloques
+            chunk[:, 0] = x_start + step * np.arange(start, start + count, dtype=np.float64)
+            if sampler is not None:
+                with sampler.sample({name: funcs[name] for name in names}, chunk[:, 0]) as samples:
+                    writer.write(start, samples.array)
+            else:
+                for column, name in enumerate(names, start=1):
+                    chunk[:, column] = evaluate(funcs[name], chunk[:, 0])
+                writer.write(start, chunk)
+
+            if progress is not None:
+                done = start + count
+                elapsed = time.perf_counter() - began
+                remaining = elapsed / done * (rows - done) if done < rows else 0.0
+                progress(done, rows, remaining)
+        completed = True
+        return rows
+    finally:
+        writer.close()
+        if not completed:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,533 @@
+"""
+Almacén de expresiones con consing por hash estructural.
+Cada expresión (y cada subexpresión) se guarda una sola vez, de modo que la
+función, sus derivadas sucesivas y las integrales comparten los subárboles
+comunes. Los resultados derivados y las funciones compiladas se asocian a
+manejadores ligeros en lugar de a copias de los árboles de SymPy. Las
+expresiones equivalentes escritas de otra forma (``x^2+2x`` y ``x(x+2)``) se
+reconocen por su huella numérica y comparten los resultados simbólicos; cada
+una se compila a partir de su propia expresión, porque pueden diferir en
+puntos aislados (``(x^2-1)/(x-1)`` no está definida en 1 y ``x+1`` sí). La
+huella solo se calcula para las expresiones con resultados guardados, y las
+expresiones menos usadas se descartan al superar la capacidad del almacén.
+"""
+import sys
+import itertools
+from collections import OrderedDict
+
+import sympy as sp
+
+from compact import is_large
+from fingerprint import fingerprint, equivalent
+from piecewise import numeric_modules
+
+# Expresiones guardadas a partir de las cuales se descartan las menos usadas
+DEFAULT_CAPACITY = 2048
+
+# Fracción de la capacidad que queda tras descartar
+EVICTION_TARGET = 0.75
+
+
+class ExprHandle:
+    """Manejador ligero de una expresión guardada en el almacén."""
+
+    __slots__ = ('key', 'store', 'canonical')
+
+    def __init__(self, key, store, canonical=None):
+        """
+        Inicializa el manejador.
+
+        Args:
+            key (int): Identificador de la expresión en el almacén.
+            store (ExpressionStore): Almacén propietario.
+            canonical (sympy.Basic, optional): Expresión canónica; permite
+                volver a guardarla si el almacén la descarta.
+        """
+        self.key = key
+        self.store = store
+        self.canonical = canonical
+
+    @property
+    def expr(self):
+        """sympy.Expr: Expresión asociada al manejador."""
+        return self.store.get(self)
+
+    def __eq__(self, other):
+        return isinstance(other, ExprHandle) and self.key == other.key and self.store is other.store
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"ExprHandle({self.key})"
+
+
+class CompiledFunction:
+    """Función numérica compilada con lambdify y asociada a una expresión."""
+
+    __slots__ = ('func', 'key')
+
+    def __init__(self, func, key):
+        """
+        Inicializa la función compilada.
+
+        Args:
+            func (callable): Función generada por lambdify.
+            key (int): Clave de la expresión de origen en el almacén.
+        """
+        self.func = func
+        self.key = key
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+
+class PendingResult:
+    """Resultado restaurado de una sesión que aún no se ha decodificado."""
+
+    __slots__ = ('payload',)
+
+    def __init__(self, payload):
+        """
+        Inicializa el resultado pendiente.
+
+        Args:
+            payload: Datos serializados del resultado.
+        """
+        self.payload = payload
+
+
+class ExpressionStore:
+    """
+    Almacén de expresiones únicas por estructura.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Inicializa las tablas del almacén.
+
+        Args:
+            capacity (int): Expresiones guardadas a partir de las cuales se
+                descartan las menos usadas (con sus resultados).
+        """
+        self.capacity = capacity
+        # Nodo -> nodo canónico (incluye todas las subexpresiones)
+        self._nodes = {}
+        # Expresión canónica raíz -> clave, y clave -> expresión (de la menos
+        # a la más usada)
+        self._keys = {}
+        self._exprs = OrderedDict()
+        # Resultados y funciones compiladas por clave
+        self._results = {}
+        self._compiled = {}
+        self._counter = itertools.count(1)
+        # Clases de equivalencia: clave -> clave representante, y huella
+        # numérica -> lista de (valores modulares, representante)
+        self._classes = {}
+        self._fingerprints = {}
+        self.equivalence_hits = 0
+        self.evictions = 0
+        # Resultados de una sesión anterior, por srepr, aún sin asociar
+        self._preloaded = {}
+        self._decode = None
+        self._on_adopt = None
+
+    def intern(self, expr):
+        """
+        Obtiene la versión canónica de una expresión.
+
+        Las subexpresiones ya conocidas se sustituyen por la instancia
+        guardada, de modo que los árboles equivalentes comparten memoria.
+
+        Args:
+            expr (sympy.Basic): Expresión a internar.
+
+        Returns:
+            sympy.Basic: Expresión canónica estructuralmente igual a expr.
+        """
+        try:
+            return self._intern(expr)
+        except RecursionError:
+            # Árboles demasiado profundos se guardan sin compartir subárboles
+            return self._nodes.setdefault(expr, expr)
+
+    def _intern(self, expr):
+        """Interna recursivamente una expresión."""
+        canonical = self._nodes.get(expr)
+        if canonical is not None:
+            return canonical
+
+        if expr.args:
+            args = tuple(self._intern(arg) for arg in expr.args)
+            if any(new is not old for new, old in zip(args, expr.args)):
+                try:
+                    rebuilt = expr.func(*args)
+                    if rebuilt == expr:
+                        expr = rebuilt
+                except Exception:
+                    pass
+
+        self._nodes[expr] = expr
+        return expr
+
+    def handle(self, expr):
+        """
+        Guarda una expresión y devuelve su manejador.
+
+        Args:
+            expr (sympy.Basic): Expresión a guardar.
+
+        Returns:
+            ExprHandle: Manejador de la expresión.
+        """
+        canonical = self.intern(expr)
+        key = self._keys.get(canonical)
+        if key is None:
+            key = next(self._counter)
+            self._keys[canonical] = key
+            self._exprs[key] = canonical
+            if self._preloaded:
+                self._adopt(canonical, key)
+            if len(self._exprs) > self.capacity:
+                self._evict()
+        else:
+            self._exprs.move_to_end(key)
+        return ExprHandle(key, self, canonical)
+
+    def _live_key(self, handle):
+        """
+        Clave actual de la expresión de un manejador.
+
+        Si la expresión se descartó, se vuelve a guardar (con una clave
+        nueva) a partir de la expresión que conserva el manejador.
+
+        Args:
+            handle (ExprHandle): Manejador, quizá anterior a un descarte.
+
+        Returns:
+            int: Clave guardada, o None si se descartó y el manejador no
+                conserva la expresión.
+        """
+        if handle.key in self._exprs:
+            return handle.key
+        if handle.canonical is None:
+            return None
+        return self.handle(handle.canonical).key
+
+    def _find_equivalent(self, expr, key):
+        """
+        Busca una expresión guardada equivalente a una nueva.
+
+        Las huellas numéricas descartan casi todas las candidatas sin
+        cálculo simbólico; solo las que coinciden se comprueban con
+        ``equivalent``.
+
+        Args:
+            expr (sympy.Basic): Expresión nueva (canónica).
+            key (int): Clave asignada a la expresión.
+
+        Returns:
+            int: Clave representante de su clase (key si no hay ninguna equivalente).
+        """
+        if not isinstance(expr, sp.Expr) or is_large(expr):
+            return key
+        signature = fingerprint(expr)
+        if signature is None:
+            # Sin huella (por ejemplo, no se puede evaluar numéricamente)
+            return key
+        names, modular, values = signature
+
+        candidates = self._fingerprints.setdefault((names, values), [])
+        for other_modular, representative in candidates:
+            # La aritmética modular es exacta: si ambas la tienen y difieren, no son iguales
+            if modular is not None and other_modular is not None and modular != other_modular:
+                continue
+            if equivalent(expr, self._exprs[representative]):
+                self.equivalence_hits += 1
+                return representative
+        candidates.append((modular, key))
+        return key
+
+    def _class_key(self, handle):
+        """
+        Clave bajo la que se guardan los resultados de una expresión.
+
+        La clase se busca la primera vez que se guarda o se recupera un
+        resultado, así que las expresiones que solo se compilan (derivadas
+        e integrales graficadas) no pagan la huella numérica.
+        """
+        key = self._live_key(handle)
+        if key is None:
+            # Expresión descartada y sin forma de recuperarla
+            return None
+        expr = self._exprs[key]
+        self._exprs.move_to_end(key)
+        representative = self._classes.get(key)
+        if representative is None:
+            representative = self._classes[key] = self._find_equivalent(expr, key)
+        return representative
+
+    def _evict(self):
+        """
+        Descarta las expresiones menos usadas hasta EVICTION_TARGET de la capacidad.
+
+        Con ellas se descartan sus resultados, sus funciones compiladas y su
+        huella; las clases cuyo representante se descarta se vuelven a
+        buscar cuando se usan. El índice de nodos se reconstruye con lo que
+        queda para liberar los subárboles que ya no comparte nadie.
+        """
+        target = int(self.capacity * EVICTION_TARGET)
+        evicted = set()
+        while len(self._exprs) > target:
+            key, expr = self._exprs.popitem(last=False)
+            self._keys.pop(expr, None)
+            evicted.add(key)
+
+        self._classes = {key: representative for key, representative in self._classes.items()
+                         if key not in evicted and representative not in evicted}
+        self._results = {name: value for name, value in self._results.items()
+                         if name[0] not in evicted}
+        self._compiled = {name: func for name, func in self._compiled.items()
+                          if name[0] not in evicted}
+        for signature in list(self._fingerprints):
+            candidates = [c for c in self._fingerprints[signature] if c[1] not in evicted]
+            if candidates:
+                self._fingerprints[signature] = candidates
+            else:
+                del self._fingerprints[signature]
+
+        self._nodes = {}
+        for root in list(self._exprs.values()) + [
+            value for value in self._results.values() if isinstance(value, sp.Basic)
+        ]:
+            self.intern(root)
+        self.evictions += len(evicted)
+
+    def preload(self, records, decode, on_adopt=None):
+        """
+        Registra resultados de una sesión anterior sin reconstruir las expresiones.
+
+        Cada registro se asocia a una clave la primera vez que se guarda una
+        expresión con la misma forma srepr; sus resultados se decodifican al
+        recuperarlos.
+
+        Args:
+            records (dict): srepr de la expresión -> (identificador en la sesión,
+                lista de pares (nombre, resultado serializado)).
+            decode (callable): Convierte un resultado serializado en su valor.
+            on_adopt (callable, optional): Recibe (identificador en la sesión,
+                clave nueva) al asociar un registro.
+        """
+        self._preloaded.update(records)
+        self._decode = decode
+        self._on_adopt = on_adopt
+
+    def _adopt(self, canonical, key):
+        """Asocia a una clave nueva el registro de sesión con la misma srepr."""
+        record = self._preloaded.pop(sp.srepr(canonical), None)
+        if record is None:
+            return
+        session_id, results = record
+        class_key = self._class_key(ExprHandle(key, self, canonical))
+        for name, payload in results:
+            self._results.setdefault((class_key, name), PendingResult(payload))
+        if self._on_adopt is not None:
+            # Las curvas se guardan con la clave propia de la expresión
+            self._on_adopt(session_id, key)
+
+    def snapshot(self):
+        """
+        Recorre las expresiones guardadas con sus resultados.
+
+        Returns:
+            list: Tuplas (clave, expresión, lista de pares (nombre, resultado));
+                los resultados restaurados que no se han usado siguen
+                serializados (PendingResult). Incluye los registros de la
+                sesión anterior que aún no se han asociado, con la clave
+                ('session', identificador) y la srepr en lugar de la expresión.
+        """
+        grouped = {key: [] for key in self._exprs}
+        for (key, name), value in self._results.items():
+            # Los resultados de una expresión descartada no se guardan
+            if key in grouped:
+                grouped[key].append((name, value))
+        entries = [(key, self._exprs[key], results) for key, results in grouped.items()]
+        for text, (session_id, results) in self._preloaded.items():
+            entries.append((('session', session_id), text,
+                            [(name, PendingResult(payload)) for name, payload in results]))
+        return entries
+
+    def get(self, handle):
+        """
+        Obtiene la expresión de un manejador.
+
+        Args:
+            handle (ExprHandle): Manejador devuelto por ``handle``.
+
+        Returns:
+            sympy.Basic: Expresión canónica.
+
+        Raises:
+            KeyError: Si la expresión se descartó y el manejador no la conserva.
+        """
+        key = self._live_key(handle)
+        if key is None:
+            raise KeyError(handle.key)
+        self._exprs.move_to_end(key)
+        return self._exprs[key]
+
+    def expression(self, key):
+        """
+        Obtiene la expresión guardada con una clave.
+
+        Args:
+            key (int): Clave de la expresión (por ejemplo, CompiledFunction.key).
+
+        Returns:
+            sympy.Basic: Expresión canónica.
+        """
+        return self._exprs[key]
+
+    def remember(self, handle, name, value):
+        """
+        Asocia un resultado derivado a una expresión (y a sus equivalentes).
+
+        Args:
+            handle (ExprHandle): Expresión de origen.
+            name (hashable): Nombre del resultado (por ejemplo, ('derivative', 2)).
+            value: Resultado; las expresiones se internan automáticamente.
+
+        Returns:
+            El valor guardado (internado si es una expresión).
+        """
+        if isinstance(value, sp.Basic):
+            value = self.intern(value)
+        class_key = self._class_key(handle)
+        if class_key is not None:
+            self._results[(class_key, name)] = value
+        return value
+
+    def recall(self, handle, name, default=None):
+        """
+        Recupera un resultado asociado a una expresión.
+
+        Args:
+            handle (ExprHandle): Expresión de origen.
+            name (hashable): Nombre del resultado.
+            default: Valor devuelto si no existe.
+
+        Returns:
+            El resultado guardado o default.
+        """
+        class_key = self._class_key(handle)
+        if class_key is None:
+            return default
+        key = (class_key, name)
+        value = self._results.get(key, default)
+        if isinstance(value, PendingResult):
+            try:
+                value = self.remember(handle, name, self._decode(value.payload))
+            except Exception as e:
+                print(f"Error al restaurar un resultado guardado: {str(e)}")
+                self._results.pop(key, None)
+                value = default
+        return value
+
+    def lambdify(self, x_symbol, expr, modules=('numpy', 'sympy'), compact=None):
+        """
+        Compila una expresión reutilizando la función si ya existe.
+
+        Args:
+            x_symbol (sympy.Symbol): Variable independiente.
+            expr (sympy.Expr): Expresión a compilar.
+            modules (tuple): Módulos para lambdify.
+            compact (CompactExpression, optional): Forma compacta de expr; si
+                se indica, se compila a partir de sus subexpresiones.
+
+        Returns:
+            CompiledFunction: Función numérica de x.
+        """
+        handle = self.handle(expr)
+        # Cada expresión se compila tal cual: las equivalentes pueden diferir
+        # en puntos aislados donde una no está definida
+        key = handle.key
+        cache_key = (key, x_symbol, tuple(modules))
+        compiled = self._compiled.get(cache_key)
+        if compiled is None:
+            if compact is not None:
+                func = compact.lambdify(x_symbol, modules)
+            else:
+                func = sp.lambdify(x_symbol, self._exprs[key], modules=numeric_modules(modules))
+            compiled = CompiledFunction(func, key)
+            self._compiled[cache_key] = compiled
+        return compiled
+
+    def clear(self):
+        """Vacía el almacén."""
+        self._nodes.clear()
+        self._keys.clear()
+        self._exprs.clear()
+        self._results.clear()
+        self._compiled.clear()
+        self._classes.clear()
+        self._fingerprints.clear()
+        self._preloaded.clear()
+
+    @staticmethod
+    def _node_size(node):
+        """Tamaño aproximado en bytes de un nodo sin contar sus hijos."""
+        return sys.getsizeof(node) + sys.getsizeof(node.args)
+
+    def memory_report(self):
+        """
+        Informa del uso de memoria del almacén.
+
+        Compara el tamaño de los nodos únicos guardados con el que ocuparían
+        los mismos árboles sin compartir subexpresiones.
+
+        Returns:
+            dict: Número de expresiones, nodos únicos, nodos equivalentes sin
+                compartir y bytes aproximados en ambos casos.
+        """
+        unique_bytes = sum(self._node_size(node) for node in self._nodes)
+
+        # Tamaño de árbol de cada nodo, calculado una sola vez por nodo (DAG)
+        tree_nodes = {}
+        tree_bytes = {}
+
+        def measure(node):
+            if node in tree_nodes:
+                return tree_nodes[node], tree_bytes[node]
+            count, size = 1, self._node_size(node)
+            for arg in node.args:
+                c, b = measure(arg)
+                count += c
+                size += b
+            tree_nodes[node] = count
+            tree_bytes[node] = size
+            return count, size
+
+        roots = list(self._exprs.values()) + [
+            value for value in self._results.values() if isinstance(value, sp.Basic)
+        ]
+        naive_nodes = 0
+        naive_bytes = 0
+        try:
+            for root in roots:
+                c, b = measure(root)
+                naive_nodes += c
+                naive_bytes += b
+        except RecursionError:
+            pass
+
+        return {
+            'expressions': len(self._exprs),
+            'results': len(self._results),
+            'compiled': len(self._compiled),
+            'equivalent': sum(1 for key, rep in self._classes.items() if key != rep),
+            'evicted': self.evictions,
+            'unique_nodes': len(self._nodes),
+            'tree_nodes': naive_nodes,
+            'unique_bytes': unique_bytes,
+            'tree_bytes': naive_bytes,
+        }
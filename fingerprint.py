@@ -0,0 +1,149 @@
+"""
+Huellas numéricas para reconocer expresiones equivalentes.
+Una misma función puede escribirse de muchas formas (``2x+x^2``,
+``x^2+2*x``, ``x*(x+2)``) que el consing estructural del almacén trata como
+distintas. La huella evalúa la expresión en puntos fijos elegidos al azar:
+en aritmética modular exacta si es racional (polinomios y cocientes) y en
+coma flotante compleja en cualquier caso. Dos expresiones con huellas
+distintas no son equivalentes; si coinciden, ``equivalent`` lo confirma
+simbólicamente antes de compartir resultados.
+"""
+import zlib
+
+import numpy as np
+import sympy as sp
+
+from compact import is_large
+
+# Primo para la aritmética modular (cabe en un int64 al multiplicar en Python)
+MODULUS = (1 << 61) - 1
+
+# Puntos de evaluación por símbolo
+FINGERPRINT_POINTS = 4
+
+# Cifras significativas conservadas de cada valor en coma flotante
+FLOAT_DIGITS = 9
+
+
+def _points(name):
+    """
+    Puntos de evaluación de un símbolo, fijos para cada nombre.
+
+    Returns:
+        tuple: (enteros módulo MODULUS, valores complejos).
+    """
+    rng = np.random.default_rng(zlib.crc32(name.encode('utf-8')))
+    modular = [int(v) for v in rng.integers(2, 1 << 60, FINGERPRINT_POINTS)]
+    # Partes reales de ambos signos: evita que sqrt(x^2) y x coincidan en todos los puntos
+    real = rng.uniform(-2.0, 2.0, FINGERPRINT_POINTS)
+    imag = rng.uniform(0.1, 1.0, FINGERPRINT_POINTS)
+    return modular, real + 1j * imag
+
+
+def _modular(expr, values):
+    """
+    Evalúa una expresión racional en aritmética modular.
+
+    Args:
+        expr (sympy.Expr): Expresión.
+        values (dict): Símbolo -> entero módulo MODULUS.
+
+    Returns:
+        int: Valor módulo MODULUS, o None si la expresión no es racional o
+            aparece una división por cero.
+    """
+    if expr.is_Symbol:
+        return values[expr]
+    if expr.is_Integer:
+        return int(expr) % MODULUS
+    if expr.is_Rational:
+        if expr.q % MODULUS == 0:
+            return None
+        return expr.p * pow(expr.q, -1, MODULUS) % MODULUS
+    if expr.is_Add or expr.is_Mul:
+        result = 0 if expr.is_Add else 1
+        for arg in expr.args:
+            value = _modular(arg, values)
+            if value is None:
+                return None
+            result = (result + value if expr.is_Add else result * value) % MODULUS
+        return result
+    if expr.is_Pow and expr.exp.is_Integer:
+        base = _modular(expr.base, values)
+        if base is None or (base == 0 and expr.exp < 0):
+            return None
+        exponent = int(expr.exp)
+        if exponent < 0:
+            return pow(pow(base, -1, MODULUS), -exponent, MODULUS)
+        return pow(base, exponent, MODULUS)
+    return None
+
+
+def fingerprint(expr):
+    """
+    Calcula la huella numérica de una expresión.
+
+    Args:
+        expr (sympy.Expr): Expresión.
+
+    Returns:
+        tuple: (nombres de los símbolos, valores modulares o None, valores
+            complejos redondeados), o None si no se puede evaluar en los
+            puntos de la huella.
+    """
+    symbols = sorted(expr.free_symbols, key=lambda s: s.name)
+    if any(not isinstance(s, sp.Symbol) for s in symbols):
+        return None
+    points = [_points(s.name) for s in symbols]
+    names = tuple(s.name for s in symbols)
+
+    modular = None
+    try:
+        modular = tuple(
+            _modular(expr, {s: p[0][i] for s, p in zip(symbols, points)})
+            for i in range(FINGERPRINT_POINTS)
+        )
+        if None in modular:
+            modular = None
+    except (RecursionError, ValueError):
+        modular = None
+
+    try:
+        func = sp.lambdify(symbols, expr, modules='numpy')
+        with np.errstate(all='ignore'):
+            values = np.broadcast_to(
+                np.asarray(func(*[p[1] for p in points]), dtype=np.complex128),
+                (FINGERPRINT_POINTS,)
+            )
+    except Exception:
+        return None
+    if not np.all(np.isfinite(values)):
+        return None
+
+    rounded = tuple(
+        (float(f"{v.real:.{FLOAT_DIGITS}g}"), float(f"{v.imag:.{FLOAT_DIGITS}g}"))
+        for v in values.tolist()
+    )
+    return names, modular, rounded
+
+
+def equivalent(a, b):
+    """
+    Confirma simbólicamente que dos expresiones son iguales.
+
+    Args:
+        a (sympy.Expr): Primera expresión.
+        b (sympy.Expr): Segunda expresión.
+
+    Returns:
+        bool: True si a - b se simplifica a cero.
+    """
+    if is_large(a) or is_large(b):
+        return False
+    try:
+        difference = a - b
+        if sp.expand(difference) == 0:
+            return True
+        return sp.simplify(difference) == 0
+    except Exception:
+        return False
@@ -4,7 +4,11 @@ Paquete de interfaz gráfica para la calculadora de derivadas.
 from .main_window import MainWindow
 from .canvas import MathPlotCanvas
 from .themes import Themes
-from .widgets import FunctionInputWidget, ResultWidget, HistoryWidget, AnimatedWidget
+from .mathtext import MathRenderer
+from .models import CriticalPointsModel
+from .crosshair import Crosshair
+from .export_dialog import ExportTableDialog
+from .widgets import FunctionInputWidget, ResultWidget, HistoryWidget, AnimatedWidget, ParameterWidget, TaylorWidget, PointEvalWidget
 
 __all__ = [
     'MainWindow',
@@ -13,5 +17,12 @@ __all__ = [
     'FunctionInputWidget',
     'ResultWidget',
     'HistoryWidget',
-    'AnimatedWidget'
+    'AnimatedWidget',
+    'ParameterWidget',
+    'TaylorWidget',
+    'PointEvalWidget',
+    'MathRenderer',
+    'CriticalPointsModel',
+    'Crosshair',
+    'ExportTableDialog'
 ]
\ No newline at end of file
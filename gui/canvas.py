@@ -12,6 +12,12 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 import matplotlib.pyplot as plt
 
+from curve_cache import CurveCache
+from intervals import evaluate
+from domain import insert_breaks
+from taylor import horner
+from .crosshair import Crosshair
+
 class MathPlotCanvas(QWidget):
     """
     Widget para mostrar gráficas matemáticas con soporte para interacción y zoom.
@@ -67,6 +73,22 @@ class MathPlotCanvas(QWidget):
             'x_range': (-10, 10),
             'critical_points': None
         }
+        
+        # Caché de curvas muestreadas (float32 basta para visualizar)
+        self.resolution = 1000
+        self.curve_cache = CurveCache(dtype=np.float32)
+        
+        # Muestreador en varios procesos y dominios de las expresiones
+        # (asignados por la aplicación)
+        self.sampler = None
+        self.domains = None
+        
+        # Artistas superpuestos de los polinomios de Taylor y del punto evaluado
+        self.taylor_artists = []
+        self.point_artists = []
+        
+        # Cursor en cruz con lectura de valores (dibujado con blitting)
+        self.crosshair = Crosshair(self.canvas, self.axes, self)
     
     def set_dark_mode(self, enable=True):
         """
@@ -113,13 +135,78 @@ class MathPlotCanvas(QWidget):
         self.axes['combined'].set_title("Comparativa")
         
         self.canvas.draw_idle()
+        self.taylor_artists = []
+        self.point_artists = []
+        self.crosshair.reset()
         
         # Reiniciar datos almacenados
         for key in self.plotted_data:
             if key != 'x_range':
                 self.plotted_data[key] = None
     
-    def plot_functions(self, lambda_funcs, x_range, critical_points=None, dark_mode=False):
+    def sample(self, func, x_range, x_vals):
+        """
+        Obtiene los valores finitos de una función sobre la malla.
+        
+        Si se conoce el dominio de la función, solo se evalúan los puntos
+        que pertenecen a él. Las funciones compiladas desde el almacén de
+        expresiones se guardan en la caché de curvas, de modo que volver a la
+        misma función y rango no requiere reevaluarla.
+        
+        Args:
+            func (callable): Función numérica de x.
+            x_range (tuple): Rango (x_min, x_max) de la malla.
+            x_vals (numpy.ndarray): Malla de evaluación.
+            
+        Returns:
+            tuple: (x, y) con solo valores finitos.
+        """
+        expr_key = getattr(func, 'key', None)
+        if expr_key is None:
+            y = evaluate(func, x_vals, fallback=True)
+            valid = np.isfinite(y)
+            return x_vals[valid], y[valid]
+        
+        key = CurveCache.make_key(expr_key, x_range, len(x_vals))
+        cached = self.curve_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if self.sampler is None:
+            if self.domains is not None:
+                return self.curve_cache.put(key, x_vals, self.domains.evaluate(func, x_vals))
+            return self.curve_cache.put(key, x_vals, evaluate(func, x_vals, fallback=True))
+        
+        # Solo se reparten los puntos del dominio; la caché copia las
+        # muestras finitas directamente del búfer compartido
+        mask = self.domains.mask(func, x_vals) if self.domains is not None else None
+        points = x_vals if mask is None else x_vals[mask]
+        if not len(points):
+            return self.curve_cache.put(key, points, points)
+        with self.sampler.sample({'y': func}, points) as samples:
+            return self.curve_cache.put(key, points, samples.column('y'))
+    
+    def _with_breaks(self, func, x_range, x, y):
+        """
+        Prepara una curva muestreada para graficarla con cortes.
+        
+        Los tramos se separan en los bordes del dominio (polos, extremos de
+        intervalos) y donde faltan muestras, para no unir tramos distintos.
+        
+        Args:
+            func (callable): Función numérica muestreada.
+            x_range (tuple): Rango (x_min, x_max) de la malla.
+            x (numpy.ndarray): Valores de x válidos.
+            y (numpy.ndarray): Valores de la función.
+            
+        Returns:
+            tuple: (x, y) con NaN en los cortes.
+        """
+        breaks = self.domains.breaks(func, x_range) if self.domains is not None else ()
+        step = (x_range[1] - x_range[0]) / max(1, self.resolution - 1)
+        return insert_breaks(x, y, breaks, step)
+    
+    def plot_functions(self, lambda_funcs, x_range, critical_points=None, intervals=None, dark_mode=False):
         """
         Grafica las funciones, derivadas, integrales y puntos críticos.
         
@@ -127,6 +214,7 @@ class MathPlotCanvas(QWidget):
             lambda_funcs (dict): Diccionario con funciones lambda para evaluación.
             x_range (tuple): Tupla (x_min, x_max) con el rango para los ejes x.
             critical_points (list): Lista de puntos críticos para marcar.
+            intervals (dict): Intervalos de monotonía y concavidad para sombrear.
             dark_mode (bool): Si es True, usa colores para modo oscuro.
         """
         # Almacenar datos para reutilizar
@@ -139,7 +227,10 @@ class MathPlotCanvas(QWidget):
         
         # Crear puntos x para graficar
         x_min, x_max = x_range
-        x_vals = np.linspace(x_min, x_max, 1000)
+        x_vals = np.linspace(x_min, x_max, self.resolution)
+        
+        # Muestras graficadas, reutilizadas por el cursor en cruz
+        hover_curves = {}
         
         # Colores según el modo
         if dark_mode:
@@ -150,7 +241,11 @@ class MathPlotCanvas(QWidget):
                 'max_point': '#FF6F00',   # Naranja oscuro
                 'min_point': '#00BFA5',   # Verde azulado
                 'inflection': '#BA68C8',  # Púrpura
-                'grid': '#555555'         # Gris oscuro
+                'grid': '#555555',        # Gris oscuro
+                'Creciente': '#66BB6A',
+                'Decreciente': '#EF5350',
+                'Cóncava hacia arriba': '#4FC3F7',
+                'Cóncava hacia abajo': '#FFB74D'
             }
         else:
             colors = {
@@ -160,19 +255,19 @@ class MathPlotCanvas(QWidget):
                 'max_point': '#E65100',   # Naranja
                 'min_point': '#00796B',   # Verde oscuro
                 'inflection': '#8E24AA',  # Púrpura
-                'grid': '#CCCCCC'         # Gris claro
+                'grid': '#CCCCCC',        # Gris claro
+                'Creciente': '#43A047',
+                'Decreciente': '#E53935',
+                'Cóncava hacia arriba': '#039BE5',
+                'Cóncava hacia abajo': '#FB8C00'
             }
         
-        # Función lambda para filtrar valores válidos
-        def filter_values(x, y):
-            valid_indices = np.isfinite(y)
-            return x[valid_indices], y[valid_indices]
-        
         # Graficar función original
         if 'function' in lambda_funcs:
             try:
-                f_vals = lambda_funcs['function'](x_vals)
-                x_valid, f_valid = filter_values(x_vals, f_vals)
+                x_valid, f_valid = self.sample(lambda_funcs['function'], x_range, x_vals)
+                hover_curves['function'] = (x_valid, f_valid)
+                x_valid, f_valid = self._with_breaks(lambda_funcs['function'], x_range, x_valid, f_valid)
                 
                 self.axes['function'].plot(x_valid, f_valid, '-', 
                                           color=colors['function'], 
@@ -192,8 +287,9 @@ class MathPlotCanvas(QWidget):
         # Graficar derivada
         if 'derivative' in lambda_funcs:
             try:
-                df_vals = lambda_funcs['derivative'](x_vals)
-                x_valid, df_valid = filter_values(x_vals, df_vals)
+                x_valid, df_valid = self.sample(lambda_funcs['derivative'], x_range, x_vals)
+                hover_curves['derivative'] = (x_valid, df_valid)
+                x_valid, df_valid = self._with_breaks(lambda_funcs['derivative'], x_range, x_valid, df_valid)
                 
                 self.axes['derivative'].plot(x_valid, df_valid, '-', 
                                             color=colors['derivative'], 
@@ -216,8 +312,9 @@ class MathPlotCanvas(QWidget):
         # Graficar integral si está disponible
         if 'integral' in lambda_funcs:
             try:
-                int_vals = lambda_funcs['integral'](x_vals)
-                x_valid, int_valid = filter_values(x_vals, int_vals)
+                x_valid, int_valid = self.sample(lambda_funcs['integral'], x_range, x_vals)
+                hover_curves['integral'] = (x_valid, int_valid)
+                x_valid, int_valid = self._with_breaks(lambda_funcs['integral'], x_range, x_valid, int_valid)
                 
                 self.axes['integral'].plot(x_valid, int_valid, '-', 
                                           color=colors['integral'], 
@@ -277,6 +374,27 @@ class MathPlotCanvas(QWidget):
                     except Exception as e:
                         print(f"Error al marcar punto crítico: {str(e)}")
         
+        # Sombrear intervalos: monotonía sobre f y concavidad sobre la derivada
+        if intervals:
+            self._shade_intervals(self.axes['function'], intervals['monotonicity'], colors)
+            self._shade_intervals(self.axes['derivative'], intervals['concavity'], colors)
+            
+            # Puntos de inflexión (cambios de signo de f'')
+            if 'function' in lambda_funcs and intervals['inflection_points']:
+                try:
+                    x_inflection = np.asarray(intervals['inflection_points'], dtype=float)
+                    with np.errstate(all='ignore'):
+                        y_inflection = np.broadcast_to(
+                            np.asarray(lambda_funcs['function'](x_inflection), dtype=float),
+                            x_inflection.shape
+                        )
+                    valid = np.isfinite(y_inflection)
+                    self.axes['function'].plot(x_inflection[valid], y_inflection[valid], 'D',
+                                               color=colors['inflection'], ms=6,
+                                               label="Inflexión")
+                except Exception as e:
+                    print(f"Error al marcar puntos de inflexión: {str(e)}")
+        
         # Añadir leyendas
         for ax in self.axes.values():
             if len(ax.get_lines()) > 0:  # Solo añadir leyenda si hay líneas
@@ -286,10 +404,237 @@ class MathPlotCanvas(QWidget):
                 if by_label:  # Solo si hay elementos
                     ax.legend(by_label.values(), by_label.keys(), loc='best', fontsize='small')
         
+        self.crosshair.set_curves(hover_curves, lambda_funcs, dark_mode)
+        
         # Ajustar diseño y refrescar canvas
         self.fig.tight_layout()
         self.canvas.draw_idle()
     
+    def _shade_intervals(self, ax, intervals, colors):
+        """
+        Sombrea en vertical los intervalos de un tipo conocido.
+        
+        Args:
+            ax (Axes): Subgráfica sobre la que sombrear.
+            intervals (list): Diccionarios con 'start', 'end' y 'type'.
+            colors (dict): Colores por tipo de intervalo.
+        """
+        for interval in intervals:
+            color = colors.get(interval['type'])
+            if color is None:
+                # Tramos constantes o lineales: sin sombreado
+                continue
+            ax.axvspan(interval['start'], interval['end'], color=color,
+                       alpha=0.12, lw=0, zorder=0, label=interval['type'])
+    
+    def plot_family(self, parametric, x_range, name, samples, dark_mode=False):
+        """
+        Grafica una familia de curvas variando un parámetro.
+        
+        Cada subgráfica se obtiene con una única evaluación vectorizada que
+        produce todas las curvas a la vez.
+        
+        Args:
+            parametric (ParametricFunctions): Funciones con parámetros libres.
+            x_range (tuple): Tupla (x_min, x_max) con el rango para los ejes x.
+            name (str): Parámetro que varía.
+            samples (numpy.ndarray): Valores del parámetro.
+            dark_mode (bool): Si es True, usa colores para modo oscuro.
+        """
+        self.clear_all()
+        self.plotted_data['x_range'] = x_range
+        
+        x_min, x_max = x_range
+        x_vals = np.linspace(x_min, x_max, 1000)
+        
+        cmap = plt.get_cmap('plasma' if dark_mode else 'viridis')
+        colors = cmap(np.linspace(0.1, 0.9, len(samples)))
+        labels = [f"{name} = {v:.2g}" for v in samples]
+        
+        titles = {
+            'function': 'f(x)',
+            'derivative': "f'(x)",
+            'integral': "∫f(x)dx"
+        }
+        
+        for key, ylabel in titles.items():
+            if key not in parametric.funcs:
+                continue
+            try:
+                values = np.array(parametric.evaluate_family(key, x_vals, name, samples))
+                
+                # Los valores no finitos se dejan como huecos en las curvas
+                values[~np.isfinite(values)] = np.nan
+                
+                ax = self.axes[key]
+                ax.set_prop_cycle(color=colors)
+                ax.plot(x_vals, values.T, '-', lw=1.5, label=labels)
+                ax.set_xlabel('x')
+                ax.set_ylabel(ylabel)
+                
+                if key == 'function':
+                    self.axes['combined'].set_prop_cycle(color=colors)
+                    self.axes['combined'].plot(x_vals, values.T, '-', lw=1.5)
+            except Exception as e:
+                print(f"Error al graficar familia de {ylabel}: {str(e)}")
+        
+        # Leyenda solo si no hay demasiadas curvas
+        if len(samples) <= 8:
+            self.axes['function'].legend(loc='best', fontsize='small')
+        
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+    
+    def plot_comparison(self, curves, x_range, dark_mode=False):
+        """
+        Superpone las curvas de varias funciones sobre una malla compartida.
+        
+        Todas las curvas (funciones, derivadas e integrales) se obtienen con
+        una única evaluación vectorizada.
+        
+        Args:
+            curves (ComparisonCurves): Curvas de las funciones comparadas.
+            x_range (tuple): Tupla (x_min, x_max) con el rango para los ejes x.
+            dark_mode (bool): Si es True, usa colores para modo oscuro.
+        """
+        self.clear_all()
+        self.plotted_data['x_range'] = x_range
+        
+        x_min, x_max = x_range
+        x_vals = np.linspace(x_min, x_max, 1000)
+        
+        # Cada función conserva su color en todas las subgráficas
+        cmap = plt.get_cmap('tab10')
+        colors = {label: cmap(i % 10) for i, label in enumerate(curves.labels)}
+        
+        titles = {
+            'function': 'f(x)',
+            'derivative': "f'(x)",
+            'integral': "∫f(x)dx"
+        }
+        
+        try:
+            evaluated = curves.evaluate(x_vals)
+        except Exception as e:
+            print(f"Error al evaluar las funciones comparadas: {str(e)}")
+            evaluated = {}
+        
+        for key, ylabel in titles.items():
+            if key not in evaluated:
+                continue
+            values, labels = evaluated[key]
+            ax = self.axes[key]
+            for row, label in zip(values, labels):
+                ax.plot(x_vals, row, '-', lw=1.5, color=colors[label], label=label)
+                if key == 'function':
+                    self.axes['combined'].plot(x_vals, row, '-', lw=1.5,
+                                               color=colors[label], label=label)
+            ax.set_xlabel('x')
+            ax.set_ylabel(ylabel)
+        
+        if 'function' in evaluated:
+            self.axes['function'].legend(loc='best', fontsize='small')
+        
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+    
+    def plot_taylor(self, point, coefficient_sets, dark_mode=False):
+        """
+        Superpone polinomios de Taylor en la gráfica de la función.
+        
+        Args:
+            point (float): Punto de desarrollo.
+            coefficient_sets (list): Lista de (orden, coeficientes) a dibujar.
+            dark_mode (bool): Si es True, usa colores para modo oscuro.
+        """
+        self.clear_taylor()
+        
+        ax = self.axes['function']
+        x_min, x_max = self.plotted_data['x_range']
+        x_vals = np.linspace(x_min, x_max, self.resolution)
+        t = x_vals - point
+        
+        # Limitar el eje y al rango visible de f para que el polinomio no lo deforme
+        y_limits = ax.get_ylim()
+        
+        cmap = plt.get_cmap('autumn' if dark_mode else 'copper')
+        colors = cmap(np.linspace(0.2, 0.8, max(len(coefficient_sets), 1)))
+        
+        for (order, coefficients), color in zip(coefficient_sets, colors):
+            try:
+                values = horner(coefficients, t)
+                line, = ax.plot(x_vals, values, '--', color=color, lw=1.2, label=f"T{order}(x)")
+                self.taylor_artists.append(line)
+            except Exception as e:
+                print(f"Error al graficar polinomio de Taylor: {str(e)}")
+        
+        self.taylor_artists.append(ax.axvline(x=point, color='gray', linestyle=':', alpha=0.6))
+        
+        ax.set_ylim(y_limits)
+        self._refresh_legend(ax)
+        self.canvas.draw_idle()
+    
+    def clear_taylor(self):
+        """Elimina las superposiciones de Taylor de la gráfica."""
+        for artist in self.taylor_artists:
+            try:
+                artist.remove()
+            except ValueError:
+                pass
+        self.taylor_artists = []
+        self._refresh_legend(self.axes['function'])
+        self.canvas.draw_idle()
+    
+    def mark_point(self, point, values, dark_mode=False):
+        """
+        Marca un punto evaluado en las gráficas de f, f' e ∫f.
+        
+        Args:
+            point (float): Coordenada x del punto.
+            values (dict): Nombre de la curva ('function', 'derivative',
+                'integral') -> valor en el punto, o None si no está definida.
+            dark_mode (bool): Si es True, usa colores para modo oscuro.
+        """
+        self.clear_point()
+        
+        color = '#FFD54F' if dark_mode else '#FF8F00'
+        for key, value in values.items():
+            ax = self.axes.get(key)
+            if ax is None:
+                continue
+            self.point_artists.append(ax.axvline(x=point, color=color, linestyle='--', alpha=0.5))
+            if value is not None and np.isfinite(value):
+                self.point_artists.extend(ax.plot(point, value, 'o', color=color, ms=8))
+        
+        self.point_artists.append(
+            self.axes['combined'].axvline(x=point, color=color, linestyle='--', alpha=0.5)
+        )
+        self.canvas.draw_idle()
+    
+    def clear_point(self):
+        """Elimina la marca del punto evaluado."""
+        for artist in self.point_artists:
+            try:
+                artist.remove()
+            except ValueError:
+                pass
+        self.point_artists = []
+        self.canvas.draw_idle()
+    
+    def _refresh_legend(self, ax):
+        """
+        Regenera la leyenda de una subgráfica sin entradas duplicadas.
+        
+        Args:
+            ax (Axes): Subgráfica a actualizar.
+        """
+        handles, labels = ax.get_legend_handles_labels()
+        by_label = dict(zip(labels, handles))
+        if by_label:
+            ax.legend(by_label.values(), by_label.keys(), loc='best', fontsize='small')
+        elif ax.get_legend() is not None:
+            ax.get_legend().remove()
+    
     def save_figure(self, filename, dpi=300):
         """
         Guarda la figura actual en un archivo.
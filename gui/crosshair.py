@@ -0,0 +1,291 @@
+"""
+Cursor en cruz con lectura de valores y recta tangente sobre las gráficas.
+Se dibuja con blitting: el fondo de la figura se guarda tras cada dibujado
+completo y, al mover el ratón, solo se repintan el cursor, la tangente y el
+texto, como mucho una vez por refresco de pantalla. Mientras el ratón se
+mueve, los valores se interpolan sobre las muestras ya calculadas; cuando se
+detiene, se sustituyen por la evaluación exacta de las funciones.
+"""
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtGui import QGuiApplication
+from matplotlib.lines import Line2D
+
+# Espera (ms) sin movimiento antes de evaluar las funciones exactamente
+IDLE_DELAY_MS = 150
+
+# Dos muestras más separadas que este múltiplo del paso delimitan un hueco
+GAP_FACTOR = 1.5
+
+# Fracción del ancho del eje que ocupa la recta tangente
+TANGENT_WIDTH = 0.3
+
+# Etiquetas de las curvas en la lectura de valores
+CURVE_LABELS = {
+    'function': "f(x)",
+    'derivative': "f'(x)",
+    'integral': "∫f(x)dx",
+}
+
+
+class Crosshair(QObject):
+    """
+    Cursor en cruz sobre las subgráficas de un MathPlotCanvas.
+    """
+
+    def __init__(self, canvas, axes, parent=None):
+        """
+        Inicializa el cursor y se conecta a los eventos del canvas.
+
+        Args:
+            canvas (FigureCanvasQTAgg): Canvas de Matplotlib.
+            axes (dict): Subgráficas por nombre ('function', 'derivative',
+                'integral', 'combined').
+            parent (QObject, optional): Objeto padre.
+        """
+        super(Crosshair, self).__init__(parent)
+        self.canvas = canvas
+        self.axes = axes
+
+        # Muestras (x, y) por curva, funciones exactas y pendiente muestreada de f
+        self.curves = {}
+        self.funcs = {}
+        self.slopes = None
+        self.step = None
+        self.dark_mode = False
+
+        self._artists = None
+        self._background = None
+        self._x = None
+
+        # Un fotograma por refresco de pantalla, aunque lleguen más eventos
+        screen = QGuiApplication.primaryScreen()
+        refresh = screen.refreshRate() if screen is not None else 60.0
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(max(1, int(1000 / (refresh or 60.0))))
+        self._frame_timer.timeout.connect(self._render)
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(IDLE_DELAY_MS)
+        self._idle_timer.timeout.connect(self._evaluate_exact)
+
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('motion_notify_event', self._on_motion)
+        self.canvas.mpl_connect('axes_leave_event', self._on_leave)
+        self.canvas.mpl_connect('figure_leave_event', self._on_leave)
+
+    def set_curves(self, curves, funcs, dark_mode=False):
+        """
+        Establece las curvas sobre las que se lee el cursor.
+
+        Args:
+            curves (dict): Nombre -> (x, y) con las muestras finitas graficadas.
+            funcs (dict): Nombre -> función numérica para la evaluación exacta.
+            dark_mode (bool): Si es True, usa colores para modo oscuro.
+        """
+        self.reset()
+        self.curves = {name: (np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+                       for name, (x, y) in curves.items() if len(x) >= 2}
+        self.funcs = {name: func for name, func in funcs.items() if name in self.curves}
+        self.dark_mode = dark_mode
+
+        if 'function' in self.curves:
+            x, y = self.curves['function']
+            self.slopes = np.gradient(y, x)
+            self.step = float(np.median(np.diff(x)))
+
+    def reset(self):
+        """Olvida las curvas y los artistas (las subgráficas se han limpiado)."""
+        self._idle_timer.stop()
+        self._frame_timer.stop()
+        self.curves = {}
+        self.funcs = {}
+        self.slopes = None
+        self.step = None
+        self._artists = None
+        self._x = None
+
+    def _create_artists(self):
+        """Crea las líneas y el texto del cursor (excluidos del dibujado normal)."""
+        color = '#BBBBBB' if self.dark_mode else '#555555'
+        artists = {'vlines': [], 'markers': {}, 'tangent': None, 'text': None}
+
+        for ax in self.axes.values():
+            # Línea vertical en coordenadas (x de datos, y del eje); add_artist
+            # no modifica los límites de la subgráfica
+            line = Line2D([0, 0], [0, 1], transform=ax.get_xaxis_transform(),
+                          color=color, lw=0.8, ls='--', animated=True, visible=False)
+            ax.add_artist(line)
+            artists['vlines'].append(line)
+
+        for name in self.curves:
+            marker = Line2D([], [], marker='o', ms=6, color=color,
+                            animated=True, visible=False)
+            self.axes[name].add_artist(marker)
+            artists['markers'][name] = marker
+
+        ax = self.axes['function']
+        if 'function' in self.curves:
+            artists['tangent'] = Line2D([], [], color='#FF7043', lw=1.5,
+                                        animated=True, visible=False)
+            ax.add_artist(artists['tangent'])
+
+        artists['text'] = ax.text(
+            0.02, 0.98, "", transform=ax.transAxes, va='top', ha='left',
+            fontsize='small', family='monospace', animated=True, visible=False,
+            color='#e0e0e0' if self.dark_mode else '#333333',
+            bbox=dict(boxstyle='round', alpha=0.8,
+                      facecolor='#2D2D30' if self.dark_mode else '#FFFFFF')
+        )
+        self._artists = artists
+
+    def _iter_artists(self):
+        """Recorre todos los artistas del cursor."""
+        if self._artists is None:
+            return
+        yield from self._artists['vlines']
+        yield from self._artists['markers'].values()
+        if self._artists['tangent'] is not None:
+            yield self._artists['tangent']
+        yield self._artists['text']
+
+    def _on_draw(self, event):
+        """Guarda el fondo tras un dibujado completo y vuelve a pintar el cursor."""
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        if self._x is not None:
+            self._blit()
+
+    def _on_motion(self, event):
+        """Registra la posición del ratón y programa un fotograma."""
+        if not self.curves or event.inaxes not in self.axes.values() or event.xdata is None:
+            self._on_leave(event)
+            return
+
+        self._x = float(event.xdata)
+        self._idle_timer.start()
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+    def _on_leave(self, event):
+        """Oculta el cursor al salir de las subgráficas."""
+        if self._x is None:
+            return
+        self._x = None
+        self._idle_timer.stop()
+        self._frame_timer.stop()
+        for artist in self._iter_artists():
+            artist.set_visible(False)
+        self._blit()
+
+    def interpolate(self, name, x):
+        """
+        Interpola una curva en x a partir de sus muestras.
+
+        Args:
+            name (str): Curva ('function', 'derivative' o 'integral').
+            x (float): Abscisa.
+
+        Returns:
+            float: Valor interpolado, o NaN fuera de las muestras o en un hueco.
+        """
+        xs, ys = self.curves[name]
+        return self._interpolate(xs, ys, x)
+
+    def _interpolate(self, xs, ys, x):
+        """Interpolación lineal de (xs, ys) en x, sin cruzar huecos."""
+        i = int(np.searchsorted(xs, x))
+        if i <= 0 or i >= len(xs):
+            return ys[0] if i == 0 and x == xs[0] else np.nan
+        x0, x1 = xs[i - 1], xs[i]
+        if self.step is not None and x1 - x0 > GAP_FACTOR * self.step:
+            # Las muestras no finitas se eliminaron: no interpolar sobre el hueco
+            return np.nan
+        t = (x - x0) / (x1 - x0)
+        return ys[i - 1] + t * (ys[i] - ys[i - 1])
+
+    def _render(self):
+        """Dibuja un fotograma con los valores interpolados."""
+        if self._x is None:
+            return
+        x = self._x
+        values = {name: self.interpolate(name, x) for name in self.curves}
+        slope = np.nan
+        if self.slopes is not None:
+            slope = self._interpolate(self.curves['function'][0], self.slopes, x)
+        self._update_artists(x, values, slope, exact=False)
+        self._blit()
+
+    def _evaluate_exact(self):
+        """Con el ratón quieto, sustituye la interpolación por los valores exactos."""
+        if self._x is None:
+            return
+        x = self._x
+        values = {}
+        with np.errstate(all='ignore'):
+            for name, func in self.funcs.items():
+                try:
+                    values[name] = float(np.real_if_close(func(x)))
+                except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+                    values[name] = np.nan
+
+            # Pendiente por diferencias centradas (error relativo ~1e-10)
+            slope = np.nan
+            func = self.funcs.get('function')
+            if func is not None:
+                h = np.cbrt(np.finfo(float).eps) * max(1.0, abs(x))
+                try:
+                    slope = (float(func(x + h)) - float(func(x - h))) / (2 * h)
+                except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+                    pass
+
+        self._update_artists(x, values, slope, exact=True)
+        self._blit()
+
+    def _update_artists(self, x, values, slope, exact):
+        """Coloca el cursor, los marcadores, la tangente y el texto."""
+        if self._artists is None:
+            self._create_artists()
+
+        for line in self._artists['vlines']:
+            line.set_xdata([x, x])
+            line.set_visible(True)
+
+        for name, marker in self._artists['markers'].items():
+            y = values.get(name, np.nan)
+            marker.set_data([x], [y])
+            marker.set_visible(bool(np.isfinite(y)))
+
+        tangent = self._artists['tangent']
+        if tangent is not None:
+            y = values.get('function', np.nan)
+            visible = bool(np.isfinite(y) and np.isfinite(slope))
+            if visible:
+                x_min, x_max = self.axes['function'].get_xlim()
+                half = 0.5 * TANGENT_WIDTH * (x_max - x_min)
+                tangent.set_data([x - half, x + half], [y - slope * half, y + slope * half])
+            tangent.set_visible(visible)
+
+        lines = [f"x = {x:.6g}"]
+        for name in self.curves:
+            y = values.get(name, np.nan)
+            lines.append(f"{CURVE_LABELS[name]} = {y:.6g}" if np.isfinite(y)
+                         else f"{CURVE_LABELS[name]} no definida")
+        if np.isfinite(slope):
+            lines.append(f"pendiente = {slope:.6g}")
+        if not exact:
+            lines[0] += "  ≈"
+        text = self._artists['text']
+        text.set_text("\n".join(lines))
+        text.set_visible(True)
+
+    def _blit(self):
+        """Restaura el fondo guardado y repinta solo los artistas del cursor."""
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        for artist in self._iter_artists():
+            if artist.get_visible():
+                artist.axes.draw_artist(artist)
+        self.canvas.blit(self.canvas.figure.bbox)
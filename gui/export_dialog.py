@@ -0,0 +1,214 @@
+"""
+Diálogo para exportar tablas numéricas de f, f' e ∫f.
+La exportación se ejecuta en un hilo de trabajo; el diálogo muestra el
+progreso y el tiempo restante estimado y permite cancelarla.
+"""
+import os
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
+                             QLineEdit, QPushButton, QProgressBar, QLabel,
+                             QFileDialog, QDialogButtonBox)
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from exporter import export_table, available_formats, row_count, ExportCancelled
+
+# Nombres de los formatos en el diálogo de archivo
+FORMAT_FILTERS = {
+    '.csv': "CSV (*.csv)",
+    '.npy': "NumPy (*.npy)",
+    '.parquet': "Parquet (*.parquet)",
+}
+
+
+def format_duration(seconds):
+    """
+    Da formato a una duración en segundos.
+
+    Args:
+        seconds (float): Duración.
+
+    Returns:
+        str: Texto "h:mm:ss" o "m:ss".
+    """
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class _ExportThread(QThread):
+    """Hilo que escribe la tabla y comunica el progreso."""
+
+    # Filas escritas, filas totales y segundos restantes
+    progress = pyqtSignal(int, int, float)
+
+    # Éxito y mensaje
+    done = pyqtSignal(bool, str)
+
+    def __init__(self, funcs, x_start, x_stop, step, path, sampler=None, parent=None):
+        super(_ExportThread, self).__init__(parent)
+        self.funcs = funcs
+        self.sampler = sampler
+        self.args = (x_start, x_stop, step, path)
+        self._cancelled = False
+
+    def cancel(self):
+        """Pide que la exportación se detenga tras el bloque actual."""
+        self._cancelled = True
+
+    def run(self):
+        x_start, x_stop, step, path = self.args
+        try:
+            rows = export_table(self.funcs, x_start, x_stop, step, path,
+                                progress=self.progress.emit,
+                                cancelled=lambda: self._cancelled,
+                                sampler=self.sampler)
+            self.done.emit(True, f"Se exportaron {rows:,} filas a:\n{path}")
+        except ExportCancelled:
+            self.done.emit(False, "Exportación cancelada.")
+        except Exception as e:
+            self.done.emit(False, f"No se pudo exportar la tabla: {str(e)}")
+
+
+class ExportTableDialog(QDialog):
+    """Diálogo de exportación de tablas de valores."""
+
+    def __init__(self, funcs, x_range, sampler=None, parent=None):
+        """
+        Inicializa el diálogo.
+
+        Args:
+            funcs (dict): 'function', 'derivative' y/o 'integral' -> función numérica.
+            x_range (tuple): Rango (x_min, x_max) propuesto.
+            sampler (ParallelSampler, optional): Muestreador en varios procesos.
+            parent (QWidget, optional): Widget padre.
+        """
+        super(ExportTableDialog, self).__init__(parent)
+        self.setWindowTitle("Exportar Tabla de Valores")
+        self.funcs = funcs
+        self.sampler = sampler
+        self._thread = None
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        x_min, x_max = x_range
+        self.start_input = QLineEdit(f"{x_min:g}")
+        self.stop_input = QLineEdit(f"{x_max:g}")
+        self.step_input = QLineEdit(f"{(x_max - x_min) / 1000:g}")
+
+        path_layout = QHBoxLayout()
+        self.path_input = QLineEdit()
+        self.browse_button = QPushButton("Examinar...")
+        path_layout.addWidget(self.path_input)
+        path_layout.addWidget(self.browse_button)
+
+        self.rows_label = QLabel()
+
+        form.addRow("Desde x =", self.start_input)
+        form.addRow("Hasta x =", self.stop_input)
+        form.addRow("Paso:", self.step_input)
+        form.addRow("Archivo:", path_layout)
+        form.addRow("Filas:", self.rows_label)
+        layout.addLayout(form)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.status_label = QLabel("")
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.status_label)
+
+        self.buttons = QDialogButtonBox()
+        self.export_button = self.buttons.addButton("Exportar", QDialogButtonBox.AcceptRole)
+        self.close_button = self.buttons.addButton(QDialogButtonBox.Close)
+        layout.addWidget(self.buttons)
+
+        self.browse_button.clicked.connect(self._browse)
+        self.export_button.clicked.connect(self._start)
+        self.close_button.clicked.connect(self._on_close_clicked)
+        for field in (self.start_input, self.stop_input, self.step_input):
+            field.textChanged.connect(self._update_rows)
+        self._update_rows()
+
+    def _read_range(self):
+        """Lee el rango y el paso; lanza ValueError si no son válidos."""
+        x_start = float(self.start_input.text())
+        x_stop = float(self.stop_input.text())
+        step = float(self.step_input.text())
+        return x_start, x_stop, step, row_count(x_start, x_stop, step)
+
+    def _update_rows(self):
+        """Muestra el número de filas que tendrá la tabla."""
+        try:
+            rows = self._read_range()[3]
+            self.rows_label.setText(f"{rows:,}")
+        except ValueError:
+            self.rows_label.setText("—")
+
+    def _browse(self):
+        """Elige el archivo de destino; el formato se deduce de la extensión."""
+        filters = ";;".join(FORMAT_FILTERS[ext] for ext in available_formats())
+        file_path, selected = QFileDialog.getSaveFileName(self, "Exportar Tabla", "tabla.csv", filters)
+        if not file_path:
+            return
+        if not os.path.splitext(file_path)[1]:
+            for ext, name in FORMAT_FILTERS.items():
+                if name == selected:
+                    file_path += ext
+        self.path_input.setText(file_path)
+
+    def _start(self):
+        """Comienza la exportación en el hilo de trabajo."""
+        try:
+            x_start, x_stop, step, _ = self._read_range()
+        except ValueError as e:
+            self.status_label.setText(f"Rango no válido: {str(e)}")
+            return
+        path = self.path_input.text().strip()
+        if not path:
+            self._browse()
+            path = self.path_input.text().strip()
+            if not path:
+                return
+
+        self.export_button.setEnabled(False)
+        self.close_button.setText("Cancelar")
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Exportando...")
+
+        self._thread = _ExportThread(self.funcs, x_start, x_stop, step, path, self.sampler, self)
+        self._thread.progress.connect(self._on_progress)
+        self._thread.done.connect(self._on_done)
+        self._thread.start()
+
+    def _on_progress(self, done, total, remaining):
+        """Actualiza la barra de progreso y el tiempo restante."""
+        self.progress_bar.setValue(int(1000 * done / total))
+        self.status_label.setText(
+            f"{done:,} de {total:,} filas — tiempo restante ≈ {format_duration(remaining)}"
+        )
+
+    def _on_done(self, success, message):
+        """Muestra el resultado y permite una nueva exportación."""
+        self._thread = None
+        self.export_button.setEnabled(True)
+        self.close_button.setText("Cerrar")
+        if success:
+            self.progress_bar.setValue(1000)
+        self.status_label.setText(message)
+
+    def _on_close_clicked(self):
+        """Cancela la exportación en curso o cierra el diálogo."""
+        if self._thread is not None:
+            self._thread.cancel()
+        else:
+            self.reject()
+
+    def reject(self):
+        """Cancela la exportación en curso antes de cerrar."""
+        if self._thread is not None:
+            self._thread.cancel()
+            self._thread.wait()
+        super(ExportTableDialog, self).reject()
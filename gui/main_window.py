@@ -29,6 +29,17 @@ class MainWindow(QMainWindow):
         # Tema actual
         self.dark_mode = self.settings.value("darkMode", False, type=bool)
         
+        # Instrumentación (asignada por la aplicación) y perfilado pendiente
+        self.instrumentation = None
+        self.profile_request = None
+        self.expression_store = None
+        
+        # Ejecutar el análisis en un proceso aislado con límites de recursos
+        self.sandbox_enabled = self.settings.value("sandbox", False, type=bool)
+        
+        # Comprobar numéricamente la derivada y la integral de cada cálculo
+        self.verify_enabled = self.settings.value("verify", False, type=bool)
+        
         # Configurar estilo inicial
         self.apply_theme()
         
@@ -91,12 +102,17 @@ class MainWindow(QMainWindow):
         save_action.setShortcut("Ctrl+S")
         save_action.triggered.connect(self.save_graph)
         
+        export_table_action = QAction("Exportar &tabla de valores...", self)
+        export_table_action.setShortcut("Ctrl+E")
+        export_table_action.triggered.connect(self.export_table)
+        
         exit_action = QAction("&Salir", self)
         exit_action.setShortcut("Ctrl+Q")
         exit_action.triggered.connect(self.close)
         
         file_menu.addAction(new_action)
         file_menu.addAction(save_action)
+        file_menu.addAction(export_table_action)
         file_menu.addSeparator()
         file_menu.addAction(exit_action)
         
@@ -113,6 +129,42 @@ class MainWindow(QMainWindow):
         view_menu.addAction(theme_action)
         view_menu.addAction(fullscreen_action)
         
+        # Menú Herramientas
+        tools_menu = self.menuBar().addMenu("&Herramientas")
+        
+        self.profile_cpu_action = QAction("Perfilar siguiente cálculo (&cProfile)", self)
+        self.profile_cpu_action.setCheckable(True)
+        self.profile_cpu_action.triggered.connect(lambda checked: self.set_profile_request('cprofile', checked))
+        
+        self.profile_memory_action = QAction("Perfilar &memoria del siguiente cálculo (tracemalloc)", self)
+        self.profile_memory_action.setCheckable(True)
+        self.profile_memory_action.triggered.connect(lambda checked: self.set_profile_request('tracemalloc', checked))
+        
+        export_metrics_action = QAction("&Exportar métricas...", self)
+        export_metrics_action.triggered.connect(self.export_metrics)
+        
+        sandbox_action = QAction("Evaluar en proceso &aislado", self)
+        sandbox_action.setCheckable(True)
+        sandbox_action.setChecked(self.sandbox_enabled)
+        sandbox_action.triggered.connect(self.set_sandbox_enabled)
+        
+        verify_action = QAction("&Verificar resultados numéricamente", self)
+        verify_action.setCheckable(True)
+        verify_action.setChecked(self.verify_enabled)
+        verify_action.triggered.connect(self.set_verify_enabled)
+        
+        tools_menu.addAction(sandbox_action)
+        tools_menu.addAction(verify_action)
+        tools_menu.addSeparator()
+        tools_menu.addAction(self.profile_cpu_action)
+        tools_menu.addAction(self.profile_memory_action)
+        tools_menu.addSeparator()
+        tools_menu.addAction(export_metrics_action)
+        
+        memory_action = QAction("Uso de memoria de &expresiones", self)
+        memory_action.triggered.connect(self.show_memory_report)
+        tools_menu.addAction(memory_action)
+        
         # Menú Ayuda
         help_menu = self.menuBar().addMenu("A&yuda")
         
@@ -178,30 +230,111 @@ class MainWindow(QMainWindow):
             )
             return
         
-        # Aquí se haría la llamada al módulo de lógica
-        # Esto es un placeholder hasta que implementemos el módulo completo
+        # El cálculo lo realiza la aplicación conectada a calculate_requested
         self.statusBar.showMessage("Calculando...")
+    
+    def set_sandbox_enabled(self, enabled):
+        """
+        Activa o desactiva el análisis en un proceso aislado.
         
-        # Simular un breve retraso para mostrar la animación de transición
-        QTimer.singleShot(500, lambda: self.process_calculation(input_data))
+        Args:
+            enabled (bool): Si es True, el análisis se ejecuta con límites de memoria y CPU.
+        """
+        self.sandbox_enabled = enabled
+        self.settings.setValue("sandbox", enabled)
     
-    def process_calculation(self, input_data):
+    def set_verify_enabled(self, enabled):
         """
-        Procesa el cálculo y muestra los resultados.
+        Activa o desactiva la comprobación numérica de los resultados.
         
         Args:
-            input_data (dict): Diccionario con los datos de entrada.
+            enabled (bool): Si es True, la derivada y la integral se comparan
+                con derivadas numéricas en puntos aleatorios.
+        """
+        self.verify_enabled = enabled
+        self.settings.setValue("verify", enabled)
+    
+    def set_profile_request(self, mode, enabled):
+        """
+        Activa o desactiva el perfilado del siguiente cálculo.
+        
+        Args:
+            mode (str): 'cprofile' o 'tracemalloc'.
+            enabled (bool): Si es True, se perfilará el siguiente cálculo.
+        """
+        self.profile_request = mode if enabled else None
+        
+        # Solo un modo de perfilado a la vez
+        self.profile_cpu_action.setChecked(self.profile_request == 'cprofile')
+        self.profile_memory_action.setChecked(self.profile_request == 'tracemalloc')
+    
+    def take_profile_request(self):
         """
-        # En la implementación real, aquí llamaríamos a las funciones del módulo logic.py
-        # Por ahora, solo mostraremos la página de resultados con datos de ejemplo
+        Obtiene y consume la petición de perfilado pendiente.
         
-        # Añadir al historial
-        self.input_page.add_to_history(input_data)
+        Returns:
+            str: Modo de perfilado o None si no hay petición.
+        """
+        mode = self.profile_request
+        self.set_profile_request(None, False)
+        return mode
+    
+    def show_metrics(self, text):
+        """
+        Muestra las métricas del último cálculo en la barra de estado.
         
-        # Mostrar la página de resultados
-        self.show_results_page()
+        Args:
+            text (str): Resumen de tiempos por etapa.
+        """
+        if text:
+            self.statusBar.showMessage(text)
+    
+    def export_metrics(self):
+        """Exporta el registro de métricas a un archivo JSON o CSV."""
+        if self.instrumentation is None or not self.instrumentation.records:
+            QMessageBox.information(
+                self,
+                "Exportar Métricas",
+                "Todavía no hay métricas registradas."
+            )
+            return
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Exportar Métricas",
+            "metricas.json",
+            "JSON (*.json);;CSV (*.csv)"
+        )
         
-        # NOTA: Aquí se conectará con la lógica real cuando implementemos el módulo completo
+        if file_path and not self.instrumentation.export(file_path):
+            QMessageBox.warning(
+                self,
+                "Error de Exportación",
+                "No se pudieron exportar las métricas. Verifique la ruta y los permisos."
+            )
+    
+    def show_memory_report(self):
+        """Muestra el uso de memoria del almacén de expresiones."""
+        if self.expression_store is None:
+            return
+        
+        report = self.expression_store.memory_report()
+        saved = 0.0
+        if report['tree_bytes']:
+            saved = 100.0 * (1.0 - report['unique_bytes'] / report['tree_bytes'])
+        
+        QMessageBox.information(
+            self,
+            "Uso de memoria de expresiones",
+            f"Expresiones guardadas: {report['expressions']} "
+            f"(descartadas por capacidad: {report['evicted']})\n"
+            f"Resultados guardados: {report['results']}\n"
+            f"Funciones compiladas: {report['compiled']}\n"
+            f"Nodos únicos: {report['unique_nodes']} "
+            f"(sin compartir serían {report['tree_nodes']})\n"
+            f"Memoria aproximada: {report['unique_bytes'] / 1024:.1f} KiB "
+            f"(sin compartir {report['tree_bytes'] / 1024:.1f} KiB, ahorro {saved:.0f} %)"
+        )
     
     def new_calculation(self):
         """Inicia un nuevo cálculo."""
@@ -220,6 +353,17 @@ class MainWindow(QMainWindow):
                 "Primero debe calcular una derivada para poder guardar la gráfica."
             )
     
+    def export_table(self):
+        """Exporta una tabla de valores de f, f' e ∫f."""
+        if self.stack.currentWidget() == self.results_page:
+            self.results_page.export_table()
+        else:
+            QMessageBox.information(
+                self,
+                "Exportar Tabla",
+                "Primero debe calcular una derivada para poder exportar la tabla."
+            )
+    
     def show_about(self):
         """Muestra información sobre la aplicación."""
         QMessageBox.about(
@@ -0,0 +1,170 @@
+"""
+Renderizado de expresiones LaTeX con mathtext de Matplotlib.
+Las imágenes se generan en un hilo de trabajo (nunca en el hilo de la
+interfaz) y se guardan en una caché LRU por (LaTeX, DPI, color), de modo que
+volver a mostrar un resultado ya visto es inmediato.
+"""
+import io
+from collections import OrderedDict
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+from matplotlib.figure import Figure
+from matplotlib.mathtext import MathTextParser
+
+# Longitud máxima del LaTeX que se intenta componer (mathtext no parte líneas)
+MAX_LATEX_LENGTH = 400
+
+# Número de imágenes guardadas en la caché
+CACHE_CAPACITY = 256
+
+
+def render_png(latex, dpi, color):
+    """
+    Compone una fórmula como PNG con fondo transparente.
+
+    Equivale a matplotlib.mathtext.math_to_image, pero sin fondo para que la
+    imagen sirva tanto en el tema claro como en el oscuro.
+
+    Args:
+        latex (str): Código LaTeX (sin delimitadores $).
+        dpi (int): Resolución de la imagen.
+        color (str): Color del texto.
+
+    Returns:
+        bytes: Imagen PNG.
+    """
+    text = f"${latex}$"
+    width, height, depth, _, _ = MathTextParser('path').parse(text, dpi=72)
+
+    fig = Figure(figsize=(width / 72.0, height / 72.0))
+    fig.text(0, depth / height, text, color=color)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, dpi=dpi, format='png', transparent=True)
+    return buffer.getvalue()
+
+
+class _RenderTask(QRunnable):
+    """Tarea que compone una fórmula en un hilo de trabajo."""
+
+    def __init__(self, renderer, key):
+        """
+        Inicializa la tarea.
+
+        Args:
+            renderer (MathRenderer): Renderizador que recibe el resultado.
+            key (tuple): (LaTeX, DPI, color).
+        """
+        super(_RenderTask, self).__init__()
+        self.renderer = renderer
+        self.key = key
+
+    def run(self):
+        latex, dpi, color = self.key
+        image = QImage()
+        try:
+            # QImage (a diferencia de QPixmap) puede crearse fuera del hilo de la interfaz
+            image.loadFromData(render_png(latex, dpi, color), 'PNG')
+        except Exception as e:
+            print(f"Error al componer la fórmula: {str(e)}")
+        self.renderer.finished.emit(self.key, image)
+
+
+class MathRenderer(QObject):
+    """
+    Renderizador asíncrono de fórmulas con caché.
+    """
+
+    # Señal emitida (en el hilo de la interfaz) cuando una fórmula está lista
+    rendered = pyqtSignal(tuple, QPixmap)
+
+    # Señal interna emitida desde el hilo de trabajo
+    finished = pyqtSignal(tuple, QImage)
+
+    def __init__(self, parent=None, capacity=CACHE_CAPACITY):
+        """
+        Inicializa el renderizador.
+
+        Args:
+            parent (QObject, optional): Objeto padre.
+            capacity (int): Número máximo de imágenes en la caché.
+        """
+        super(MathRenderer, self).__init__(parent)
+        self.capacity = capacity
+        self._cache = OrderedDict()
+        self._pending = set()
+        self._failed = set()
+
+        # Un único hilo: mathtext no se usa en paralelo y las tareas se sirven en orden
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        self.finished.connect(self._on_finished)
+
+    @staticmethod
+    def make_key(latex, dpi, color):
+        """
+        Construye la clave de una fórmula.
+
+        Args:
+            latex (str): Código LaTeX (sin delimitadores $).
+            dpi (int): Resolución de la imagen.
+            color (str): Color del texto.
+
+        Returns:
+            tuple: Clave de la caché.
+        """
+        return (latex, int(dpi), color)
+
+    def request(self, latex, dpi, color):
+        """
+        Solicita la imagen de una fórmula.
+
+        Si está en la caché se devuelve inmediatamente; en otro caso se encola
+        su composición y se emitirá ``rendered`` cuando esté lista.
+
+        Args:
+            latex (str): Código LaTeX (sin delimitadores $).
+            dpi (int): Resolución de la imagen.
+            color (str): Color del texto.
+
+        Returns:
+            tuple: (clave, QPixmap o None si aún no está disponible).
+        """
+        key = self.make_key(latex, dpi, color)
+        pixmap = self._cache.get(key)
+        if pixmap is not None:
+            self._cache.move_to_end(key)
+            return key, pixmap
+
+        if len(latex) <= MAX_LATEX_LENGTH and key not in self._pending and key not in self._failed:
+            self._pending.add(key)
+            self._pool.start(_RenderTask(self, key))
+        return key, None
+
+    def _on_finished(self, key, image):
+        """Convierte la imagen en QPixmap (en el hilo de la interfaz) y la guarda."""
+        self._pending.discard(key)
+        if image.isNull():
+            # Fórmulas que mathtext no admite: se sigue mostrando el texto plano
+            self._failed.add(key)
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        self._cache[key] = pixmap
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+        self.rendered.emit(key, pixmap)
+
+    def wait(self, msecs=-1):
+        """
+        Espera a que terminen las composiciones pendientes.
+
+        Args:
+            msecs (int): Tiempo máximo de espera en milisegundos (-1 sin límite).
+
+        Returns:
+            bool: True si no quedan tareas en ejecución.
+        """
+        return self._pool.waitForDone(msecs)
@@ -0,0 +1,174 @@
+"""
+Modelos de datos para las vistas de la interfaz.
+"""
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from PyQt5.QtGui import QColor
+
+# Tipos de punto crítico: código -> (nombre, color de fondo)
+POINT_TYPES = (
+    ("Mínimo", QColor(200, 255, 200)),              # Verde claro
+    ("Máximo", QColor(255, 200, 200)),              # Rojo claro
+    ("Punto de inflexión", QColor(200, 200, 255)),  # Azul claro
+    ("Indeterminado", None),
+)
+TYPE_CODES = {name: code for code, (name, _) in enumerate(POINT_TYPES)}
+TYPE_TEXT_COLOR = QColor(51, 51, 51)
+
+
+class CriticalPointsModel(QAbstractTableModel):
+    """
+    Modelo de tabla de puntos críticos sobre arreglos por columnas.
+
+    Los puntos se guardan como tres arreglos (x, y, código de tipo); y vale
+    NaN si la función no está definida en el punto. El texto de cada celda se
+    genera solo cuando la vista lo pide, es decir, para las filas visibles.
+    """
+
+    HEADERS = ("Valor x", "Valor f(x)", "Tipo")
+
+    def __init__(self, parent=None):
+        """
+        Inicializa el modelo vacío.
+
+        Args:
+            parent (QObject, optional): Objeto padre.
+        """
+        super(CriticalPointsModel, self).__init__(parent)
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.codes = np.empty(0, dtype=np.int8)
+        # Filas mostradas (índices en los arreglos), tras filtrar y ordenar
+        self._rows = np.empty(0, dtype=np.intp)
+        self._type_filter = None
+        self._sort = None
+
+    def set_points(self, critical_points):
+        """
+        Reemplaza todos los puntos con un único reinicio del modelo.
+
+        Args:
+            critical_points (list): Diccionarios con claves 'x', 'y' y 'type'.
+        """
+        count = len(critical_points)
+        x = np.fromiter((p['x'] for p in critical_points), dtype=float, count=count)
+        y = np.fromiter((np.nan if p['y'] is None else p['y'] for p in critical_points),
+                        dtype=float, count=count)
+        codes = np.fromiter((TYPE_CODES.get(p['type'], TYPE_CODES["Indeterminado"])
+                             for p in critical_points), dtype=np.int8, count=count)
+        self.set_arrays(x, y, codes)
+
+    def set_arrays(self, x, y, codes):
+        """
+        Reemplaza todos los puntos a partir de arreglos por columnas.
+
+        Args:
+            x (numpy.ndarray): Coordenadas x.
+            y (numpy.ndarray): Valores f(x) (NaN si no está definida).
+            codes (numpy.ndarray): Códigos de tipo (índices de POINT_TYPES).
+        """
+        self.beginResetModel()
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.codes = np.asarray(codes, dtype=np.int8)
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    def clear(self):
+        """Elimina todos los puntos."""
+        self.set_arrays(np.empty(0), np.empty(0), np.empty(0, dtype=np.int8))
+
+    def set_type_filter(self, code):
+        """
+        Muestra solo los puntos de un tipo.
+
+        Args:
+            code (int): Código de tipo, o None para mostrar todos.
+        """
+        self.beginResetModel()
+        self._type_filter = code
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    def _visible_rows(self):
+        """Calcula las filas visibles aplicando el filtro y el orden actuales."""
+        if self._type_filter is None:
+            rows = np.arange(len(self.x))
+        else:
+            rows = np.flatnonzero(self.codes == self._type_filter)
+
+        if self._sort is not None:
+            column, order = self._sort
+            keys = (self.x, self.y, self.codes)[column][rows].astype(float)
+            if order == Qt.DescendingOrder:
+                keys = -keys
+            # argsort estable; los NaN (f no definida) quedan siempre al final
+            rows = rows[np.argsort(keys, kind='stable')]
+        return rows
+
+    def point(self, row):
+        """
+        Obtiene el punto mostrado en una fila.
+
+        Args:
+            row (int): Fila de la vista.
+
+        Returns:
+            dict: Punto con claves 'x', 'y' y 'type'.
+        """
+        i = self._rows[row]
+        y = self.y[i]
+        return {
+            'x': float(self.x[i]),
+            'y': None if np.isnan(y) else float(y),
+            'type': POINT_TYPES[self.codes[i]][0],
+        }
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return QVariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+
+        i = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return f"{self.x[i]:.4f}"
+            if column == 1:
+                y = self.y[i]
+                return "Indefinido" if np.isnan(y) else f"{y:.4f}"
+            return POINT_TYPES[self.codes[i]][0]
+
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+
+        if role == Qt.BackgroundRole and column == 2:
+            color = POINT_TYPES[self.codes[i]][1]
+            return color if color is not None else QVariant()
+
+        if role == Qt.ForegroundRole and column == 2 and POINT_TYPES[self.codes[i]][1] is not None:
+            # Texto oscuro sobre los fondos claros, también en el tema oscuro
+            return TYPE_TEXT_COLOR
+
+        if role == Qt.UserRole:
+            return float((self.x, self.y, self.codes)[column][i])
+
+        return QVariant()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        # Columna -1: orden original (por x, tal como se calcularon)
+        self._sort = (column, order) if column >= 0 else None
+        self._rows = self._visible_rows()
+        self.layoutChanged.emit()
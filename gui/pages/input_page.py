@@ -79,6 +79,24 @@ class InputPage(QWidget):
         """
         self.history_widget.add_to_history(entry_data)
     
+    def get_history(self):
+        """
+        Obtiene las entradas del historial.
+        
+        Returns:
+            list: Diccionarios de entrada, el más reciente primero.
+        """
+        return self.history_widget.get_history_items()
+    
+    def set_history(self, items):
+        """
+        Sustituye el historial (por ejemplo, al restaurar una sesión).
+        
+        Args:
+            items (list): Diccionarios de entrada, el más reciente primero.
+        """
+        self.history_widget.set_history_items(items)
+    
     def clear_inputs(self):
         """Limpia los campos de entrada."""
         empty_data = {
@@ -6,14 +6,17 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QIcon
 
-from ..widgets import ResultWidget
+from ..widgets import ResultWidget, ParameterWidget, TaylorWidget, PointEvalWidget
 from ..canvas import MathPlotCanvas
+from ..export_dialog import ExportTableDialog
 
 class ResultsPage(QWidget):
     """Página para mostrar los resultados y gráficas."""
     
     # Señales
     back_requested = pyqtSignal()
+    taylor_requested = pyqtSignal(str, int, bool)
+    evaluation_requested = pyqtSignal(str, int)
     
     def __init__(self, parent=None):
         """Inicializa la página de resultados."""
@@ -24,7 +27,10 @@ class ResultsPage(QWidget):
         self.current_data = {
             'lambda_funcs': None,
             'x_range': (-10, 10),
-            'critical_points': None
+            'critical_points': None,
+            'intervals': None,
+            'parametric': None,
+            'comparison': None
         }
         
         # Layout principal
@@ -61,12 +67,24 @@ class ResultsPage(QWidget):
         # Panel superior: gráficas
         self.plot_canvas = MathPlotCanvas(self, dark_mode=self.dark_mode)
         
-        # Panel inferior: resultados
+        # Panel inferior: parámetros y resultados
+        bottom_panel = QWidget()
+        bottom_layout = QVBoxLayout(bottom_panel)
+        bottom_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.parameter_widget = ParameterWidget()
+        self.taylor_widget = TaylorWidget()
+        self.point_eval_widget = PointEvalWidget()
         self.result_widget = ResultWidget()
         
+        bottom_layout.addWidget(self.parameter_widget)
+        bottom_layout.addWidget(self.taylor_widget)
+        bottom_layout.addWidget(self.point_eval_widget)
+        bottom_layout.addWidget(self.result_widget)
+        
         # Añadir widgets al splitter
         splitter.addWidget(self.plot_canvas)
-        splitter.addWidget(self.result_widget)
+        splitter.addWidget(bottom_panel)
         
         # Establecer proporciones (70% gráficas, 30% resultados)
         splitter.setSizes([700, 300])
@@ -79,8 +97,15 @@ class ResultsPage(QWidget):
         self.theme_btn.clicked.connect(self.toggle_dark_mode)
         self.fullscreen_btn.clicked.connect(self.toggle_fullscreen)
         self.result_widget.export_image_btn.clicked.connect(self.export_image)
+        self.result_widget.export_table_btn.clicked.connect(self.export_table)
+        self.parameter_widget.parameters_changed.connect(self._on_parameters_changed)
+        self.parameter_widget.family_changed.connect(self.replot)
+        self.taylor_widget.taylor_requested.connect(self.taylor_requested)
+        self.taylor_widget.clear_button.clicked.connect(self.clear_taylor)
+        self.point_eval_widget.evaluation_requested.connect(self.evaluation_requested)
+        self.point_eval_widget.clear_button.clicked.connect(self.clear_evaluation)
     
-    def set_results(self, results, lambda_funcs, x_range):
+    def set_results(self, results, lambda_funcs, x_range, parametric=None, comparison=None):
         """
         Establece y muestra los resultados del cálculo.
         
@@ -88,21 +113,110 @@ class ResultsPage(QWidget):
             results (dict): Diccionario con los resultados a mostrar.
             lambda_funcs (dict): Funciones lambda para evaluación numérica.
             x_range (tuple): Rango para el eje X de las gráficas.
+            parametric (ParametricFunctions, optional): Funciones con parámetros libres.
+            comparison (ComparisonCurves, optional): Curvas de varias funciones comparadas.
         """
         # Almacenar datos actuales
         self.current_data['lambda_funcs'] = lambda_funcs
         self.current_data['x_range'] = x_range
+        self.current_data['parametric'] = parametric
+        self.current_data['comparison'] = comparison
         
         if 'critical_points' in results:
             self.current_data['critical_points'] = results['critical_points']
+        self.current_data['intervals'] = results.get('intervals')
+        
+        # Deslizadores para los parámetros libres
+        if parametric is not None:
+            self.parameter_widget.set_parameters(parametric.parameters, parametric.values)
+        else:
+            self.parameter_widget.set_parameters([])
         
         # Mostrar resultados
         self.result_widget.set_results(results)
+        self.taylor_widget.set_polynomial_text("")
+        self.point_eval_widget.set_values_text("")
         
         # Graficar funciones
-        self.plot_canvas.plot_functions(lambda_funcs, x_range, 
-                                       critical_points=self.current_data['critical_points'],
-                                       dark_mode=self.dark_mode)
+        self.replot()
+    
+    def replot(self):
+        """Vuelve a graficar los datos actuales según el modo seleccionado."""
+        comparison = self.current_data['comparison']
+        if comparison is not None:
+            self.plot_canvas.plot_comparison(comparison, self.current_data['x_range'],
+                                             dark_mode=self.dark_mode)
+            return
+        
+        if not self.current_data['lambda_funcs']:
+            return
+        
+        parametric = self.current_data['parametric']
+        family = self.parameter_widget.get_family() if parametric is not None else None
+        
+        if family is not None:
+            name, samples = family
+            self.plot_canvas.plot_family(parametric, self.current_data['x_range'],
+                                         name, samples, dark_mode=self.dark_mode)
+        else:
+            self.plot_canvas.plot_functions(
+                self.current_data['lambda_funcs'],
+                self.current_data['x_range'],
+                critical_points=self.current_data['critical_points'],
+                intervals=self.current_data['intervals'],
+                dark_mode=self.dark_mode
+            )
+    
+    def _on_parameters_changed(self, values):
+        """
+        Vuelve a graficar al mover un deslizador de parámetro.
+        
+        Solo se reevalúan numéricamente las funciones ya compiladas; no se
+        repite ningún cálculo simbólico.
+        
+        Args:
+            values (dict): Nombre del parámetro -> valor.
+        """
+        parametric = self.current_data['parametric']
+        if parametric is None:
+            return
+        
+        self.current_data['lambda_funcs'] = parametric.bind(values)
+        self.replot()
+    
+    def show_taylor(self, point, coefficient_sets, text):
+        """
+        Muestra polinomios de Taylor superpuestos a la función.
+        
+        Args:
+            point (float): Punto de desarrollo.
+            coefficient_sets (list): Lista de (orden, coeficientes numéricos).
+            text (str): Texto del polinomio de mayor orden.
+        """
+        self.taylor_widget.set_polynomial_text(text)
+        self.plot_canvas.plot_taylor(point, coefficient_sets, dark_mode=self.dark_mode)
+    
+    def clear_taylor(self):
+        """Quita los polinomios de Taylor de la gráfica."""
+        self.taylor_widget.set_polynomial_text("")
+        self.plot_canvas.clear_taylor()
+    
+    def show_evaluation(self, point, values, text):
+        """
+        Muestra los valores en un punto y lo marca en las gráficas.
+        
+        Args:
+            point (float): Punto evaluado.
+            values (dict): Nombre de la curva -> valor (float o None).
+            text (str): Texto con los valores.
+        """
+        self.point_eval_widget.set_values_text(text)
+        self.plot_canvas.mark_point(point, values, dark_mode=self.dark_mode)
+    
+    def clear_evaluation(self):
+        """Quita el punto evaluado de las gráficas."""
+        self.point_eval_widget.set_values_text("")
+        self.plot_canvas.clear_point()
     
     def toggle_dark_mode(self):
         """Alterna entre modo claro y oscuro."""
@@ -121,13 +235,7 @@ class ResultsPage(QWidget):
         self.result_widget.set_dark_mode(self.dark_mode)
         
         # Volver a graficar para aplicar estilo
-        if self.current_data['lambda_funcs']:
-            self.plot_canvas.plot_functions(
-                self.current_data['lambda_funcs'],
-                self.current_data['x_range'],
-                critical_points=self.current_data['critical_points'],
-                dark_mode=self.dark_mode
-            )
+        self.replot()
     
     def toggle_fullscreen(self):
         """Alterna entre modo normal y pantalla completa."""
@@ -138,6 +246,21 @@ class ResultsPage(QWidget):
             self.window().showFullScreen()
             self.fullscreen_btn.setText("Restaurar")
     
+    def export_table(self):
+        """Exporta una tabla de valores de las funciones actuales."""
+        if not self.current_data['lambda_funcs']:
+            QMessageBox.information(
+                self,
+                "Exportar Tabla",
+                "La tabla de valores solo está disponible para una única función."
+            )
+            return
+        
+        dialog = ExportTableDialog(self.current_data['lambda_funcs'],
+                                   self.current_data['x_range'],
+                                   self.plot_canvas.sampler, self)
+        dialog.exec_()
+    
     def export_image(self):
         """Exporta la gráfica actual como imagen."""
         # Abrir diálogo para guardar archivo
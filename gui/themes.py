@@ -121,14 +121,14 @@ class Themes:
             background-color: #a0a0a0;
         }
         
-        QListWidget, QTreeWidget, QTableWidget {
+        QListWidget, QTreeWidget, QTableView {
             background-color: white;
             alternate-background-color: #f9f9f9;
             border: 1px solid #cccccc;
             border-radius: 4px;
         }
         
-        QListWidget::item:selected, QTreeWidget::item:selected, QTableWidget::item:selected {
+        QListWidget::item:selected, QTreeWidget::item:selected, QTableView::item:selected {
             background-color: #e0f0ff;
             color: #333333;
         }
@@ -318,7 +318,7 @@ class Themes:
             background-color: #5e5e60;
         }
         
-        QListWidget, QTreeWidget, QTableWidget {
+        QListWidget, QTreeWidget, QTableView {
             background-color: #1e1e1e;
             alternate-background-color: #252526;
             border: 1px solid #3e3e42;
@@ -326,7 +326,7 @@ class Themes:
             color: #e0e0e0;
         }
         
-        QListWidget::item:selected, QTreeWidget::item:selected, QTableWidget::item:selected {
+        QListWidget::item:selected, QTreeWidget::item:selected, QTableView::item:selected {
             background-color: #2d5fb3;
             color: white;
         }
@@ -1,14 +1,19 @@
 """
 Módulo con widgets personalizados para la interfaz de la calculadora.
 """
+import numpy as np
 from PyQt5.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton, QComboBox,
                            QSpinBox, QHBoxLayout, QVBoxLayout, QFormLayout,
                            QGroupBox, QListWidget, QListWidgetItem, QSplitter,
                            QFrame, QFileDialog, QMessageBox, QAction, QMenu,
-                           QTableWidget, QTableWidgetItem, QHeaderView)
+                           QTableView, QHeaderView, QSlider,
+                           QCheckBox, QGridLayout, QApplication)
 from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QIcon, QColor, QPalette
 
+from .mathtext import MathRenderer
+from .models import CriticalPointsModel, TYPE_CODES
+
 class AnimatedWidget(QWidget):
     """Base para widgets con animaciones de aparición/desaparición."""
     
@@ -98,7 +103,8 @@ class FunctionInputWidget(QGroupBox):
         self.calc_button.setMinimumHeight(40)
         
         # Ejemplos de uso
-        self.examples_label = QLabel("Puedes usar: sin(x), cos(x), tan(x), exp(x)/e^x, ln(x), etc.")
+        self.examples_label = QLabel("Puedes usar: sin(x), cos(x), tan(x), exp(x)/e^x, ln(x), abs(x), signo(x), "
+                                     "trozos(x^2, x<0, x), etc.")
         self.examples_label.setStyleSheet("color: #666666;")
         
         # Añadir widgets al layout
@@ -176,6 +182,9 @@ class ResultWidget(AnimatedWidget):
         self.function_result = QLabel("")
         self.derivative_result = QLabel("")
         self.integral_result = QLabel("")
+        self.monotonicity_result = QLabel("")
+        self.concavity_result = QLabel("")
+        self.verification_result = QLabel("")
         
         # Estilo para los resultados
         result_style = """
@@ -188,15 +197,39 @@ class ResultWidget(AnimatedWidget):
         self.function_result.setStyleSheet(result_style)
         self.derivative_result.setStyleSheet(result_style)
         self.integral_result.setStyleSheet(result_style)
+        self.monotonicity_result.setStyleSheet(result_style)
+        self.concavity_result.setStyleSheet(result_style)
+        self.verification_result.setStyleSheet(result_style)
         
         self.function_result.setWordWrap(True)
         self.derivative_result.setWordWrap(True)
         self.integral_result.setWordWrap(True)
+        self.monotonicity_result.setWordWrap(True)
+        self.concavity_result.setWordWrap(True)
+        self.verification_result.setWordWrap(True)
         
         # Añadir etiquetas al layout
         results_layout.addRow("Función f(x):", self.function_result)
         results_layout.addRow("Derivada f'(x):", self.derivative_result)
         results_layout.addRow("Integral:", self.integral_result)
+        results_layout.addRow("Monotonía:", self.monotonicity_result)
+        results_layout.addRow("Concavidad:", self.concavity_result)
+        results_layout.addRow("Verificación:", self.verification_result)
+        
+        # Botón para acciones diferidas sobre la derivada (generar o expandir el texto)
+        self.derivative_text_btn = QPushButton("")
+        self.derivative_text_btn.setVisible(False)
+        self.derivative_text_btn.clicked.connect(self._show_lazy_derivative)
+        self._lazy_derivative = None
+        results_layout.addRow("", self.derivative_text_btn)
+        
+        # Composición tipográfica en segundo plano: etiqueta -> (clave, texto plano)
+        self.renderer = MathRenderer(self)
+        self.renderer.rendered.connect(self._on_formula_rendered)
+        self._typeset = {}
+        self._latex = {}
+        self._plain = {}
+        self.dark_mode = False
         
         # Añadir grupo al layout principal
         layout.addWidget(self.results_group)
@@ -205,9 +238,31 @@ class ResultWidget(AnimatedWidget):
         self.critical_points_group = QGroupBox("Puntos Críticos")
         critical_points_layout = QVBoxLayout(self.critical_points_group)
         
-        self.critical_points_table = QTableWidget(0, 3)
-        self.critical_points_table.setHorizontalHeaderLabels(["Valor x", "Valor f(x)", "Tipo"])
+        # Filtro por tipo de punto
+        filter_layout = QHBoxLayout()
+        self.type_filter_combo = QComboBox()
+        self.type_filter_combo.addItem("Todos", None)
+        self.type_filter_combo.addItem("Mínimos", TYPE_CODES["Mínimo"])
+        self.type_filter_combo.addItem("Máximos", TYPE_CODES["Máximo"])
+        self.type_filter_combo.addItem("Puntos de inflexión", TYPE_CODES["Punto de inflexión"])
+        self.type_filter_combo.addItem("Indeterminados", TYPE_CODES["Indeterminado"])
+        self.type_filter_combo.currentIndexChanged.connect(self._on_type_filter_changed)
+        self.points_count_label = QLabel("")
+        
+        filter_layout.addWidget(QLabel("Mostrar:"))
+        filter_layout.addWidget(self.type_filter_combo)
+        filter_layout.addStretch()
+        filter_layout.addWidget(self.points_count_label)
+        critical_points_layout.addLayout(filter_layout)
+        
+        # Vista sobre un modelo por columnas: solo se formatean las filas visibles
+        self.critical_points_model = CriticalPointsModel(self)
+        self.critical_points_table = QTableView()
+        self.critical_points_table.setModel(self.critical_points_model)
+        self.critical_points_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.critical_points_table.setSortingEnabled(True)
         self.critical_points_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.critical_points_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         
         critical_points_layout.addWidget(self.critical_points_table)
         
@@ -220,7 +275,11 @@ class ResultWidget(AnimatedWidget):
         self.export_image_btn = QPushButton("Guardar Gráfica")
         self.export_image_btn.setIcon(QIcon.fromTheme("document-save"))
         
+        self.export_table_btn = QPushButton("Exportar Tabla")
+        self.export_table_btn.setIcon(QIcon.fromTheme("x-office-spreadsheet"))
+        
         export_layout.addWidget(self.export_image_btn)
+        export_layout.addWidget(self.export_table_btn)
         
         layout.addWidget(self.export_group)
     
@@ -240,7 +299,7 @@ class ResultWidget(AnimatedWidget):
                 color: #e0e0e0;
             """
             table_style = """
-                QTableWidget {
+                QTableView {
                     background-color: #252526;
                     color: #e0e0e0;
                     border: 1px solid #3e3e42;
@@ -260,7 +319,7 @@ class ResultWidget(AnimatedWidget):
                 color: #2c3e50;
             """
             table_style = """
-                QTableWidget {
+                QTableView {
                     background-color: #ffffff;
                     color: #333333;
                     border: 1px solid #cccccc;
@@ -275,7 +334,15 @@ class ResultWidget(AnimatedWidget):
         self.function_result.setStyleSheet(result_style)
         self.derivative_result.setStyleSheet(result_style)
         self.integral_result.setStyleSheet(result_style)
+        self.monotonicity_result.setStyleSheet(result_style)
+        self.concavity_result.setStyleSheet(result_style)
+        self.verification_result.setStyleSheet(result_style)
         self.critical_points_table.setStyleSheet(table_style)
+        
+        # Volver a componer las fórmulas con el color del tema
+        if enable != self.dark_mode:
+            self.dark_mode = enable
+            self._request_formulas()
     
     def set_results(self, results):
         """
@@ -284,6 +351,10 @@ class ResultWidget(AnimatedWidget):
         Args:
             results (dict): Diccionario con los resultados a mostrar.
         """
+        # Quitar las fórmulas anteriores (setText no borra la imagen si el texto no cambia)
+        for label in (self.function_result, self.derivative_result, self.integral_result):
+            label.clear()
+        
         # Actualizar textos
         if 'function' in results:
             self.function_result.setText(results['function'])
@@ -295,21 +366,111 @@ class ResultWidget(AnimatedWidget):
         else:
             self.derivative_result.setText("")
         
+        self._set_lazy_derivative(results.get('derivative_lazy'))
+        
         if 'integral' in results:
             self.integral_result.setText(results['integral'])
         else:
             self.integral_result.setText("")
         
+        # Intervalos de monotonía y concavidad (una línea por tipo)
+        self.monotonicity_result.setText(results.get('monotonicity', ""))
+        self.concavity_result.setText(results.get('concavity', ""))
+        
+        # Comprobación numérica (solo si está activada)
+        self.verification_result.setText(results.get('verification', ""))
+        
+        # Mostrar el texto plano y sustituirlo por la fórmula cuando esté lista
+        self._latex = dict(results.get('latex', {}))
+        self._plain = {}
+        for label in (self.function_result, self.derivative_result, self.integral_result):
+            label.setToolTip("")
+            label.setMinimumHeight(0)
+            self._plain[label] = label.text()
+        self._request_formulas()
+        
         # Actualizar tabla de puntos críticos
         if 'critical_points' in results and results['critical_points']:
             self.update_critical_points(results['critical_points'])
         else:
             # Limpiar tabla
-            self.critical_points_table.setRowCount(0)
+            self.critical_points_model.clear()
+            self._update_points_count()
         
         # Animar la aparición
         self.fade_in()
     
+    def _request_formulas(self):
+        """Solicita la composición de las fórmulas de los resultados actuales."""
+        labels = {
+            'function': self.function_result,
+            'derivative': self.derivative_result,
+            'integral': self.integral_result,
+        }
+        color = '#e0e0e0' if self.dark_mode else '#2c3e50'
+        ratio = self.devicePixelRatioF()
+        self._typeset = {}
+        
+        for name, label in labels.items():
+            latex = self._latex.get(name)
+            if latex is None:
+                continue
+            key, pixmap = self.renderer.request(latex, 110 * ratio, color)
+            self._typeset[label] = (key, self._plain.get(label, ""))
+            if pixmap is not None:
+                self._show_formula(label, pixmap)
+    
+    def _show_formula(self, label, pixmap):
+        """
+        Muestra una fórmula compuesta en lugar del texto plano.
+        
+        Args:
+            label (QLabel): Etiqueta del resultado.
+            pixmap (QPixmap): Imagen de la fórmula.
+        """
+        ratio = self.devicePixelRatioF()
+        pixmap.setDevicePixelRatio(ratio)
+        label.setToolTip(self._typeset[label][1])
+        label.setPixmap(pixmap)
+        # La altura de una etiqueta con ajuste de línea se calcula a partir del texto
+        label.setMinimumHeight(int(pixmap.height() / ratio) + 20)
+    
+    def _on_formula_rendered(self, key, pixmap):
+        """Coloca una fórmula recién compuesta en las etiquetas que la esperan."""
+        for label, (expected, _) in self._typeset.items():
+            if expected == key:
+                self._show_formula(label, pixmap)
+    
+    def _set_lazy_derivative(self, lazy):
+        """
+        Configura el botón de la acción diferida sobre la derivada.
+        
+        Args:
+            lazy (tuple): (etiqueta, función) o None si no hay acción.
+        """
+        self._lazy_derivative = lazy
+        if lazy is not None:
+            self.derivative_text_btn.setText(lazy[0])
+        self.derivative_text_btn.setVisible(lazy is not None)
+    
+    def _show_lazy_derivative(self):
+        """Ejecuta la acción diferida y muestra el nuevo texto de la derivada."""
+        if self._lazy_derivative is None:
+            return
+        
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            text, lazy = self._lazy_derivative[1]()
+            self._typeset.pop(self.derivative_result, None)
+            self.derivative_result.setToolTip("")
+            self.derivative_result.setMinimumHeight(0)
+            self.derivative_result.setText(text)
+            self._set_lazy_derivative(lazy)
+        except Exception as e:
+            self.derivative_result.setText(f"No se pudo obtener la expresión: {str(e)}")
+        finally:
+            QApplication.restoreOverrideCursor()
+    
     def update_critical_points(self, critical_points):
         """
         Actualiza la tabla de puntos críticos.
@@ -317,38 +478,276 @@ class ResultWidget(AnimatedWidget):
         Args:
             critical_points (list): Lista de diccionarios con información de puntos críticos.
         """
-        # Limpiar tabla
-        self.critical_points_table.setRowCount(0)
+        # Un único reinicio del modelo, sea cual sea el número de puntos
+        self.critical_points_model.set_points(critical_points)
+        self._update_points_count()
+    
+    def _on_type_filter_changed(self, index):
+        """Aplica el filtro por tipo seleccionado."""
+        self.critical_points_model.set_type_filter(self.type_filter_combo.itemData(index))
+        self._update_points_count()
+    
+    def _update_points_count(self):
+        """Muestra cuántos puntos hay y cuántos pasan el filtro."""
+        total = len(self.critical_points_model.x)
+        shown = self.critical_points_model.rowCount()
+        if total == shown:
+            self.points_count_label.setText(f"{total} puntos")
+        else:
+            self.points_count_label.setText(f"{shown} de {total} puntos")
+
+
+class ParameterWidget(QGroupBox):
+    """Widget con deslizadores para los parámetros libres de la función."""
+    
+    parameters_changed = pyqtSignal(dict)   # Emite: nombre -> valor
+    family_changed = pyqtSignal()           # Cambio en el modo familia
+    
+    # Rango y resolución de los deslizadores
+    MIN_VALUE = -5.0
+    MAX_VALUE = 5.0
+    STEP = 0.1
+    
+    def __init__(self, parent=None):
+        """Inicializa el widget de parámetros."""
+        super(ParameterWidget, self).__init__("Parámetros", parent)
         
-        # Añadir filas para cada punto crítico
-        for i, point in enumerate(critical_points):
-            self.critical_points_table.insertRow(i)
-            
-            # Crear y configurar celdas
-            x_item = QTableWidgetItem(f"{point['x']:.4f}")
-            x_item.setTextAlignment(Qt.AlignCenter)
+        layout = QVBoxLayout(self)
+        
+        # Rejilla con un deslizador por parámetro
+        self.sliders_layout = QGridLayout()
+        layout.addLayout(self.sliders_layout)
+        
+        # Controles del modo familia
+        family_layout = QHBoxLayout()
+        self.family_check = QCheckBox("Familia de curvas")
+        self.family_param = QComboBox()
+        self.family_count = QSpinBox()
+        self.family_count.setRange(2, 50)
+        self.family_count.setValue(7)
+        family_layout.addWidget(self.family_check)
+        family_layout.addWidget(QLabel("Variar:"))
+        family_layout.addWidget(self.family_param)
+        family_layout.addWidget(QLabel("Curvas:"))
+        family_layout.addWidget(self.family_count)
+        family_layout.addStretch()
+        layout.addLayout(family_layout)
+        
+        self.sliders = {}
+        self.value_labels = {}
+        
+        # Agrupar movimientos rápidos del deslizador en un solo redibujado
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(30)
+        self.update_timer.timeout.connect(self._emit_values)
+        
+        self.family_check.toggled.connect(self.family_changed)
+        self.family_param.currentIndexChanged.connect(self.family_changed)
+        self.family_count.valueChanged.connect(self.family_changed)
+        
+        self.setVisible(False)
+    
+    def set_parameters(self, names, values=None):
+        """
+        Crea los deslizadores para los parámetros indicados.
+        
+        Args:
+            names (list): Nombres de los parámetros.
+            values (dict, optional): Valores iniciales.
+        """
+        values = values or {}
+        
+        # Eliminar los deslizadores anteriores
+        while self.sliders_layout.count():
+            item = self.sliders_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        self.sliders = {}
+        self.value_labels = {}
+        
+        self.family_param.blockSignals(True)
+        self.family_param.clear()
+        self.family_param.addItems(names)
+        self.family_param.blockSignals(False)
+        self.family_check.setChecked(False)
+        
+        for row, name in enumerate(names):
+            slider = QSlider(Qt.Horizontal)
+            slider.setRange(int(round(self.MIN_VALUE / self.STEP)), int(round(self.MAX_VALUE / self.STEP)))
+            slider.setValue(int(round(values.get(name, 1.0) / self.STEP)))
             
-            if point['y'] is not None:
-                y_item = QTableWidgetItem(f"{point['y']:.4f}")
-            else:
-                y_item = QTableWidgetItem("Indefinido")
-            y_item.setTextAlignment(Qt.AlignCenter)
+            value_label = QLabel()
+            value_label.setMinimumWidth(50)
             
-            type_item = QTableWidgetItem(point['type'])
-            type_item.setTextAlignment(Qt.AlignCenter)
+            self.sliders_layout.addWidget(QLabel(f"{name} ="), row, 0)
+            self.sliders_layout.addWidget(slider, row, 1)
+            self.sliders_layout.addWidget(value_label, row, 2)
             
-            # Colorear según el tipo de punto
-            if point['type'] == "Máximo":
-                type_item.setBackground(QColor(255, 200, 200))  # Rojo claro
-            elif point['type'] == "Mínimo":
-                type_item.setBackground(QColor(200, 255, 200))  # Verde claro
-            elif point['type'] == "Punto de inflexión":
-                type_item.setBackground(QColor(200, 200, 255))  # Azul claro
+            self.sliders[name] = slider
+            self.value_labels[name] = value_label
+            self._update_label(name)
             
-            # Añadir celdas a la tabla
-            self.critical_points_table.setItem(i, 0, x_item)
-            self.critical_points_table.setItem(i, 1, y_item)
-            self.critical_points_table.setItem(i, 2, type_item)
+            slider.valueChanged.connect(lambda _, n=name: self._on_slider_moved(n))
+        
+        self.setVisible(bool(names))
+    
+    def _update_label(self, name):
+        """Actualiza la etiqueta con el valor de un parámetro."""
+        self.value_labels[name].setText(f"{self.sliders[name].value() * self.STEP:.1f}")
+    
+    def _on_slider_moved(self, name):
+        """Maneja el movimiento de un deslizador."""
+        self._update_label(name)
+        self.update_timer.start()
+    
+    def _emit_values(self):
+        """Emite los valores actuales de los parámetros."""
+        self.parameters_changed.emit(self.get_values())
+    
+    def get_values(self):
+        """
+        Obtiene los valores actuales de los parámetros.
+        
+        Returns:
+            dict: Nombre del parámetro -> valor.
+        """
+        return {name: slider.value() * self.STEP for name, slider in self.sliders.items()}
+    
+    def get_family(self):
+        """
+        Obtiene la configuración del modo familia.
+        
+        Returns:
+            tuple: (nombre del parámetro, valores) o None si el modo está desactivado.
+        """
+        if not self.family_check.isChecked() or not self.family_param.currentText():
+            return None
+        
+        samples = np.linspace(self.MIN_VALUE, self.MAX_VALUE, self.family_count.value())
+        return self.family_param.currentText(), samples
+
+
+class TaylorWidget(QGroupBox):
+    """Widget para calcular y superponer polinomios de Taylor."""
+    
+    taylor_requested = pyqtSignal(str, int, bool)  # Emite: punto, orden, órdenes intermedios
+    
+    def __init__(self, parent=None):
+        """Inicializa el widget de Taylor."""
+        super(TaylorWidget, self).__init__("Serie de Taylor", parent)
+        
+        layout = QVBoxLayout(self)
+        controls_layout = QHBoxLayout()
+        
+        self.point_input = QLineEdit("0")
+        self.point_input.setMaximumWidth(80)
+        self.order_spin = QSpinBox()
+        self.order_spin.setRange(0, 30)
+        self.order_spin.setValue(3)
+        self.all_orders_check = QCheckBox("Órdenes intermedios")
+        self.calc_button = QPushButton("Superponer")
+        self.clear_button = QPushButton("Quitar")
+        
+        controls_layout.addWidget(QLabel("Punto a:"))
+        controls_layout.addWidget(self.point_input)
+        controls_layout.addWidget(QLabel("Orden N:"))
+        controls_layout.addWidget(self.order_spin)
+        controls_layout.addWidget(self.all_orders_check)
+        controls_layout.addStretch()
+        controls_layout.addWidget(self.calc_button)
+        controls_layout.addWidget(self.clear_button)
+        
+        self.polynomial_label = QLabel("")
+        self.polynomial_label.setWordWrap(True)
+        self.polynomial_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        
+        layout.addLayout(controls_layout)
+        layout.addWidget(self.polynomial_label)
+        
+        # Conectar señales
+        self.calc_button.clicked.connect(self._on_calculate)
+        self.order_spin.valueChanged.connect(self._on_order_changed)
+    
+    def _on_calculate(self):
+        """Emite la petición con los valores actuales."""
+        self.taylor_requested.emit(
+            self.point_input.text().strip() or "0",
+            self.order_spin.value(),
+            self.all_orders_check.isChecked()
+        )
+    
+    def _on_order_changed(self):
+        """Actualiza la superposición al cambiar el orden si ya se mostró."""
+        if self.polynomial_label.text():
+            self._on_calculate()
+    
+    def set_polynomial_text(self, text):
+        """
+        Muestra el polinomio calculado.
+        
+        Args:
+            text (str): Texto del polinomio o mensaje de error.
+        """
+        self.polynomial_label.setText(text)
+
+
+class PointEvalWidget(QGroupBox):
+    """Widget para evaluar f, f' e ∫f en un punto."""
+    
+    evaluation_requested = pyqtSignal(str, int)  # Emite: punto, dígitos
+    
+    def __init__(self, parent=None):
+        """Inicializa el widget de evaluación puntual."""
+        super(PointEvalWidget, self).__init__("Evaluar en un punto", parent)
+        
+        layout = QVBoxLayout(self)
+        controls_layout = QHBoxLayout()
+        
+        self.point_input = QLineEdit("1")
+        self.point_input.setMaximumWidth(120)
+        self.point_input.setPlaceholderText("Ej: 1/3, pi/4")
+        self.digits_spin = QSpinBox()
+        self.digits_spin.setRange(15, 200)
+        self.digits_spin.setValue(30)
+        self.digits_spin.setSuffix(" dígitos")
+        self.digits_spin.setToolTip("Precisión usada si la evaluación en coma flotante pierde dígitos")
+        self.eval_button = QPushButton("Evaluar")
+        self.clear_button = QPushButton("Quitar")
+        
+        controls_layout.addWidget(QLabel("Punto x:"))
+        controls_layout.addWidget(self.point_input)
+        controls_layout.addWidget(QLabel("Precisión:"))
+        controls_layout.addWidget(self.digits_spin)
+        controls_layout.addStretch()
+        controls_layout.addWidget(self.eval_button)
+        controls_layout.addWidget(self.clear_button)
+        
+        self.values_label = QLabel("")
+        self.values_label.setWordWrap(True)
+        self.values_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        
+        layout.addLayout(controls_layout)
+        layout.addWidget(self.values_label)
+        
+        # Conectar señales
+        self.eval_button.clicked.connect(self._on_evaluate)
+        self.point_input.returnPressed.connect(self._on_evaluate)
+    
+    def _on_evaluate(self):
+        """Emite la petición con los valores actuales."""
+        point = self.point_input.text().strip()
+        if point:
+            self.evaluation_requested.emit(point, self.digits_spin.value())
+    
+    def set_values_text(self, text):
+        """
+        Muestra los valores calculados.
+        
+        Args:
+            text (str): Valores en el punto o mensaje de error.
+        """
+        self.values_label.setText(text)
 
 
 class HistoryWidget(QGroupBox):
@@ -434,4 +833,17 @@ class HistoryWidget(QGroupBox):
             item = self.history_list.item(i)
             items.append(item.data(Qt.UserRole))
         
-        return items
\ No newline at end of file
+        return items
+    
+    def set_history_items(self, items):
+        """
+        Sustituye el historial por una lista de entradas.
+        
+        Args:
+            items (list): Diccionarios de entrada, el más reciente primero.
+        """
+        self.history_list.setUpdatesEnabled(False)
+        self.history_list.clear()
+        for entry in reversed(items):
+            self.add_to_history(entry)
+        self.history_list.setUpdatesEnabled(True)
\ No newline at end of file
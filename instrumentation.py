@@ -0,0 +1,249 @@
+"""
+Módulo de instrumentación para medir las etapas del cálculo.
+Registra tiempo de pared, tiempo de CPU y tamaño de la expresión (count_ops)
+de cada etapa en un búfer circular en memoria que puede exportarse, y permite
+perfilar un cálculo completo con cProfile o tracemalloc.
+"""
+import os
+import csv
+import json
+import time
+import cProfile
+import tempfile
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import sympy as sp
+
+# Métodos de MathHelper que se instrumentan y el nombre de su etapa
+HELPER_STAGES = {
+    'set_function': 'análisis',
+    'calculate_derivative': 'derivada',
+    'calculate_integral': 'integral',
+    'find_critical_points': 'puntos críticos',
+    'analyze_intervals': 'intervalos',
+    'evaluate_at': 'evaluación puntual',
+    'get_suitable_range': 'rango',
+    'create_lambda_functions': 'lambdify',
+    'create_parametric_functions': 'lambdify',
+    'create_derivative_evaluator': 'diferenciación automática',
+    'compact_derivative': 'subexpresiones',
+    'format_expression': 'formato',
+}
+
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+
+
+class Instrumentation:
+    """
+    Registro de tiempos por etapa con búfer circular y perfilado opcional.
+    """
+
+    def __init__(self, capacity=1000):
+        """
+        Inicializa el registro.
+
+        Args:
+            capacity (int): Número máximo de registros que se conservan.
+        """
+        self.records = deque(maxlen=capacity)
+        self.calculation_id = 0
+        self.current_label = ''
+        self.last_profile_path = None
+
+    def begin_calculation(self, label=''):
+        """
+        Marca el inicio de un nuevo cálculo para agrupar sus etapas.
+
+        Args:
+            label (str): Descripción del cálculo (por ejemplo, la función).
+
+        Returns:
+            int: Identificador del cálculo.
+        """
+        self.calculation_id += 1
+        self.current_label = label
+        return self.calculation_id
+
+    @contextmanager
+    def stage(self, name, expr=None):
+        """
+        Mide una etapa del cálculo.
+
+        El diccionario devuelto permite asignar ``record['expr']`` dentro del
+        bloque para registrar el tamaño de la expresión resultante.
+
+        Args:
+            name (str): Nombre de la etapa.
+            expr (sympy.Expr, optional): Expresión cuyo tamaño se registra.
+
+        Yields:
+            dict: Registro de la etapa.
+        """
+        record = {'expr': expr}
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        ok = False
+        try:
+            yield record
+            ok = True
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self._store(name, wall, cpu, record.get('expr'), ok)
+
+    def _store(self, name, wall, cpu, expr, ok):
+        """Añade un registro al búfer circular."""
+        ops = None
+        if isinstance(expr, sp.Basic):
+            try:
+                ops = int(sp.count_ops(expr))
+            except Exception:
+                ops = None
+
+        self.records.append({
+            'calculation': self.calculation_id,
+            'label': self.current_label,
+            'stage': name,
+            'wall_ms': wall * 1000.0,
+            'cpu_ms': cpu * 1000.0,
+            'ops': ops,
+            'ok': ok,
+            'timestamp': time.time(),
+        })
+
+    def instrument_helper(self, helper):
+        """
+        Envuelve los métodos de un MathHelper para medir cada llamada.
+
+        Args:
+            helper (MathHelper): Instancia a instrumentar.
+        """
+        for method_name, stage_name in HELPER_STAGES.items():
+            method = getattr(helper, method_name)
+            setattr(helper, method_name, self._wrap(method, stage_name))
+
+    def _wrap(self, method, stage_name):
+        """Crea la versión medida de un método."""
+        @wraps(method)
+        def instrumented(*args, **kwargs):
+            with self.stage(stage_name) as record:
+                result = method(*args, **kwargs)
+                record['expr'] = result
+                return result
+        return instrumented
+
+    def last_calculation(self):
+        """
+        Obtiene los registros del último cálculo.
+
+        Returns:
+            list: Registros del cálculo más reciente.
+        """
+        return [r for r in self.records if r['calculation'] == self.calculation_id]
+
+    def summary_text(self):
+        """
+        Resume el último cálculo en una línea para la barra de estado.
+
+        Returns:
+            str: Texto con el tiempo por etapa.
+        """
+        records = self.last_calculation()
+        if not records:
+            return ""
+
+        # Agrupar por etapa (una etapa puede ejecutarse varias veces)
+        totals = {}
+        for r in records:
+            wall, cpu, ops = totals.get(r['stage'], (0.0, 0.0, None))
+            totals[r['stage']] = (wall + r['wall_ms'], cpu + r['cpu_ms'], r['ops'] if r['ops'] is not None else ops)
+
+        total = totals.pop('total', None)
+
+        parts = []
+        for stage, (wall, cpu, ops) in totals.items():
+            text = f"{stage} {wall:.0f} ms"
+            if ops is not None:
+                text += f" ({ops} ops)"
+            parts.append(text)
+
+        summary = " · ".join(parts)
+        if total is not None:
+            summary = f"Total {total[0]:.0f} ms (CPU {total[1]:.0f} ms) | {summary}"
+        return summary
+
+    def export(self, filename):
+        """
+        Exporta el búfer a JSON o CSV según la extensión del archivo.
+
+        Args:
+            filename (str): Ruta del archivo de salida.
+
+        Returns:
+            bool: True si se exportó correctamente, False en caso contrario.
+        """
+        records = list(self.records)
+        try:
+            if filename.lower().endswith('.csv'):
+                fields = ['calculation', 'label', 'stage', 'wall_ms', 'cpu_ms', 'ops', 'ok', 'timestamp']
+                with open(filename, 'w', newline='', encoding='utf-8') as fh:
+                    writer = csv.DictWriter(fh, fieldnames=fields)
+                    writer.writeheader()
+                    writer.writerows(records)
+            else:
+                with open(filename, 'w', encoding='utf-8') as fh:
+                    json.dump(records, fh, indent=2, ensure_ascii=False)
+            return True
+        except Exception as e:
+            print(f"Error al exportar métricas: {str(e)}")
+            return False
+
+    @contextmanager
+    def profile(self, mode, directory=None):
+        """
+        Perfila el bloque con cProfile o tracemalloc y guarda el resultado.
+
+        Args:
+            mode (str): 'cprofile', 'tracemalloc' o None para no perfilar.
+            directory (str, optional): Directorio de salida (temporal por defecto).
+
+        Yields:
+            None
+        """
+        if mode not in PROFILE_MODES:
+            yield
+            return
+
+        directory = directory or tempfile.gettempdir()
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+
+        if mode == 'cprofile':
+            path = os.path.join(directory, f"calcderivadas-{stamp}.prof")
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                profiler.dump_stats(path)
+                self.last_profile_path = path
+        else:
+            path = os.path.join(directory, f"calcderivadas-{stamp}-memoria.txt")
+            already_tracing = tracemalloc.is_tracing()
+            if not already_tracing:
+                tracemalloc.start(25)
+            try:
+                yield
+            finally:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                if not already_tracing:
+                    tracemalloc.stop()
+                with open(path, 'w', encoding='utf-8') as fh:
+                    fh.write(f"Memoria actual: {current / 1024:.1f} KiB, pico: {peak / 1024:.1f} KiB\n\n")
+                    for stat in snapshot.statistics('lineno')[:50]:
+                        fh.write(f"{stat}\n")
+                self.last_profile_path = path
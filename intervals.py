@@ -0,0 +1,232 @@
+"""
+Intervalos de monotonía y concavidad por análisis de signo numérico.
+En lugar de resolver desigualdades simbólicas (lento y a menudo imposible),
+se evalúan f' y f'' compiladas sobre una malla, se localizan de forma
+vectorizada los cambios de signo y cada cambio se refina con una bisección
+que avanza a la vez sobre todos los intervalos que lo encierran.
+"""
+import numpy as np
+
+# Número de muestras de la malla (impar, para que el centro del rango se muestree)
+INTERVAL_SAMPLES = 4001
+
+# Iteraciones máximas de la bisección (suficientes para la precisión de float64)
+BISECTION_ITERATIONS = 60
+
+# Valores por debajo de esta fracción del máximo se consideran cero
+ZERO_TOLERANCE = 1e-12
+
+# Código de signo de los puntos donde la función no está definida
+UNDEFINED = 2
+
+MONOTONICITY_TYPES = {1: "Creciente", -1: "Decreciente", 0: "Constante"}
+CONCAVITY_TYPES = {1: "Cóncava hacia arriba", -1: "Cóncava hacia abajo", 0: "Lineal"}
+
+
+def evaluate_pointwise(func, values, dtype=float):
+    """
+    Evalúa punto a punto una función que no acepta arreglos.
+
+    Args:
+        func (callable): Función numérica de un escalar.
+        values (numpy.ndarray): Argumentos.
+        dtype (type): float o complex.
+
+    Returns:
+        numpy.ndarray: Valores (NaN donde la evaluación falla).
+    """
+    result = np.empty(np.shape(values), dtype=dtype)
+    flat = result.reshape(-1)
+    for i, value in enumerate(np.asarray(values).reshape(-1).tolist()):
+        try:
+            flat[i] = dtype(func(value))
+        except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+            flat[i] = np.nan
+    return result
+
+
+def evaluate(func, x_vals, fallback=False):
+    """
+    Evalúa una función numérica sobre la malla, sin avisos de NumPy.
+
+    Los valores complejos con parte imaginaria no nula y los no finitos se
+    devuelven como NaN.
+
+    Args:
+        func (callable): Función numérica de x.
+        x_vals (numpy.ndarray): Valores de x.
+        fallback (bool): Si es True y la función no se puede evaluar sobre
+            el arreglo completo, se evalúa punto a punto.
+
+    Returns:
+        numpy.ndarray: Valores reales de la función (NaN donde no está definida).
+    """
+    with np.errstate(all='ignore'):
+        try:
+            y = np.asarray(func(x_vals))
+        except Exception:
+            if not fallback:
+                raise
+            y = evaluate_pointwise(func, x_vals, complex)
+        if np.iscomplexobj(y):
+            y = np.where(y.imag == 0, y.real, np.nan)
+        y = np.array(np.broadcast_to(y.astype(float), np.shape(x_vals)))
+    y[~np.isfinite(y)] = np.nan
+    return y
+
+
+def sign_codes(values):
+    """
+    Clasifica cada muestra según su signo.
+
+    Args:
+        values (numpy.ndarray): Valores de la función (NaN donde no está definida).
+
+    Returns:
+        numpy.ndarray: Códigos -1, 0, 1 o UNDEFINED (int8).
+    """
+    finite = np.isfinite(values)
+    codes = np.full(values.shape, UNDEFINED, dtype=np.int8)
+    if finite.any():
+        defined = values[finite]
+        scale = np.max(np.abs(defined))
+        codes[finite] = np.where(np.abs(defined) <= ZERO_TOLERANCE * scale, 0, np.sign(defined))
+    return codes
+
+
+def refine_roots(func, a, b, iterations=BISECTION_ITERATIONS):
+    """
+    Refina a la vez varios cambios de signo por bisección vectorizada.
+
+    Args:
+        func (callable): Función numérica de x.
+        a (numpy.ndarray): Extremos izquierdos (f(a) y f(b) de signo opuesto).
+        b (numpy.ndarray): Extremos derechos.
+        iterations (int): Número máximo de iteraciones.
+
+    Returns:
+        tuple: (raíces, es_cero); es_cero es False donde el cambio de signo
+            se debe a una discontinuidad (|f| crece al acercarse) y no a un cero.
+    """
+    a = np.array(a, dtype=float)
+    b = np.array(b, dtype=float)
+    fa = evaluate(func, a)
+    fb = evaluate(func, b)
+    sign_a = np.sign(fa)
+
+    for _ in range(iterations):
+        middle = 0.5 * (a + b)
+        if np.all(middle == a) or np.all(middle == b):
+            break
+        same = np.sign(evaluate(func, middle)) == sign_a
+        a = np.where(same, middle, a)
+        b = np.where(same, b, middle)
+
+    roots = 0.5 * (a + b)
+    residual = np.abs(evaluate(func, roots))
+    # En un cero |f| disminuye; en un polo o salto no baja de los extremos
+    is_zero = np.isfinite(residual) & (residual <= np.minimum(np.abs(fa), np.abs(fb)))
+    return roots, is_zero
+
+
+def sign_intervals(func, x_range, samples=INTERVAL_SAMPLES):
+    """
+    Divide un rango en tramos de signo constante de una función.
+
+    Args:
+        func (callable): Función numérica de x.
+        x_range (tuple): Rango (x_min, x_max).
+        samples (int): Número de muestras de la malla.
+
+    Returns:
+        tuple: (tramos, cambios). Cada tramo es un diccionario con 'start',
+            'end' y 'sign' (-1, 0 o 1); los puntos donde la función no está
+            definida quedan fuera de los tramos. 'cambios' contiene las x
+            donde la función se anula cambiando de signo.
+    """
+    x_vals = np.linspace(x_range[0], x_range[1], samples)
+    codes = sign_codes(evaluate(func, x_vals))
+
+    # Refinar a la vez todos los cambios directos de signo (+ a - o - a +)
+    crossing = np.flatnonzero(codes[:-1] * codes[1:] == -1)
+    roots, is_zero = refine_roots(func, x_vals[crossing], x_vals[crossing + 1])
+    refined = dict(zip(crossing.tolist(), zip(roots.tolist(), is_zero.tolist())))
+
+    # Tramos de código constante
+    change = np.flatnonzero(codes[1:] != codes[:-1])
+    starts = np.concatenate(([0], change + 1))
+    ends = np.concatenate((change, [samples - 1]))
+
+    segments = []
+    sign_changes = []
+    last = None       # último tramo, si es contiguo al actual
+    joint = None      # unión ya conocida (cero exacto en una muestra aislada)
+    for s, e in zip(starts.tolist(), ends.tolist()):
+        code = int(codes[s])
+        if code == UNDEFINED:
+            last, joint = None, None
+            continue
+
+        # Un cero aislado entre dos tramos definidos es solo el punto de unión
+        if code == 0 and s == e and last is not None and e + 1 < samples \
+                and codes[e + 1] != UNDEFINED:
+            joint = (float(x_vals[s]), True)
+            continue
+
+        start, end = float(x_vals[s]), float(x_vals[e])
+        if last is not None:
+            if joint is None:
+                if s - 1 in refined:
+                    joint = refined[s - 1]
+                elif code == 0:
+                    joint = (start, False)
+                else:
+                    joint = (float(x_vals[s - 1]), False)
+            x_joint, is_root = joint
+            joint = None
+
+            if last['sign'] == code:
+                last['end'] = end
+                continue
+            if is_root and last['sign'] * code == -1:
+                sign_changes.append(x_joint)
+            last['end'] = x_joint
+            start = x_joint
+
+        last = {'start': start, 'end': end, 'sign': code}
+        segments.append(last)
+
+    # Los ceros en un extremo del rango no forman un tramo
+    segments = [seg for seg in segments if seg['end'] > seg['start']]
+    return segments, sign_changes
+
+
+def analyze_intervals(first_derivative, second_derivative, x_range, samples=INTERVAL_SAMPLES):
+    """
+    Calcula los intervalos de monotonía y concavidad de f en un rango.
+
+    Args:
+        first_derivative (callable): f' compilada.
+        second_derivative (callable): f'' compilada.
+        x_range (tuple): Rango (x_min, x_max).
+        samples (int): Número de muestras de la malla.
+
+    Returns:
+        dict: 'monotonicity' y 'concavity' (listas de diccionarios con
+            'start', 'end' y 'type') e 'inflection_points' (x donde f''
+            cambia de signo).
+    """
+    monotonicity, _ = sign_intervals(first_derivative, x_range, samples)
+    concavity, inflection_points = sign_intervals(second_derivative, x_range, samples)
+
+    return {
+        'monotonicity': [
+            {'start': s['start'], 'end': s['end'], 'type': MONOTONICITY_TYPES[s['sign']]}
+            for s in monotonicity
+        ],
+        'concavity': [
+            {'start': s['start'], 'end': s['end'], 'type': CONCAVITY_TYPES[s['sign']]}
+            for s in concavity
+        ],
+        'inflection_points': inflection_points,
+    }
@@ -7,6 +7,226 @@ import numpy as np
 import re
 from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
 
+from parameters import ParametricFunctions
+from expression_store import ExpressionStore
+from taylor import DerivativeTower, taylor_polynomial
+from autodiff import TaylorEvaluator, DerivativeFunction
+from compact import CompactExpression, is_large
+from intervals import analyze_intervals
+from point_eval import PointEvaluator, DEFAULT_DIGITS
+from printer import spanish_str, spanish_latex
+from verification import (check_derivative, check_antiderivative, check_definite_integral,
+                          VERIFY_POINTS)
+from piecewise import (trozos, has_piecewise, real_variable, restore_variable, real_diff,
+                       solve_branches, breakpoints, breakpoint_extrema, SIGN_FUNCTIONS)
+
+# Nombres de funciones en notación española -> nombres de SymPy
+SPANISH_FUNCTIONS = {
+    'sen': 'sin',
+    'tg': 'tan',
+    'arctg': 'atan',
+    'arcsen': 'asin',
+    'arccos': 'acos',
+    'cotg': 'cot',
+    'cosec': 'csc',
+    'signo': 'sign',
+    'ln': 'log'
+}
+SPANISH_FUNCTIONS_RE = re.compile(
+    r'(?<![a-zA-Z])(' + '|'.join(sorted(SPANISH_FUNCTIONS, key=len, reverse=True)) + ')'
+)
+
+# A partir de este orden la derivada se grafica con diferenciación automática
+# y su expresión simbólica solo se construye cuando se necesita el texto
+AD_ORDER_THRESHOLD = 5
+
+# Transformaciones del parser (multiplicación implícita: 2x, x(x+1), ...)
+TRANSFORMATIONS = standard_transformations + (implicit_multiplication_application,)
+
+# Nombres con significado fijo (la constante de Euler no es un parámetro)
+# y funciones propias de la entrada
+LOCAL_NAMES = {'e': sp.E, 'trozos': trozos}
+
+def preprocess_function(func_str):
+    """
+    Convierte una cadena de función en una forma que SymPy pueda interpretar.
+    
+    Args:
+        func_str (str): Cadena de texto con la función matemática.
+        
+    Returns:
+        str: Cadena de texto procesada para ser usada por SymPy.
+    """
+    # Reemplazar notación amigable con notación de SymPy
+    func_str = func_str.replace("^", "**")
+    
+    # Reemplazar casos como 2x con 2*x
+    func_str = re.sub(r'([0-9])([a-zA-Z])', r'\1*\2', func_str)
+    func_str = re.sub(r'(\))([a-zA-Z])', r'\1*\2', func_str)
+    
+    # Reemplazar funciones en notación española en una sola pasada; la
+    # alternativa más larga gana (arcsen antes que sen, cotg antes que tg)
+    func_str = SPANISH_FUNCTIONS_RE.sub(lambda m: SPANISH_FUNCTIONS[m.group(1)], func_str)
+    
+    return func_str
+
+def parse_expression(func_str, local_names=None, transformations=TRANSFORMATIONS):
+    """
+    Interpreta una función escrita por el usuario.
+    
+    Args:
+        func_str (str): Cadena de texto con la función matemática.
+        local_names (dict, optional): Nombres con significado fijo (por defecto LOCAL_NAMES).
+        transformations (tuple): Transformaciones del parser.
+        
+    Returns:
+        sympy.Expr: Expresión de la función.
+        
+    Raises:
+        Exception: Si la cadena no es una expresión válida.
+    """
+    if local_names is None:
+        local_names = LOCAL_NAMES
+    parsed_func = preprocess_function(func_str)
+    
+    # Intentar convertir a expresión SymPy usando parse_expr para mayor robustez
+    try:
+        return parse_expr(parsed_func, local_dict=dict(local_names),
+                          transformations=transformations)
+    except:
+        # Si falla, intentar el método tradicional
+        return sp.sympify(parsed_func, locals=dict(local_names))
+
+def free_parameters(expr, x_symbol):
+    """
+    Obtiene los parámetros libres de una expresión.
+    
+    Args:
+        expr (sympy.Expr): Expresión.
+        x_symbol (sympy.Symbol): Variable independiente.
+        
+    Returns:
+        list: Símbolos distintos de x, ordenados por nombre.
+    """
+    return sorted((s for s in expr.free_symbols if s != x_symbol), key=lambda s: s.name)
+
+def differentiate(expr, x_symbol, order=1, simplify=True):
+    """
+    Calcula la derivada de una expresión.
+    
+    Args:
+        expr (sympy.Expr): Expresión.
+        x_symbol (sympy.Symbol): Variable de derivación.
+        order (int): Orden de la derivada.
+        simplify (bool): Si es True, simplifica las derivadas que no son grandes.
+        
+    Returns:
+        sympy.Expr: Derivada.
+    """
+    derivative = real_diff(expr, x_symbol, order)
+    
+    # Intentar simplificar la expresión; en árboles grandes simplify domina
+    # el tiempo, y se guardan en forma compacta (ver compact_derivative);
+    # con sign o Abs la alargaría
+    if simplify and not is_large(derivative) and not derivative.has(*SIGN_FUNCTIONS):
+        derivative = sp.simplify(derivative)
+    return derivative
+
+def integrate(expr, x_symbol, lower=None, upper=None):
+    """
+    Calcula la integral de una expresión.
+    
+    Args:
+        expr (sympy.Expr): Expresión.
+        x_symbol (sympy.Symbol): Variable de integración.
+        lower (float, optional): Límite inferior (integral definida si se dan ambos).
+        upper (float, optional): Límite superior.
+        
+    Returns:
+        sympy.Expr: Integral indefinida o valor de la definida.
+    """
+    variable = x_symbol
+    if has_piecewise(expr):
+        # Sobre la recta real, abs y sign tienen primitiva a trozos
+        expr, variable = real_variable(expr, x_symbol)
+    if lower is not None and upper is not None:
+        result = sp.integrate(expr, (variable, lower, upper))
+    else:
+        result = sp.integrate(expr, variable)
+    return restore_variable(result, variable, x_symbol)
+
+def critical_points_of(expr, x_symbol, first_derivative=None):
+    """
+    Encuentra y clasifica los puntos críticos reales de una expresión.
+    
+    Args:
+        expr (sympy.Expr): Expresión.
+        x_symbol (sympy.Symbol): Variable independiente.
+        first_derivative (sympy.Expr, optional): f' ya calculada.
+        
+    Returns:
+        list: Diccionarios {'x', 'y', 'type'} ordenados por x.
+        
+    Raises:
+        Exception: Si no se puede resolver f'(x) = 0.
+    """
+    critical_points = []
+    
+    if has_piecewise(expr):
+        # Sobre la recta real y rama a rama (solve no trata sign ni Abs);
+        # los puntos de corte se clasifican aparte, con ambos lados
+        expr, x_symbol = real_variable(expr, x_symbol)
+        second_derivative = sp.diff(expr, x_symbol, 2)
+        points = breakpoints(expr, x_symbol)
+        critical_points.extend(breakpoint_extrema(expr, x_symbol, points))
+        cuts = {float(point) for point in points}
+        solutions = [s for s in solve_branches(sp.diff(expr, x_symbol), x_symbol)
+                     if not (s.is_Number and float(s) in cuts)]
+    else:
+        if first_derivative is None:
+            first_derivative = sp.diff(expr, x_symbol)
+        
+        # Calcular la segunda derivada para clasificar los puntos
+        second_derivative = sp.diff(expr, x_symbol, 2)
+        
+        # Resolver f'(x) = 0
+        solutions = sp.solve(first_derivative, x_symbol)
+    
+    for solution in solutions:
+        # Verificar que la solución es real
+        if isinstance(solution, sp.Number) and solution.is_real:
+            x_val = float(solution)
+            
+            # Evaluar la segunda derivada en el punto crítico
+            try:
+                second_deriv_val = float(second_derivative.subs(x_symbol, solution))
+                
+                # Clasificar el punto crítico
+                if second_deriv_val > 0:
+                    point_type = "Mínimo"
+                elif second_deriv_val < 0:
+                    point_type = "Máximo"
+                else:
+                    point_type = "Punto de inflexión"
+            except:
+                point_type = "Indeterminado"
+            
+            # Evaluar la función en el punto
+            try:
+                y_val = float(expr.subs(x_symbol, solution))
+            except:
+                y_val = None
+            
+            critical_points.append({
+                'x': x_val,
+                'y': y_val,
+                'type': point_type
+            })
+    
+    # Ordenar los puntos por valor de x
+    critical_points.sort(key=lambda p: p['x'])
+    return critical_points
+
 class MathHelper:
     """
     Clase para realizar operaciones matemáticas simbólicas y numéricas.
@@ -22,11 +242,27 @@ class MathHelper:
             'derivative': None,
             'integral': None,
             'order': 1,
-            'critical_points': None
+            'critical_points': None,
+            'parameters': [],
+            'handle': None
         }
         
+        # Almacén compartido de expresiones y resultados
+        self.store = ExpressionStore()
+        
         # Configuración del parser para manejar expresiones más complejas
-        self.transformations = standard_transformations + (implicit_multiplication_application,)
+        self.transformations = TRANSFORMATIONS
+        
+        # Nombres con significado fijo (la constante de Euler no es un parámetro)
+        self.local_names = dict(LOCAL_NAMES)
+        
+        # Longitud máxima del texto de una expresión mostrada al usuario
+        self.max_display_length = 20000
+        
+        # Función que calcula las derivadas simbólicas (expr, x, orden); None
+        # para ``differentiate``. Con el proceso aislado, la interfaz usa
+        # sandbox.differentiate_sandboxed
+        self.differentiator = None
     
     def parse_function(self, func_str):
         """
@@ -38,30 +274,7 @@ class MathHelper:
         Returns:
             str: Cadena de texto procesada para ser usada por SymPy.
         """
-        # Reemplazar notación amigable con notación de SymPy
-        func_str = func_str.replace("^", "**")
-        
-        # Reemplazar casos como 2x con 2*x
-        func_str = re.sub(r'([0-9])([a-zA-Z])', r'\1*\2', func_str)
-        func_str = re.sub(r'(\))([a-zA-Z])', r'\1*\2', func_str)
-        
-        # Reemplazar funciones trigonométricas
-        replacements = {
-            'sen': 'sin',
-            'tg': 'tan',
-            'arctg': 'atan',
-            'arcsen': 'asin',
-            'arccos': 'acos',
-            'cotg': 'cot',
-            'sec': 'sec',
-            'cosec': 'csc',
-            'ln': 'log'
-        }
-        
-        for old, new in replacements.items():
-            func_str = func_str.replace(old, new)
-        
-        return func_str
+        return preprocess_function(func_str)
     
     def set_function(self, func_str):
         """
@@ -74,17 +287,15 @@ class MathHelper:
             bool: True si la función se estableció correctamente, False en caso contrario.
         """
         try:
-            # Parsear la función
-            parsed_func = self.parse_function(func_str)
+            expr = parse_expression(func_str, self.local_names, self.transformations)
             
-            # Intentar convertir a expresión SymPy usando parse_expr para mayor robustez
-            try:
-                expr = parse_expr(parsed_func, transformations=self.transformations)
-            except:
-                # Si falla, intentar el método tradicional
-                expr = sp.sympify(parsed_func)
+            # Guardar la expresión una sola vez por estructura
+            handle = self.store.handle(expr)
+            self.current['handle'] = handle
+            self.current['function'] = handle.expr
             
-            self.current['function'] = expr
+            # Cualquier símbolo distinto de x es un parámetro libre
+            self.current['parameters'] = free_parameters(expr, self.x_symbol)
             
             # Limpiar derivadas y puntos críticos previos
             self.current['derivative'] = None
@@ -96,6 +307,35 @@ class MathHelper:
             print(f"Error al establecer la función: {str(e)}")
             return False
     
+    def _recall(self, name):
+        """
+        Recupera un resultado guardado para la función actual.
+        
+        Args:
+            name (tuple): Nombre del resultado en el almacén.
+            
+        Returns:
+            El resultado guardado o None.
+        """
+        if self.current['handle'] is None:
+            return None
+        return self.store.recall(self.current['handle'], name)
+    
+    def _remember(self, name, value):
+        """
+        Guarda un resultado de la función actual en el almacén.
+        
+        Args:
+            name (tuple): Nombre del resultado en el almacén.
+            value: Resultado a guardar.
+            
+        Returns:
+            El valor guardado (internado si es una expresión).
+        """
+        if self.current['handle'] is None:
+            return value
+        return self.store.remember(self.current['handle'], name, value)
+    
     def calculate_derivative(self, order=1):
         """
         Calcula la derivada de la función actual.
@@ -112,17 +352,51 @@ class MathHelper:
         self.current['order'] = order
         
         try:
-            # Calcular la derivada
-            self.current['derivative'] = sp.diff(self.current['function'], self.x_symbol, order)
-            
-            # Intentar simplificar la expresión
-            self.current['derivative'] = sp.simplify(self.current['derivative'])
-            
+            self.current['derivative'] = self.derivative_of(self.current['handle'], order)
             return self.current['derivative']
         except Exception as e:
             print(f"Error al calcular la derivada: {str(e)}")
             raise
     
+    def derivative_of(self, handle, order):
+        """
+        Calcula (o recupera del almacén) la derivada de una expresión guardada.
+        
+        Args:
+            handle (ExprHandle): Expresión de origen.
+            order (int): Orden de la derivada.
+            
+        Returns:
+            sympy.Expr: Derivada simplificada.
+        """
+        # Reutilizar la derivada si ya se calculó para esta expresión
+        cached = self.store.recall(handle, ('derivative', order))
+        if cached is not None:
+            return cached
+        
+        derivative = (self.differentiator or differentiate)(handle.expr, self.x_symbol, order)
+        
+        return self.store.remember(handle, ('derivative', order), derivative)
+    
+    def compact_derivative(self, handle, order):
+        """
+        Obtiene la forma compacta (subexpresiones comunes) de una derivada grande.
+        
+        Args:
+            handle (ExprHandle): Expresión de origen.
+            order (int): Orden de la derivada.
+            
+        Returns:
+            CompactExpression: Forma compacta, o None si la derivada es pequeña.
+        """
+        compact = self.store.recall(handle, ('derivative_compact', order))
+        if compact is None:
+            derivative = self.derivative_of(handle, order)
+            # False indica que ya se comprobó y no hace falta compactar
+            compact = CompactExpression(derivative) if is_large(derivative) else False
+            self.store.remember(handle, ('derivative_compact', order), compact)
+        return compact or None
+    
     def calculate_integral(self, definite=False, lower=None, upper=None):
         """
         Calcula la integral de la función actual.
@@ -138,12 +412,23 @@ class MathHelper:
         if self.current['function'] is None:
             raise ValueError("No hay función establecida")
         
+        if definite and lower is not None and upper is not None:
+            key = ('integral', lower, upper)
+        else:
+            key = ('integral',)
+        
+        cached = self._recall(key)
+        if cached is not None:
+            self.current['integral'] = cached
+            return cached
+        
         try:
             if definite and lower is not None and upper is not None:
-                self.current['integral'] = sp.integrate(self.current['function'], (self.x_symbol, lower, upper))
+                integral = integrate(self.current['function'], self.x_symbol, lower, upper)
             else:
-                self.current['integral'] = sp.integrate(self.current['function'], self.x_symbol)
+                integral = integrate(self.current['function'], self.x_symbol)
             
+            self.current['integral'] = self._remember(key, integral)
             return self.current['integral']
         except Exception as e:
             print(f"Error al calcular la integral: {str(e)}")
@@ -159,103 +444,348 @@ class MathHelper:
         if self.current['function'] is None:
             raise ValueError("No hay función establecida")
         
-        if self.current['derivative'] is None:
-            self.calculate_derivative()
-        
         # Si ya hemos calculado los puntos críticos, devolverlos
         if self.current['critical_points'] is not None:
             return self.current['critical_points']
         
+        cache_key = ('critical_points',)
+        cached = self._recall(cache_key)
+        if cached is not None:
+            self.current['critical_points'] = cached
+            return cached
+        
         try:
-            # Calcular la primera derivada si no existe
-            if self.current['derivative'] is None:
-                self.calculate_derivative()
+            # Los puntos críticos dependen de f', no de la derivada de orden n
+            first_derivative = self._recall(('derivative', 1))
+            critical_points = critical_points_of(self.current['function'], self.x_symbol,
+                                                 first_derivative)
+            
+            self.current['critical_points'] = self._remember(cache_key, critical_points)
+            return critical_points
+        
+        except Exception as e:
+            print(f"Error al encontrar puntos críticos: {str(e)}")
+            # En caso de error, devolver lista vacía (y no volver a intentarlo)
+            self.current['critical_points'] = self._remember(cache_key, [])
+            return []
+    
+    def analyze_intervals(self, x_range):
+        """
+        Calcula los intervalos de monotonía y concavidad en un rango.
+        
+        Se analiza numéricamente el signo de f' y f'' compiladas, sin resolver
+        desigualdades simbólicas. El resultado se guarda por función y rango.
+        
+        Args:
+            x_range (tuple): Rango (x_min, x_max).
+        
+        Returns:
+            dict: Intervalos de monotonía, de concavidad y puntos de inflexión
+                (ver ``intervals.analyze_intervals``), o None si la función
+                tiene parámetros libres.
+        """
+        if self.current['function'] is None:
+            raise ValueError("No hay función establecida")
+        
+        # Los intervalos dependen del valor de los parámetros
+        if self.current['parameters']:
+            return None
+        
+        cache_key = ('intervals', tuple(float(v) for v in x_range))
+        cached = self._recall(cache_key)
+        if cached is not None:
+            return cached
+        
+        derivatives = []
+        for order in (1, 2):
+            # Reutilizar la derivada ya calculada; si no, basta la no simplificada
+            derivative = self._recall(('derivative', order))
+            if derivative is None:
+                derivative = real_diff(self.current['function'], self.x_symbol, order)
+            compact = CompactExpression(derivative) if is_large(derivative) else None
+            derivatives.append(self.store.lambdify(self.x_symbol, derivative, compact=compact))
+        
+        result = analyze_intervals(derivatives[0], derivatives[1], x_range)
+        return self._remember(cache_key, result)
+    
+    def verify_results(self, x_range, points=VERIFY_POINTS, seed=None, integral_spec=None):
+        """
+        Comprueba numéricamente la derivada y la integral de la función actual.
+        
+        La derivada compilada se compara en puntos aleatorios con derivadas
+        numéricas de f, y la antiderivada se deriva numéricamente para
+        compararla con f (ver ``verification``). Cuesta milisegundos.
+        
+        Args:
+            x_range (tuple): Rango (x_min, x_max) de los puntos.
+            points (int): Puntos aleatorios por comprobación.
+            seed (int, optional): Semilla del generador aleatorio.
+            integral_spec: Especificación de la integral calculada (ver
+                ``run_analysis``); con una tupla se comprueba el valor definido.
             
-            # Calcular la segunda derivada para clasificar los puntos
-            second_derivative = sp.diff(self.current['function'], self.x_symbol, 2)
+        Returns:
+            list: Resultados (CheckResult) de cada comprobación.
+        """
+        if self.current['function'] is None:
+            raise ValueError("No hay función establecida")
+        
+        funcs = self.create_lambda_functions()
+        order = self.current['order']
+        label = "f'(x)" if order == 1 else f"f^({order})(x)"
+        checks = [check_derivative(funcs['function'], funcs['derivative'], x_range, order,
+                                   points, seed, label=label)]
+        
+        integral = self.current['integral']
+        if integral is not None:
+            if isinstance(integral_spec, tuple):
+                try:
+                    value = float(integral)
+                except (TypeError, ValueError):
+                    value = np.nan
+                lower, upper = integral_spec
+                checks.append(check_definite_integral(funcs['function'], lower, upper, value))
+            else:
+                checks.append(check_antiderivative(funcs['function'], funcs['integral'], x_range,
+                                                   points, seed))
+        return checks
+    
+    def run_analysis(self, func_str, order=1, integral_spec=None):
+        """
+        Ejecuta el análisis completo de una función.
+        
+        Args:
+            func_str (str): Cadena de texto con la función matemática.
+            order (int): Orden de la derivada.
+            integral_spec: None para omitir la integral, 'indefinida' o una
+                tupla (inferior, superior) para la integral definida.
+            
+        Returns:
+            dict: Función, derivada, integral (o None) y puntos críticos. La
+                derivada es None si su expresión se calculará bajo demanda.
+        """
+        if not self.set_function(func_str):
+            raise ValueError(f"No se pudo analizar la función: {func_str}")
+        
+        # Calcular derivada (diferida para órdenes altos si se puede graficar con AD)
+        if self.uses_automatic_differentiation(order):
+            derivative = self._recall(('derivative', order))
+            self.current['order'] = order
+            self.current['derivative'] = derivative
+        else:
+            derivative = self.calculate_derivative(order)
+        
+        # Buscar puntos críticos
+        critical_points = self.find_critical_points()
+        
+        # Calcular integral si es necesario
+        integral = None
+        if integral_spec is not None:
+            try:
+                if integral_spec == 'indefinida':
+                    integral = self.calculate_integral(False)
+                else:
+                    lower, upper = integral_spec
+                    integral = self.calculate_integral(True, lower, upper)
+            except Exception as e:
+                print(f"Error al calcular integral: {str(e)}")
+        
+        return {
+            'function': self.current['function'],
+            'derivative': derivative,
+            'integral': integral,
+            'critical_points': critical_points
+        }
+    
+    def uses_automatic_differentiation(self, order=None):
+        """
+        Indica si la derivada de la función actual se evalúa con diferenciación automática.
+        
+        Args:
+            order (int, optional): Orden de la derivada; por defecto, el actual.
             
-            # Resolver f'(x) = 0
-            solutions = sp.solve(self.current['derivative'], self.x_symbol)
+        Returns:
+            bool: True si el orden es alto y la función no tiene parámetros libres.
+        """
+        if order is None:
+            order = self.current['order']
+        return order >= AD_ORDER_THRESHOLD and not self.current['parameters']
+    
+    def derivative_expression(self):
+        """
+        Obtiene la expresión simbólica de la derivada actual, calculándola si se difirió.
+        
+        Returns:
+            sympy.Expr: Derivada de orden self.current['order'].
+        """
+        if self.current['derivative'] is None:
+            self.calculate_derivative(self.current['order'])
+        return self.current['derivative']
+    
+    def create_derivative_evaluator(self, order=None):
+        """
+        Compila la función actual para evaluar sus derivadas con diferenciación automática.
+        
+        El programa se guarda por función, de modo que volver a graficar no
+        repite la compilación.
+        
+        Args:
+            order (int, optional): Orden máximo; por defecto, el actual.
             
-            critical_points = []
+        Returns:
+            DerivativeFunction: Función numérica de x que devuelve f^(order)(x).
             
-            for solution in solutions:
-                # Verificar que la solución es real
-                if isinstance(solution, sp.Number) and solution.is_real:
-                    x_val = float(solution)
-                    
-                    # Evaluar la segunda derivada en el punto crítico
-                    try:
-                        second_deriv_val = float(second_derivative.subs(self.x_symbol, solution))
-                        
-                        # Clasificar el punto crítico
-                        if second_deriv_val > 0:
-                            point_type = "Mínimo"
-                        elif second_deriv_val < 0:
-                            point_type = "Máximo"
-                        else:
-                            point_type = "Punto de inflexión"
-                    except:
-                        point_type = "Indeterminado"
-                    
-                    # Evaluar la función en el punto
-                    try:
-                        y_val = float(self.current['function'].subs(self.x_symbol, solution))
-                    except:
-                        y_val = None
-                    
-                    critical_points.append({
-                        'x': x_val,
-                        'y': y_val,
-                        'type': point_type
-                    })
+        Raises:
+            NotImplementedError: Si la función contiene operaciones no soportadas.
+        """
+        if self.current['function'] is None:
+            raise ValueError("No hay función establecida")
+        
+        if order is None:
+            order = self.current['order']
+        
+        evaluator = self._recall(('taylor_evaluator', order))
+        if evaluator is None:
+            evaluator = self._remember(('taylor_evaluator', order),
+                                       TaylorEvaluator(self.current['function'], self.x_symbol, order))
+        
+        key = None
+        if self.current['handle'] is not None:
+            key = (self.current['handle'].key, 'ad', order)
+        return DerivativeFunction(evaluator, order, key)
+    
+    def taylor_coefficients(self, point, order):
+        """
+        Calcula los coeficientes del polinomio de Taylor de la función actual.
+        
+        La torre de derivadas se guarda por función, de modo que aumentar el
+        orden solo calcula las derivadas y sustituciones que faltan.
+        
+        Args:
+            point (sympy.Expr): Punto de desarrollo.
+            order (int): Orden del polinomio.
             
-            # Ordenar los puntos por valor de x
-            critical_points.sort(key=lambda p: p['x'])
+        Returns:
+            list: Coeficientes exactos en potencias de (x - punto).
+        """
+        if self.current['function'] is None:
+            raise ValueError("No hay función establecida")
+        
+        tower = self._recall(('tower',))
+        if tower is None:
+            tower = self._remember(('tower',), DerivativeTower(self.current['function'], self.x_symbol))
+        
+        return tower.coefficients(sp.sympify(point), order)
+    
+    def taylor_polynomial(self, point, order):
+        """
+        Obtiene el polinomio de Taylor de la función actual.
+        
+        Args:
+            point (sympy.Expr): Punto de desarrollo.
+            order (int): Orden del polinomio.
             
-            self.current['critical_points'] = critical_points
-            return critical_points
+        Returns:
+            sympy.Expr: Polinomio de Taylor de orden 'order'.
+        """
+        point = sp.sympify(point)
+        return taylor_polynomial(self.taylor_coefficients(point, order), point, self.x_symbol)
+    
+    def evaluate_at(self, point, digits=DEFAULT_DIGITS):
+        """
+        Evalúa f, la derivada actual y la integral indefinida en un punto.
         
-        except Exception as e:
-            print(f"Error al encontrar puntos críticos: {str(e)}")
-            # En caso de error, devolver lista vacía
-            self.current['critical_points'] = []
-            return []
+        El evaluador (con sus funciones compiladas y resultados memorizados)
+        se guarda por función, orden e integral, de modo que repetir una
+        consulta es inmediato. Si la derivada se difirió (orden alto), su
+        valor float64 se obtiene por diferenciación automática.
+        
+        Args:
+            point (sympy.Expr): Punto exacto de evaluación.
+            digits (int): Dígitos significativos si hace falta precisión arbitraria.
+        
+        Returns:
+            dict: Resultados por nombre (ver ``PointEvaluator.evaluate``).
+        """
+        if self.current['function'] is None:
+            raise ValueError("No hay función establecida")
+        if self.current['parameters']:
+            raise ValueError("la función tiene parámetros libres")
+        
+        expressions = {'function': self.current['function']}
+        keys = [self.store.handle(self.current['function']).key]
+        numeric = {}
+        if self.current['derivative'] is None and self.uses_automatic_differentiation():
+            # Derivada diferida: el valor float64 sale de la diferenciación
+            # automática y la simbólica solo se calcula si hace falta mpmath
+            function, order = self.current['function'], self.current['order']
+            
+            def build_derivative():
+                # El evaluador se guarda: la función actual puede haber cambiado
+                if self.current['function'] is function and self.current['order'] == order:
+                    return self.derivative_expression()
+                return (self.differentiator or differentiate)(function, self.x_symbol, order,
+                                                              simplify=False)
+            
+            try:
+                derivative = self.create_derivative_evaluator()
+                numeric['derivative'] = (derivative, 'function')
+                expressions['derivative'] = build_derivative
+                keys.append(derivative.key)
+            except NotImplementedError:
+                pass
+        if 'derivative' not in expressions:
+            expressions['derivative'] = self.derivative_expression()
+            keys.append(self.store.handle(expressions['derivative']).key)
+        # Una integral definida es un número: no depende del punto
+        integral = self.current['integral']
+        if integral is not None and self.x_symbol in integral.free_symbols \
+                and not integral.has(sp.Integral):
+            expressions['integral'] = integral
+            keys.append(self.store.handle(integral).key)
+        
+        cache_key = ('point_evaluator',) + tuple(keys)
+        evaluator = self._recall(cache_key)
+        if evaluator is None:
+            evaluator = self._remember(cache_key, PointEvaluator(self.x_symbol, expressions, numeric))
+        return evaluator.evaluate(sp.sympify(point), digits)
     
-    def format_expression(self, expr, use_latex=False):
+    def format_expression(self, expr, use_latex=False, max_length=None):
         """
         Formatea una expresión simbólica para su visualización.
         
         Args:
             expr (sympy.Expr): Expresión simbólica a formatear.
             use_latex (bool): Si es True, devuelve la expresión en formato LaTeX.
+            max_length (int, optional): Longitud máxima del texto; por defecto,
+                self.max_display_length.
             
         Returns:
             str: Expresión formateada para mostrar al usuario.
         """
         if use_latex:
-            return sp.latex(expr)
-        
-        # Convertir a cadena más legible
-        expr_str = str(expr)
-        
-        # Reemplazar operaciones para mejor visualización
-        expr_str = expr_str.replace("**", "^")
-        expr_str = expr_str.replace("*", "·")  # Usando el punto medio para multiplicación
-        
-        # Reemplazar funciones comunes
-        replacements = {
-            'sin': 'sen',
-            'log': 'ln',
-            'asin': 'arcsen',
-            'atan': 'arctg',
-            'acos': 'arccos'
-        }
+            return spanish_latex(expr)
         
-        for new, old in replacements.items():
-            expr_str = expr_str.replace(new, old)
+        if max_length is None:
+            max_length = self.max_display_length
+        
+        # En expresiones grandes no se ordenan los términos (evita comparar subárboles)
+        order = 'none' if isinstance(expr, sp.Basic) and is_large(expr) else None
+        return spanish_str(expr, max_length=max_length, order=order)
+    
+    def format_compact(self, compact):
+        """
+        Formatea una expresión compacta como expresión reducida y definiciones.
         
-        return expr_str
+        Args:
+            compact (CompactExpression): Expresión compacta.
+            
+        Returns:
+            tuple: (texto de la expresión reducida, lista de textos "u1 = ...").
+        """
+        definitions = [
+            f"{symbol} = {self.format_expression(value)}" for symbol, value in compact.replacements
+        ]
+        return self.format_expression(compact.reduced), definitions
     
     def get_suitable_range(self, x_min=-10, x_max=10):
         """
@@ -303,25 +833,62 @@ class MathHelper:
         """
         Crea funciones lambda para evaluación numérica.
         
+        Si la función tiene parámetros libres, las funciones devueltas quedan
+        ligadas a los valores predeterminados de los parámetros.
+        
         Returns:
             dict: Diccionario con funciones lambda para f(x), f'(x) e integral.
         """
         if self.current['function'] is None:
             raise ValueError("No hay función establecida")
         
+        if self.current['parameters']:
+            return self.create_parametric_functions().bind()
+        
         # Inicializar el diccionario
         lambda_funcs = {}
         
         # Función original
-        lambda_funcs['function'] = sp.lambdify(self.x_symbol, self.current['function'], modules=['numpy', 'sympy'])
+        lambda_funcs['function'] = self.store.lambdify(self.x_symbol, self.current['function'])
         
-        # Derivada
-        if self.current['derivative'] is None:
-            self.calculate_derivative()
-        lambda_funcs['derivative'] = sp.lambdify(self.x_symbol, self.current['derivative'], modules=['numpy', 'sympy'])
+        # Derivada: con diferenciación automática si su expresión se difirió
+        derivative_func = None
+        if self.current['derivative'] is None and self.uses_automatic_differentiation():
+            try:
+                derivative_func = self.create_derivative_evaluator()
+            except NotImplementedError as e:
+                print(f"Diferenciación automática no disponible: {str(e)}")
+        if derivative_func is None:
+            derivative = self.derivative_expression()
+            compact = self.compact_derivative(self.current['handle'], self.current['order'])
+            derivative_func = self.store.lambdify(self.x_symbol, derivative, compact=compact)
+        lambda_funcs['derivative'] = derivative_func
         
         # Integral (si está disponible)
         if self.current['integral'] is not None:
-            lambda_funcs['integral'] = sp.lambdify(self.x_symbol, self.current['integral'], modules=['numpy', 'sympy'])
+            lambda_funcs['integral'] = self.store.lambdify(self.x_symbol, self.current['integral'])
+        
+        return lambda_funcs
+    
+    def create_parametric_functions(self):
+        """
+        Crea funciones numéricas con los parámetros libres como argumentos.
+        
+        Las expresiones simbólicas se calculan una sola vez; las funciones
+        resultantes aceptan arreglos de NumPy difundibles para x y para cada
+        parámetro.
+        
+        Returns:
+            ParametricFunctions: Funciones evaluables para cualquier valor de los parámetros.
+        """
+        if self.current['function'] is None:
+            raise ValueError("No hay función establecida")
+        
+        expressions = {
+            'function': self.current['function'],
+            'derivative': self.derivative_expression(),
+        }
+        if self.current['integral'] is not None:
+            expressions['integral'] = self.current['integral']
         
-        return lambda_funcs
\ No newline at end of file
+        return ParametricFunctions(self.x_symbol, self.current['parameters'], expressions)
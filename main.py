@@ -12,15 +12,46 @@ Versión: 2.0
 """
 import sys
 import os
+
+# Modo servicio: sin interfaz gráfica (python main.py --serve [--host H] [--port P]).
+# Se atiende antes de importar PyQt y la interfaz, que el servicio no necesita
+if __name__ == "__main__" and '--serve' in sys.argv[1:]:
+    import server
+    server.main([arg for arg in sys.argv[1:] if arg != '--serve'])
+    sys.exit(0)
+
 import numpy as np
 import sympy as sp
 from PyQt5.QtWidgets import QApplication, QMessageBox, QSplashScreen
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QStandardPaths, QThread, pyqtSignal
 from PyQt5.QtGui import QPixmap
 
 # Importar módulos propios
 from gui import MainWindow
 from logic import MathHelper
+from instrumentation import Instrumentation
+from sandbox import analyze_sandboxed, restore_analysis, differentiate_sandboxed
+from compact import is_large
+from comparison import FunctionComparison, SEPARATOR, split_functions
+from session import save_session, load_session
+from parallel_sampling import ParallelSampler
+from domain import DomainAnalyzer
+
+# Archivo de la instantánea de sesión (en el directorio de datos de la aplicación)
+SESSION_FILENAME = "sesion.bin"
+
+class _SandboxThread(QThread):
+    """Hilo que espera al análisis en el proceso aislado sin bloquear la interfaz."""
+    
+    # Resultado de analyze_sandboxed
+    done = pyqtSignal(dict)
+    
+    def __init__(self, func_str, order, integral_spec, verify, parent=None):
+        super(_SandboxThread, self).__init__(parent)
+        self.args = (func_str, order, integral_spec, verify)
+    
+    def run(self):
+        self.done.emit(analyze_sandboxed(*self.args))
 
 class DerivativeCalculator:
     """Clase principal de la aplicación."""
@@ -43,12 +74,40 @@ class DerivativeCalculator:
         # Crear instancia de la lógica matemática
         self.math_helper = MathHelper()
         
+        # Instrumentación de tiempos por etapa
+        self.instrumentation = Instrumentation()
+        self.instrumentation.instrument_helper(self.math_helper)
+        
+        # Comparación de varias funciones (comparte el almacén de expresiones)
+        self.comparison = FunctionComparison(self.math_helper)
+        
         # Crear ventana principal
         self.main_window = MainWindow()
+        self.main_window.instrumentation = self.instrumentation
+        self.main_window.expression_store = self.math_helper.store
+        
+        # Muestreo denso repartido entre procesos (gráficas y exportación)
+        self.sampler = ParallelSampler(self.math_helper.store)
+        self.main_window.results_page.plot_canvas.sampler = self.sampler
+        
+        # Dominio real de cada expresión graficada (máscaras y cortes de las curvas)
+        self.main_window.results_page.plot_canvas.domains = DomainAnalyzer(self.math_helper.store)
         
         # Conectar lógica con interfaz
         self.connect_logic()
         
+        # Análisis en curso en el proceso aislado
+        self.sandbox_thread = None
+        
+        # Restaurar la sesión anterior y guardarla al salir
+        self.last_input = None
+        self.session_mapping = None
+        self.session_path = os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), SESSION_FILENAME
+        )
+        self.restore_session()
+        self.app.aboutToQuit.connect(self.save_session)
+        
         # Mostrar ventana con un pequeño retardo
         QTimer.singleShot(500, lambda: self._show_main_window(splash if 'splash' in locals() else None))
     
@@ -62,6 +121,8 @@ class DerivativeCalculator:
         """Conecta la lógica matemática con la interfaz gráfica."""
         # Conectar señal de cálculo
         self.main_window.input_page.calculate_requested.connect(self.process_calculation)
+        self.main_window.results_page.taylor_requested.connect(self.process_taylor)
+        self.main_window.results_page.evaluation_requested.connect(self.process_evaluation)
     
     def process_calculation(self, input_data):
         """
@@ -70,6 +131,31 @@ class DerivativeCalculator:
         Args:
             input_data (dict): Diccionario con los parámetros de cálculo.
         """
+        self.instrumentation.begin_calculation(input_data.get('function', ''))
+        profile_mode = self.main_window.take_profile_request()
+        
+        with self.instrumentation.profile(profile_mode):
+            with self.instrumentation.stage('total'):
+                self._run_calculation(input_data)
+        
+        # Mostrar tiempos por etapa en la barra de estado
+        self.main_window.show_metrics(self.instrumentation.summary_text())
+        if profile_mode:
+            self.main_window.statusBar.showMessage(
+                f"Perfil guardado en {self.instrumentation.last_profile_path}"
+            )
+    
+    def _run_calculation(self, input_data, restoring=False):
+        """
+        Ejecuta las etapas del cálculo y muestra los resultados.
+        
+        Args:
+            input_data (dict): Diccionario con los parámetros de cálculo.
+            restoring (bool): Si es True, se vuelve a mostrar un cálculo de la
+                sesión anterior: los resultados ya están en el almacén, así
+                que no se usa el proceso aislado, no se verifica de nuevo y
+                no se añade al historial.
+        """
         try:
             # Extraer datos
             func_str = input_data.get('function', '')
@@ -78,95 +164,491 @@ class DerivativeCalculator:
             lower_limit = input_data.get('lower_limit', '')
             upper_limit = input_data.get('upper_limit', '')
             
-            # Establecer función en el helper
-            if not self.math_helper.set_function(func_str):
-                raise ValueError(f"No se pudo analizar la función: {func_str}")
+            # Determinar la integral solicitada
+            integral_spec = None
+            if calc_integral:
+                integral_spec = 'indefinida'
+                if lower_limit and upper_limit:
+                    try:
+                        integral_spec = (float(lower_limit), float(upper_limit))
+                    except ValueError:
+                        # Si hay error en los límites, calcular la indefinida
+                        pass
             
-            # Calcular derivada
-            derivative = self.math_helper.calculate_derivative(order)
+            # Varias funciones separadas por ';': comparación superpuesta
+            if SEPARATOR in func_str:
+                self._run_comparison(input_data, split_functions(func_str), order, integral_spec,
+                                     restoring)
+                return
             
-            # Buscar puntos críticos
-            critical_points = self.math_helper.find_critical_points()
+            # Con el proceso aislado, también las derivadas diferidas que se
+            # pidan después (texto, evaluación con mpmath) se calculan en él
+            sandboxed = self.main_window.sandbox_enabled
+            self.math_helper.differentiator = differentiate_sandboxed if sandboxed else None
             
-            # Calcular integral si es necesario
-            integral = None
-            if calc_integral:
+            # Análisis simbólico en el proceso aislado: se espera en otro hilo
+            # y los resultados se muestran al terminar (ver _finish_sandboxed)
+            if sandboxed and not restoring:
+                self._start_sandboxed(input_data, func_str, order, integral_spec)
+                return
+            
+            analysis = self.math_helper.run_analysis(func_str, order, integral_spec)
+            self._show_analysis(input_data, analysis, integral_spec, restoring)
+            
+        except Exception as e:
+            self._show_calculation_error(e)
+    
+    def _start_sandboxed(self, input_data, func_str, order, integral_spec):
+        """
+        Lanza el análisis en el proceso aislado sin bloquear la interfaz.
+        
+        Args:
+            input_data (dict): Diccionario con los parámetros de cálculo.
+            func_str (str): Función a analizar.
+            order (int): Orden de la derivada.
+            integral_spec: None, 'indefinida' o una tupla (inferior, superior).
+        """
+        if self.sandbox_thread is not None and self.sandbox_thread.isRunning():
+            self.main_window.statusBar.showMessage("Ya hay un cálculo en curso en el proceso aislado")
+            return
+        
+        self.main_window.statusBar.showMessage("Calculando en el proceso aislado...")
+        thread = _SandboxThread(func_str, order, integral_spec, self.main_window.verify_enabled)
+        thread.done.connect(lambda analysis: self._finish_sandboxed(input_data, integral_spec, analysis))
+        self.sandbox_thread = thread
+        thread.start()
+    
+    def _finish_sandboxed(self, input_data, integral_spec, analysis):
+        """
+        Muestra el resultado del análisis en el proceso aislado.
+        
+        Args:
+            input_data (dict): Diccionario con los parámetros de cálculo.
+            integral_spec: None, 'indefinida' o una tupla (inferior, superior).
+            analysis (dict): Resultado de ``analyze_sandboxed``.
+        """
+        self.main_window.statusBar.clearMessage()
+        if analysis['status'] != 'ok':
+            QMessageBox.warning(
+                self.main_window,
+                "Cálculo demasiado costoso",
+                f"El cálculo se interrumpió: {analysis['message']}"
+            )
+            return
+        
+        try:
+            with self.instrumentation.stage('presentación'):
+                restore_analysis(self.math_helper, analysis)
+                results = {k: self.math_helper.current[k]
+                           for k in ('function', 'derivative', 'integral', 'critical_points')}
+                # Intervalos y comprobación ya calculados en el proceso aislado
+                results['intervals'] = analysis['intervals']
+                results['checks'] = analysis['checks']
+                self._show_analysis(input_data, results, integral_spec)
+        except Exception as e:
+            self._show_calculation_error(e)
+        self.main_window.show_metrics(self.instrumentation.summary_text())
+    
+    def _show_calculation_error(self, error):
+        """Muestra un error del cálculo."""
+        QMessageBox.critical(
+            self.main_window,
+            "Error en el cálculo",
+            f"Se produjo un error al procesar la función:\n{str(error)}"
+        )
+    
+    def _show_analysis(self, input_data, analysis, integral_spec, restoring=False):
+        """
+        Formatea y muestra los resultados de un análisis.
+        
+        Args:
+            input_data (dict): Diccionario con los parámetros de cálculo.
+            analysis (dict): Función, derivada, integral y puntos críticos;
+                opcionalmente 'intervals' y 'checks' ya calculados (proceso aislado).
+            integral_spec: None, 'indefinida' o una tupla (inferior, superior).
+            restoring (bool): Ver ``_run_calculation``.
+        """
+        order = input_data.get('order', 1)
+        calc_integral = input_data.get('integral_definida', False)
+        lower_limit = input_data.get('lower_limit', '')
+        upper_limit = input_data.get('upper_limit', '')
+        
+        derivative = analysis['derivative']
+        critical_points = analysis['critical_points']
+        integral = analysis['integral']
+        
+        # Preparar resultados para mostrar
+        results = {}
+        
+        # Versiones LaTeX para la composición tipográfica (solo expresiones pequeñas)
+        latex = {}
+        
+        # Formatear función
+        func_formatted = self.math_helper.format_expression(self.math_helper.current['function'])
+        results['function'] = f"f(x) = {func_formatted}"
+        func_latex = self._latex(self.math_helper.current['function'])
+        if func_latex is not None:
+            latex['function'] = f"f(x) = {func_latex}"
+        
+        # Formatear derivada (si se difirió, el texto se genera bajo demanda)
+        handle = self.math_helper.current['handle']
+        prefix = "f'(x)" if order == 1 else f"f^({order})(x)"
+        if derivative is not None:
+            results['derivative'], lazy = self._format_derivative(handle, order, prefix)
+        else:
+            results['derivative'] = f"{prefix} = …"
+            lazy = ("Mostrar expresión de la derivada",
+                    lambda: self._format_derivative(handle, order, prefix))
+        if lazy is not None:
+            results['derivative_lazy'] = lazy
+        elif derivative is not None:
+            derivative_latex = self._latex(derivative)
+            if derivative_latex is not None:
+                prefix_latex = "f'(x)" if order == 1 else f"f^{{({order})}}(x)"
+                latex['derivative'] = f"{prefix_latex} = {derivative_latex}"
+        
+        # Incluir puntos críticos
+        results['critical_points'] = critical_points
+        
+        # Formatear integral si está disponible
+        if integral is not None:
+            integral_formatted = self.math_helper.format_expression(integral)
+            integral_latex = self._latex(integral)
+            
+            if calc_integral and lower_limit and upper_limit:
+                integral_sign = rf"\int_{{{lower_limit}}}^{{{upper_limit}}}"
                 try:
-                    # Determinar si es integral definida o indefinida
-                    if lower_limit and upper_limit:
-                        try:
-                            lower = float(lower_limit)
-                            upper = float(upper_limit)
-                            integral = self.math_helper.calculate_integral(True, lower, upper)
-                        except ValueError:
-                            # Si hay error en los límites, calcular la indefinida
-                            integral = self.math_helper.calculate_integral(False)
-                    else:
-                        integral = self.math_helper.calculate_integral(False)
-                except Exception as e:
-                    print(f"Error al calcular integral: {str(e)}")
-            
-            # Preparar resultados para mostrar
-            results = {}
-            
-            # Formatear función
-            func_formatted = self.math_helper.format_expression(self.math_helper.current['function'])
-            results['function'] = f"f(x) = {func_formatted}"
-            
-            # Formatear derivada
-            derivative_formatted = self.math_helper.format_expression(derivative)
-            if order == 1:
-                results['derivative'] = f"f'(x) = {derivative_formatted}"
+                    # Valor numérico de la integral definida
+                    int_value = float(integral)
+                    results['integral'] = (
+                        f"∫({func_formatted})dx "
+                        f"desde {lower_limit} hasta {upper_limit} = {round(int_value, 6)}"
+                    )
+                    integral_latex = str(round(int_value, 6))
+                except:
+                    results['integral'] = (
+                        f"∫({func_formatted})dx "
+                        f"desde {lower_limit} hasta {upper_limit} = {integral_formatted}"
+                    )
+                suffix = ""
             else:
-                results['derivative'] = f"f^({order})(x) = {derivative_formatted}"
-            
-            # Incluir puntos críticos
-            results['critical_points'] = critical_points
+                results['integral'] = f"∫({func_formatted})dx = {integral_formatted} + C"
+                integral_sign = r"\int"
+                suffix = " + C"
             
-            # Formatear integral si está disponible
-            if integral is not None:
-                integral_formatted = self.math_helper.format_expression(integral)
-                
-                if calc_integral and lower_limit and upper_limit:
-                    try:
-                        # Valor numérico de la integral definida
-                        int_value = float(integral)
-                        results['integral'] = (
-                            f"∫({func_formatted})dx "
-                            f"desde {lower_limit} hasta {upper_limit} = {round(int_value, 6)}"
-                        )
-                    except:
-                        results['integral'] = (
-                            f"∫({func_formatted})dx "
-                            f"desde {lower_limit} hasta {upper_limit} = {integral_formatted}"
-                        )
+            if func_latex is not None and integral_latex is not None:
+                latex['integral'] = (
+                    rf"{integral_sign} {func_latex} \, dx = {integral_latex}{suffix}"
+                )
+        
+        results['latex'] = latex
+        
+        # Obtener rango adecuado para gráfica
+        x_range = self.math_helper.get_suitable_range()
+        
+        # Intervalos de monotonía y concavidad en el rango mostrado
+        if 'intervals' in analysis:
+            intervals = analysis['intervals']
+        else:
+            try:
+                intervals = self.math_helper.analyze_intervals(x_range)
+            except Exception as e:
+                print(f"Error al calcular los intervalos: {str(e)}")
+                intervals = None
+        if intervals is not None:
+            results['intervals'] = intervals
+            results['monotonicity'] = self._format_intervals(intervals['monotonicity'])
+            results['concavity'] = self._format_intervals(intervals['concavity'])
+        
+        # Comprobación numérica de la derivada y la integral
+        checks = analysis.get('checks')
+        if isinstance(checks, str):
+            results['verification'] = f"No se pudo verificar: {checks}"
+        elif checks is not None:
+            results['verification'] = "\n".join(check.summary() for check in checks)
+        elif self.main_window.verify_enabled and not restoring and 'checks' not in analysis:
+            try:
+                with self.instrumentation.stage('verificación'):
+                    checks = self.math_helper.verify_results(x_range, integral_spec=integral_spec)
+                results['verification'] = "\n".join(check.summary() for check in checks)
+            except Exception as e:
+                results['verification'] = f"No se pudo verificar: {str(e)}"
+        
+        # Crear funciones lambda para evaluación numérica
+        parametric = None
+        if self.math_helper.current['parameters']:
+            parametric = self.math_helper.create_parametric_functions()
+            lambda_funcs = parametric.bind()
+        else:
+            lambda_funcs = self.math_helper.create_lambda_functions()
+        
+        # Mostrar resultados
+        with self.instrumentation.stage('graficado'):
+            self.main_window.results_page.set_results(results, lambda_funcs, x_range, parametric)
+        self.main_window.show_results_page()
+        
+        # Añadir al historial
+        if not restoring:
+            self.main_window.input_page.add_to_history(input_data)
+        self.last_input = dict(input_data)
+    
+    def _run_comparison(self, input_data, func_strs, order, integral_spec, restoring=False):
+        """
+        Analiza varias funciones y superpone sus curvas.
+        
+        Args:
+            input_data (dict): Diccionario con los parámetros de cálculo.
+            func_strs (list): Funciones a comparar.
+            order (int): Orden de la derivada.
+            integral_spec: None, 'indefinida' o una tupla (inferior, superior).
+            restoring (bool): Si es True, no se añade al historial.
+        """
+        helper = self.math_helper
+        with self.instrumentation.stage('comparación'):
+            entries = self.comparison.analyze(func_strs, order, integral_spec)
+        
+        subscripts = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
+        names = [f"f{str(i + 1).translate(subscripts)}" for i in range(len(entries))]
+        derivative_mark = "'" if order == 1 else f"^({order})"
+        
+        functions, derivatives, integrals = [], [], []
+        for name, entry in zip(names, entries):
+            functions.append(f"{name}(x) = {helper.format_expression(entry['function'])}")
+            derivatives.append(
+                f"{name}{derivative_mark}(x) = {helper.format_expression(entry['derivative'])}"
+            )
+            if integral_spec is not None:
+                integral = entry['integral']
+                if integral is None:
+                    integrals.append(f"∫{name}(x)dx: no se pudo calcular")
+                elif integral_spec == 'indefinida':
+                    integrals.append(f"∫{name}(x)dx = {helper.format_expression(integral)} + C")
                 else:
-                    results['integral'] = f"∫({func_formatted})dx = {integral_formatted} + C"
+                    lower, upper = integral_spec
+                    try:
+                        value = round(float(integral), 6)
+                    except (TypeError, ValueError):
+                        value = helper.format_expression(integral)
+                    integrals.append(f"∫{name}(x)dx desde {lower} hasta {upper} = {value}")
+        
+        results = {
+            'function': "\n".join(functions),
+            'derivative': "\n".join(derivatives),
+            'integral': "\n".join(integrals),
+            'latex': {},
+        }
+        
+        # Rango que abarca los puntos críticos de todas las funciones
+        ranges = []
+        for text in func_strs:
+            helper.set_function(text)
+            ranges.append(helper.get_suitable_range())
+        x_range = (min(r[0] for r in ranges), max(r[1] for r in ranges))
+        
+        # La función actual (Taylor, evaluación puntual) es la primera de la lista
+        helper.set_function(func_strs[0])
+        helper.current['order'] = order
+        
+        labels = [f"{name}: {text}" for name, text in zip(names, func_strs)]
+        curves = self.comparison.curves(entries, labels)
+        
+        with self.instrumentation.stage('graficado'):
+            self.main_window.results_page.set_results(results, None, x_range, comparison=curves)
+        self.main_window.show_results_page()
+        if not restoring:
+            self.main_window.input_page.add_to_history(input_data)
+        self.last_input = dict(input_data)
+    
+    def _latex(self, expr):
+        """
+        Obtiene el LaTeX de una expresión si es lo bastante pequeña para componerla.
+        
+        Args:
+            expr (sympy.Expr): Expresión a convertir.
             
-            # Obtener rango adecuado para gráfica
-            x_range = self.math_helper.get_suitable_range()
+        Returns:
+            str: Código LaTeX, o None si la expresión es demasiado grande.
+        """
+        if not isinstance(expr, sp.Basic) or is_large(expr):
+            return None
+        return self.math_helper.format_expression(expr, use_latex=True)
+    
+    def _format_intervals(self, intervals):
+        """
+        Agrupa los intervalos por tipo para mostrarlos como uniones.
+        
+        Args:
+            intervals (list): Diccionarios con 'start', 'end' y 'type'.
             
-            # Crear funciones lambda para evaluación numérica
-            lambda_funcs = self.math_helper.create_lambda_functions()
+        Returns:
+            str: Una línea por tipo, por ejemplo "Creciente: (-10, -1) ∪ (1, 10)".
+        """
+        if not intervals:
+            return "Sin intervalos en el rango mostrado"
+        
+        grouped = {}
+        for interval in intervals:
+            grouped.setdefault(interval['type'], []).append(
+                f"({interval['start']:.4g}, {interval['end']:.4g})"
+            )
+        return "\n".join(f"{kind}: {' ∪ '.join(parts)}" for kind, parts in grouped.items())
+    
+    def _format_derivative(self, handle, order, prefix):
+        """
+        Formatea una derivada, en forma compacta si su árbol es grande.
+        
+        Args:
+            handle (ExprHandle): Función de origen.
+            order (int): Orden de la derivada.
+            prefix (str): Prefijo a mostrar, por ejemplo "f^(7)(x)".
             
-            # Mostrar resultados
-            self.main_window.results_page.set_results(results, lambda_funcs, x_range)
-            self.main_window.show_results_page()
+        Returns:
+            tuple: (texto, acción diferida o None). La acción es una tupla
+                (etiqueta del botón, función que devuelve otro par (texto, acción)).
+        """
+        helper = self.math_helper
+        compact = helper.compact_derivative(handle, order)
+        if compact is None:
+            derivative = helper.derivative_of(handle, order)
+            return f"{prefix} = {helper.format_expression(derivative)}", None
+        
+        reduced, definitions = helper.format_compact(compact)
+        stats = compact.stats()
+        text = (
+            f"{prefix} = {reduced}\n"
+            f"donde:\n    " + "\n    ".join(definitions) + "\n"
+            f"[{stats['tree_nodes']} nodos en el árbol completo · "
+            f"{stats['dag_nodes']} nodos distintos · "
+            f"{stats['subexpressions']} subexpresiones]"
+        )
+        expand = (
+            "Expandir expresión completa",
+            lambda: (f"{prefix} = {helper.format_expression(compact.expand())}", None)
+        )
+        return text, expand
+    
+    def process_taylor(self, point_str, order, all_orders):
+        """
+        Calcula y superpone el polinomio de Taylor de la función actual.
+        
+        Args:
+            point_str (str): Punto de desarrollo introducido por el usuario.
+            order (int): Orden del polinomio.
+            all_orders (bool): Si es True, superpone también los órdenes 1..N-1.
+        """
+        results_page = self.main_window.results_page
+        try:
+            point = sp.sympify(self.math_helper.parse_function(point_str),
+                               locals=dict(self.math_helper.local_names))
+            point_value = float(point)
             
-            # Añadir al historial
-            self.main_window.input_page.add_to_history(input_data)
+            coefficients = self.math_helper.taylor_coefficients(point, order)
+            if any(c.free_symbols for c in coefficients):
+                raise ValueError("los coeficientes dependen de los parámetros libres")
+            numeric = [float(c) for c in coefficients]
             
-        except Exception as e:
-            # Mostrar error
-            QMessageBox.critical(
-                self.main_window,
-                "Error en el cálculo",
-                f"Se produjo un error al procesar la función:\n{str(e)}"
+            orders = range(1, order + 1) if all_orders else [order]
+            coefficient_sets = [(n, numeric[:n + 1]) for n in orders]
+            
+            polynomial = self.math_helper.taylor_polynomial(point, order)
+            text = f"T{order}(x) = {self.math_helper.format_expression(polynomial)}"
+            
+            results_page.show_taylor(point_value, coefficient_sets, text)
+        except (TypeError, ValueError, sp.SympifyError) as e:
+            results_page.taylor_widget.set_polynomial_text(
+                f"No se puede desarrollar en {point_str}: {str(e)}"
+            )
+    
+    def process_evaluation(self, point_str, digits):
+        """
+        Evalúa la función, su derivada y su integral en un punto.
+        
+        Args:
+            point_str (str): Punto introducido por el usuario.
+            digits (int): Dígitos significativos si hace falta precisión arbitraria.
+        """
+        results_page = self.main_window.results_page
+        try:
+            # Punto exacto: 0.1 se lee como 1/10 para no arrastrar el error binario
+            try:
+                point = sp.Rational(point_str)
+            except (TypeError, ValueError):
+                point = sp.sympify(self.math_helper.parse_function(point_str),
+                                   locals=dict(self.math_helper.local_names), rational=True)
+            point_value = float(point)
+            
+            with self.instrumentation.stage('evaluación puntual'):
+                values = self.math_helper.evaluate_at(point, digits)
+            
+            order = self.math_helper.current['order']
+            names = {
+                'function': "f",
+                'derivative': "f'" if order == 1 else f"f^({order})",
+                'integral': "∫f",
+            }
+            lines = []
+            for key, result in values.items():
+                line = f"{names[key]}({point_str}) = {result['text']}"
+                if result['method'] == 'mpmath' and result['value'] is not None:
+                    line += f"   [mpmath, {result['working_digits']} dígitos de trabajo"
+                    if result['digits_lost'] > 0:
+                        line += f"; cancelación en float64 ≈ {min(result['digits_lost'], 16):.0f} dígitos"
+                    line += "]"
+                lines.append(line)
+            
+            results_page.show_evaluation(
+                point_value,
+                {key: None if r['value'] is None else float(r['value']) for key, r in values.items()},
+                "\n".join(lines)
             )
+        except (TypeError, ValueError, sp.SympifyError) as e:
+            results_page.point_eval_widget.set_values_text(
+                f"No se puede evaluar en {point_str}: {str(e)}"
+            )
+    
+    def save_session(self):
+        """Guarda el historial, los resultados, las curvas y la vista actual."""
+        window = self.main_window
+        view = {
+            'page': 'results' if window.stack.currentWidget() == window.results_page else 'input',
+            'input': window.input_page.function_input.get_function_input(),
+            'calculation': self.last_input,
+        }
+        save_session(self.session_path, window.input_page.get_history(), view,
+                     self.math_helper.store, window.results_page.plot_canvas.curve_cache,
+                     self.session_mapping)
+        self.session_mapping = None
+    
+    def restore_session(self):
+        """
+        Restaura la sesión guardada sin recalcular nada.
+        
+        Los resultados simbólicos y las curvas se toman del almacén y de la
+        caché restaurados, así que volver a mostrar el último cálculo solo
+        compila y dibuja las funciones, sin proceso aislado.
+        """
+        window = self.main_window
+        state = load_session(self.session_path, self.math_helper.store,
+                             window.results_page.plot_canvas.curve_cache)
+        if state is None:
+            return
+        self.session_mapping = state['mapping']
+        
+        view = state['view']
+        if view.get('page') == 'results' and view.get('calculation'):
+            self._run_calculation(view['calculation'], restoring=True)
+        
+        window.input_page.set_history(state['history'])
+        if view.get('input'):
+            window.input_page.function_input.set_function_input(view['input'])
     
     def run(self):
         """Ejecuta la aplicación."""
-        sys.exit(self.app.exec_())
+        status = self.app.exec_()
+        # No destruir el hilo de un análisis aislado que sigue en curso
+        if self.sandbox_thread is not None:
+            self.sandbox_thread.wait()
+        sys.exit(status)
 
 
 def main():
@@ -0,0 +1,290 @@
+"""
+Muestreo denso de funciones repartido entre varios procesos.
+La malla se divide en bloques que los procesos de trabajo evalúan y escriben
+directamente en un búfer de multiprocessing.shared_memory; la gráfica y la
+exportación leen las columnas del búfer sin copiarlas. Solo se reparte el
+trabajo cuando una muestra inicial indica que compensa el coste de enviarlo;
+las funciones que NumPy no puede vectorizar se evalúan punto a punto con
+mpmath, que es justo el caso en que más se gana.
+"""
+import os
+import time
+import atexit
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+import sympy as sp
+
+from intervals import evaluate
+from sandbox import _get_context, _limit_resources, DEFAULT_MEMORY_LIMIT_MB
+from piecewise import numeric_modules
+
+# Procesos de trabajo
+MAX_WORKERS = max(1, os.cpu_count() or 1)
+
+# Puntos evaluados en este proceso para estimar el coste de cada función
+PROBE_POINTS = 2048
+
+# Tiempo estimado a partir del cual se reparte el muestreo
+PARALLEL_MIN_SECONDS = 0.25
+
+# Bloques por proceso (equilibra la carga si unas zonas son más costosas) y
+# tamaño mínimo de bloque
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_POINTS = 4096
+
+# Funciones compiladas en cada proceso de trabajo, por srepr
+_COMPILED = {}
+
+
+def _compile(text):
+    """
+    Compila una expresión serializada, reutilizándola si ya se compiló.
+
+    Args:
+        text (str): srepr de la expresión (función de x).
+
+    Returns:
+        tuple: (función vectorizada, función mpmath para evaluar punto a punto).
+    """
+    compiled = _COMPILED.get(text)
+    if compiled is None:
+        expr = sp.sympify(text)
+        symbols = sorted(expr.free_symbols, key=lambda s: s.name)
+        x_symbol = symbols[0] if symbols else sp.Symbol('x')
+        compiled = (
+            sp.lambdify(x_symbol, expr, modules=numeric_modules(('numpy', 'sympy')), cse=True),
+            sp.lambdify(x_symbol, expr, modules=numeric_modules('mpmath')),
+        )
+        _COMPILED[text] = compiled
+    return compiled
+
+
+def evaluate_points(func, x_vals, text=None):
+    """
+    Evalúa una función sobre una malla, punto a punto si no se puede vectorizar.
+
+    Args:
+        func (callable): Función numérica vectorizada.
+        x_vals (numpy.ndarray): Valores de x.
+        text (str, optional): srepr de la expresión; si func no acepta
+            arreglos, se evalúa punto a punto con mpmath.
+
+    Returns:
+        numpy.ndarray: Valores reales (NaN donde la función no está definida).
+    """
+    try:
+        return evaluate(func, x_vals)
+    except Exception:
+        if text is None:
+            raise
+
+    fallback = _compile(text)[1]
+    values = np.empty(len(x_vals))
+    for i, x in enumerate(x_vals.tolist()):
+        try:
+            value = complex(fallback(x))
+            values[i] = value.real if value.imag == 0 else np.nan
+        except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+            values[i] = np.nan
+    values[~np.isfinite(values)] = np.nan
+    return values
+
+
+def _sample_chunk(shm_name, shape, column, text, start, stop):
+    """
+    Evalúa un bloque de la malla en un proceso de trabajo.
+
+    Args:
+        shm_name (str): Nombre del búfer compartido.
+        shape (tuple): Forma (puntos, columnas) del búfer; la columna 0 es x.
+        column (int): Columna donde se escriben los valores.
+        text (str): srepr de la expresión.
+        start (int): Primera fila del bloque.
+        stop (int): Fila siguiente a la última.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        table = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        table[start:stop, column] = evaluate_points(_compile(text)[0], table[start:stop, 0], text)
+        del table
+    finally:
+        shm.close()
+
+
+class SharedSamples:
+    """
+    Tabla de muestras (x y una columna por función), posiblemente en memoria compartida.
+
+    Se usa como gestor de contexto: al salir se libera el búfer compartido,
+    así que las vistas obtenidas no deben usarse después.
+    """
+
+    def __init__(self, names, points, shared=False):
+        """
+        Crea la tabla.
+
+        Args:
+            names (list): Nombres de las funciones (columnas 1, 2, ...).
+            points (int): Número de puntos.
+            shared (bool): Si es True, la tabla vive en memoria compartida.
+        """
+        self.names = list(names)
+        self.shape = (points, len(self.names) + 1)
+        self.shm = None
+        if shared:
+            size = max(1, int(np.prod(self.shape)) * np.dtype(np.float64).itemsize)
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.array = np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)
+        else:
+            self.array = np.empty(self.shape)
+
+    @property
+    def x(self):
+        """numpy.ndarray: Columna de x (vista)."""
+        return self.array[:, 0]
+
+    def column(self, name):
+        """
+        Obtiene los valores de una función.
+
+        Args:
+            name (str): Nombre de la función.
+
+        Returns:
+            numpy.ndarray: Vista de la columna (NaN donde no está definida).
+        """
+        return self.array[:, self.names.index(name) + 1]
+
+    def close(self):
+        """Libera el búfer compartido."""
+        self.array = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ParallelSampler:
+    """
+    Muestreador que reparte las funciones costosas entre procesos.
+    """
+
+    def __init__(self, store, max_workers=MAX_WORKERS, min_seconds=PARALLEL_MIN_SECONDS):
+        """
+        Inicializa el muestreador.
+
+        Args:
+            store (ExpressionStore): Almacén del que proceden las funciones
+                compiladas (los procesos de trabajo reciben su expresión).
+            max_workers (int): Número máximo de procesos de trabajo.
+            min_seconds (float): Tiempo estimado a partir del cual se reparte.
+        """
+        self.store = store
+        self.max_workers = max_workers
+        self.min_seconds = min_seconds
+        self._executor = None
+        self._texts = {}
+        atexit.register(self.shutdown)
+
+    def _get_executor(self):
+        """Crea el grupo de procesos al primer uso y lo reutiliza después."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=_get_context(),
+                initializer=_limit_resources,
+                initargs=(DEFAULT_MEMORY_LIMIT_MB, None),
+            )
+        return self._executor
+
+    def shutdown(self):
+        """Termina los procesos de trabajo."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _expression_text(self, func):
+        """srepr de la expresión de una función del almacén, o None si no procede de él."""
+        # Solo los identificadores enteros son del almacén; las derivadas por
+        # AD usan claves compuestas y se evalúan en este proceso
+        key = getattr(func, 'key', None)
+        if not isinstance(key, int):
+            return None
+        text = self._texts.get(key)
+        if text is None:
+            try:
+                expr = self.store.expression(key)
+            except KeyError:
+                return None
+            text = self._texts[key] = sp.srepr(expr)
+        return text
+
+    def sample(self, funcs, x_vals):
+        """
+        Evalúa varias funciones sobre una malla.
+
+        Args:
+            funcs (dict): Nombre -> función numérica. Las compiladas desde el
+                almacén pueden repartirse entre procesos; las demás se
+                evalúan en este proceso.
+            x_vals (numpy.ndarray): Malla de x (1D).
+
+        Returns:
+            SharedSamples: Tabla con x y una columna por función.
+        """
+        x_vals = np.asarray(x_vals, dtype=np.float64)
+        points = len(x_vals)
+        probe = min(points, PROBE_POINTS)
+
+        # Evaluar una muestra inicial y estimar el coste del resto
+        texts = {name: self._expression_text(func) for name, func in funcs.items()}
+        head = {}
+        remaining = 0.0
+        for name, func in funcs.items():
+            began = time.perf_counter()
+            head[name] = evaluate_points(func, x_vals[:probe], texts[name])
+            if texts[name] is not None:
+                remaining += (time.perf_counter() - began) * (points - probe) / probe
+
+        shared = self.max_workers > 1 and remaining >= self.min_seconds
+        samples = SharedSamples(funcs, points, shared=shared)
+        samples.array[:, 0] = x_vals
+        for column, name in enumerate(samples.names, start=1):
+            samples.array[:probe, column] = head[name]
+
+        if probe == points:
+            return samples
+
+        try:
+            futures = []
+            for column, name in enumerate(samples.names, start=1):
+                if not shared or texts[name] is None:
+                    samples.array[probe:, column] = evaluate_points(
+                        funcs[name], x_vals[probe:], texts[name]
+                    )
+                    continue
+
+                chunk = max(MIN_CHUNK_POINTS,
+                            -(-(points - probe) // (self.max_workers * CHUNKS_PER_WORKER)))
+                executor = self._get_executor()
+                for start in range(probe, points, chunk):
+                    futures.append(executor.submit(
+                        _sample_chunk, samples.shm.name, samples.shape, column,
+                        texts[name], start, min(start + chunk, points)
+                    ))
+
+            done, _ = wait(futures)
+            for future in done:
+                future.result()
+        except BaseException:
+            samples.close()
+            raise
+        return samples
@@ -0,0 +1,127 @@
+"""
+Módulo para funciones con parámetros libres.
+Permite evaluar f, f' e integral para cualquier valor de los parámetros
+(por ejemplo, la 'a' en a*sin(x)) mediante difusión de NumPy, sin repetir
+el cálculo simbólico.
+"""
+from functools import partial
+
+import numpy as np
+import sympy as sp
+
+from piecewise import numeric_modules
+
+# Valor inicial de cada parámetro
+DEFAULT_VALUE = 1.0
+
+
+def _as_array(values, shape):
+    """
+    Convierte un resultado de evaluación en un arreglo de la forma indicada.
+
+    Las expresiones constantes (por ejemplo, la derivada de a*x) devuelven un
+    escalar, que se difunde a la forma de la malla.
+
+    Args:
+        values: Resultado de la función numérica.
+        shape (tuple): Forma esperada.
+
+    Returns:
+        numpy.ndarray: Arreglo de tipo float con la forma indicada.
+    """
+    array = np.asarray(values, dtype=float)
+    if array.shape != shape:
+        array = np.broadcast_to(array, shape)
+    return array
+
+
+class ParametricFunctions:
+    """
+    Conjunto de funciones numéricas de x y de los parámetros libres.
+    """
+
+    def __init__(self, x_symbol, parameters, expressions):
+        """
+        Crea las funciones numéricas a partir de las expresiones simbólicas.
+
+        Args:
+            x_symbol (sympy.Symbol): Variable independiente.
+            parameters (list): Símbolos de los parámetros libres.
+            expressions (dict): Expresiones por clave ('function', 'derivative', 'integral').
+        """
+        self.parameters = [p.name for p in parameters]
+        self.values = {name: DEFAULT_VALUE for name in self.parameters}
+
+        args = (x_symbol, *parameters)
+        self.funcs = {
+            key: sp.lambdify(args, expr, modules=numeric_modules(('numpy', 'sympy')))
+            for key, expr in expressions.items()
+        }
+
+    def set_values(self, values):
+        """
+        Actualiza los valores actuales de los parámetros.
+
+        Args:
+            values (dict): Nombre del parámetro -> valor.
+        """
+        for name, value in values.items():
+            if name in self.values:
+                self.values[name] = float(value)
+
+    def evaluate(self, key, x, values=None):
+        """
+        Evalúa una de las funciones en una única llamada vectorizada.
+
+        Args:
+            key (str): 'function', 'derivative' o 'integral'.
+            x (numpy.ndarray): Valores de x.
+            values (dict, optional): Valores de los parámetros (los actuales por defecto).
+
+        Returns:
+            numpy.ndarray: Valores de la función con la forma de x.
+        """
+        values = self.values if values is None else {**self.values, **values}
+        x = np.asarray(x, dtype=float)
+        result = self.funcs[key](x, *(values[name] for name in self.parameters))
+        return _as_array(result, x.shape)
+
+    def evaluate_family(self, key, x, name, samples):
+        """
+        Evalúa una familia de curvas variando un parámetro.
+
+        Todas las curvas se obtienen en una sola llamada difundiendo x como
+        fila y los valores del parámetro como columna.
+
+        Args:
+            key (str): 'function', 'derivative' o 'integral'.
+            x (numpy.ndarray): Valores de x (1D).
+            name (str): Parámetro que varía.
+            samples (numpy.ndarray): Valores del parámetro (1D).
+
+        Returns:
+            numpy.ndarray: Matriz (len(samples), len(x)) con una curva por fila.
+        """
+        x = np.asarray(x, dtype=float)
+        samples = np.asarray(samples, dtype=float)
+        args = [
+            samples[:, np.newaxis] if p == name else self.values[p]
+            for p in self.parameters
+        ]
+        result = self.funcs[key](x[np.newaxis, :], *args)
+        return _as_array(result, (samples.size, x.size))
+
+    def bind(self, values=None):
+        """
+        Obtiene funciones de una sola variable con los parámetros fijados.
+
+        Args:
+            values (dict, optional): Valores de los parámetros (los actuales por defecto).
+
+        Returns:
+            dict: Funciones lambda de x compatibles con ``plot_functions``.
+        """
+        if values is not None:
+            self.set_values(values)
+        fixed = dict(self.values)
+        return {key: partial(self.evaluate, key, values=fixed) for key in self.funcs}
@@ -0,0 +1,350 @@
+"""
+Funciones definidas a trozos: trozos(...), abs, signo y escalón.
+La variable de la calculadora es un símbolo complejo, así que SymPy deriva
+abs(x) como una expresión con re(x) e im(x) que no se puede compilar. Las
+operaciones de este módulo se hacen sobre una variable real equivalente, de
+modo que las derivadas quedan con sign, Piecewise y DiracDelta. Al compilar,
+Piecewise se traduce a numpy.select (sin condicionales de Python) y
+DiracDelta a cero, su valor fuera del soporte. Los puntos donde cambia la
+rama (raíces de las condiciones) se usan para buscar extremos en las
+esquinas y cortar las curvas en los saltos.
+"""
+import mpmath
+import numpy as np
+import sympy as sp
+
+# Funciones de signo: simplify las reescribe como cocientes con Abs más largos
+SIGN_FUNCTIONS = (sp.Abs, sp.sign, sp.Heaviside, sp.DiracDelta)
+
+# Funciones cuyas expresiones se tratan como definidas a trozos
+PIECEWISE_FUNCTIONS = (sp.Piecewise,) + SIGN_FUNCTIONS
+
+# Funciones sin equivalente en NumPy/mpmath para lambdify
+NUMPY_FUNCTIONS = {
+    'DiracDelta': lambda x, order=0: np.zeros(np.shape(x)),
+}
+MPMATH_FUNCTIONS = {
+    'DiracDelta': lambda x, order=0: mpmath.mpf(0),
+    'Heaviside': lambda x, h0=0.5: mpmath.mpf(h0) if x == 0 else mpmath.mpf(x > 0),
+}
+
+# Paso relativo para evaluar f y f' a ambos lados de un punto de corte
+SIDE_STEP = 1e-7
+
+# Diferencia relativa a partir de la cual hay un salto en un punto de corte
+JUMP_TOLERANCE = 1e-4
+
+
+def trozos(*args):
+    """
+    Construye una función definida a trozos.
+
+    Se usa en la entrada como ``trozos(expr1, cond1, expr2, cond2, ...,
+    [expr_resto])``; gana la primera condición que se cumple. Las
+    condiciones admiten <, <=, >, >=, & (y) y | (o).
+
+    Args:
+        *args: Expresiones y condiciones alternadas, con una expresión
+            final opcional para el resto de la recta.
+
+    Returns:
+        sympy.Piecewise: Función a trozos.
+
+    Raises:
+        ValueError: Si faltan argumentos o una condición no es booleana.
+    """
+    if not args:
+        raise ValueError("trozos necesita al menos una expresión y una condición")
+    pieces = [(args[i], args[i + 1]) for i in range(0, len(args) - 1, 2)]
+    if len(args) % 2:
+        pieces.append((args[-1], sp.true))
+    for _, condition in pieces:
+        if not isinstance(sp.sympify(condition), sp.logic.boolalg.Boolean):
+            raise ValueError(f"Condición no válida en trozos: {condition}")
+    return sp.Piecewise(*pieces)
+
+
+def has_piecewise(expr):
+    """
+    Indica si una expresión tiene partes definidas a trozos.
+
+    Args:
+        expr (sympy.Expr): Expresión.
+
+    Returns:
+        bool: True si contiene Piecewise, Abs, sign, Heaviside o DiracDelta.
+    """
+    return isinstance(expr, sp.Basic) and expr.has(*PIECEWISE_FUNCTIONS)
+
+
+def real_variable(expr, x_symbol):
+    """
+    Sustituye la variable por un símbolo real.
+
+    Args:
+        expr (sympy.Expr): Expresión.
+        x_symbol (sympy.Symbol): Variable.
+
+    Returns:
+        tuple: (expresión, variable real).
+    """
+    x_real = sp.Dummy(x_symbol.name, real=True)
+    return expr.xreplace({x_symbol: x_real}), x_real
+
+
+def restore_variable(expr, x_real, x_symbol):
+    """Deshace ``real_variable`` en una expresión."""
+    return expr.xreplace({x_real: x_symbol})
+
+
+def drop_null_deltas(expr, x_symbol):
+    """
+    Elimina los términos g(x)·DiracDelta(h(x)) con g nula en los ceros de h.
+
+    Por ejemplo, x^2·DiracDelta(x) = 0, que aparece al derivar x^2·sign(x).
+
+    Args:
+        expr (sympy.Expr): Expresión.
+        x_symbol (sympy.Symbol): Variable (real).
+
+    Returns:
+        sympy.Expr: Expresión sin esos términos.
+    """
+    def is_null(term):
+        deltas = [f for f in term.args if isinstance(f, sp.DiracDelta) and len(f.args) == 1]
+        if len(deltas) != 1:
+            return False
+        coefficient = term / deltas[0]
+        try:
+            roots = sp.solveset(deltas[0].args[0], x_symbol, sp.S.Reals)
+        except Exception:
+            return False
+        return (isinstance(roots, sp.FiniteSet)
+                and all(coefficient.subs(x_symbol, root) == 0 for root in roots))
+
+    return expr.replace(lambda e: e.is_Mul and is_null(e), lambda e: sp.S.Zero)
+
+
+def real_diff(expr, x_symbol, order=1):
+    """
+    Deriva una expresión tratando la variable como real.
+
+    Args:
+        expr (sympy.Expr): Expresión.
+        x_symbol (sympy.Symbol): Variable de derivación.
+        order (int): Orden de la derivada.
+
+    Returns:
+        sympy.Expr: Derivada (con sign, Piecewise o DiracDelta si procede).
+    """
+    if not has_piecewise(expr):
+        return sp.diff(expr, x_symbol, order)
+    expr, x_real = real_variable(expr, x_symbol)
+    derivative = drop_null_deltas(sp.diff(expr, x_real, order), x_real)
+    return restore_variable(derivative, x_real, x_symbol)
+
+
+def explicit_branches(expr):
+    """
+    Reescribe Abs, sign y Heaviside como Piecewise y une las ramas.
+
+    Los términos DiracDelta se anulan (derivada clásica fuera de los cortes).
+
+    Args:
+        expr (sympy.Expr): Expresión en una variable real.
+
+    Returns:
+        sympy.Expr: Expresión con las ramas explícitas.
+    """
+    expr = expr.replace(lambda e: isinstance(e, sp.DiracDelta), lambda e: sp.S.Zero)
+    return sp.piecewise_fold(expr.rewrite(sp.Piecewise))
+
+
+def breakpoints(expr, x_symbol):
+    """
+    Obtiene los puntos en los que cambia la rama de una expresión a trozos.
+
+    Las condiciones con infinitos cortes (por ejemplo, sen(x) >= 0) no se
+    incluyen.
+
+    Args:
+        expr (sympy.Expr): Expresión en una variable real.
+        x_symbol (sympy.Symbol): Variable real.
+
+    Returns:
+        list: Puntos de corte (expresiones exactas) ordenados.
+    """
+    points = set()
+    for piecewise in explicit_branches(expr).atoms(sp.Piecewise):
+        for _, condition in piecewise.args:
+            for relation in condition.atoms(sp.core.relational.Relational):
+                try:
+                    roots = sp.solveset(relation.lhs - relation.rhs, x_symbol, sp.S.Reals)
+                except Exception:
+                    continue
+                if isinstance(roots, sp.FiniteSet):
+                    points.update(root for root in roots if root.is_real)
+    return sorted(points, key=float)
+
+
+def solve_branches(expr, x_symbol):
+    """
+    Resuelve expr = 0 rama a rama.
+
+    De cada rama solo se conservan las soluciones en las que esa rama es la
+    que se aplica. Una rama idénticamente nula aporta los puntos de su
+    región si son aislados (un tramo constante de f no los tiene).
+
+    Args:
+        expr (sympy.Expr): Expresión en una variable real.
+        x_symbol (sympy.Symbol): Variable real.
+
+    Returns:
+        list: Soluciones.
+    """
+    expr = explicit_branches(expr)
+    if not isinstance(expr, sp.Piecewise):
+        return sp.solve(expr, x_symbol)
+
+    solutions = []
+    previous = []
+    for branch, condition in expr.args:
+        if branch.is_zero:
+            try:
+                region = sp.And(condition, *[sp.Not(c) for c in previous]).as_set()
+            except NotImplementedError:
+                region = None
+            if isinstance(region, sp.FiniteSet):
+                solutions.extend(region)
+        else:
+            for solution in sp.solve(branch, x_symbol):
+                if (condition.subs(x_symbol, solution) == sp.true
+                        and all(c.subs(x_symbol, solution) == sp.false for c in previous)):
+                    solutions.append(solution)
+        previous.append(condition)
+    return solutions
+
+
+def _sides(func, point):
+    """Valores de func a la izquierda y a la derecha de un punto."""
+    step = SIDE_STEP * max(1.0, abs(point))
+    with np.errstate(all='ignore'):
+        values = np.asarray(func(np.array([point - step, point + step])), dtype=float)
+    return np.broadcast_to(values, (2,))
+
+
+def _jumps(func, point):
+    """Indica si func salta (o no es finita) en un punto."""
+    left, right = _sides(func, point)
+    if not (np.isfinite(left) and np.isfinite(right)):
+        return True
+    return abs(right - left) > JUMP_TOLERANCE * max(1.0, abs(left), abs(right))
+
+
+def discontinuities(expr, x_symbol):
+    """
+    Obtiene los saltos de una expresión a trozos.
+
+    Args:
+        expr (sympy.Expr): Expresión.
+        x_symbol (sympy.Symbol): Variable.
+
+    Returns:
+        list: Valores de x (float) de los puntos de corte con salto.
+    """
+    if not has_piecewise(expr):
+        return []
+    expr, x_real = real_variable(expr, x_symbol)
+    func = sp.lambdify(x_real, expr, modules=numeric_modules(('numpy', 'sympy')))
+    return [float(point) for point in breakpoints(expr, x_real) if _jumps(func, float(point))]
+
+
+def _side_direction(func, slope, point, value, side):
+    """
+    Indica si f queda por encima (1) o por debajo (-1) de f(point) a un lado.
+
+    Si hay salto decide el límite lateral; si no, el signo de la derivada
+    lateral (cambiado a la izquierda).
+
+    Args:
+        func (callable): Función numérica.
+        slope (callable): Derivada numérica.
+        point (float): Punto de corte.
+        value (float): f(point).
+        side (int): 0 para la izquierda, 1 para la derecha.
+
+    Returns:
+        int: 1, -1 o 0 si no se puede decidir (tramo constante, valor no finito).
+    """
+    limit = _sides(func, point)[side]
+    if not np.isfinite(limit):
+        return 0
+    if abs(limit - value) > JUMP_TOLERANCE * max(1.0, abs(limit), abs(value)):
+        return 1 if limit > value else -1
+    derivative = _sides(slope, point)[side]
+    if not np.isfinite(derivative) or derivative == 0:
+        return 0
+    direction = 1 if derivative > 0 else -1
+    return direction if side else -direction
+
+
+def breakpoint_extrema(expr, x_symbol, points=None):
+    """
+    Clasifica los puntos de corte que son extremos.
+
+    En un punto de corte f' puede no existir (la esquina de abs(x) en 0) y
+    f puede saltar, así que no se usa la segunda derivada: se compara f en
+    el punto con los límites laterales o, si f es continua por ese lado,
+    con el signo de la derivada lateral.
+
+    Args:
+        expr (sympy.Expr): Expresión en una variable real.
+        x_symbol (sympy.Symbol): Variable real.
+        points (list, optional): Puntos de corte ya calculados.
+
+    Returns:
+        list: Diccionarios {'x', 'y', 'type'}.
+    """
+    modules = numeric_modules(('numpy', 'sympy'))
+    func = sp.lambdify(x_symbol, expr, modules=modules)
+    slope = sp.lambdify(x_symbol, sp.diff(expr, x_symbol), modules=modules)
+    if points is None:
+        points = breakpoints(expr, x_symbol)
+
+    extrema = []
+    for point in points:
+        try:
+            y_val = float(expr.subs(x_symbol, point))
+        except (TypeError, ValueError):
+            continue
+        if not np.isfinite(y_val):
+            continue
+        x_val = float(point)
+        left = _side_direction(func, slope, x_val, y_val, 0)
+        right = _side_direction(func, slope, x_val, y_val, 1)
+        if left == right == 1:
+            point_type = "Mínimo"
+        elif left == right == -1:
+            point_type = "Máximo"
+        else:
+            continue
+        extrema.append({'x': x_val, 'y': y_val, 'type': point_type})
+    return extrema
+
+
+def numeric_modules(modules):
+    """
+    Añade a los módulos de lambdify las funciones a trozos que les faltan.
+
+    Args:
+        modules (iterable): Módulos para lambdify ('numpy', 'mpmath', ...).
+
+    Returns:
+        list: Módulos, precedidos de las traducciones necesarias.
+    """
+    modules = [modules] if isinstance(modules, str) else list(modules)
+    if 'numpy' in modules:
+        return [NUMPY_FUNCTIONS] + modules
+    if 'mpmath' in modules:
+        return [MPMATH_FUNCTIONS] + modules
+    return modules
@@ -40,12 +40,12 @@ class MathCanvas(FigureCanvas):
         for ax in self.axes.values():
             ax.grid(True, alpha=0.3)
         
-        # Aplicar estilo según el modo
-        self.set_dark_mode(dark_mode)
-        
         super(MathCanvas, self).__init__(self.fig)
         self.setParent(parent)
         
+        # Aplicar estilo según el modo (requiere el canvas ya inicializado)
+        self.set_dark_mode(dark_mode)
+        
         # Ajustar diseño
         self.fig.tight_layout()
     
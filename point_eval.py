@@ -0,0 +1,251 @@
+"""
+Evaluación de f, f' e ∫f en un punto con precisión adaptativa.
+Primero se usan las funciones compiladas en float64; si alguna suma de la
+expresión pierde demasiados dígitos por cancelación (o el resultado no es
+finito), se repite la evaluación con mpmath a la precisión pedida, subiendo
+la precisión de trabajo hasta que dos evaluaciones coinciden. Los resultados
+se memorizan por punto y precisión. Una expresión puede darse diferida, con
+una función float64 que la sustituye (por ejemplo, una derivada de orden
+alto por diferenciación automática): solo se construye si hace falta mpmath.
+"""
+import math
+from collections import OrderedDict
+
+import mpmath
+import numpy as np
+import sympy as sp
+
+from piecewise import numeric_modules
+
+# Dígitos significativos de float64
+FLOAT_DIGITS = 15
+
+# Dígitos perdidos por cancelación a partir de los cuales se usa mpmath
+CANCELLATION_DIGITS = 4
+
+# Dígitos de guarda y número máximo de duplicaciones de la precisión
+GUARD_DIGITS = 10
+MAX_REFINEMENTS = 4
+
+# Precisión predeterminada (dígitos) y resultados memorizados
+DEFAULT_DIGITS = 30
+CACHE_CAPACITY = 1024
+
+
+def _cancellation_terms(expr):
+    """
+    Obtiene, para cada suma de la expresión, la suma de los valores absolutos
+    de sus términos y la propia suma.
+
+    Args:
+        expr (sympy.Expr): Expresión a analizar.
+
+    Returns:
+        list: Pares (sum|t_i|, sum t_i) como expresiones.
+    """
+    adds = dict.fromkeys(node for node in sp.preorder_traversal(expr) if node.is_Add)
+    return [(sp.Add(*[sp.Abs(arg) for arg in node.args]), node) for node in adds]
+
+
+class PointEvaluator:
+    """
+    Evaluador de un conjunto de expresiones en puntos concretos.
+    """
+
+    def __init__(self, x_symbol, expressions, numeric=None):
+        """
+        Inicializa el evaluador; las funciones se compilan al primer uso.
+
+        Args:
+            x_symbol (sympy.Symbol): Variable independiente.
+            expressions (dict): Nombre -> expresión (por ejemplo 'function',
+                'derivative', 'integral'), o función sin argumentos que la
+                construye la primera vez que se necesita.
+            numeric (dict, optional): Nombre -> (función float64, nombre de la
+                expresión cuyas sumas estiman la cancelación). Sustituye a la
+                expresión compilada en la evaluación rápida.
+        """
+        self.x_symbol = x_symbol
+        self.expressions = dict(expressions)
+        self.numeric = dict(numeric or {})
+        self._float = {name: func for name, (func, _) in self.numeric.items()}
+        self._mpmath = {}
+        self._terms = {}
+        self._cache = OrderedDict()
+
+    def expression(self, name):
+        """
+        Obtiene una expresión, construyéndola si se dio diferida.
+
+        Args:
+            name (str): Nombre de la expresión.
+
+        Returns:
+            sympy.Expr: Expresión.
+        """
+        expr = self.expressions[name]
+        if not isinstance(expr, sp.Basic):
+            expr = self.expressions[name] = sp.sympify(expr())
+        return expr
+
+    def _compiled(self, table, name, builder):
+        """Obtiene una función compilada, construyéndola si aún no existe."""
+        if name not in table:
+            table[name] = builder(self.expression(name))
+        return table[name]
+
+    def cancellation_digits(self, name, x):
+        """
+        Estima los dígitos perdidos por cancelación al evaluar en float64.
+
+        Args:
+            name (str): Expresión a analizar.
+            x (float): Punto de evaluación.
+
+        Returns:
+            float: Máximo de log10(sum|t_i| / |sum t_i|) sobre las sumas de la
+                expresión (inf si alguna se anula exactamente). Las que tienen
+                función float64 propia se estiman con las sumas de la
+                expresión indicada, que su programa evalúa.
+        """
+        if name in self.numeric:
+            name = self.numeric[name][1]
+
+        def build(expr):
+            pairs = _cancellation_terms(expr)
+            if not pairs:
+                return None
+            return sp.lambdify(self.x_symbol, [list(pair) for pair in pairs],
+                               modules=numeric_modules(('numpy', 'sympy')), cse=True)
+
+        func = self._compiled(self._terms, name, build)
+        if func is None:
+            return 0.0
+
+        try:
+            with np.errstate(all='ignore'):
+                pairs = np.array(func(x), dtype=float).reshape(-1, 2)
+        except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+            # Sin estimación fiable (por ejemplo, términos complejos): usar mpmath
+            return math.inf
+        magnitude, total = np.abs(pairs[:, 0]), np.abs(pairs[:, 1])
+        lost = 0.0
+        for m, t in zip(magnitude, total):
+            if not (np.isfinite(m) and np.isfinite(t)) or m == 0:
+                continue
+            lost = max(lost, math.inf if t == 0 else math.log10(m / t))
+        return lost
+
+    def _evaluate_float(self, name, x):
+        """Evalúa en float64; devuelve None si el resultado no es un real finito."""
+        func = self._compiled(
+            self._float, name,
+            lambda expr: sp.lambdify(self.x_symbol, expr, modules=numeric_modules(('numpy', 'sympy')))
+        )
+        try:
+            with np.errstate(all='ignore'):
+                value = complex(func(x))
+        except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+            return None
+        if value.imag != 0 or not math.isfinite(value.real):
+            return None
+        return value.real
+
+    def _evaluate_mpmath(self, name, point, dps):
+        """Evalúa con mpmath a dps dígitos; devuelve None si no es un real finito."""
+        func = self._compiled(
+            self._mpmath, name,
+            lambda expr: sp.lambdify(self.x_symbol, expr, modules=numeric_modules('mpmath'))
+        )
+        with mpmath.workdps(dps):
+            try:
+                value = func(mpmath.mpmathify(point.evalf(dps)))
+            except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+                return None
+            if isinstance(value, mpmath.mpc):
+                if value.imag != 0:
+                    return None
+                value = value.real
+            value = mpmath.mpf(value)
+            if not mpmath.isfinite(value):
+                return None
+            return +value
+
+    def _refine(self, name, point, digits, lost):
+        """
+        Evalúa con mpmath duplicando la precisión hasta que el resultado se estabiliza.
+
+        Returns:
+            tuple: (valor mpf o None, dígitos de trabajo usados).
+        """
+        extra = 0 if math.isinf(lost) else int(math.ceil(lost))
+        dps = digits + extra + GUARD_DIGITS
+        previous = self._evaluate_mpmath(name, point, dps)
+        for _ in range(MAX_REFINEMENTS):
+            dps *= 2
+            current = self._evaluate_mpmath(name, point, dps)
+            if previous is None or current is None:
+                previous = current
+                if current is None:
+                    break
+                continue
+            with mpmath.workdps(dps):
+                if mpmath.almosteq(previous, current, rel_eps=mpmath.mpf(10) ** (-digits - 1), abs_eps=0):
+                    return current, dps
+                # Un cero exacto da residuos que se reducen con la precisión;
+                # un valor no nulo no cambia de magnitud al duplicarla
+                if current == 0 or mpmath.log10(abs(previous / current)) >= dps / 4:
+                    return mpmath.mpf(0), dps
+            previous = current
+        return previous, dps
+
+    def evaluate(self, point, digits=DEFAULT_DIGITS):
+        """
+        Evalúa todas las expresiones en un punto.
+
+        Args:
+            point (sympy.Expr): Punto exacto (por ejemplo, Rational(1, 10) o pi/4).
+            digits (int): Dígitos significativos pedidos si hace falta mpmath.
+
+        Returns:
+            dict: Nombre -> diccionario con 'value' (float, mpf o None si no
+                está definida), 'text', 'method' ('float64' o 'mpmath'),
+                'digits_lost' (dígitos perdidos por cancelación en float64) y
+                'working_digits' (precisión con la que se obtuvo el valor).
+        """
+        key = (point, int(digits))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        x = float(point)
+        results = {}
+        for name in self.expressions:
+            value = self._evaluate_float(name, x)
+            lost = self.cancellation_digits(name, x)
+            if value is not None and lost <= CANCELLATION_DIGITS:
+                # Solo se muestran los dígitos que sobreviven a la cancelación
+                shown = FLOAT_DIGITS - int(lost)
+                results[name] = {
+                    'value': value,
+                    'text': f"{value:.{shown}g}",
+                    'method': 'float64',
+                    'digits_lost': lost,
+                    'working_digits': FLOAT_DIGITS,
+                }
+                continue
+
+            value, dps = self._refine(name, point, digits, lost)
+            results[name] = {
+                'value': value,
+                'text': "No definida" if value is None else mpmath.nstr(value, digits),
+                'method': 'mpmath',
+                'digits_lost': lost,
+                'working_digits': dps,
+            }
+
+        self._cache[key] = results
+        while len(self._cache) > CACHE_CAPACITY:
+            self._cache.popitem(last=False)
+        return results
@@ -0,0 +1,238 @@
+"""
+Impresoras de expresiones en notación española.
+Genera directamente sen, ln, arcsen, ^ y · mientras recorre el árbol de la
+expresión, sin reemplazos de texto posteriores, y admite un límite de
+longitud para no construir cadenas enormes. Incluye también una variante
+LaTeX con los mismos nombres de funciones.
+"""
+from sympy import Mul, Pow, Rational, S
+from sympy.core.mul import _keep_coeff
+from sympy.printing.precedence import precedence
+from sympy.printing.latex import LatexPrinter
+from sympy.printing.str import StrPrinter
+
+# Nombres de SymPy -> notación mostrada al usuario
+FUNCTION_NAMES = {
+    'sin': 'sen',
+    'sinh': 'senh',
+    'log': 'ln',
+    'asin': 'arcsen',
+    'acos': 'arccos',
+    'atan': 'arctg',
+    'asinh': 'arcsenh',
+    'acosh': 'arccosh',
+    'atanh': 'arctgh',
+    'sign': 'signo',
+    'Abs': 'abs',
+}
+
+# Nombres de funciones en LaTeX que difieren de los de SymPy
+LATEX_FUNCTION_NAMES = {
+    'sin': r'\operatorname{sen}',
+    'sinh': r'\operatorname{senh}',
+    'asin': r'\operatorname{arcsen}',
+    'acos': r'\arccos',
+    'atan': r'\operatorname{arctg}',
+    'asinh': r'\operatorname{arcsenh}',
+    'acosh': r'\operatorname{arccosh}',
+    'atanh': r'\operatorname{arctgh}',
+}
+
+TIMES = '·'
+POWER = '^'
+ELLIPSIS = '…'
+
+
+def _defined_pieces(expr):
+    """Ramas de un Piecewise sin la final 'NaN en otro caso' (función no definida)."""
+    pieces = expr.args
+    if len(pieces) > 1 and pieces[-1].cond is S.true and pieces[-1].expr is S.NaN:
+        pieces = pieces[:-1]
+    return pieces
+
+
+class SpanishPrinter(StrPrinter):
+    """
+    Impresora de texto con la notación de la calculadora.
+    """
+
+    printmethod = '_spanish'
+
+    _default_settings = dict(StrPrinter._default_settings, max_length=None)
+
+    def __init__(self, settings=None):
+        """
+        Inicializa la impresora.
+
+        Args:
+            settings (dict, optional): Opciones de StrPrinter y 'max_length'
+                (número máximo aproximado de caracteres, None sin límite).
+        """
+        super().__init__(settings)
+        self._emitted = 0
+        self.truncated = False
+
+    def doprint(self, expr):
+        """
+        Convierte una expresión en texto.
+
+        Args:
+            expr (sympy.Basic): Expresión a imprimir.
+
+        Returns:
+            str: Texto en notación española, acortado con '…' si supera el
+                límite (el '…' cuenta dentro del límite).
+        """
+        self._emitted = 0
+        self.truncated = False
+        text = super().doprint(expr)
+
+        limit = self._settings['max_length']
+        if limit is not None and len(text) > limit:
+            self.truncated = True
+            text = text[:max(0, limit - len(ELLIPSIS))] + ELLIPSIS
+        return text
+
+    def _print(self, expr, **kwargs):
+        limit = self._settings['max_length']
+        if limit is not None and self._emitted >= limit:
+            # Superado el límite, el resto del árbol no se recorre
+            self.truncated = True
+            return ELLIPSIS
+
+        text = super()._print(expr, **kwargs)
+        if not getattr(expr, 'args', None):
+            self._emitted += len(text)
+        return text
+
+    def _print_Function(self, expr):
+        name = expr.func.__name__
+        return FUNCTION_NAMES.get(name, name) + "(%s)" % self.stringify(expr.args, ", ")
+
+    def _print_Piecewise(self, expr):
+        # Misma sintaxis que la entrada: trozos(expr1, cond1, ..., resto)
+        args = []
+        for branch, condition in _defined_pieces(expr):
+            args.append(self._print(branch))
+            if condition is not S.true:
+                args.append(self._print(condition))
+        return "trozos(%s)" % ", ".join(args)
+
+    def _print_Pow(self, expr, rational=False):
+        prec = precedence(expr)
+
+        if expr.exp is S.Half and not rational:
+            return "sqrt(%s)" % self._print(expr.base)
+
+        if expr.is_commutative:
+            if -expr.exp is S.Half and not rational:
+                return "1/sqrt(%s)" % self._print(expr.base)
+            if expr.exp is S.NegativeOne:
+                return "1/%s" % self.parenthesize(expr.base, prec, strict=False)
+
+        base = self.parenthesize(expr.base, prec, strict=False)
+        exponent = self.parenthesize(expr.exp, prec, strict=False)
+        return base + POWER + exponent
+
+    def _print_Mul(self, expr):
+        args = expr.args
+        if args[0] is S.One or any(
+                a.is_Number or (a.is_Pow and all(ai.is_Integer for ai in a.args))
+                for a in args[1:]):
+            # Producto sin evaluar: se imprime tal cual, factor a factor
+            prec = precedence(expr)
+            return TIMES.join(self.parenthesize(a, prec, strict=False) for a in args)
+
+        prec = precedence(expr)
+
+        c, e = expr.as_coeff_Mul()
+        if c < 0:
+            expr = _keep_coeff(-c, e)
+            sign = "-"
+        else:
+            sign = ""
+
+        if self.order not in ('old', 'none'):
+            factors = expr.as_ordered_factors()
+        else:
+            factors = Mul.make_args(expr)
+
+        # Separar numerador y denominador
+        numerator = []
+        denominator = []
+        for item in factors:
+            if item.is_commutative and item.is_Pow and bool(item.exp.as_coeff_Mul()[0] < 0):
+                if item.exp is S.NegativeOne:
+                    denominator.append(item.base)
+                else:
+                    denominator.append(Pow(item.base, -item.exp, evaluate=False))
+            elif item.is_Rational and item is not S.Infinity:
+                if item.p != 1:
+                    numerator.append(Rational(item.p))
+                if item.q != 1:
+                    denominator.append(Rational(item.q))
+            else:
+                numerator.append(item)
+
+        numerator = numerator or [S.One]
+        numerator_str = TIMES.join(self.parenthesize(a, prec, strict=False) for a in numerator)
+
+        if not denominator:
+            return sign + numerator_str
+        if len(denominator) == 1:
+            single = denominator[0]
+            text = self.parenthesize(single, prec, strict=False)
+            if single.is_Mul:
+                text = "(%s)" % text
+            return sign + numerator_str + "/" + text
+        denominator_str = TIMES.join(self.parenthesize(b, prec, strict=False) for b in denominator)
+        return sign + numerator_str + "/(%s)" % denominator_str
+
+
+def spanish_str(expr, max_length=None, order=None):
+    """
+    Convierte una expresión en texto con la notación de la calculadora.
+
+    Args:
+        expr (sympy.Basic): Expresión a imprimir.
+        max_length (int, optional): Longitud máxima aproximada del resultado.
+        order (str, optional): Orden de los términos ('none' evita ordenarlos).
+
+    Returns:
+        str: Texto de la expresión.
+    """
+    return SpanishPrinter({'max_length': max_length, 'order': order}).doprint(expr)
+
+
+class SpanishLatexPrinter(LatexPrinter):
+    """
+    Impresora LaTeX con los nombres de funciones de la calculadora.
+    """
+
+    _default_settings = dict(LatexPrinter._default_settings, ln_notation=True)
+
+    def _hprint_Function(self, func):
+        return LATEX_FUNCTION_NAMES.get(func) or super()._hprint_Function(func)
+
+    def _print_Piecewise(self, expr):
+        # mathtext no admite el entorno cases: una línea con llave izquierda
+        pieces = []
+        for branch, condition in _defined_pieces(expr):
+            if condition is S.true:
+                pieces.append(r"%s \;\mathrm{en\ otro\ caso}" % self._print(branch))
+            else:
+                pieces.append(r"%s \;\mathrm{si}\; %s" % (self._print(branch), self._print(condition)))
+        return r"\left\{ %s \right." % r",\; ".join(pieces)
+
+
+def spanish_latex(expr):
+    """
+    Convierte una expresión en LaTeX con la notación de la calculadora.
+
+    Args:
+        expr (sympy.Basic): Expresión a imprimir.
+
+    Returns:
+        str: Código LaTeX (sin delimitadores $).
+    """
+    return SpanishLatexPrinter().doprint(expr)
@@ -0,0 +1,351 @@
+"""
+Módulo para ejecutar el análisis simbólico en un proceso aislado.
+El proceso hijo se ejecuta con límites de memoria (RLIMIT_AS) y de tiempo de
+CPU (RLIMIT_CPU), y el proceso padre lo vigila y lo termina si excede el
+tiempo máximo. Así, entradas como x^100000 no pueden agotar la memoria de la
+aplicación.
+"""
+import signal
+import multiprocessing as mp
+
+import sympy as sp
+
+try:
+    import resource
+except ImportError:  # Windows no dispone de límites de recursos POSIX
+    resource = None
+
+# Límites predeterminados del proceso hijo
+DEFAULT_MEMORY_LIMIT_MB = 2048
+DEFAULT_CPU_LIMIT_S = 20
+DEFAULT_TIMEOUT_S = 30
+
+# Módulos que el servidor de procesos importa una sola vez: cada hijo nace de
+# él ya con SymPy y la lógica cargados, en lugar de importarlos (segundos)
+FORKSERVER_PRELOAD = ['sandbox', 'logic']
+
+# Señales con las que el núcleo termina un proceso al agotar RLIMIT_CPU
+# (SIGXCPU con el límite blando, SIGKILL con el duro)
+CPU_LIMIT_SIGNALS = tuple(
+    -sig for sig in (getattr(signal, 'SIGXCPU', None), getattr(signal, 'SIGKILL', None))
+    if sig is not None
+)
+
+
+def _get_context():
+    """
+    Obtiene el contexto de multiprocessing más seguro disponible.
+
+    'forkserver' evita duplicar los hilos de Qt del proceso padre; si no está
+    disponible se usa 'spawn'.
+
+    Returns:
+        multiprocessing.context.BaseContext: Contexto para crear procesos.
+    """
+    if 'forkserver' in mp.get_all_start_methods():
+        ctx = mp.get_context('forkserver')
+        # Solo tiene efecto antes de que arranque el servidor de procesos
+        ctx.set_forkserver_preload(FORKSERVER_PRELOAD)
+        return ctx
+    return mp.get_context('spawn')
+
+
+def _limit_resources(memory_mb, cpu_seconds):
+    """
+    Aplica los límites de recursos al proceso actual.
+
+    Args:
+        memory_mb (int): Memoria virtual máxima en MiB.
+        cpu_seconds (int): Tiempo máximo de CPU en segundos.
+    """
+    if resource is None:
+        return
+
+    if memory_mb:
+        limit = int(memory_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_seconds:
+        # El límite blando envía SIGXCPU; el duro, un segundo después, SIGKILL
+        resource.setrlimit(resource.RLIMIT_CPU, (int(cpu_seconds), int(cpu_seconds) + 1))
+
+
+def _analysis_task(func_str, order, integral_spec, verify):
+    """
+    Análisis completo de una función en el proceso hijo.
+
+    Además de la derivada, la integral y los puntos críticos, calcula el
+    rango de la gráfica, los intervalos de monotonía y concavidad y, si se
+    pide, la comprobación numérica, para que el proceso principal no tenga
+    que hacer ningún cálculo simbólico sin límites.
+
+    Args:
+        func_str (str): Función a analizar.
+        order (int): Orden de la derivada.
+        integral_spec: Especificación de la integral (ver ``MathHelper.run_analysis``).
+        verify (bool): Si es True, comprueba numéricamente los resultados.
+
+    Returns:
+        dict: Resultado con estado 'ok' (expresiones en formato srepr).
+    """
+    from logic import MathHelper
+
+    helper = MathHelper()
+    analysis = helper.run_analysis(func_str, order, integral_spec)
+    x_range = helper.get_suitable_range()
+    try:
+        intervals = helper.analyze_intervals(x_range)
+    except Exception as e:
+        print(f"Error al calcular los intervalos: {str(e)}")
+        intervals = None
+    checks = None
+    if verify:
+        try:
+            checks = helper.verify_results(x_range, integral_spec=integral_spec)
+        except Exception as e:
+            checks = str(e)
+    return {
+        'status': 'ok',
+        'function': sp.srepr(analysis['function']),
+        'derivative': sp.srepr(analysis['derivative']) if analysis['derivative'] is not None else None,
+        'integral': sp.srepr(analysis['integral']) if analysis['integral'] is not None else None,
+        'critical_points': analysis['critical_points'],
+        'order': order,
+        'integral_spec': integral_spec,
+        'x_range': tuple(float(v) for v in x_range),
+        'intervals': intervals,
+        'checks': checks,
+    }
+
+
+def _derivative_task(expr_text, symbol_text, order, simplify):
+    """
+    Derivada simbólica de una expresión en el proceso hijo.
+
+    Args:
+        expr_text (str): Expresión en formato srepr.
+        symbol_text (str): Variable de derivación en formato srepr.
+        order (int): Orden de la derivada.
+        simplify (bool): Ver ``logic.differentiate``.
+
+    Returns:
+        dict: Resultado con estado 'ok' y la derivada en formato srepr.
+    """
+    from logic import differentiate
+
+    derivative = differentiate(sp.sympify(expr_text), sp.sympify(symbol_text), order,
+                               simplify=simplify)
+    return {'status': 'ok', 'derivative': sp.srepr(derivative)}
+
+
+def _worker(conn, task, args, memory_mb, cpu_seconds):
+    """
+    Punto de entrada del proceso hijo.
+
+    Args:
+        conn (Connection): Extremo de escritura de la tubería hacia el padre.
+        task (callable): Tarea a ejecutar; devuelve el resultado (dict).
+        args (tuple): Argumentos de la tarea.
+        memory_mb (int): Memoria virtual máxima en MiB.
+        cpu_seconds (int): Tiempo máximo de CPU en segundos.
+    """
+    # Importar antes de limitar, para que el límite solo afecte al cálculo
+    import logic
+
+    _limit_resources(memory_mb, cpu_seconds)
+
+    try:
+        result = task(*args)
+    except MemoryError:
+        result = {
+            'status': 'too_expensive',
+            'reason': 'memory',
+            'message': f"se superó el límite de memoria ({memory_mb} MiB)",
+        }
+    except RecursionError:
+        result = {
+            'status': 'too_expensive',
+            'reason': 'recursion',
+            'message': "la expresión está demasiado anidada",
+        }
+    except Exception as e:
+        result = {'status': 'error', 'reason': 'error', 'message': str(e)}
+
+    try:
+        conn.send(result)
+    except MemoryError:
+        conn.send({
+            'status': 'too_expensive',
+            'reason': 'memory',
+            'message': "el resultado es demasiado grande",
+        })
+    finally:
+        conn.close()
+
+
+def _run_sandboxed(task, args, memory_mb, cpu_seconds, timeout):
+    """
+    Ejecuta una tarea en un proceso hijo vigilado.
+
+    Args:
+        task (callable): Tarea de este módulo (ver ``_worker``).
+        args (tuple): Argumentos de la tarea.
+        memory_mb (int): Memoria virtual máxima del hijo en MiB.
+        cpu_seconds (int): Tiempo máximo de CPU del hijo en segundos.
+        timeout (float): Tiempo real máximo antes de terminar el hijo.
+
+    Returns:
+        dict: Resultado de la tarea, o con 'status' 'too_expensive' o
+            'error' y las claves 'reason' y 'message'.
+    """
+    ctx = _get_context()
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_worker,
+        args=(sender, task, args, memory_mb, cpu_seconds),
+        daemon=True
+    )
+    process.start()
+    sender.close()
+
+    result = None
+    expired = killed = False
+    try:
+        # Vigilancia: esperar el resultado como máximo 'timeout' segundos
+        if receiver.poll(timeout):
+            result = receiver.recv()
+        else:
+            expired = True
+    except (EOFError, OSError):
+        # El hijo terminó sin enviar nada (por ejemplo, por SIGKILL)
+        result = None
+    finally:
+        receiver.close()
+        if not expired:
+            # La tubería se cerró: el hijo ya está terminando por sí mismo
+            process.join(timeout=1)
+        if process.is_alive():
+            process.kill()
+            killed = True
+        process.join()
+
+    if result is None:
+        if expired:
+            return {
+                'status': 'too_expensive',
+                'reason': 'timeout',
+                'message': f"se superó el tiempo máximo ({timeout} s)",
+            }
+        if not killed and process.exitcode in CPU_LIMIT_SIGNALS:
+            return {
+                'status': 'too_expensive',
+                'reason': 'cpu',
+                'message': f"se superó el límite de CPU ({cpu_seconds} s)",
+            }
+        return {
+            'status': 'error',
+            'reason': 'crash',
+            'message': f"el proceso de cálculo terminó inesperadamente (código {process.exitcode})",
+        }
+
+    return result
+
+
+def analyze_sandboxed(func_str, order=1, integral_spec=None, verify=False,
+                      memory_mb=DEFAULT_MEMORY_LIMIT_MB,
+                      cpu_seconds=DEFAULT_CPU_LIMIT_S,
+                      timeout=DEFAULT_TIMEOUT_S):
+    """
+    Analiza una función en un proceso hijo con límites de recursos.
+
+    Args:
+        func_str (str): Función a analizar.
+        order (int): Orden de la derivada.
+        integral_spec: None, 'indefinida' o una tupla (inferior, superior).
+        verify (bool): Si es True, también comprueba numéricamente los resultados.
+        memory_mb (int): Memoria virtual máxima del hijo en MiB.
+        cpu_seconds (int): Tiempo máximo de CPU del hijo en segundos.
+        timeout (float): Tiempo real máximo antes de terminar el hijo.
+
+    Returns:
+        dict: Resultado con 'status' igual a 'ok', 'too_expensive' o 'error'.
+            Si es 'ok', las expresiones se devuelven en formato srepr, junto
+            con el rango de la gráfica ('x_range'), sus intervalos
+            ('intervals') y las comprobaciones ('checks': lista de
+            CheckResult, texto del error o None); en otro caso incluye
+            'reason' y 'message'.
+    """
+    return _run_sandboxed(_analysis_task, (func_str, order, integral_spec, verify),
+                          memory_mb, cpu_seconds, timeout)
+
+
+def differentiate_sandboxed(expr, x_symbol, order=1, simplify=True,
+                            memory_mb=DEFAULT_MEMORY_LIMIT_MB,
+                            cpu_seconds=DEFAULT_CPU_LIMIT_S,
+                            timeout=DEFAULT_TIMEOUT_S):
+    """
+    Deriva una expresión en un proceso hijo con límites de recursos.
+
+    Sirve para las derivadas de orden alto que el análisis difiere y que
+    se piden después (texto de la derivada, evaluación con mpmath).
+
+    Args:
+        expr (sympy.Expr): Expresión a derivar.
+        x_symbol (sympy.Symbol): Variable de derivación.
+        order (int): Orden de la derivada.
+        simplify (bool): Ver ``logic.differentiate``.
+        memory_mb (int): Memoria virtual máxima del hijo en MiB.
+        cpu_seconds (int): Tiempo máximo de CPU del hijo en segundos.
+        timeout (float): Tiempo real máximo antes de terminar el hijo.
+
+    Returns:
+        sympy.Expr: Derivada, como la de ``logic.differentiate``.
+
+    Raises:
+        ValueError: Si el cálculo supera los límites o falla.
+    """
+    result = _run_sandboxed(_derivative_task, (sp.srepr(expr), sp.srepr(x_symbol), order, simplify),
+                            memory_mb, cpu_seconds, timeout)
+    if result['status'] != 'ok':
+        raise ValueError(f"El cálculo se interrumpió: {result['message']}")
+    return sp.sympify(result['derivative'])
+
+
+def restore_analysis(helper, result):
+    """
+    Carga en un MathHelper el resultado de un análisis aislado.
+
+    Los resultados se guardan en el almacén con los mismos nombres que usa
+    el propio MathHelper, de modo que nada se vuelve a calcular en este
+    proceso (por ejemplo, la derivada al compactarla o formatearla).
+
+    Args:
+        helper (MathHelper): Instancia donde cargar el estado.
+        result (dict): Resultado con estado 'ok' de ``analyze_sandboxed``.
+    """
+    store = helper.store
+    handle = store.handle(sp.sympify(result['function']))
+    function = handle.expr
+    order = result['order']
+    helper.current['handle'] = handle
+    helper.current['function'] = function
+    if result['derivative'] is not None:
+        helper.current['derivative'] = store.remember(
+            handle, ('derivative', order), sp.sympify(result['derivative']))
+    else:
+        # Derivada diferida: se calcula en este proceso si se pide el texto
+        helper.current['derivative'] = None
+    if result['integral'] is not None:
+        spec = result.get('integral_spec')
+        key = ('integral', *spec) if isinstance(spec, (tuple, list)) else ('integral',)
+        helper.current['integral'] = store.remember(handle, key, sp.sympify(result['integral']))
+    else:
+        helper.current['integral'] = None
+    helper.current['critical_points'] = store.remember(
+        handle, ('critical_points',), result['critical_points'])
+    if result.get('intervals') is not None:
+        store.remember(handle, ('intervals', tuple(result['x_range'])), result['intervals'])
+    helper.current['order'] = order
+    helper.current['parameters'] = sorted(
+        (s for s in function.free_symbols if s != helper.x_symbol),
+        key=lambda s: s.name
+    )
@@ -0,0 +1,714 @@
+"""
+Servicio HTTP/JSON con el mismo motor de cálculo que la interfaz gráfica.
+Se inicia con ``python main.py --serve`` (o ``python server.py``) y no usa
+PyQt. Cada operación (análisis, derivada, integral, puntos críticos y curvas
+muestreadas) se ejecuta en un grupo acotado de procesos. La derivada, la
+integral y los puntos críticos se calculan con ``analysis.analyze``, sin
+estado compartido; el análisis sintáctico y el muestreo usan el MathHelper
+propio de cada proceso. Las peticiones idénticas en
+curso se atienden con un único cálculo, cada petición tiene un tiempo máximo
+y /metrics publica histogramas de latencia y la tasa de aciertos de la caché.
+
+El tiempo máximo de una petición ('timeout') solo limita cuánto espera esa
+petición: el cálculo, compartido con las peticiones idénticas, se detiene
+siempre a los MAX_BUDGET_S segundos, y si termina después de que la petición
+deje de esperar su resultado queda en la caché para la siguiente.
+
+Rutas:
+    POST /parse, /derivative, /integral, /critical_points, /sample
+         Cuerpo JSON con 'function' y los parámetros de la operación;
+         'timeout' (segundos) limita el tiempo de la petición.
+    POST /rpc        Las mismas operaciones en formato JSON-RPC 2.0.
+    GET  /metrics    Métricas en formato de texto de Prometheus.
+    GET  /health     Estado del servicio.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import sympy as sp
+
+from logic import MathHelper
+from analysis import analyze, AnalysisOptions
+from intervals import evaluate
+from sandbox import _get_context, _limit_resources, DEFAULT_MEMORY_LIMIT_MB
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Procesos de cálculo y peticiones que pueden esperar a la vez
+DEFAULT_WORKERS = max(1, min(4, os.cpu_count() or 1))
+QUEUE_PER_WORKER = 8
+
+# Tiempo máximo de espera por petición (segundos): predeterminado y máximo
+# admitido; el máximo es también el tiempo máximo de cada cálculo
+DEFAULT_BUDGET_S = 10.0
+MAX_BUDGET_S = 60.0
+
+# Resultados guardados (número y tamaño total aproximado en bytes, medido en
+# JSON) y límites de las peticiones
+CACHE_CAPACITY = 1024
+CACHE_MAX_BYTES = 64 << 20
+MAX_BODY_BYTES = 1 << 20
+MAX_SAMPLE_POINTS = 100000
+
+# Límites superiores de los intervalos del histograma de latencia (segundos)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+OPERATIONS = ('parse', 'derivative', 'integral', 'critical_points', 'sample')
+
+# Opciones de ``analyze`` por operación: solo se calcula lo que se pide
+DERIVATIVE_OPTIONS = AnalysisOptions(critical_points=False)
+INTEGRAL_OPTIONS = AnalysisOptions(simplify=False, critical_points=False)
+
+HTTP_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 500: 'Internal Server Error',
+    503: 'Service Unavailable', 504: 'Gateway Timeout',
+}
+
+
+class RequestError(Exception):
+    """Error de una petición con su código de estado HTTP."""
+
+    def __init__(self, status, message):
+        """
+        Inicializa el error.
+
+        Args:
+            status (int): Código de estado HTTP.
+            message (str): Descripción del error.
+        """
+        super(RequestError, self).__init__(message)
+        self.status = status
+
+
+class BudgetExceeded(BaseException):
+    """
+    El cálculo superó su tiempo máximo.
+
+    Deriva de BaseException para que los ``except Exception`` de MathHelper
+    no lo confundan con un fallo del cálculo ni guarden un resultado vacío.
+    """
+
+
+# --- Procesos de trabajo -----------------------------------------------------
+
+# MathHelper de cada proceso de trabajo
+_helper = None
+
+
+def _init_worker(memory_mb):
+    """Limita la memoria del proceso y crea su MathHelper."""
+    global _helper
+    _limit_resources(memory_mb, None)
+    _helper = MathHelper()
+
+
+def _on_budget_exceeded(signum, frame):
+    """
+    Manejador de SIGALRM: interrumpe el cálculo en curso.
+
+    Args:
+        signum (int): Número de la señal.
+        frame (frame): Marco que se estaba ejecutando.
+
+    Raises:
+        BudgetExceeded: Siempre.
+    """
+    raise BudgetExceeded()
+
+
+def _float_or_none(value):
+    """Convierte a float; None si no es un real finito (JSON no admite NaN)."""
+    try:
+        value = complex(value)
+    except (TypeError, ValueError):
+        return None
+    if value.imag != 0 or not np.isfinite(value.real):
+        return None
+    return value.real
+
+
+def _function_text(params):
+    """Obtiene el texto de la función de la petición."""
+    func_str = params.get('function')
+    if not isinstance(func_str, str) or not func_str.strip():
+        raise ValueError("falta el campo 'function'")
+    return func_str
+
+
+def _set_function(params):
+    """Establece la función de la petición en el MathHelper del proceso."""
+    func_str = _function_text(params)
+    if not _helper.set_function(func_str):
+        raise ValueError(f"no se pudo analizar la función: {func_str}")
+    return _helper.current['function']
+
+
+def _operation_parse(params):
+    function = _set_function(params)
+    return {
+        'function': _helper.format_expression(function),
+        'srepr': sp.srepr(function),
+        'latex': sp.latex(function),
+        'parameters': [s.name for s in _helper.current['parameters']],
+    }
+
+
+def _operation_derivative(params):
+    order = int(params.get('order', 1))
+    if not 1 <= order <= 50:
+        raise ValueError("el orden debe estar entre 1 y 50")
+    derivative = analyze(_function_text(params), order, options=DERIVATIVE_OPTIONS).derivative
+    return {
+        'order': order,
+        'derivative': _helper.format_expression(derivative),
+        'srepr': sp.srepr(derivative),
+        'latex': sp.latex(derivative),
+    }
+
+
+def _operation_integral(params):
+    lower, upper = params.get('lower'), params.get('upper')
+    definite = lower is not None and upper is not None
+    integral_spec = (float(lower), float(upper)) if definite else 'indefinida'
+    analysis = analyze(_function_text(params), integral_spec=integral_spec,
+                       options=INTEGRAL_OPTIONS)
+    if analysis.integral is None:
+        raise ValueError(analysis.errors[0] if analysis.errors else "no se pudo calcular la integral")
+    integral = analysis.integral
+    result = {
+        'integral': _helper.format_expression(integral),
+        'srepr': sp.srepr(integral),
+        'latex': sp.latex(integral),
+    }
+    if definite:
+        result['value'] = _float_or_none(integral)
+    return result
+
+
+def _operation_critical_points(params):
+    analysis = analyze(_function_text(params))
+    if analysis.errors:
+        raise ValueError(analysis.errors[0])
+    return {'critical_points': [point.as_dict() for point in analysis.critical_points]}
+
+
+def _operation_sample(params):
+    _set_function(params)
+    x_min = float(params.get('x_min', -10))
+    x_max = float(params.get('x_max', 10))
+    points = int(params.get('points', 1000))
+    if not (np.isfinite(x_min) and np.isfinite(x_max) and x_min < x_max):
+        raise ValueError("rango no válido")
+    if not 2 <= points <= MAX_SAMPLE_POINTS:
+        raise ValueError(f"'points' debe estar entre 2 y {MAX_SAMPLE_POINTS}")
+    curves = params.get('curves', ['function', 'derivative'])
+    if not isinstance(curves, list) or not curves:
+        raise ValueError("'curves' debe ser una lista no vacía")
+
+    order = int(params.get('order', 1))
+    _helper.current['order'] = order
+    if 'derivative' in curves:
+        _helper.calculate_derivative(order)
+    if 'integral' in curves:
+        _helper.calculate_integral(False)
+
+    funcs = _helper.create_lambda_functions()
+    x_vals = np.linspace(x_min, x_max, points)
+    result = {'x': x_vals.tolist()}
+    for name in curves:
+        if name not in funcs:
+            raise ValueError(f"curva no disponible: {name}")
+        values = evaluate(funcs[name], x_vals)
+        result[name] = [None if np.isnan(v) else v for v in values.tolist()]
+    return result
+
+
+_OPERATIONS = {
+    'parse': _operation_parse,
+    'derivative': _operation_derivative,
+    'integral': _operation_integral,
+    'critical_points': _operation_critical_points,
+    'sample': _operation_sample,
+}
+
+
+def _run_operation(operation, params, budget):
+    """
+    Ejecuta una operación en el proceso de trabajo con un tiempo máximo.
+
+    La señal del tiempo máximo puede llegar a mitad de una escritura en el
+    MathHelper o en su almacén de expresiones, así que tras un tiempo
+    agotado se descartan y las peticiones siguientes usan unos nuevos.
+
+    Args:
+        operation (str): Nombre de la operación.
+        params (dict): Parámetros de la petición.
+        budget (float): Tiempo máximo en segundos.
+
+    Returns:
+        tuple: ('ok', resultado), ('error', mensaje) o ('timeout', mensaje).
+    """
+    global _helper
+    timer = hasattr(signal, 'setitimer')
+    if timer:
+        # Se repite cada 50 ms por si algún ``except:`` genérico absorbe la primera señal
+        signal.signal(signal.SIGALRM, _on_budget_exceeded)
+        signal.setitimer(signal.ITIMER_REAL, budget, 0.05)
+    try:
+        try:
+            result = ('ok', _OPERATIONS[operation](params))
+        finally:
+            if timer:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+    except BudgetExceeded:
+        _helper = MathHelper()
+        return ('timeout', f"se superó el tiempo máximo ({budget:g} s)")
+    except Exception as e:
+        return ('error', str(e))
+    return result
+
+
+# --- Métricas ----------------------------------------------------------------
+
+class ServerMetrics:
+    """
+    Contadores e histogramas de latencia del servicio.
+    """
+
+    def __init__(self):
+        """Inicializa las métricas."""
+        self.requests = {}      # (ruta, estado) -> peticiones
+        self.latency = {}       # ruta -> (cuentas por intervalo, suma, total)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.inflight = 0
+
+    def observe(self, route, status, seconds):
+        """
+        Registra una petición atendida.
+
+        Args:
+            route (str): Ruta de la petición.
+            status (int): Código de estado de la respuesta.
+            seconds (float): Latencia.
+        """
+        self.requests[(route, status)] = self.requests.get((route, status), 0) + 1
+        buckets, total, count = self.latency.get(route, ([0] * len(LATENCY_BUCKETS), 0.0, 0))
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                buckets[i] += 1
+        self.latency[route] = (buckets, total + seconds, count + 1)
+
+    def hit_ratio(self):
+        """float: Fracción de peticiones de cálculo servidas desde la caché."""
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    def render(self):
+        """
+        Genera las métricas en el formato de texto de Prometheus.
+
+        Returns:
+            str: Texto de las métricas.
+        """
+        lines = [
+            "# TYPE calc_requests_total counter",
+        ]
+        for (route, status), count in sorted(self.requests.items()):
+            lines.append(f'calc_requests_total{{route="{route}",status="{status}"}} {count}')
+
+        lines.append("# TYPE calc_request_duration_seconds histogram")
+        for route, (buckets, total, count) in sorted(self.latency.items()):
+            for bound, value in zip(LATENCY_BUCKETS, buckets):
+                lines.append(f'calc_request_duration_seconds_bucket{{route="{route}",le="{bound:g}"}} {value}')
+            lines.append(f'calc_request_duration_seconds_bucket{{route="{route}",le="+Inf"}} {count}')
+            lines.append(f'calc_request_duration_seconds_sum{{route="{route}"}} {total:.6f}')
+            lines.append(f'calc_request_duration_seconds_count{{route="{route}"}} {count}')
+
+        lines += [
+            "# TYPE calc_cache_hits_total counter",
+            f"calc_cache_hits_total {self.cache_hits}",
+            "# TYPE calc_cache_misses_total counter",
+            f"calc_cache_misses_total {self.cache_misses}",
+            "# TYPE calc_cache_hit_ratio gauge",
+            f"calc_cache_hit_ratio {self.hit_ratio():.6f}",
+            "# TYPE calc_coalesced_total counter",
+            f"calc_coalesced_total {self.coalesced}",
+            "# TYPE calc_timeouts_total counter",
+            f"calc_timeouts_total {self.timeouts}",
+            "# TYPE calc_rejected_total counter",
+            f"calc_rejected_total {self.rejected}",
+            "# TYPE calc_inflight gauge",
+            f"calc_inflight {self.inflight}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# --- Servicio ----------------------------------------------------------------
+
+class ComputeService:
+    """
+    Servicio de cálculo con grupo de procesos, caché y agrupación de peticiones.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, memory_mb=DEFAULT_MEMORY_LIMIT_MB,
+                 cache_capacity=CACHE_CAPACITY, cache_max_bytes=CACHE_MAX_BYTES):
+        """
+        Inicializa el servicio (los procesos se crean al primer cálculo).
+
+        Args:
+            workers (int): Número de procesos de cálculo.
+            memory_mb (int): Memoria máxima de cada proceso en MiB.
+            cache_capacity (int): Resultados guardados.
+            cache_max_bytes (int): Tamaño total aproximado de los resultados
+                guardados; los mayores que una cuarta parte no se guardan.
+        """
+        self.workers = workers
+        self.memory_mb = memory_mb
+        self.cache_capacity = cache_capacity
+        self.cache_max_bytes = cache_max_bytes
+        self.metrics = ServerMetrics()
+        self._executor = None
+        # Clave -> (resultado, tamaño aproximado), de la menos a la más usada
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._inflight = {}
+        self._slots = None
+
+    def _get_executor(self):
+        """Crea el grupo de procesos al primer uso."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=_get_context(),
+                initializer=_init_worker,
+                initargs=(self.memory_mb,),
+            )
+        return self._executor
+
+    def shutdown(self):
+        """Termina los procesos de cálculo."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _budget(params):
+        """Tiempo máximo de la petición, acotado a MAX_BUDGET_S."""
+        try:
+            budget = float(params.get('timeout', DEFAULT_BUDGET_S))
+        except (TypeError, ValueError):
+            raise RequestError(400, "'timeout' debe ser un número")
+        if not budget > 0:
+            raise RequestError(400, "'timeout' debe ser positivo")
+        return min(budget, MAX_BUDGET_S)
+
+    async def compute(self, operation, params):
+        """
+        Ejecuta una operación, reutilizando resultados y cálculos en curso.
+
+        El tiempo máximo de la petición solo limita la espera; las peticiones
+        agrupadas en un mismo cálculo esperan cada una según el suyo.
+
+        Args:
+            operation (str): Nombre de la operación (ver OPERATIONS).
+            params (dict): Parámetros de la petición.
+
+        Returns:
+            dict: Resultado de la operación.
+
+        Raises:
+            RequestError: Si la petición no es válida, se supera el tiempo
+                máximo o el servicio está saturado.
+        """
+        if operation not in OPERATIONS:
+            raise RequestError(404, f"operación desconocida: {operation}")
+        if not isinstance(params, dict):
+            raise RequestError(400, "los parámetros deben ser un objeto JSON")
+        budget = self._budget(params)
+
+        # La clave no incluye el tiempo máximo: solo cambia cuánto se espera
+        key = (operation, json.dumps({k: v for k, v in params.items() if k != 'timeout'},
+                                     sort_keys=True))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.metrics.cache_hits += 1
+            return cached[0]
+        self.metrics.cache_misses += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.metrics.coalesced += 1
+        else:
+            if self._slots is None:
+                self._slots = asyncio.Semaphore(self.workers * QUEUE_PER_WORKER)
+            if self._slots.locked():
+                self.metrics.rejected += 1
+                raise RequestError(503, "el servicio está saturado; inténtelo más tarde")
+            task = asyncio.ensure_future(self._submit(key, operation, params))
+            self._inflight[key] = task
+
+        try:
+            # shield: si esta petición deja de esperar, el cálculo sigue para las demás
+            status, value = await asyncio.wait_for(asyncio.shield(task), budget)
+        except asyncio.TimeoutError:
+            status, value = 'timeout', f"se superó el tiempo máximo ({budget:g} s)"
+
+        if status == 'ok':
+            return value
+        if status == 'timeout':
+            self.metrics.timeouts += 1
+            raise RequestError(504, value)
+        raise RequestError(400, value)
+
+    async def _submit(self, key, operation, params):
+        """
+        Envía el cálculo al grupo de procesos y guarda el resultado.
+
+        El cálculo no depende del tiempo máximo de la petición que lo inicia:
+        se detiene a los MAX_BUDGET_S segundos.
+        """
+        async with self._slots:
+            self.metrics.inflight += 1
+            try:
+                future = self._get_executor().submit(_run_operation, operation, params, MAX_BUDGET_S)
+                status, value = await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                # Un proceso murió (por ejemplo, por el límite de memoria): recrear el grupo
+                self.shutdown()
+                status, value = 'error', "el cálculo agotó los recursos del proceso"
+            finally:
+                self.metrics.inflight -= 1
+                self._inflight.pop(key, None)
+
+        if status == 'ok':
+            self._store(key, value)
+        return status, value
+
+    def _store(self, key, value):
+        """
+        Guarda un resultado en la caché, acotada en número y en tamaño.
+
+        Las curvas muestreadas pueden tener MAX_SAMPLE_POINTS puntos por
+        curva, así que el número de resultados no acota la memoria.
+        """
+        size = len(key[1]) + len(json.dumps(value))
+        if size > self.cache_max_bytes // 4:
+            return
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._cache_bytes -= previous[1]
+        self._cache[key] = (value, size)
+        self._cache_bytes += size
+        while len(self._cache) > self.cache_capacity or self._cache_bytes > self.cache_max_bytes:
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted
+
+
+class ComputeServer:
+    """
+    Servidor HTTP/1.1 mínimo sobre asyncio para ComputeService.
+    """
+
+    def __init__(self, service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Inicializa el servidor.
+
+        Args:
+            service (ComputeService): Servicio de cálculo.
+            host (str): Dirección de escucha.
+            port (int): Puerto (0 elige uno libre).
+        """
+        self.service = service
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self):
+        """
+        Empieza a escuchar conexiones.
+
+        Returns:
+            int: Puerto en el que escucha.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        """Atiende conexiones hasta que se cancele."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Deja de escuchar y termina los procesos de cálculo."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.service.shutdown()
+
+    async def _handle_connection(self, reader, writer):
+        """Atiende las peticiones de una conexión (con keep-alive)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "línea de petición no válida"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close' \
+                    and version == 'HTTP/1.1'
+                length = int(headers.get('content-length', 0) or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': "cuerpo demasiado grande"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                route = target.split('?', 1)[0]
+                began = time.perf_counter()
+                status, payload = await self._dispatch(method, route, body)
+                self.service.metrics.observe(route if status != 404 else 'desconocida',
+                                             status, time.perf_counter() - began)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, route, body):
+        """
+        Atiende una petición.
+
+        Returns:
+            tuple: (código de estado, cuerpo JSON o texto).
+        """
+        if route == '/metrics':
+            if method != 'GET':
+                return 405, {'error': "use GET"}
+            return 200, self.service.metrics.render()
+        if route == '/health':
+            return 200, {'status': 'ok', 'workers': self.service.workers}
+        if route == '/rpc':
+            return await self._dispatch_rpc(method, body)
+
+        operation = route.strip('/')
+        if operation not in OPERATIONS:
+            return 404, {'error': f"ruta desconocida: {route}"}
+        if method != 'POST':
+            return 405, {'error': "use POST con un cuerpo JSON"}
+        try:
+            params = json.loads(body or b'{}')
+            return 200, await self.service.compute(operation, params)
+        except json.JSONDecodeError:
+            return 400, {'error': "el cuerpo no es JSON válido"}
+        except RequestError as e:
+            return e.status, {'error': str(e)}
+        except Exception as e:
+            print(f"Error en el servicio: {str(e)}")
+            return 500, {'error': str(e)}
+
+    async def _dispatch_rpc(self, method, body):
+        """Atiende una llamada JSON-RPC 2.0."""
+        if method != 'POST':
+            return 405, {'error': "use POST"}
+        try:
+            call = json.loads(body or b'{}')
+        except json.JSONDecodeError:
+            return 200, {'jsonrpc': '2.0', 'id': None,
+                         'error': {'code': -32700, 'message': "JSON no válido"}}
+
+        call_id = call.get('id') if isinstance(call, dict) else None
+        if not isinstance(call, dict) or not isinstance(call.get('method'), str):
+            return 200, {'jsonrpc': '2.0', 'id': call_id,
+                         'error': {'code': -32600, 'message': "petición no válida"}}
+        try:
+            result = await self.service.compute(call['method'], call.get('params', {}))
+            return 200, {'jsonrpc': '2.0', 'id': call_id, 'result': result}
+        except RequestError as e:
+            code = -32601 if e.status == 404 else -32602 if e.status == 400 else -32000
+            return 200, {'jsonrpc': '2.0', 'id': call_id,
+                         'error': {'code': code, 'message': str(e), 'data': {'status': e.status}}}
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        """Escribe una respuesta HTTP."""
+        if isinstance(payload, str):
+            body = payload.encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            content_type = 'application/json; charset=utf-8'
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+def main(argv=None):
+    """
+    Inicia el servicio desde la línea de órdenes.
+
+    Args:
+        argv (list, optional): Argumentos (sin el nombre del programa).
+    """
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON de la calculadora de derivadas")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--memory', type=int, default=DEFAULT_MEMORY_LIMIT_MB,
+                        help="memoria máxima por proceso de cálculo (MiB)")
+    args = parser.parse_args(argv)
+
+    server = ComputeServer(ComputeService(args.workers, args.memory), args.host, args.port)
+
+    async def run():
+        port = await server.start()
+        print(f"Servicio de cálculo en http://{args.host}:{port} ({args.workers} procesos)")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
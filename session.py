@@ -0,0 +1,306 @@
+"""
+Instantáneas binarias de la sesión.
+Al salir se guardan en un único archivo el historial, la vista actual, los
+resultados simbólicos del almacén de expresiones (como srepr) y las curvas
+muestreadas de la caché. Al iniciar, el archivo se proyecta en memoria con
+mmap: solo se lee el índice comprimido, las expresiones se reconstruyen al
+recuperar cada resultado y las curvas se leen del disco al graficarlas.
+
+Formato del archivo:
+    cabecera   firma, versión, longitud del índice y posición de los datos
+    índice     JSON comprimido con zlib
+    datos      muestras (x, y) de las curvas, alineadas a 8 bytes
+"""
+import os
+import json
+import mmap
+import zlib
+import struct
+
+import numpy as np
+import sympy as sp
+
+from expression_store import PendingResult
+
+SESSION_MAGIC = b'CDSESION'
+SESSION_VERSION = 2
+
+# Firma, versión, longitud del índice comprimido y posición de los datos
+HEADER = struct.Struct('<8sIQQ')
+
+# Alineación de cada arreglo en la sección de datos
+DATA_ALIGNMENT = 8
+
+
+def _to_json_name(name):
+    """Convierte un nombre de resultado (tuplas anidadas) en listas JSON."""
+    if isinstance(name, tuple):
+        return [_to_json_name(part) for part in name]
+    return name
+
+
+def _from_json_name(name):
+    """Reconstruye un nombre de resultado a partir de listas JSON."""
+    if isinstance(name, list):
+        return tuple(_from_json_name(part) for part in name)
+    return name
+
+
+def _is_plain(value):
+    """Indica si un valor se guarda en JSON sin perder su tipo."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return True
+    if isinstance(value, list):
+        return all(_is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_plain(v) for k, v in value.items())
+    return False
+
+
+def encode_result(value):
+    """
+    Serializa un resultado del almacén de expresiones.
+
+    Args:
+        value: Resultado guardado (expresión, datos simples o PendingResult).
+
+    Returns:
+        dict: {'srepr': texto} o {'json': valor}, o None si el resultado no
+            se guarda (por ejemplo, funciones compiladas que se regeneran).
+    """
+    if isinstance(value, PendingResult):
+        return value.payload
+    if isinstance(value, sp.Basic):
+        return {'srepr': sp.srepr(value)}
+    if _is_plain(value):
+        return {'json': value}
+    return None
+
+
+def decode_result(payload):
+    """
+    Reconstruye un resultado serializado con ``encode_result``.
+
+    Args:
+        payload (dict): Resultado serializado.
+
+    Returns:
+        El resultado original.
+    """
+    if 'srepr' in payload:
+        return sp.sympify(payload['srepr'])
+    return payload['json']
+
+
+def _aligned(offset):
+    """Redondea una posición al siguiente múltiplo de DATA_ALIGNMENT."""
+    return -(-offset // DATA_ALIGNMENT) * DATA_ALIGNMENT
+
+
+def _curve_base(key, ids):
+    """
+    Separa la clave de una curva en la expresión guardada y un sufijo.
+
+    Las curvas de la propia expresión usan su clave; las derivadas (por
+    ejemplo, las de diferenciación automática) usan (clave, 'ad', orden).
+
+    Returns:
+        tuple: (clave de la expresión, sufijo), o (None, None) si la
+            expresión no se guarda.
+    """
+    if key in ids:
+        return key, ()
+    if isinstance(key, tuple) and key and key[0] in ids:
+        return key[0], key[1:]
+    return None, None
+
+
+def _pack_curves(curves, ids):
+    """
+    Calcula la posición de cada curva en la sección de datos.
+
+    Args:
+        curves (list): Resultado de ``CurveCache.snapshot``.
+        ids (dict): Clave de expresión -> identificador en la sesión.
+
+    Returns:
+        tuple: (índice de las curvas, lista de (posición, arreglo)).
+    """
+    arrays = []
+    curve_index = []
+    offset = 0
+    for key, x_min, x_max, resolution, x, y in curves:
+        base, suffix = _curve_base(key, ids)
+        if base is None:
+            continue
+        x = np.ascontiguousarray(x)
+        y = np.ascontiguousarray(y, dtype=x.dtype)
+        curve_index.append([ids[base], x_min, x_max, resolution,
+                            x.dtype.str, offset, int(x.size), _to_json_name(suffix)])
+        arrays.append((offset, x))
+        arrays.append((offset + x.nbytes, y))
+        offset = _aligned(offset + x.nbytes + y.nbytes)
+    return curve_index, arrays
+
+
+def _write_file(path, compressed, arrays):
+    """Escribe la cabecera, el índice comprimido y los datos de las curvas."""
+    data_offset = _aligned(HEADER.size + len(compressed))
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(SESSION_MAGIC, SESSION_VERSION, len(compressed), data_offset))
+        f.write(compressed)
+        for position, array in arrays:
+            f.seek(data_offset + position)
+            f.write(memoryview(array).cast('B'))
+
+
+def close_mapping(mapping, curve_cache=None):
+    """
+    Cierra la proyección en memoria de una sesión restaurada.
+
+    Las curvas aún proyectadas se copian antes a memoria.
+
+    Args:
+        mapping (mmap.mmap): Proyección devuelta por ``load_session``.
+        curve_cache (CurveCache, optional): Caché con curvas de la sesión.
+    """
+    if curve_cache is not None:
+        curve_cache.detach_session()
+    try:
+        mapping.close()
+    except BufferError as e:
+        # Alguna vista sobre el archivo sigue en uso fuera de la caché
+        print(f"Error al cerrar la sesión proyectada: {str(e)}")
+
+
+def save_session(path, history, view, store, curve_cache=None, mapping=None):
+    """
+    Guarda la sesión en un archivo binario.
+
+    El archivo se escribe aparte y luego sustituye al anterior. Si el
+    anterior está proyectado en memoria, la proyección se cierra antes de
+    sustituirlo (en Windows no se puede sustituir un archivo proyectado).
+
+    Args:
+        path (str): Ruta del archivo de sesión.
+        history (list): Entradas del historial (diccionarios), la más reciente primero.
+        view (dict): Estado de la vista actual.
+        store (ExpressionStore): Almacén de expresiones y resultados.
+        curve_cache (CurveCache, optional): Caché de curvas muestreadas.
+        mapping (mmap.mmap, optional): Proyección de la sesión restaurada.
+
+    Returns:
+        bool: True si se guardó correctamente.
+    """
+    try:
+        curves = curve_cache.snapshot() if curve_cache is not None else []
+        # Las curvas derivadas (clave, sufijo...) también conservan su expresión
+        curve_keys = {curve[0] for curve in curves}
+        curve_keys.update(key[0] for key in list(curve_keys) if isinstance(key, tuple) and key)
+
+        # Identificadores consecutivos para las expresiones guardadas
+        ids = {}
+        expressions = []
+        for key, expr, results in store.snapshot():
+            encoded = []
+            for name, value in results:
+                payload = encode_result(value)
+                if payload is not None:
+                    encoded.append([_to_json_name(name), payload])
+            if not encoded and key not in curve_keys:
+                continue
+            ids[key] = len(ids)
+            text = expr if isinstance(key, tuple) else sp.srepr(expr)
+            expressions.append([ids[key], text, encoded])
+
+        curve_index, arrays = _pack_curves(curves, ids)
+        del curves
+
+        index = {
+            'history': history,
+            'view': view,
+            'expressions': expressions,
+            'curves': curve_index,
+        }
+        compressed = zlib.compress(json.dumps(index, separators=(',', ':')).encode('utf-8'))
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temporary = path + '.tmp'
+        _write_file(temporary, compressed, arrays)
+        # Sin vistas locales sobre la proyección anterior, ya se puede cerrar
+        del arrays
+        if mapping is not None:
+            close_mapping(mapping, curve_cache)
+        os.replace(temporary, path)
+        return True
+    except Exception as e:
+        print(f"Error al guardar la sesión: {str(e)}")
+        return False
+
+
+def load_session(path, store, curve_cache=None):
+    """
+    Restaura una sesión guardada con ``save_session``.
+
+    Los resultados y las curvas se registran en el almacén y en la caché sin
+    reconstruirse: se decodifican o se leen del disco cuando se usan. Las
+    curvas son vistas sobre el archivo proyectado, que sigue abierto hasta
+    que se cierra con ``close_mapping`` (``save_session`` lo hace).
+
+    Args:
+        path (str): Ruta del archivo de sesión.
+        store (ExpressionStore): Almacén donde se registran los resultados.
+        curve_cache (CurveCache, optional): Caché donde se registran las curvas.
+
+    Returns:
+        dict: 'history', 'view' y 'mapping' (la proyección, o None si no
+            quedan curvas sobre ella), o None si no hay sesión válida.
+    """
+    if not os.path.exists(path):
+        return None
+
+    mapped = None
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, index_length, data_offset = HEADER.unpack_from(mapped, 0)
+        if magic != SESSION_MAGIC or version != SESSION_VERSION:
+            print("El archivo de sesión no es compatible; se ignora")
+            mapped.close()
+            return None
+        index = json.loads(zlib.decompress(mapped[HEADER.size:HEADER.size + index_length]))
+
+        records = {
+            text: (session_id, [(_from_json_name(name), payload) for name, payload in results])
+            for session_id, text, results in index['expressions']
+        }
+
+        if curve_cache is not None:
+            # Vistas de solo lectura sobre el archivo proyectado
+            curves = {}
+            for session_id, x_min, x_max, resolution, dtype, offset, count, suffix in index['curves']:
+                dtype = np.dtype(dtype)
+                start = data_offset + offset
+                x = np.frombuffer(mapped, dtype, count, start)
+                y = np.frombuffer(mapped, dtype, count, start + count * dtype.itemsize)
+                curves.setdefault(session_id, []).append(
+                    (x_min, x_max, resolution, x, y, _from_json_name(suffix))
+                )
+            curve_cache.preload(curves)
+            store.preload(records, decode_result, curve_cache.adopt)
+        else:
+            store.preload(records, decode_result)
+
+        if curve_cache is None or not index['curves']:
+            mapped.close()
+            mapped = None
+        return {'history': index['history'], 'view': index['view'], 'mapping': mapped}
+    except Exception as e:
+        print(f"Error al restaurar la sesión: {str(e)}")
+        if mapped is not None:
+            try:
+                mapped.close()
+            except BufferError:
+                pass
+        return None
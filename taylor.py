@@ -0,0 +1,115 @@
+"""
+Módulo para polinomios de Taylor/Maclaurin.
+Mantiene una torre de derivadas en caché: pasar del orden N al N+1 solo
+requiere una derivación y una sustitución más. Los polinomios se evalúan
+de forma vectorizada con el esquema de Horner.
+"""
+import numpy as np
+import sympy as sp
+
+from piecewise import real_diff
+
+
+class DerivativeTower:
+    """
+    Torre de derivadas sucesivas de una función con valores por punto.
+    """
+
+    def __init__(self, expr, x_symbol):
+        """
+        Inicializa la torre con la función original.
+
+        Args:
+            expr (sympy.Expr): Función f(x).
+            x_symbol (sympy.Symbol): Variable de derivación.
+        """
+        self.x_symbol = x_symbol
+        self.derivatives = [expr]
+        # Punto -> lista de valores f^(k)(punto) ya calculados
+        self._values = {}
+
+    def derivative(self, k):
+        """
+        Obtiene la derivada k-ésima, extendiendo la torre si hace falta.
+
+        Args:
+            k (int): Orden de la derivada.
+
+        Returns:
+            sympy.Expr: Derivada k-ésima (sin simplificar).
+        """
+        while len(self.derivatives) <= k:
+            # Derivada real: abs y signo dan sign y DiracDelta, no re/im
+            self.derivatives.append(real_diff(self.derivatives[-1], self.x_symbol))
+        return self.derivatives[k]
+
+    def values_at(self, point, order):
+        """
+        Obtiene f(punto), f'(punto), ..., f^(order)(punto).
+
+        Args:
+            point (sympy.Expr): Punto de desarrollo.
+            order (int): Orden máximo.
+
+        Returns:
+            list: Valores exactos de las derivadas en el punto.
+        """
+        values = self._values.setdefault(point, [])
+        for k in range(len(values), order + 1):
+            value = self.derivative(k).subs(self.x_symbol, point)
+            if value.has(sp.zoo, sp.nan, sp.oo, -sp.oo):
+                # Intentar con el límite si la sustitución directa no es finita
+                value = sp.limit(self.derivative(k), self.x_symbol, point)
+            if value.has(sp.zoo, sp.nan, sp.oo, -sp.oo):
+                raise ValueError(f"la derivada de orden {k} no es finita en el punto")
+            values.append(value)
+        return values[:order + 1]
+
+    def coefficients(self, point, order):
+        """
+        Obtiene los coeficientes del polinomio de Taylor en potencias de (x - punto).
+
+        Args:
+            point (sympy.Expr): Punto de desarrollo.
+            order (int): Orden del polinomio.
+
+        Returns:
+            list: Coeficientes exactos c_0, ..., c_order.
+        """
+        return [value / sp.factorial(k) for k, value in enumerate(self.values_at(point, order))]
+
+
+def taylor_polynomial(coefficients, point, x_symbol):
+    """
+    Construye la expresión simbólica del polinomio de Taylor.
+
+    Args:
+        coefficients (list): Coeficientes c_0, ..., c_n.
+        point (sympy.Expr): Punto de desarrollo.
+        x_symbol (sympy.Symbol): Variable independiente.
+
+    Returns:
+        sympy.Expr: Polinomio sum(c_k * (x - punto)^k).
+    """
+    shift = x_symbol - point
+    return sp.Add(*[c * shift**k for k, c in enumerate(coefficients)])
+
+
+def horner(coefficients, t):
+    """
+    Evalúa un polinomio con el esquema de Horner sobre un arreglo.
+
+    Args:
+        coefficients (array_like): Coeficientes c_0, ..., c_n (orden ascendente).
+        t (numpy.ndarray): Valores de la variable (x - punto).
+
+    Returns:
+        numpy.ndarray: Valores del polinomio.
+    """
+    t = np.asarray(t, dtype=float)
+    coefficients = np.asarray(coefficients, dtype=float)
+    result = np.full_like(t, coefficients[-1])
+    for c in coefficients[-2::-1]:
+        result *= t
+        result += c
+    return result
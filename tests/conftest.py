@@ -0,0 +1,23 @@
+"""
+Configuración común de las pruebas.
+Los módulos de la calculadora están en la raíz del repositorio (sin paquete),
+así que se añade al camino de importación.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Las pruebas de la interfaz se ejecutan sin pantalla
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """Aplicación Qt compartida por las pruebas de la interfaz."""
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
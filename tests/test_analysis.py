@@ -0,0 +1,43 @@
+"""Pruebas del análisis sin estado."""
+import dataclasses
+
+import pytest
+import sympy as sp
+
+from analysis import analyze, AnalysisOptions, CriticalPoint
+
+x = sp.Symbol('x')
+
+
+def test_analysis():
+    result = analyze('x^3 - 3x', integral_spec='indefinida')
+    assert result.derivative == 3*x**2 - 3
+    assert sp.diff(result.integral, x) == x**3 - 3*x
+    assert [(p.x, p.type) for p in result.critical_points] == [(-1.0, "Máximo"), (1.0, "Mínimo")]
+    assert result.errors == ()
+
+
+def test_definite_integral_and_options():
+    result = analyze(x**2, order=2, integral_spec=(0, 3),
+                     options=AnalysisOptions(critical_points=False))
+    assert result.derivative == 2
+    assert result.integral == 9
+    assert result.critical_points == ()
+
+
+def test_result_is_immutable():
+    result = analyze('sen(x)')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.order = 2
+    assert result.as_dict()['derivative'] == sp.cos(x)
+
+
+def test_critical_point_without_value():
+    assert CriticalPoint(1.0).as_dict() == {'x': 1.0, 'y': None, 'type': "Indeterminado"}
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        analyze('x^2', order=0)
+    with pytest.raises(ValueError):
+        analyze('x +* 2')
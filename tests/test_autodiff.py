@@ -0,0 +1,47 @@
+"""Pruebas de la diferenciación automática en modo Taylor."""
+import numpy as np
+import pytest
+import sympy as sp
+
+from autodiff import TaylorEvaluator, DerivativeFunction
+from logic import MathHelper, AD_ORDER_THRESHOLD
+
+x = sp.Symbol('x')
+
+FUNCTIONS = [
+    sp.sin(x) * sp.exp(x),
+    sp.log(x) / (1 + x**2),
+    sp.atan(x) ** 3,
+    sp.sqrt(x) * sp.cosh(x),
+    x ** x,
+    sp.tan(x) + sp.asinh(x),
+]
+
+
+@pytest.mark.parametrize('expr', FUNCTIONS, ids=str)
+def test_matches_symbolic_derivatives(expr):
+    order = 6
+    x_vals = np.linspace(0.3, 1.2, 7)
+    rows = TaylorEvaluator(expr, x, order).derivatives(x_vals)
+    for k in range(order + 1):
+        expected = sp.lambdify(x, sp.diff(expr, x, k), 'numpy')(x_vals)
+        np.testing.assert_allclose(rows[k], expected, rtol=1e-9)
+
+
+def test_derivative_function_accepts_scalars():
+    func = DerivativeFunction(TaylorEvaluator(x**3, x, 2), 2)
+    assert func(2.0) == pytest.approx(12.0)
+
+
+def test_unsupported_function_fails_at_compile_time():
+    with pytest.raises(NotImplementedError):
+        TaylorEvaluator(sp.erf(x) * x, x, 6)
+
+
+def test_high_order_derivative_falls_back_to_symbolic():
+    helper = MathHelper()
+    helper.set_function('erf(x)')
+    helper.current['order'] = AD_ORDER_THRESHOLD + 1
+    derivative = helper.create_lambda_functions()['derivative']
+    expected = sp.lambdify(x, sp.diff(sp.erf(x), x, AD_ORDER_THRESHOLD + 1), 'numpy')
+    np.testing.assert_allclose(derivative(np.array([0.5, 1.0])), expected(np.array([0.5, 1.0])))
@@ -0,0 +1,56 @@
+"""Pruebas de las utilidades del banco de pruebas de renderizado."""
+import pytest
+
+import benchmark
+from benchmark import STAGES, summarize, synthetic_critical_points, compare_reports
+
+
+def _report(total_ms, key='MathPlotCanvas/polinomio'):
+    stages = {stage: {'median_ms': 1.0} for stage in STAGES}
+    stages['total'] = {'median_ms': total_ms}
+    return {'results': {key: {'stages': stages}}}
+
+
+def test_summarize_converts_to_milliseconds():
+    samples = [{stage: value for stage in STAGES} for value in (0.001, 0.003, 0.002)]
+    summary = summarize(samples)
+    assert summary['draw'] == {'median_ms': 2.0, 'min_ms': 1.0, 'mean_ms': 2.0, 'max_ms': 3.0}
+
+
+def test_synthetic_critical_points_stay_inside_the_range():
+    points = synthetic_critical_points((-3, 3), 4)
+    assert len(points) == 4
+    assert all(-3 < p['x'] < 3 for p in points)
+    assert points[0]['type'] == "Máximo" and points[3]['type'] == "Indeterminado"
+    assert synthetic_critical_points((0, 1), 0) == []
+
+
+def test_compare_reports():
+    assert compare_reports(_report(12.0), _report(10.0), 0.25) == []
+    regressions = compare_reports(_report(13.0), _report(10.0), 0.25)
+    assert len(regressions) == 1 and '[total]' in regressions[0]
+    # Casos nuevos y etapas demasiado pequeñas no se comparan
+    assert compare_reports(_report(13.0, key='otro'), _report(10.0), 0.25) == []
+    assert compare_reports(_report(0.4), _report(0.1), 0.25) == []
+
+
+def test_build_lambda_functions():
+    funcs = benchmark.build_lambda_functions("x^3 - 3x")
+    assert funcs['derivative'](2.0) == 9.0
+
+
+def test_stage_clock_keeps_the_expression_key():
+    funcs = benchmark.build_lambda_functions("x^2")
+    clock = benchmark._StageClock()
+    timed = clock.wrap(funcs['function'])
+    assert timed.key == funcs['function'].key
+    assert timed(3.0) == 9.0 and clock.elapsed > 0
+
+
+def test_baseline_cannot_be_the_output_report(tmp_path, capsys):
+    baseline = tmp_path / benchmark.REPORT_FILENAME
+    baseline.write_text('{"results": {}}', encoding='utf-8')
+    with pytest.raises(SystemExit):
+        benchmark.main(['--baseline', str(baseline), '--output', str(tmp_path)])
+    assert "--baseline" in capsys.readouterr().err
+    assert baseline.read_text(encoding='utf-8') == '{"results": {}}'
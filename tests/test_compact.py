@@ -0,0 +1,44 @@
+"""Pruebas de la representación compacta de expresiones grandes."""
+import numpy as np
+import sympy as sp
+
+from compact import CompactExpression, expression_size, is_large
+
+x = sp.Symbol('x')
+
+LARGE = sp.diff(sp.exp(sp.sin(x)) / (1 + x**2), x, 6)
+
+
+def test_expression_size_counts_shared_subtrees_once():
+    tree, dag = expression_size(sp.sin(x) + sp.sin(x)**2)
+    assert tree > dag
+
+
+def test_large_derivative_is_detected():
+    assert is_large(LARGE)
+    assert not is_large(x**2 + 1)
+
+
+def test_round_trip():
+    compact = CompactExpression(LARGE)
+    assert compact.replacements
+    assert compact.expand() == LARGE
+
+
+def test_does_not_keep_the_full_tree():
+    compact = CompactExpression(LARGE)
+    assert not hasattr(compact, '_expanded')
+    assert compact.stats()['compact_nodes'] < compact.stats()['tree_nodes']
+
+
+def test_compiled_form_matches_expression():
+    compact = CompactExpression(LARGE)
+    x_vals = np.linspace(-1.0, 1.0, 9)
+    expected = sp.lambdify(x, LARGE, 'numpy')(x_vals)
+    np.testing.assert_allclose(compact.lambdify(x)(x_vals), expected, rtol=1e-12)
+
+
+def test_names_avoid_existing_symbols():
+    u1 = sp.Symbol('u1')
+    expr = sp.diff(sp.exp(sp.sin(x * u1)), x, 4)
+    assert CompactExpression(expr).expand() == expr
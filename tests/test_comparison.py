@@ -0,0 +1,63 @@
+"""Pruebas de la comparación de varias funciones."""
+import time
+
+import numpy as np
+import pytest
+
+from comparison import FunctionComparison, split_functions
+from logic import MathHelper
+
+
+@pytest.fixture
+def comparison():
+    comparison = FunctionComparison(MathHelper(), max_workers=1)
+    yield comparison
+    comparison.shutdown()
+
+
+def test_split_functions():
+    assert split_functions(" sen(x); x^2 ;; e^x ") == ["sen(x)", "x^2", "e^x"]
+
+
+def test_constant_curves_are_kept(comparison):
+    entries = comparison.analyze(["2*x", "x^2"], order=2)
+    curves = comparison.curves(entries, ["a", "b"]).evaluate(np.linspace(-1.0, 1.0, 5))
+    values, labels = curves['derivative']
+    assert labels == ["a", "b"]
+    np.testing.assert_allclose(values, [[0.0] * 5, [2.0] * 5])
+
+
+def test_definite_integrals_are_not_curves(comparison):
+    entries = comparison.analyze(["x", "3"], order=1, integral_spec=(0, 1))
+    assert [float(entry['integral']) for entry in entries] == [0.5, 3.0]
+    curves = comparison.curves(entries, ["a", "b"]).evaluate(np.linspace(0.0, 1.0, 3))
+    assert 'integral' not in curves
+    np.testing.assert_allclose(curves['function'][0], [[0.0, 0.5, 1.0], [3.0, 3.0, 3.0]])
+
+
+def test_indefinite_integral_curves(comparison):
+    entries = comparison.analyze(["1"], order=1, integral_spec='indefinida')
+    curves = comparison.curves(entries, ["a"]).evaluate(np.array([0.0, 2.0]))
+    np.testing.assert_allclose(curves['integral'][0], [[0.0, 2.0]])
+
+
+def test_timeout_terminates_running_workers():
+    comparison = FunctionComparison(MathHelper(), max_workers=2)
+    executor = comparison._get_executor()
+    processes = set()
+    submit = executor.submit
+
+    def tracking_submit(*args, **kwargs):
+        future = submit(*args, **kwargs)
+        processes.update(executor._processes.values())
+        return future
+
+    executor.submit = tracking_submit
+    start = time.monotonic()
+    # Dos análisis lentos (solve de f'): el plazo es común a ambos
+    with pytest.raises(ValueError, match="tiempo máximo"):
+        comparison.analyze(['sin(x)*x^3', 'cos(x)*x^3'], timeout=1.0)
+    assert time.monotonic() - start < 4.0
+    assert processes
+    assert not any(process.is_alive() for process in processes)
+    assert comparison._executor is None
@@ -0,0 +1,76 @@
+"""Pruebas del cursor en cruz sobre las gráficas."""
+import numpy as np
+import pytest
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+from gui.crosshair import Crosshair
+
+
+@pytest.fixture
+def crosshair(qapp):
+    fig = Figure()
+    canvas = FigureCanvasQTAgg(fig)
+    names = ('function', 'derivative', 'integral', 'combined')
+    axes = dict(zip(names, fig.subplots(2, 2).flat))
+    cursor = Crosshair(canvas, axes)
+
+    x = np.linspace(-2, 2, 401)
+    # f no está definida en (0.5, 1): las muestras se filtraron
+    keep = (x <= 0.5) | (x >= 1)
+    curves = {'function': (x[keep], x[keep] ** 2), 'derivative': (x, 2 * x)}
+    funcs = {'function': lambda v: v ** 2, 'derivative': lambda v: 2 * v,
+             'integral': lambda v: v ** 3 / 3}
+    cursor.set_curves(curves, funcs)
+    for name, (cx, cy) in curves.items():
+        axes[name].plot(cx, cy)
+    canvas.draw()
+    return cursor
+
+
+def _move(cursor, name, x):
+    ax = cursor.axes[name]
+    px, py = ax.transData.transform((x, 0.5))
+    event = MouseEvent('motion_notify_event', cursor.canvas, px, py)
+    cursor.canvas.callbacks.process('motion_notify_event', event)
+
+
+def test_only_sampled_curves_are_tracked(crosshair):
+    assert set(crosshair.curves) == {'function', 'derivative'}
+    assert set(crosshair.funcs) == {'function', 'derivative'}
+
+
+def test_interpolation_does_not_cross_gaps(crosshair):
+    assert crosshair.interpolate('function', 0.25) == pytest.approx(0.0625, abs=1e-4)
+    assert np.isnan(crosshair.interpolate('function', 0.75))
+    assert np.isnan(crosshair.interpolate('function', 3.0))
+    assert crosshair.interpolate('derivative', -2.0) == -4.0
+
+
+def test_motion_shows_interpolated_then_exact_values(crosshair):
+    _move(crosshair, 'function', 0.3)
+    assert crosshair._x == pytest.approx(0.3, abs=1e-6)
+
+    crosshair._render()
+    text = crosshair._artists['text']
+    assert text.get_visible() and "≈" in text.get_text()
+
+    crosshair._evaluate_exact()
+    lines = text.get_text().splitlines()
+    assert "≈" not in lines[0]
+    assert lines[1] == f"f(x) = {crosshair._x ** 2:.6g}"
+    assert lines[3].startswith("pendiente = 0.6")
+    assert crosshair._artists['tangent'].get_visible()
+
+
+def test_undefined_point_and_leave(crosshair):
+    _move(crosshair, 'function', 0.75)
+    crosshair._render()
+    text = crosshair._artists['text']
+    assert "f(x) no definida" in text.get_text()
+    assert not crosshair._artists['markers']['function'].get_visible()
+
+    crosshair._on_leave(None)
+    assert crosshair._x is None
+    assert not any(artist.get_visible() for artist in crosshair._iter_artists())
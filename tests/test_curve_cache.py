@@ -0,0 +1,76 @@
+"""Pruebas de la caché de curvas muestreadas."""
+import os
+
+import numpy as np
+
+from curve_cache import CurveCache
+
+# Bytes de una curva de 100 puntos en float32 (x e y)
+CURVE_BYTES = 2 * 100 * 4
+
+
+def _curve(cache, i):
+    x = np.linspace(0, 1, 100)
+    return cache.put(cache.make_key(i, (0, 1), 100), x, x * i)
+
+
+def _spilled_files(directory):
+    return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+
+def test_put_filters_non_finite_values():
+    cache = CurveCache()
+    x = np.array([0.0, 1.0, 2.0])
+    key = cache.make_key('f', (0, 2), 3)
+    x_stored, y_stored = cache.put(key, x, np.array([1.0, np.nan, np.inf]))
+    assert x_stored.tolist() == [0.0] and y_stored.tolist() == [1.0]
+    assert x_stored.dtype == np.float32
+    assert cache.get(key)[1].tolist() == [1.0]
+
+
+def test_values_out_of_float32_range_are_filtered():
+    cache = CurveCache()
+    x = np.linspace(0.0, 100.0, 5)
+    # exp(100) ~ 2.7e43 es finito en float64 pero no en float32
+    x_stored, y_stored = cache.put(cache.make_key('exp', (0, 100), 5), x, np.exp(x))
+    assert np.isfinite(y_stored).all()
+    assert x_stored.tolist() == [0.0, 25.0, 50.0, 75.0]
+    np.testing.assert_allclose(y_stored, np.exp(x_stored), rtol=1e-6)
+
+
+def test_spilled_curves_reload_from_disk(tmp_path):
+    cache = CurveCache(memory_budget=CURVE_BYTES, spill_dir=str(tmp_path))
+    for i in range(3):
+        _curve(cache, i)
+    assert cache.stats()['spilled'] == 2
+    x, y = cache.get(cache.make_key(1, (0, 1), 100))
+    assert isinstance(y, np.memmap)
+    np.testing.assert_allclose(y, np.linspace(0, 1, 100), rtol=1e-6)
+
+
+def test_disk_budget_evicts_and_deletes_files(tmp_path):
+    cache = CurveCache(memory_budget=CURVE_BYTES, disk_budget=2 * CURVE_BYTES,
+                       spill_dir=str(tmp_path))
+    for i in range(10):
+        _curve(cache, i)
+    stats = cache.stats()
+    assert stats['disk_bytes'] <= 2 * CURVE_BYTES
+    assert stats['entries'] == 3
+    # Solo quedan los archivos de las curvas volcadas que siguen en la caché
+    assert len(_spilled_files(tmp_path)) == 2 * stats['spilled']
+    # Las curvas más recientes sobreviven, las más antiguas se descartaron
+    assert cache.get(cache.make_key(9, (0, 1), 100)) is not None
+    assert cache.get(cache.make_key(0, (0, 1), 100)) is None
+
+
+def test_discard_and_clear_remove_files(tmp_path):
+    spill_dir = tmp_path / 'curvas'
+    cache = CurveCache(memory_budget=0, spill_dir=str(spill_dir))
+    for i in range(2):
+        _curve(cache, i)
+    assert len(_spilled_files(spill_dir)) == 4
+    cache.discard(cache.make_key(0, (0, 1), 100))
+    assert len(_spilled_files(spill_dir)) == 2
+    cache.clear()
+    assert _spilled_files(spill_dir) == []
+    assert cache.stats()['disk_bytes'] == 0
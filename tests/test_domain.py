@@ -0,0 +1,63 @@
+"""Pruebas del dominio real de las funciones graficadas."""
+import numpy as np
+import sympy as sp
+
+from domain import real_domain, domain_mask, domain_breaks, insert_breaks, DomainAnalyzer
+from expression_store import ExpressionStore
+
+x = sp.Symbol('x')
+
+
+def test_real_domain():
+    assert real_domain(sp.log(x)) == sp.Interval.open(0, sp.oo)
+    assert real_domain(sp.sqrt(x - 1)) == sp.Interval(1, sp.oo)
+    assert real_domain(sp.Integer(3)) is sp.S.Reals
+    # Con parámetros libres no se analiza
+    assert real_domain(sp.log(x * sp.Symbol('a'))) is None
+
+
+def test_mask_and_breaks_of_a_pole():
+    grid = np.linspace(-2, 2, 5)
+    domain = real_domain(1 / (x - 1))
+    np.testing.assert_array_equal(domain_mask(domain, grid), grid != 1)
+    np.testing.assert_array_equal(domain_breaks(domain, -2, 2), [1.0])
+
+
+def test_periodic_poles():
+    domain = real_domain(sp.tan(x))
+    breaks = domain_breaks(domain, -4, 4)
+    np.testing.assert_allclose(breaks, [-np.pi / 2, np.pi / 2])
+
+
+def test_insert_breaks():
+    xs = np.array([0.0, 1.0, 2.0, 3.0, 6.0, 7.0])
+    ys = xs * 2
+    new_x, new_y = insert_breaks(xs, ys, breaks=[1.5], step=1.0)
+    assert np.isnan(new_x).sum() == 2
+    np.testing.assert_array_equal(np.flatnonzero(np.isnan(new_y)), [2, 5])
+    # Sin cortes se devuelven los mismos arreglos
+    assert insert_breaks(xs, ys)[0] is xs
+
+
+def test_analyzer_evaluates_only_inside_the_domain():
+    store = ExpressionStore()
+    analyzer = DomainAnalyzer(store)
+    func = store.lambdify(x, sp.sqrt(x))
+    grid = np.linspace(-1, 1, 5)
+    with np.errstate(all='raise'):
+        values = analyzer.evaluate(func, grid)
+    assert np.isnan(values[:2]).all()
+    np.testing.assert_allclose(values[2:], np.sqrt(grid[2:]))
+    np.testing.assert_array_equal(analyzer.breaks(func, (-1, 1)), [0.0])
+
+
+def test_analyzer_falls_back_when_the_domain_is_too_narrow():
+    store = ExpressionStore()
+    analyzer = DomainAnalyzer(store)
+    func = store.lambdify(x, x + 1)
+    # Un dominio simbólico más estrecho que el numérico se descarta
+    analyzer._domains[func.key] = sp.Interval(0, 1)
+    grid = np.linspace(-1, 1, 5)
+    assert analyzer.mask(func, grid) is None
+    assert analyzer.domain(func) is None
+    np.testing.assert_allclose(analyzer.evaluate(func, grid), grid + 1)
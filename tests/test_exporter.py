@@ -0,0 +1,71 @@
+"""Pruebas de la exportación de tablas."""
+import csv
+
+import numpy as np
+import pytest
+
+from exporter import (export_table, row_count, available_formats, ExportCancelled,
+                      COLUMN_NAMES, pyarrow)
+
+FUNCS = {
+    'function': lambda x: x ** 2,
+    'derivative': lambda x: 2 * x,
+    'integral': lambda x: np.log(x),
+}
+
+
+def test_row_count_includes_the_end():
+    assert row_count(0.0, 1.0, 0.1) == 11
+    with pytest.raises(ValueError):
+        row_count(1.0, 0.0, 0.1)
+    with pytest.raises(ValueError):
+        row_count(0.0, 1.0, 0.0)
+
+
+def test_npy_in_chunks(tmp_path):
+    path = str(tmp_path / 'tabla.npy')
+    progress = []
+    rows = export_table(FUNCS, -1.0, 1.0, 0.01, path, chunk_rows=50,
+                        progress=lambda done, total, remaining: progress.append((done, total)))
+    table = np.load(path)
+    assert rows == table.shape[0] == 201
+    assert progress[-1] == (201, 201) and len(progress) == 5
+    x = table[:, 0]
+    np.testing.assert_allclose(x, -1.0 + 0.01 * np.arange(201))
+    np.testing.assert_allclose(table[:, 1], x ** 2)
+    # ln(x) no es real para x <= 0
+    assert np.isnan(table[x <= 0, 3]).all()
+
+
+def test_csv_header_and_values(tmp_path):
+    path = str(tmp_path / 'tabla.csv')
+    export_table({'function': FUNCS['function']}, 0.0, 2.0, 1.0, path)
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["x", COLUMN_NAMES['function']]
+    assert [[float(v) for v in row] for row in rows[1:]] == [[0.0, 0.0], [1.0, 1.0], [2.0, 4.0]]
+
+
+def test_cancel_removes_partial_file(tmp_path):
+    path = tmp_path / 'tabla.npy'
+    with pytest.raises(ExportCancelled):
+        export_table(FUNCS, 0.0, 1.0, 0.001, str(path), chunk_rows=100,
+                     progress=lambda *args: None, cancelled=iter([False, True]).__next__)
+    assert not path.exists()
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        export_table(FUNCS, 0.0, 1.0, 0.1, str(tmp_path / 'tabla.txt'))
+
+
+@pytest.mark.skipif(pyarrow is None, reason="pyarrow no está instalado")
+def test_parquet(tmp_path):
+    path = str(tmp_path / 'tabla.parquet')
+    export_table(FUNCS, 1.0, 2.0, 0.5, path, chunk_rows=2)
+    table = pyarrow.parquet.read_table(path)
+    assert table.num_rows == 3
+
+
+def test_available_formats():
+    assert set(available_formats()) >= {'.csv', '.npy'}
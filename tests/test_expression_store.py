@@ -0,0 +1,92 @@
+"""Pruebas del almacén de expresiones."""
+import numpy as np
+import sympy as sp
+
+import expression_store
+from expression_store import ExpressionStore
+
+x = sp.Symbol('x')
+
+
+def test_structural_sharing():
+    store = ExpressionStore()
+    a = store.handle(sp.sin(x) ** 2 + x)
+    b = store.handle(sp.sin(x) ** 2 + x)
+    assert a == b
+    assert store.intern(sp.sin(x) ** 2) is store.intern(sp.sin(x) ** 2)
+
+
+def test_equivalent_expressions_share_results():
+    store = ExpressionStore()
+    a = store.handle(x**2 + 2*x)
+    store.remember(a, ('derivative', 1), 2*x + 2)
+    b = store.handle(x * (x + 2))
+    assert store.recall(b, ('derivative', 1)) == 2*x + 2
+    assert store.equivalence_hits == 1
+
+
+def test_equivalent_expressions_are_compiled_separately():
+    store = ExpressionStore()
+    line = store.handle(x + 1)
+    store.remember(line, ('derivative', 1), sp.Integer(1))
+    quotient = (x**2 - 1) / (x - 1)
+    assert store.recall(store.handle(quotient), ('derivative', 1)) == 1
+
+    func = store.lambdify(x, quotient)
+    with np.errstate(all='ignore'):
+        values = func(np.array([0.0, 1.0, 2.0]))
+    # El hueco en x = 1 se conserva
+    assert np.isnan(values[1])
+    np.testing.assert_allclose(values[[0, 2]], [1.0, 3.0])
+    assert func.key != store.lambdify(x, x + 1).key
+
+
+def test_compiling_does_not_fingerprint(monkeypatch):
+    calls = []
+    original = expression_store.fingerprint
+    monkeypatch.setattr(expression_store, 'fingerprint',
+                        lambda expr: calls.append(expr) or original(expr))
+    store = ExpressionStore()
+    store.lambdify(x, sp.cos(x) * x)
+    assert calls == []
+    store.recall(store.handle(sp.cos(x) * x), ('derivative', 1))
+    assert len(calls) == 1
+
+
+def test_least_used_expressions_are_evicted():
+    store = ExpressionStore(capacity=8)
+    kept = store.handle(sp.exp(x))
+    store.remember(kept, ('derivative', 1), sp.exp(x))
+    for n in range(2, 20):
+        store.handle(x ** n)
+        # Usar la expresión la mantiene entre las más recientes
+        assert store.recall(kept, ('derivative', 1)) == sp.exp(x)
+    assert store.memory_report()['expressions'] <= 8
+    assert store.evictions > 0
+    assert store.get(kept) == sp.exp(x)
+    # Las descartadas se vuelven a guardar con una clave nueva
+    assert store.handle(x ** 2).key > kept.key
+
+
+def test_stale_handle_after_eviction():
+    store = ExpressionStore(capacity=4)
+    stale = store.handle(sp.sin(x))
+    for n in range(2, 8):
+        store.handle(x ** n)
+    assert stale.key not in store._exprs
+
+    # El manejador vuelve a guardar su expresión en lugar de fallar
+    assert stale.expr == sp.sin(x)
+    store.remember(stale, ('derivative', 1), sp.cos(x))
+    assert store.recall(stale, ('derivative', 1)) == sp.cos(x)
+    assert store.recall(store.handle(sp.sin(x)), ('derivative', 1)) == sp.cos(x)
+    entries = {expr: results for _, expr, results in store.snapshot()}
+    assert entries[sp.sin(x)] == [(('derivative', 1), sp.cos(x))]
+
+
+def test_snapshot_skips_results_of_evicted_expressions():
+    store = ExpressionStore(capacity=4)
+    handle = store.handle(sp.sin(x))
+    store._results[(handle.key, ('derivative', 1))] = sp.cos(x)
+    store._exprs.pop(handle.key)
+    assert all(results == [] for _, _, results in store.snapshot())
@@ -0,0 +1,31 @@
+"""Pruebas de las huellas numéricas de expresiones."""
+import sympy as sp
+
+from fingerprint import fingerprint, equivalent
+
+x, a = sp.symbols('x a')
+
+
+def test_equal_fingerprints_for_rewritten_expressions():
+    assert fingerprint(x**2 + 2*x) == fingerprint(x * (x + 2))
+    assert fingerprint(sp.sin(2*x)) == fingerprint(2 * sp.sin(x) * sp.cos(x))
+
+
+def test_different_fingerprints():
+    assert fingerprint(x**2) != fingerprint(x**3)
+    # La aritmética modular distingue polinomios muy parecidos
+    assert fingerprint(x**2 + 1) != fingerprint(x**2 + 1 + sp.Rational(1, 10**12))
+
+
+def test_fingerprint_includes_symbol_names():
+    assert fingerprint(a * x)[0] == ('a', 'x')
+    assert fingerprint(a * x) != fingerprint(x * x)
+
+
+def test_non_numeric_expression_has_no_fingerprint():
+    assert fingerprint(sp.Function('g')(x)) is None
+
+
+def test_equivalent():
+    assert equivalent(sp.sin(x)**2 + sp.cos(x)**2, sp.Integer(1))
+    assert not equivalent(x + 1, x + 2)
@@ -0,0 +1,82 @@
+"""Pruebas de la instrumentación de etapas."""
+import csv
+import json
+
+import pytest
+import sympy as sp
+
+from instrumentation import Instrumentation
+from logic import MathHelper
+
+x = sp.Symbol('x')
+
+
+def test_stage_records_time_size_and_failures():
+    instr = Instrumentation()
+    instr.begin_calculation('x^2')
+    with instr.stage('derivada') as record:
+        record['expr'] = sp.sin(x) + x ** 2
+    with pytest.raises(ValueError):
+        with instr.stage('integral'):
+            raise ValueError("fallo")
+
+    first, second = instr.last_calculation()
+    assert first['stage'] == 'derivada' and first['ok'] and first['ops'] == 3
+    assert first['label'] == 'x^2' and first['wall_ms'] >= 0
+    assert second['stage'] == 'integral' and not second['ok'] and second['ops'] is None
+
+
+def test_ring_buffer_and_grouping_by_calculation():
+    instr = Instrumentation(capacity=3)
+    for _ in range(2):
+        instr.begin_calculation()
+        for name in ('a', 'b'):
+            with instr.stage(name):
+                pass
+    assert len(instr.records) == 3
+    assert [r['stage'] for r in instr.last_calculation()] == ['a', 'b']
+
+
+def test_summary_text_groups_stages():
+    instr = Instrumentation()
+    assert instr.summary_text() == ""
+    instr.begin_calculation()
+    for _ in range(2):
+        with instr.stage('derivada'):
+            pass
+    with instr.stage('total'):
+        pass
+    summary = instr.summary_text()
+    assert summary.startswith("Total ") and summary.count("derivada") == 1
+
+
+def test_export_json_and_csv(tmp_path):
+    instr = Instrumentation()
+    instr.begin_calculation('f')
+    with instr.stage('derivada', sp.cos(x)):
+        pass
+    json_path, csv_path = tmp_path / 'm.json', tmp_path / 'm.csv'
+    assert instr.export(str(json_path)) and instr.export(str(csv_path))
+    assert json.loads(json_path.read_text(encoding='utf-8'))[0]['stage'] == 'derivada'
+    with open(csv_path, newline='', encoding='utf-8') as fh:
+        assert next(csv.DictReader(fh))['ops'] == '1'
+    assert not instr.export(str(tmp_path / 'no-existe' / 'm.json'))
+
+
+def test_instrument_helper():
+    instr = Instrumentation()
+    helper = MathHelper()
+    instr.instrument_helper(helper)
+    instr.begin_calculation()
+    helper.set_function('x^2')
+    helper.calculate_derivative(1)
+    stages = [r['stage'] for r in instr.last_calculation()]
+    assert 'análisis' in stages and 'derivada' in stages
+
+
+@pytest.mark.parametrize('mode', ['cprofile', 'tracemalloc'])
+def test_profile_writes_a_file(tmp_path, mode):
+    instr = Instrumentation()
+    with instr.profile(mode, str(tmp_path)):
+        sum(range(1000))
+    assert instr.last_profile_path and instr.last_profile_path.startswith(str(tmp_path))
@@ -0,0 +1,43 @@
+"""Pruebas de los intervalos de monotonía y concavidad."""
+import numpy as np
+import pytest
+import sympy as sp
+
+from intervals import analyze_intervals, sign_intervals, evaluate, refine_roots
+from logic import MathHelper
+
+
+def test_cubic():
+    result = analyze_intervals(lambda t: 3 * t**2 - 3, lambda t: 6 * t, (-3, 3))
+    assert [(s['start'], s['end'], s['type']) for s in result['monotonicity']] == [
+        (-3.0, pytest.approx(-1.0), "Creciente"),
+        (pytest.approx(-1.0), pytest.approx(1.0), "Decreciente"),
+        (pytest.approx(1.0), 3.0, "Creciente"),
+    ]
+    assert [s['type'] for s in result['concavity']] == ["Cóncava hacia abajo", "Cóncava hacia arriba"]
+    assert result['inflection_points'] == [pytest.approx(0.0)]
+
+
+def test_pole_is_not_a_sign_change():
+    segments, changes = sign_intervals(lambda t: 1 / t, (-1, 1))
+    assert [s['sign'] for s in segments] == [-1, 1]
+    assert changes == []
+
+
+def test_refined_roots():
+    roots, is_zero = refine_roots(np.cos, np.array([1.0, 4.0]), np.array([2.0, 5.0]))
+    np.testing.assert_allclose(roots, [np.pi / 2, 3 * np.pi / 2], atol=1e-12)
+    assert is_zero.all()
+
+
+def test_evaluate_discards_complex_values():
+    values = evaluate(lambda t: np.sqrt(t + 0j), np.array([-1.0, 4.0]))
+    assert np.isnan(values[0]) and values[1] == 2.0
+
+
+def test_helper_caches_intervals():
+    helper = MathHelper()
+    helper.set_function('x^3 - 3x')
+    first = helper.analyze_intervals((-3, 3))
+    assert helper.analyze_intervals((-3, 3)) is first
+    assert len(first['monotonicity']) == 3
@@ -0,0 +1,49 @@
+"""Pruebas del renderizado de fórmulas con mathtext."""
+from gui.mathtext import MathRenderer, render_png, MAX_LATEX_LENGTH
+
+
+def _wait(renderer, qapp):
+    renderer.wait()
+    # La señal del hilo de trabajo se entrega en el bucle de eventos
+    qapp.processEvents()
+
+
+def test_render_png():
+    data = render_png(r"\frac{x^{2}}{2}", 100, 'black')
+    assert data.startswith(b'\x89PNG')
+
+
+def test_request_renders_once_and_caches(qapp):
+    renderer = MathRenderer()
+    rendered = []
+    renderer.rendered.connect(lambda key, pixmap: rendered.append(key))
+
+    key, pixmap = renderer.request(r"\sin{\left(x \right)}", 100, 'black')
+    assert pixmap is None
+    _wait(renderer, qapp)
+    assert rendered == [key]
+
+    again, pixmap = renderer.request(r"\sin{\left(x \right)}", 100, 'black')
+    assert again == key and pixmap is not None and not pixmap.isNull()
+
+
+def test_lru_capacity(qapp):
+    renderer = MathRenderer(capacity=1)
+    for latex in ("x", "y"):
+        renderer.request(latex, 100, 'black')
+        _wait(renderer, qapp)
+    assert renderer.request("y", 100, 'black')[1] is not None
+    assert renderer.request("x", 100, 'black')[1] is None
+    _wait(renderer, qapp)
+
+
+def test_invalid_and_long_formulas_are_not_retried(qapp):
+    renderer = MathRenderer()
+    key, _ = renderer.request(r"\frac{", 100, 'black')
+    _wait(renderer, qapp)
+    assert key in renderer._failed
+    renderer.request(r"\frac{", 100, 'black')
+    assert key not in renderer._pending
+
+    long_key, _ = renderer.request("x+" * MAX_LATEX_LENGTH, 100, 'black')
+    assert long_key not in renderer._pending
@@ -0,0 +1,53 @@
+"""Pruebas del modelo de la tabla de puntos críticos."""
+import numpy as np
+from PyQt5.QtCore import Qt
+
+from gui.models import CriticalPointsModel, TYPE_CODES
+
+POINTS = [
+    {'x': -1.0, 'y': 2.0, 'type': "Máximo"},
+    {'x': 0.0, 'y': None, 'type': "Punto de inflexión"},
+    {'x': 1.0, 'y': -2.0, 'type': "Mínimo"},
+    {'x': 2.0, 'y': 0.5, 'type': "desconocido"},
+]
+
+
+def _column(model, column):
+    return [model.data(model.index(row, column)) for row in range(model.rowCount())]
+
+
+def test_set_points_and_display(qapp):
+    model = CriticalPointsModel()
+    model.set_points(POINTS)
+    assert model.rowCount() == 4 and model.columnCount() == 3
+    assert _column(model, 0)[0] == "-1.0000"
+    assert _column(model, 1)[1] == "Indefinido"
+    assert _column(model, 2)[3] == "Indeterminado"
+    assert model.point(1) == {'x': 0.0, 'y': None, 'type': "Punto de inflexión"}
+    assert model.data(model.index(2, 2), Qt.BackgroundRole) is not None
+
+
+def test_filter_and_sort(qapp):
+    model = CriticalPointsModel()
+    model.set_points(POINTS)
+    model.set_type_filter(TYPE_CODES["Mínimo"])
+    assert model.rowCount() == 1 and model.point(0)['x'] == 1.0
+
+    model.set_type_filter(None)
+    model.sort(1, Qt.DescendingOrder)
+    # El punto sin valor queda al final en ambos órdenes
+    assert [model.point(row)['y'] for row in range(4)] == [2.0, 0.5, -2.0, None]
+    model.sort(1, Qt.AscendingOrder)
+    assert [model.point(row)['y'] for row in range(4)] == [-2.0, 0.5, 2.0, None]
+    model.sort(-1)
+    assert [model.point(row)['x'] for row in range(4)] == [-1.0, 0.0, 1.0, 2.0]
+
+
+def test_large_arrays_and_clear(qapp):
+    model = CriticalPointsModel()
+    n = 100000
+    model.set_arrays(np.arange(n, dtype=float), np.zeros(n), np.zeros(n, dtype=np.int8))
+    assert model.rowCount() == n
+    assert model.data(model.index(n - 1, 0), Qt.UserRole) == n - 1
+    model.clear()
+    assert model.rowCount() == 0
@@ -0,0 +1,54 @@
+"""Pruebas del muestreo repartido entre procesos."""
+import numpy as np
+import pytest
+import sympy as sp
+
+from exporter import export_table
+from logic import MathHelper
+from parallel_sampling import ParallelSampler
+
+x = sp.Symbol('x')
+
+
+@pytest.fixture
+def helper():
+    helper = MathHelper()
+    helper.set_function('sin(x)*exp(x)')
+    helper.current['order'] = 6
+    return helper
+
+
+@pytest.fixture
+def sampler(helper):
+    # Repartir siempre, aunque la muestra inicial indique que no compensa
+    sampler = ParallelSampler(helper.store, max_workers=2, min_seconds=0.0)
+    yield sampler
+    sampler.shutdown()
+
+
+def test_samples_store_functions_in_workers(helper, sampler):
+    funcs = helper.create_lambda_functions()
+    x_vals = np.linspace(-2.0, 2.0, 10000)
+    with sampler.sample({'function': funcs['function']}, x_vals) as samples:
+        assert samples.shm is not None
+        np.testing.assert_allclose(samples.column('function'), np.sin(x_vals) * np.exp(x_vals))
+
+
+def test_automatic_derivative_is_sampled_in_process(helper, sampler):
+    funcs = helper.create_lambda_functions()
+    assert not isinstance(funcs['derivative'].key, int)
+    x_vals = np.linspace(-2.0, 2.0, 10000)
+    expected = sp.lambdify(x, sp.diff(sp.sin(x) * sp.exp(x), x, 6), 'numpy')(x_vals)
+    with sampler.sample(funcs, x_vals) as samples:
+        np.testing.assert_allclose(samples.column('derivative'), expected, rtol=1e-9)
+        np.testing.assert_allclose(samples.column('function'), np.sin(x_vals) * np.exp(x_vals))
+
+
+def test_export_with_sampler_keeps_automatic_derivative(helper, sampler, tmp_path):
+    funcs = helper.create_lambda_functions()
+    path = str(tmp_path / 'tabla.npy')
+    rows = export_table(funcs, -2.0, 2.0, 0.0004, path, sampler=sampler)
+    table = np.load(path)
+    assert table.shape[0] == rows
+    expected = sp.lambdify(x, sp.diff(sp.sin(x) * sp.exp(x), x, 6), 'numpy')(table[:, 0])
+    np.testing.assert_allclose(table[:, 2], expected, rtol=1e-9)
@@ -0,0 +1,53 @@
+"""Pruebas de las funciones con parámetros libres."""
+import numpy as np
+import sympy as sp
+
+from logic import MathHelper
+from parameters import ParametricFunctions
+
+x, a, b = sp.symbols('x a b')
+
+
+def make_functions():
+    return ParametricFunctions(x, [a, b], {
+        'function': a * sp.sin(b * x),
+        'derivative': a * b * sp.cos(b * x),
+    })
+
+
+def test_evaluate_with_default_and_given_values():
+    funcs = make_functions()
+    x_vals = np.linspace(0.0, 1.0, 5)
+    np.testing.assert_allclose(funcs.evaluate('function', x_vals), np.sin(x_vals))
+    np.testing.assert_allclose(funcs.evaluate('function', x_vals, {'a': 2.0}), 2 * np.sin(x_vals))
+
+
+def test_family_in_one_call():
+    funcs = make_functions()
+    x_vals = np.linspace(0.0, 1.0, 5)
+    family = funcs.evaluate_family('derivative', x_vals, 'b', np.array([1.0, 2.0, 3.0]))
+    assert family.shape == (3, 5)
+    np.testing.assert_allclose(family[2], 3 * np.cos(3 * x_vals))
+
+
+def test_constant_expression_is_broadcast():
+    funcs = ParametricFunctions(x, [a], {'derivative': a})
+    funcs.set_values({'a': 4})
+    np.testing.assert_allclose(funcs.evaluate('derivative', np.zeros(3)), [4.0] * 3)
+    family = funcs.evaluate_family('derivative', np.zeros(3), 'a', np.array([1.0, 2.0]))
+    np.testing.assert_allclose(family, [[1.0] * 3, [2.0] * 3])
+
+
+def test_bound_functions_keep_their_values():
+    funcs = make_functions()
+    bound = funcs.bind({'a': 3.0})
+    funcs.set_values({'a': 5.0})
+    np.testing.assert_allclose(bound['function'](np.array([np.pi / 2])), [3.0])
+
+
+def test_helper_detects_parameters():
+    helper = MathHelper()
+    helper.set_function('a*sen(x) + e^x')
+    assert [p.name for p in helper.current['parameters']] == ['a']
+    funcs = helper.create_lambda_functions()
+    np.testing.assert_allclose(funcs['derivative'](np.array([0.0])), [2.0])
@@ -0,0 +1,56 @@
+"""Pruebas de las funciones definidas a trozos."""
+import numpy as np
+import pytest
+import sympy as sp
+
+from logic import MathHelper
+from piecewise import trozos, real_diff, discontinuities, numeric_modules
+
+x = sp.Symbol('x')
+
+
+def critical_points(text):
+    helper = MathHelper()
+    helper.set_function(text)
+    return helper.find_critical_points()
+
+
+def test_trozos_requires_boolean_conditions():
+    with pytest.raises(ValueError):
+        trozos(x, x + 1)
+
+
+def test_abs_derivative_uses_sign():
+    assert real_diff(sp.Abs(x), x) == sp.sign(x)
+
+
+def test_piecewise_compiles_to_numpy():
+    func = sp.lambdify(x, trozos(-x, x < 0, x**2), modules=numeric_modules('numpy'))
+    np.testing.assert_allclose(func(np.array([-2.0, 0.0, 3.0])), [2.0, 0.0, 9.0])
+
+
+def test_discontinuities_only_at_jumps():
+    assert discontinuities(trozos(-x, x < 0, x**2 + 1), x) == [0.0]
+    assert discontinuities(sp.Abs(x), x) == []
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('abs(x)', [(0.0, 0.0, "Mínimo")]),
+    ('2 - abs(x - 1)', [(1.0, 2.0, "Máximo")]),
+    # Salto hacia abajo a la izquierda y rama creciente a la derecha
+    ('trozos(1 - x, x < 0, x^2)', [(0.0, 0.0, "Mínimo")]),
+    ('trozos(x^2 - 4, x < 1, 3 - x)', [(0.0, -4.0, "Mínimo"), (1.0, 2.0, "Máximo")]),
+])
+def test_breakpoint_extrema(text, expected):
+    points = critical_points(text)
+    assert [(p['x'], p['y'], p['type']) for p in points] == expected
+
+
+def test_branch_root_on_breakpoint_is_not_an_extremum():
+    # x^2 tiene f' = 0 en 0, pero por la izquierda la función es creciente
+    assert critical_points('trozos(x, x < 0, x^2)') == []
+
+
+def test_branch_root_across_a_jump_is_not_an_extremum():
+    # El límite por la izquierda (0) queda por debajo de f(0) = 1
+    assert critical_points('trozos(-x, x < 0, x^2 + 1)') == []
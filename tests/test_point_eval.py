@@ -0,0 +1,70 @@
+"""Pruebas de la evaluación en un punto con precisión adaptativa."""
+import mpmath
+import sympy as sp
+
+from logic import MathHelper
+from point_eval import PointEvaluator
+
+x = sp.Symbol('x')
+
+
+def test_float64_when_there_is_no_cancellation():
+    evaluator = PointEvaluator(x, {'function': sp.exp(x) * sp.sin(x)})
+    result = evaluator.evaluate(sp.Rational(1, 2))['function']
+    assert result['method'] == 'float64'
+    assert abs(result['value'] - float(sp.exp(0.5) * sp.sin(0.5))) < 1e-15
+
+
+def test_mpmath_on_cancellation():
+    # 1 - cos(h) pierde todos los dígitos en float64 para h = 1e-8
+    evaluator = PointEvaluator(x, {'function': (1 - sp.cos(x)) / x**2})
+    result = evaluator.evaluate(sp.Rational(1, 10**8), 20)['function']
+    assert result['method'] == 'mpmath'
+    assert result['text'] == "0.49999999999999999583"
+
+
+def test_exact_zero():
+    evaluator = PointEvaluator(x, {'function': x**2 - 2})
+    result = evaluator.evaluate(sp.sqrt(2))['function']
+    assert result['method'] == 'mpmath'
+    assert result['value'] == 0
+
+
+def test_undefined_value():
+    evaluator = PointEvaluator(x, {'function': sp.log(x)})
+    assert evaluator.evaluate(sp.Integer(-1))['function']['value'] is None
+
+
+def test_results_are_memorized():
+    evaluator = PointEvaluator(x, {'function': x**2})
+    assert evaluator.evaluate(sp.Integer(3)) is evaluator.evaluate(sp.Integer(3))
+
+
+def test_helper_evaluates_function_and_derivative():
+    helper = MathHelper()
+    helper.set_function('x^3')
+    helper.calculate_derivative(1)
+    values = helper.evaluate_at(sp.Integer(2))
+    assert values['function']['value'] == 8.0
+    assert values['derivative']['value'] == 12.0
+    assert mpmath.mpf(values['function']['text']) == 8
+
+
+def test_deferred_derivative_uses_automatic_differentiation():
+    helper = MathHelper()
+    helper.run_analysis('exp(sen(x))', 6)
+    result = helper.evaluate_at(sp.Rational(1, 2))['derivative']
+    # La derivada simbólica sigue sin calcularse
+    assert helper.current['derivative'] is None
+    assert result['method'] == 'float64'
+    exact = sp.diff(sp.exp(sp.sin(x)), x, 6).subs(x, sp.Rational(1, 2))
+    assert abs(result['value'] - float(exact)) < 1e-12 * abs(float(exact))
+
+
+def test_deferred_derivative_is_built_for_mpmath():
+    helper = MathHelper()
+    helper.run_analysis('x^6 - 2x^3', 6)
+    # f se anula en 2^(1/3): la cancelación obliga a usar mpmath
+    result = helper.evaluate_at(sp.cbrt(2), 20)['derivative']
+    assert result['method'] == 'mpmath' and result['value'] == 720
+    assert helper.current['derivative'] == 720
@@ -0,0 +1,43 @@
+"""Pruebas de las impresoras en notación española."""
+import pytest
+import sympy as sp
+
+from printer import spanish_str, spanish_latex, SpanishPrinter, ELLIPSIS
+from piecewise import trozos
+
+x = sp.Symbol('x')
+
+
+@pytest.mark.parametrize('expr, text', [
+    (sp.sin(x) * sp.log(x), "ln(x)·sen(x)"),
+    (sp.atan(x) + sp.asin(x), "arcsen(x) + arctg(x)"),
+    (x ** 3, "x^3"),
+    (sp.sqrt(x) / (x + 1), "sqrt(x)/(x + 1)"),
+    (sp.Abs(x) + sp.sign(x), "abs(x) + signo(x)"),
+    (trozos(-x, x < 0, x ** 2), "trozos(-x, x < 0, x^2)"),
+])
+def test_spanish_notation(expr, text):
+    assert spanish_str(expr) == text
+
+
+@pytest.mark.parametrize('limit', [1, 10, 100])
+def test_max_length_includes_ellipsis(limit):
+    printer = SpanishPrinter({'max_length': limit})
+    text = printer.doprint(sp.expand((x + 1) ** 200))
+    assert len(text) <= limit
+    assert text.endswith(ELLIPSIS)
+    assert printer.truncated
+
+
+def test_spanish_str_limit():
+    assert len(spanish_str(sp.expand((x + 1) ** 200), max_length=100)) == 100
+
+
+def test_short_expression_is_not_truncated():
+    printer = SpanishPrinter({'max_length': 100})
+    assert printer.doprint(x ** 2 + 1) == "x^2 + 1"
+    assert not printer.truncated
+
+
+def test_latex_names():
+    assert spanish_latex(sp.sin(x)) == r"\operatorname{sen}{\left(x \right)}"
@@ -0,0 +1,78 @@
+"""Pruebas del análisis en un proceso aislado."""
+import pytest
+
+import logic
+from logic import MathHelper
+from sandbox import analyze_sandboxed, differentiate_sandboxed, restore_analysis, resource
+
+# Función cuyo análisis (solve de f') cuesta varios segundos de CPU
+SLOW_FUNCTION = 'sin(x)*x^3'
+
+
+def _forbid(*args, **kwargs):
+    raise AssertionError("se volvió a calcular en el proceso principal")
+
+
+def test_restore_analysis_reuses_child_results(monkeypatch):
+    result = analyze_sandboxed('x^3 - 3x', 2, 'indefinida')
+    assert result['status'] == 'ok'
+
+    helper = MathHelper()
+    restore_analysis(helper, result)
+    monkeypatch.setattr(logic, 'differentiate', _forbid)
+    monkeypatch.setattr(logic, 'integrate', _forbid)
+    monkeypatch.setattr(logic, 'critical_points_of', _forbid)
+
+    assert str(helper.derivative_of(helper.current['handle'], 2)) == '6*x'
+    assert helper.compact_derivative(helper.current['handle'], 2) is None
+    assert str(helper.calculate_integral(False)) == 'x**4/4 - 3*x**2/2'
+    helper.current['critical_points'] = None
+    assert [p['type'] for p in helper.find_critical_points()] == ["Máximo", "Mínimo"]
+
+
+def test_restore_analysis_definite_integral(monkeypatch):
+    result = analyze_sandboxed('x^2', 1, (0.0, 3.0))
+    helper = MathHelper()
+    restore_analysis(helper, result)
+    monkeypatch.setattr(logic, 'integrate', _forbid)
+    assert float(helper.calculate_integral(True, 0.0, 3.0)) == pytest.approx(9.0)
+
+
+def test_intervals_and_checks_come_from_the_child(monkeypatch):
+    result = analyze_sandboxed('x^3 - 3x', 1, None, verify=True)
+    assert result['status'] == 'ok'
+    assert result['intervals']['monotonicity']
+    assert all(check.passed for check in result['checks'])
+
+    helper = MathHelper()
+    restore_analysis(helper, result)
+    monkeypatch.setattr(logic, 'real_diff', _forbid)
+    assert helper.analyze_intervals(result['x_range']) == result['intervals']
+
+
+def test_deferred_derivative_in_the_child(monkeypatch):
+    helper = MathHelper()
+    helper.differentiator = differentiate_sandboxed
+    helper.run_analysis('sin(x)*exp(x)', 6, None)
+    monkeypatch.setattr(logic, 'differentiate', _forbid)
+    expected = logic.real_diff(helper.current['function'], helper.x_symbol, 6)
+    assert logic.sp.simplify(helper.derivative_expression() - expected) == 0
+
+
+def test_deferred_derivative_limit_raises():
+    x = logic.sp.Symbol('x', real=True)
+    with pytest.raises(ValueError, match="interrumpió"):
+        differentiate_sandboxed(logic.sp.sin(x) * x**3, x, 1, timeout=0.01)
+
+
+@pytest.mark.skipif(resource is None, reason="sin límites de recursos POSIX")
+def test_cpu_limit_is_reported_as_cpu():
+    result = analyze_sandboxed(SLOW_FUNCTION, 1, None, cpu_seconds=1, timeout=60)
+    assert result['status'] == 'too_expensive'
+    assert result['reason'] == 'cpu'
+
+
+def test_wall_clock_limit_is_reported_as_timeout():
+    result = analyze_sandboxed(SLOW_FUNCTION, 1, None, cpu_seconds=60, timeout=0.5)
+    assert result['status'] == 'too_expensive'
+    assert result['reason'] == 'timeout'
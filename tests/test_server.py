@@ -0,0 +1,136 @@
+"""Pruebas del servicio HTTP/JSON."""
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+import server
+from logic import MathHelper
+
+SLOW_FUNCTION = 'exp(sin(x))*x^7/(1+x^3)'
+
+
+@pytest.fixture
+def helper(monkeypatch):
+    helper = MathHelper()
+    monkeypatch.setattr(server, '_helper', helper)
+    return helper
+
+
+def test_operation_in_worker(helper):
+    status, result = server._run_operation('derivative', {'function': 'x^3', 'order': 2}, 5.0)
+    assert status == 'ok'
+    assert result['srepr'] == "Mul(Integer(6), Symbol('x'))"
+
+
+def test_timeout_discards_the_worker_helper(helper):
+    status, message = server._run_operation('integral', {'function': SLOW_FUNCTION}, 0.2)
+    assert status == 'timeout'
+    # El cálculo interrumpido pudo dejar el almacén a medias
+    assert server._helper is not helper
+    status, _ = server._run_operation('parse', {'function': 'x^2'}, 5.0)
+    assert status == 'ok'
+
+
+def test_identical_requests_are_coalesced():
+    service = server.ComputeService(workers=1)
+
+    async def run():
+        params = {'function': 'sin(x)*x^2', 'order': 3}
+        first, second = await asyncio.gather(
+            service.compute('derivative', params),
+            service.compute('derivative', dict(params, timeout=20)),
+        )
+        third = await service.compute('derivative', params)
+        return first, second, third
+
+    try:
+        first, second, third = asyncio.run(run())
+    finally:
+        service.shutdown()
+    assert first == second == third
+    assert service.metrics.coalesced == 1
+    assert service.metrics.cache_hits == 1
+
+
+def test_request_timeout(monkeypatch):
+    # El cálculo se detiene por sí mismo poco después de que la petición deje de esperar
+    monkeypatch.setattr(server, 'MAX_BUDGET_S', 1.0)
+    service = server.ComputeService(workers=1)
+
+    async def run():
+        await service.compute('integral', {'function': SLOW_FUNCTION, 'timeout': 0.2})
+
+    try:
+        with pytest.raises(server.RequestError) as error:
+            asyncio.run(run())
+    finally:
+        service.shutdown()
+    assert error.value.status == 504
+    assert service.metrics.timeouts == 1
+
+
+def test_coalesced_request_keeps_its_own_timeout():
+    service = server.ComputeService(workers=1)
+    # Derivada que tarda unos segundos
+    params = {'function': SLOW_FUNCTION, 'order': 3}
+
+    async def run():
+        return await asyncio.gather(
+            service.compute('derivative', dict(params, timeout=0.5)),
+            service.compute('derivative', dict(params, timeout=30)),
+            return_exceptions=True,
+        )
+
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        service.shutdown()
+    assert isinstance(first, server.RequestError) and first.status == 504
+    # El tiempo máximo de la primera petición no detuvo el cálculo compartido
+    assert 'srepr' in second
+    assert service.metrics.coalesced == 1
+
+
+def test_cache_is_bounded_by_size():
+    service = server.ComputeService(cache_max_bytes=4000)
+    small = {'x': [0.5] * 150}
+    for n in range(10):
+        service._store(('sample', str(n)), small)
+    assert service._cache_bytes <= 4000
+    assert len(service._cache) < 10
+    assert ('sample', '9') in service._cache
+    # Un resultado mayor que una cuarta parte del límite no se guarda
+    service._store(('sample', 'big'), {'x': [0.5] * 1000})
+    assert ('sample', 'big') not in service._cache
+    assert service._cache_bytes == sum(size for _, size in service._cache.values())
+
+
+def test_serve_does_not_import_the_gui():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import runpy, sys\n"
+        "sys.argv = ['main.py', '--serve', '--help']\n"
+        "try:\n"
+        "    runpy.run_path('main.py', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('PyQt5' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True,
+                            text=True, timeout=60).stdout
+    assert output.strip().splitlines()[-1] == 'False'
+
+
+def test_symbolic_operations_use_analyze(helper, monkeypatch):
+    calls = []
+    original = server.analyze
+    monkeypatch.setattr(server, 'analyze',
+                        lambda *args, **kwargs: calls.append(args) or original(*args, **kwargs))
+    status, result = server._run_operation('integral', {'function': 'x', 'lower': 0, 'upper': 2}, 5.0)
+    assert (status, result['value']) == ('ok', 2.0)
+    status, result = server._run_operation('critical_points', {'function': 'x^2 - 2x'}, 5.0)
+    assert result['critical_points'] == [{'x': 1.0, 'y': -1.0, 'type': "Mínimo"}]
+    assert len(calls) == 2
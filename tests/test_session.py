@@ -0,0 +1,117 @@
+"""Pruebas de las instantáneas de sesión."""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import sympy as sp
+
+from curve_cache import CurveCache
+from expression_store import ExpressionStore
+from session import save_session, load_session
+
+x = sp.Symbol('x')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_session(path):
+    store = ExpressionStore()
+    cache = CurveCache()
+    handle = store.handle(sp.sin(x) * x)
+    store.remember(handle, ('derivative', 1), sp.diff(sp.sin(x) * x, x))
+    store.remember(handle, ('critical_points',), [{'x': 0.0, 'y': 0.0, 'type': "Mínimo"}])
+    x_vals = np.linspace(-1.0, 1.0, 11)
+    cache.put(CurveCache.make_key(handle.key, (-1, 1), 11), x_vals, x_vals * np.sin(x_vals))
+    # Curva de una derivada por diferenciación automática
+    cache.put(CurveCache.make_key((handle.key, 'ad', 6), (-1, 1), 11), x_vals, x_vals ** 2)
+    assert save_session(path, [{'function': 'sin(x)*x'}], {'page': 'input'}, store, cache)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'sesion.bin')
+    make_session(path)
+
+    store = ExpressionStore()
+    cache = CurveCache()
+    state = load_session(path, store, cache)
+    assert state['history'] == [{'function': 'sin(x)*x'}]
+    handle = store.handle(sp.sin(x) * x)
+    assert store.recall(handle, ('derivative', 1)) == sp.diff(sp.sin(x) * x, x)
+    assert store.recall(handle, ('critical_points',))[0]['type'] == "Mínimo"
+
+    x_vals = np.linspace(-1.0, 1.0, 11)
+    _, y = cache.get(CurveCache.make_key(handle.key, (-1, 1), 11))
+    np.testing.assert_allclose(y, x_vals * np.sin(x_vals), rtol=1e-6)
+    _, y = cache.get(CurveCache.make_key((handle.key, 'ad', 6), (-1, 1), 11))
+    np.testing.assert_allclose(y, x_vals ** 2, rtol=1e-6)
+
+
+def test_save_over_mapped_session(tmp_path):
+    path = str(tmp_path / 'sesion.bin')
+    make_session(path)
+
+    store = ExpressionStore()
+    cache = CurveCache()
+    state = load_session(path, store, cache)
+    handle = store.handle(sp.sin(x) * x)
+    key = CurveCache.make_key(handle.key, (-1, 1), 11)
+
+    assert save_session(path, [], {'page': 'input'}, store, cache, state['mapping'])
+    assert state['mapping'].closed
+    # Las curvas siguen disponibles (copiadas a memoria) y se guardaron de nuevo
+    assert cache.get(key) is not None
+    assert load_session(path, ExpressionStore(), CurveCache()) is not None
+
+
+def run_app(code, tmp_path):
+    env = dict(os.environ, HOME=str(tmp_path), XDG_CONFIG_HOME=str(tmp_path / 'config'),
+               XDG_DATA_HOME=str(tmp_path / 'data'), QT_QPA_PLATFORM='offscreen')
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip().splitlines()[-1]
+
+
+def test_restore_does_not_recalculate(tmp_path):
+    first = (
+        "import main\n"
+        "app = main.DerivativeCalculator()\n"
+        "app.main_window.sandbox_enabled = True\n"
+        "app.process_calculation({'function': 'sin(x)*x', 'order': 6})\n"
+        "# El análisis aislado termina en otro hilo\n"
+        "app.sandbox_thread.wait()\n"
+        "main.QApplication.processEvents()\n"
+        "app.save_session()\n"
+        "print(len(app.main_window.results_page.plot_canvas.curve_cache.snapshot()))\n"
+    )
+    assert int(run_app(first, tmp_path)) > 0
+
+    second = (
+        "import main, logic\n"
+        "def fail(*args, **kwargs):\n"
+        "    raise AssertionError('recalculado')\n"
+        "main.analyze_sandboxed = fail\n"
+        "logic.differentiate = fail\n"
+        "logic.critical_points_of = fail\n"
+        "app = main.DerivativeCalculator()\n"
+        "app.main_window.sandbox_enabled = True\n"
+        "window = app.main_window\n"
+        "print(window.stack.currentWidget() is window.results_page,\n"
+        "      app.session_mapping is not None)\n"
+    )
+    assert run_app(second, tmp_path) == "True True"
+
+
+def test_save_after_eviction(tmp_path):
+    store = ExpressionStore(capacity=4)
+    stale = store.handle(sp.sin(x) * x)
+    for n in range(2, 8):
+        store.handle(x ** n)
+    store.remember(stale, ('derivative', 1), sp.diff(sp.sin(x) * x, x))
+
+    path = str(tmp_path / 'sesion.bin')
+    assert save_session(path, [], {'page': 'input'}, store, CurveCache())
+    restored = ExpressionStore()
+    assert load_session(path, restored, CurveCache()) is not None
+    assert restored.recall(restored.handle(sp.sin(x) * x), ('derivative', 1)) == \
+        sp.diff(sp.sin(x) * x, x)
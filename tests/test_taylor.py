@@ -0,0 +1,42 @@
+"""Pruebas de los polinomios de Taylor."""
+import numpy as np
+import sympy as sp
+
+from logic import MathHelper
+from taylor import DerivativeTower, taylor_polynomial, horner
+
+x = sp.Symbol('x')
+
+
+def test_coefficients_match_series():
+    tower = DerivativeTower(sp.exp(x) * sp.cos(x), x)
+    coefficients = tower.coefficients(sp.Integer(0), 6)
+    series = sp.series(sp.exp(x) * sp.cos(x), x, 0, 7).removeO()
+    assert sp.expand(taylor_polynomial(coefficients, 0, x) - series) == 0
+
+
+def test_tower_grows_one_order_at_a_time():
+    tower = DerivativeTower(sp.sin(x), x)
+    tower.values_at(sp.Integer(0), 3)
+    assert len(tower.derivatives) == 4
+    assert tower.values_at(sp.Integer(0), 5) == [0, 1, 0, -1, 0, 1]
+    assert len(tower.derivatives) == 6
+
+
+def test_removable_singularity_uses_the_limit():
+    tower = DerivativeTower(sp.sin(x) / x, x)
+    assert tower.values_at(sp.Integer(0), 2) == [1, 0, sp.Rational(-1, 3)]
+
+
+def test_horner_matches_polynomial():
+    coefficients = [1.0, -2.0, 0.5, 3.0]
+    t = np.linspace(-2.0, 2.0, 9)
+    np.testing.assert_allclose(horner(coefficients, t), np.polyval(coefficients[::-1], t))
+
+
+def test_abs_uses_the_real_derivative():
+    helper = MathHelper()
+    helper.run_analysis('abs(x)', 1)
+    coefficients = helper.taylor_coefficients(1, 3)
+    assert coefficients == [1, 1, 0, 0]
+    assert all(isinstance(float(c), float) for c in coefficients)
@@ -0,0 +1,56 @@
+"""Pruebas de la comprobación numérica de derivadas e integrales."""
+import numpy as np
+
+from logic import MathHelper
+from verification import (check_derivative, check_antiderivative, check_definite_integral,
+                          complex_derivative, contour_singular, finite_difference)
+
+
+def test_numeric_references():
+    x = np.array([0.5, 1.0, 2.0])
+    np.testing.assert_allclose(complex_derivative(np.sin, x), np.cos(x), rtol=1e-14)
+    np.testing.assert_allclose(complex_derivative(np.exp, x, 3), np.exp(x), rtol=1e-9)
+    value, _ = finite_difference(np.sin, x, 2)
+    np.testing.assert_allclose(value, -np.sin(x), rtol=1e-5)
+
+
+def test_correct_and_wrong_derivatives():
+    assert check_derivative(np.sin, np.cos, (-3, 3), seed=1).passed
+    wrong = check_derivative(np.sin, lambda x: np.cos(x) + 1e-3, (-3, 3), seed=1)
+    assert not wrong.passed and wrong.failed == wrong.checked
+    assert wrong.summary().startswith("✗")
+
+
+def test_non_analytic_function_uses_finite_differences():
+    result = check_derivative(np.abs, np.sign, (-2, 2), seed=3)
+    assert result.passed
+
+
+def test_antiderivative_and_definite_integral():
+    assert check_antiderivative(lambda x: x ** 2, lambda x: x ** 3 / 3, (0, 2), seed=2).passed
+    assert check_definite_integral(lambda x: x ** 2, 0.0, 3.0, 9.0).passed
+    assert not check_definite_integral(lambda x: x ** 2, 0.0, 3.0, 9.5).passed
+
+
+def test_helper_verification():
+    helper = MathHelper()
+    helper.run_analysis('x^3*sen(x)', 2, 'indefinida')
+    checks = helper.verify_results((-3, 3), seed=0, integral_spec='indefinida')
+    assert [check.name for check in checks] == ['derivative', 'integral']
+    assert all(check.passed for check in checks)
+
+
+def test_high_order_derivatives_use_the_cauchy_reference():
+    # sen^(6) = -sen: las diferencias finitas ya no distinguen nada a este orden
+    correct = check_derivative(np.sin, lambda x: -np.sin(x), (-3, 3), order=6, seed=4)
+    assert correct.passed and correct.checked == 64
+    wrong = check_derivative(np.sin, lambda x: -np.sin(x) + 1e-3, (-3, 3), order=6, seed=4)
+    assert not wrong.passed and wrong.failed == wrong.checked
+
+
+def test_contour_enclosing_a_pole_is_not_trusted():
+    # Cerca de los polos de tan el círculo de Cauchy no sirve de referencia
+    assert contour_singular(np.tan, np.array([1.5]))[0]
+    assert not contour_singular(np.tan, np.array([0.0]))[0]
+    wrong = check_derivative(np.tan, lambda x: np.zeros_like(x), (1.45, 1.55), order=5, seed=0)
+    assert wrong.checked == 0 or not wrong.passed
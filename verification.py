@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Comprobación numérica aleatoria de derivadas e integrales.
+Las derivadas simbólicas compiladas se comparan en puntos aleatorios con
+derivadas numéricas de f: paso complejo (primer orden) o fórmula integral de
+Cauchy sobre un círculo complejo (órdenes superiores), con diferencias
+finitas centradas como alternativa para funciones que no admiten argumentos
+complejos o no son analíticas (Abs, sign). En órdenes altos, donde las
+diferencias finitas ya no distinguen un error, la fórmula de Cauchy se usa
+sola si el círculo no encierra singularidades. La antiderivada se comprueba
+derivándola del mismo modo y la integral definida con cuadratura de
+Gauss-Legendre. Todo está vectorizado y cuesta milisegundos, frente a los
+segundos de ``simplify(a - b) == 0``.
+
+Uso por lotes:
+    python verification.py "x^3 - 3x" "sen(x)*exp(x)" --order 2 --integral
+"""
+import sys
+import math
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+
+from intervals import evaluate, evaluate_pointwise
+
+# Puntos aleatorios por comprobación
+VERIFY_POINTS = 64
+
+# Paso del método del paso complejo (sin cancelación: puede ser minúsculo)
+COMPLEX_STEP = 1e-20
+
+# Puntos y radio del círculo de la fórmula integral de Cauchy
+CONTOUR_POINTS = 32
+CONTOUR_RADIUS = 0.25
+
+# Error de redondeo admitido en la fórmula de Cauchy, en múltiplos de
+# eps·n!/r^n (el redondeo de f se amplifica al dividir por r^n)
+CONTOUR_RTOL_FACTOR = 100
+
+# Coeficientes de potencias negativas (relativos a |f|) a partir de los
+# cuales el círculo encierra una singularidad o corta una rama
+CONTOUR_SINGULAR_RTOL = 1e-9
+SINGULAR_TERMS = 3
+
+# Tolerancias relativas: derivada compleja y diferencias finitas (por orden,
+# ampliada con el error estimado por extrapolación de Richardson)
+COMPLEX_RTOL = 1e-7
+FD_RTOL_FACTOR = 1e3
+FD_ERROR_FACTOR = 10
+# Por encima de esta tolerancia las diferencias finitas no comprueban nada
+FD_MAX_RTOL = 1e-2
+
+# Nodos de las dos cuadraturas de Gauss-Legendre que se comparan entre sí
+QUADRATURE_NODES = (64, 128)
+QUADRATURE_RTOL = 1e-8
+
+
+@dataclass(frozen=True, slots=True)
+class CheckResult:
+    """Resultado de una comprobación numérica."""
+
+    # Qué se comprobó: 'derivative', 'integral' o 'definite_integral'
+    name: str
+    # Etiqueta mostrada (por ejemplo, "f'(x)")
+    label: str
+    # Método de referencia que más puntos validó
+    method: str
+    checked: int
+    failed: int
+    max_error: float = 0.0
+    worst_x: float = None
+
+    @property
+    def passed(self):
+        """bool: True si se comprobó algún punto y ninguno falló."""
+        return self.checked > 0 and self.failed == 0
+
+    def summary(self):
+        """
+        Describe el resultado en una línea.
+
+        Returns:
+            str: Texto para la interfaz o la salida por lotes.
+        """
+        if self.checked == 0:
+            return f"? {self.label}: no se pudo comprobar (sin puntos evaluables)"
+        if self.failed == 0:
+            points = "punto" if self.checked == 1 else "puntos"
+            return (f"✓ {self.label}: correcta en {self.checked} {points} "
+                    f"({self.method}, error relativo máx. {self.max_error:.1e})")
+        return (f"✗ {self.label}: falla en {self.failed} de {self.checked} puntos "
+                f"(peor en x = {self.worst_x:.6g}, error relativo {self.max_error:.1e})")
+
+
+def _evaluate(func, x):
+    """Valores reales de func en x, punto a punto si no se puede vectorizar."""
+    return evaluate(func, x, fallback=True)
+
+
+def _complex_values(func, z):
+    """Evalúa una función en argumentos complejos (ValueError si no los admite)."""
+    with np.errstate(all='ignore'):
+        try:
+            values = np.asarray(func(z), dtype=np.complex128)
+        except Exception:
+            values = evaluate_pointwise(func, z, complex)
+            if np.all(np.isnan(values)):
+                raise ValueError("la función no admite argumentos complejos")
+    return np.broadcast_to(values, np.shape(z))
+
+
+def complex_derivative(func, x, order=1):
+    """
+    Derivada numérica por extensión compleja de la función.
+
+    Orden 1: paso complejo, f'(x) ≈ Im f(x + ih) / h, sin error de cancelación.
+    Órdenes superiores: fórmula integral de Cauchy con la regla del trapecio
+    sobre un círculo de radio CONTOUR_RADIUS. Si el círculo encierra una
+    singularidad el resultado es erróneo: ``check_derivative`` solo lo usa
+    donde concuerda con las diferencias finitas y ``contour_singular`` no
+    detecta ninguna.
+
+    Args:
+        func (callable): Función vectorizada que admite complejos.
+        x (numpy.ndarray): Puntos reales.
+        order (int): Orden de la derivada.
+
+    Returns:
+        numpy.ndarray: Derivadas (NaN donde no se pudieron calcular).
+
+    Raises:
+        ValueError: Si la función no admite argumentos complejos.
+    """
+    if order == 1:
+        values = _complex_values(func, x + 1j * COMPLEX_STEP)
+        return values.imag / COMPLEX_STEP
+
+    roots, values = _contour_values(func, x)
+    coefficient = np.mean(values * roots[None, :] ** (-order), axis=1)
+    return (coefficient * math.factorial(order) / CONTOUR_RADIUS ** order).real
+
+
+def _contour_values(func, x):
+    """Raíces de la unidad y valores de func en el círculo alrededor de cada x."""
+    roots = np.exp(2j * np.pi * np.arange(CONTOUR_POINTS) / CONTOUR_POINTS)
+    return roots, _complex_values(func, x[:, None] + CONTOUR_RADIUS * roots[None, :])
+
+
+def contour_singular(func, x):
+    """
+    Detecta los círculos de la fórmula de Cauchy que encierran una singularidad.
+
+    Si f es analítica en el disco, su serie de Laurent en x no tiene potencias
+    negativas y la regla del trapecio las anula; un polo o un corte de rama
+    dentro del círculo (o muy cerca) las hace aparecer.
+
+    Args:
+        func (callable): Función vectorizada que admite complejos.
+        x (numpy.ndarray): Puntos reales.
+
+    Returns:
+        numpy.ndarray: True donde la referencia de Cauchy no es fiable.
+
+    Raises:
+        ValueError: Si la función no admite argumentos complejos.
+    """
+    roots, values = _contour_values(func, x)
+    powers = roots[None, :, None] ** np.arange(1, SINGULAR_TERMS + 1)[None, None, :]
+    negative = np.abs(np.mean(values[:, :, None] * powers, axis=1)).max(axis=1)
+    scale = np.maximum(1.0, np.mean(np.abs(values), axis=1))
+    return ~(negative <= CONTOUR_SINGULAR_RTOL * scale)
+
+
+def contour_tolerance(order):
+    """
+    Tolerancia relativa de la referencia compleja de un orden.
+
+    Args:
+        order (int): Orden de la derivada.
+
+    Returns:
+        float: COMPLEX_RTOL, ampliada en órdenes altos por el redondeo que
+            amplifica la fórmula de Cauchy.
+    """
+    if order == 1:
+        return COMPLEX_RTOL
+    rounding = np.finfo(float).eps * math.factorial(order) / CONTOUR_RADIUS ** order
+    return max(COMPLEX_RTOL, CONTOUR_RTOL_FACTOR * rounding)
+
+
+def _central_difference(func, x, order, h):
+    """Diferencia centrada de orden ``order`` con paso h (error O(h²))."""
+    result = np.zeros_like(x)
+    for k in range(order + 1):
+        weight = (-1) ** k * math.comb(order, k)
+        result += weight * _evaluate(func, x + (order / 2 - k) * h)
+    return result / h ** order
+
+
+def finite_difference(func, x, order=1):
+    """
+    Derivada numérica por diferencias finitas centradas con extrapolación de Richardson.
+
+    Args:
+        func (callable): Función numérica de x.
+        x (numpy.ndarray): Puntos reales.
+        order (int): Orden de la derivada.
+
+    Returns:
+        tuple: (derivadas, error absoluto estimado); NaN donde f no está
+            definida en la plantilla.
+    """
+    # Paso que equilibra el error de truncamiento y el de redondeo
+    h = np.finfo(float).eps ** (1.0 / (order + 2)) * np.maximum(1.0, np.abs(x))
+    coarse = _central_difference(func, x, order, h)
+    fine = _central_difference(func, x, order, h / 2)
+    return (4 * fine - coarse) / 3, np.abs(fine - coarse)
+
+
+def _relative_error(value, reference):
+    """Error relativo con escala al menos 1 (los valores cercanos a cero usan el absoluto)."""
+    scale = np.maximum(1.0, np.maximum(np.abs(value), np.abs(reference)))
+    return np.abs(value - reference) / scale
+
+
+def _sample_points(x_range, points, rng):
+    """Puntos aleatorios en el rango, sin incluir los extremos."""
+    x_min, x_max = x_range
+    return np.sort(rng.uniform(x_min, x_max, points))
+
+
+def check_derivative(func, derivative, x_range, order=1, points=VERIFY_POINTS, seed=None,
+                     name='derivative', label="f'(x)"):
+    """
+    Comprueba una derivada compilada frente a la derivada numérica de func.
+
+    Un punto es correcto si coincide con la referencia compleja (tolerancia
+    estricta) o con las diferencias finitas (tolerancia según el orden y el
+    error estimado). Donde las diferencias finitas son demasiado imprecisas
+    para comprobar nada (órdenes altos), solo cuenta la referencia compleja,
+    y únicamente si el círculo de Cauchy no encierra singularidades. Los
+    puntos donde f o la derivada no están definidas se descartan.
+
+    Args:
+        func (callable): Función numérica f.
+        derivative (callable): Derivada de orden ``order`` que se comprueba.
+        x_range (tuple): Rango (x_min, x_max) de los puntos.
+        order (int): Orden de la derivada.
+        points (int): Número de puntos aleatorios.
+        seed (int, optional): Semilla del generador aleatorio.
+        name (str): Nombre de la comprobación.
+        label (str): Etiqueta mostrada.
+
+    Returns:
+        CheckResult: Resultado de la comprobación.
+    """
+    rng = np.random.default_rng(seed)
+    x = _sample_points(x_range, points, rng)
+    claimed = _evaluate(derivative, x)
+
+    # Tolerancia de las diferencias finitas, ampliada donde el error estimado
+    # es mayor (por ejemplo, cerca de un polo)
+    fd_reference, fd_uncertainty = finite_difference(func, x, order)
+    fd_tolerance = np.maximum(FD_RTOL_FACTOR * np.finfo(float).eps ** (2.0 / (order + 2)),
+                              FD_ERROR_FACTOR * fd_uncertainty / np.maximum(1.0, np.abs(fd_reference)))
+    fd_error = _relative_error(claimed, fd_reference)
+    # Donde las diferencias finitas no son fiables, solo cuenta la referencia compleja
+    fd_reliable = fd_tolerance <= FD_MAX_RTOL
+    fd_ok = fd_reliable & (fd_error <= fd_tolerance)
+
+    try:
+        complex_reference = complex_derivative(func, x, order)
+        # La referencia compleja se descarta donde contradice a las diferencias finitas
+        # (círculo que encierra una singularidad, función no analítica)
+        trusted = _relative_error(complex_reference, fd_reference) <= fd_tolerance
+        if order > 1 and not fd_reliable.all():
+            # Sin diferencias finitas precisas, la concordancia no basta: el
+            # círculo tampoco debe encerrar ninguna singularidad
+            trusted &= fd_reliable | ~contour_singular(func, x)
+        else:
+            trusted &= fd_reliable
+        complex_error = np.where(trusted, _relative_error(claimed, complex_reference), np.nan)
+    except ValueError:
+        complex_error = np.full_like(x, np.nan)
+    complex_ok = complex_error <= contour_tolerance(order)
+
+    # Se descartan los puntos sin valor de f o de la derivada, o sin referencia
+    valid = np.isfinite(_evaluate(func, x)) & np.isfinite(claimed) & np.isfinite(fd_reference)
+    valid &= fd_reliable | np.isfinite(complex_error)
+    ok = (complex_ok | fd_ok)[valid]
+    error = np.fmin(complex_error, fd_error)[valid]
+    x = x[valid]
+    if not len(x):
+        return CheckResult(name, label, "-", 0, 0)
+
+    method = "paso complejo" if order == 1 else "fórmula de Cauchy"
+    if 2 * np.count_nonzero(complex_ok[valid]) < len(x):
+        method = "diferencias finitas"
+    worst = int(np.argmax(error))
+    return CheckResult(name, label, method, len(x), int(np.count_nonzero(~ok)),
+                       float(error[worst]), float(x[worst]))
+
+
+def check_antiderivative(func, antiderivative, x_range, points=VERIFY_POINTS, seed=None):
+    """
+    Comprueba que d/dx de la antiderivada coincide con f.
+
+    Args:
+        func (callable): Función numérica f.
+        antiderivative (callable): Antiderivada F que se comprueba.
+        x_range (tuple): Rango (x_min, x_max) de los puntos.
+        points (int): Número de puntos aleatorios.
+        seed (int, optional): Semilla del generador aleatorio.
+
+    Returns:
+        CheckResult: Resultado de la comprobación.
+    """
+    return check_derivative(antiderivative, func, x_range, 1, points, seed,
+                            name='integral', label="d/dx ∫f(x)dx = f(x)")
+
+
+def check_definite_integral(func, lower, upper, value):
+    """
+    Comprueba el valor de una integral definida con cuadratura de Gauss-Legendre.
+
+    Si las cuadraturas con distinto número de nodos no coinciden (integrando
+    singular u oscilante), la comprobación se da por no concluyente.
+
+    Args:
+        func (callable): Función numérica f.
+        lower (float): Límite inferior.
+        upper (float): Límite superior.
+        value (float): Valor calculado de la integral.
+
+    Returns:
+        CheckResult: Resultado de la comprobación (un único punto).
+    """
+    label = "∫f(x)dx definida"
+    estimates = []
+    for nodes in QUADRATURE_NODES:
+        t, w = np.polynomial.legendre.leggauss(nodes)
+        x = 0.5 * (upper - lower) * t + 0.5 * (upper + lower)
+        estimates.append(0.5 * (upper - lower) * np.sum(w * _evaluate(func, x)))
+
+    coarse, fine = estimates
+    if not (np.isfinite(fine) and np.isfinite(value)) \
+            or _relative_error(coarse, fine) > QUADRATURE_RTOL:
+        return CheckResult('definite_integral', label, "-", 0, 0)
+    error = float(_relative_error(value, fine))
+    return CheckResult('definite_integral', label, "Gauss-Legendre", 1,
+                       int(error > 100 * QUADRATURE_RTOL), error, 0.5 * (lower + upper))
+
+
+def main(argv=None):
+    """
+    Comprueba por lotes las funciones dadas en la línea de órdenes.
+
+    Args:
+        argv (list, optional): Argumentos (sin el nombre del programa).
+
+    Returns:
+        int: 0 si todas las comprobaciones pasan; 1 en caso contrario.
+    """
+    # Importación diferida: logic importa este módulo
+    from logic import MathHelper
+
+    parser = argparse.ArgumentParser(description="Comprobación numérica de derivadas e integrales")
+    parser.add_argument('functions', nargs='*', help="funciones a comprobar")
+    parser.add_argument('--file', help="archivo con una función por línea")
+    parser.add_argument('--order', type=int, default=1)
+    parser.add_argument('--integral', action='store_true', help="comprobar también la integral indefinida")
+    parser.add_argument('--points', type=int, default=VERIFY_POINTS)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    functions = list(args.functions)
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            functions += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+    helper = MathHelper()
+    failures = 0
+    for func_str in functions:
+        print(func_str)
+        try:
+            helper.run_analysis(func_str, args.order, 'indefinida' if args.integral else None)
+            checks = helper.verify_results(helper.get_suitable_range(), args.points, args.seed)
+        except Exception as e:
+            print(f"  ✗ Error al comprobar la función: {str(e)}")
+            failures += 1
+            continue
+        for check in checks:
+            print(f"  {check.summary()}")
+            failures += check.checked > 0 and not check.passed
+    print(f"{len(functions)} funciones, {failures} con errores")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))